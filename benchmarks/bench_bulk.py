@@ -0,0 +1,86 @@
+"""Benchmark for the commands which change many tasks at once.
+
+Generates a database with benchmarks/generator.py and times 'start', 'stop',
+'modify', 'done' and 'delete' on all pending tasks of a group, with the new
+versions added task by task as before and in bulk. Each command runs on a
+fresh copy of the database.
+
+Usage:
+    python benchmarks/bench_bulk.py [--pending N] [--group AREA1] [--runs N]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mock
+from click.testing import CliRunner
+
+from benchmarks.generator import generate
+from src.mytcli.myt import start, stop, modify, done, delete
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+
+def timed(template, path, command, args, bulk_min, runs):
+    timings = []
+    for _ in range(runs):
+        shutil.copyfile(template, path)
+        with mock.patch('src.mytcli.operations.BULK_MIN_TASKS', bulk_min), \
+                mock.patch('src.mytcli.operations.Prompt.ask',
+                           return_value="this"):
+            start_t = time.perf_counter()
+            result = runner.invoke(command, args + ["-db", path])
+            timings.append(time.perf_counter() - start_t)
+        db.discard_db_resources()
+        if result.exit_code != 0:
+            raise RuntimeError("{} failed: {}".format(command.name,
+                                                      result.output))
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pending", type=int, default=4000)
+    parser.add_argument("--group", default="AREA1")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    template = os.path.join(workdir, "bench_bulk.sqlite3")
+    path = os.path.join(workdir, "bench_bulk_run.sqlite3")
+    try:
+        generate(template, args.pending, args.pending, args.pending // 10,
+                 recurring=0, rnd=random.Random(args.seed))
+        group = ["gr:" + args.group]
+        cases = [
+            ("start", start, group),
+            ("stop", stop, group),
+            ("modify", modify, group + ["-pr", "H", "-tg", "bulk"]),
+            ("done", done, group),
+            ("delete", delete, group),
+        ]
+        print("{:<10} {:>14} {:>12} {:>8}"
+              .format("command", "task by task", "bulk", "speedup"))
+        for name, command, cmd_args in cases:
+            single_t = timed(template, path, command, cmd_args, 10**9,
+                             args.runs)
+            bulk_t = timed(template, path, command, cmd_args, 2, args.runs)
+            print("{:<10} {:>12.1f}ms {:>10.1f}ms {:>7.1f}x"
+                  .format(name, single_t * 1000, bulk_t * 1000,
+                          single_t / bulk_t))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
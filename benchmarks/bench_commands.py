@@ -0,0 +1,164 @@
+"""Benchmark for the core commands on generated databases of a few sizes.
+
+Generates a database for each size with benchmarks/generator.py and times
+the commands as run from the shell, less the interpreter's startup: 'view',
+a filtered 'view', 'stats', 'add', 'modify', 'done' and 'undo', and the
+catch up on the recurring tasks on the first run after a week away. The
+commands which change the tasks run on a copy of the database, one after
+the other in each run.
+
+The results are printed and with --json written as a JSON document with
+the environment and the timings, for comparing runs across changes.
+
+Usage:
+    python benchmarks/bench_commands.py [--sizes 1000,10000,100000]
+                                        [--runs N] [--json PATH]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from click.testing import CliRunner
+
+from benchmarks.generator import generate, drop_recent_instances
+from src.mytcli.myt import add, modify, done, undo, stats, view
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+READ_COMMANDS = [
+    ("view", view, []),
+    ("view gr:AREA1 tg:tag0", view, ["gr:AREA1", "tg:tag0"]),
+    ("stats", stats, []),
+]
+RECUR_DAYS_AWAY = 7
+
+
+def invoke(command, args, path):
+    start = time.perf_counter()
+    result = runner.invoke(command, args + ["-db", path])
+    elapsed = time.perf_counter() - start
+    if result.exit_code != 0:
+        raise RuntimeError("{} {} failed: {}".format(
+            command.name, " ".join(args), result.output))
+    return elapsed
+
+
+def summary(size, name, timings):
+    timings = sorted(timings)
+    return {"size": size, "command": name, "runs": len(timings),
+            "min_ms": round(timings[0] * 1000, 3),
+            "median_ms": round(timings[len(timings) // 2] * 1000, 3),
+            "max_ms": round(timings[-1] * 1000, 3)}
+
+
+def bench_size(size, args, workdir):
+    rnd = random.Random(args.seed)
+    pending = int(size * args.pending)
+    binned = int(size * args.binned)
+    completed = size - pending - binned
+    template = os.path.join(workdir, "bench_{}.sqlite3".format(size))
+    start = time.perf_counter()
+    counts = generate(template, pending, completed, binned, args.versions,
+                      args.tags, args.group_depth,
+                      max(size // args.recurring_per, 1), rnd=rnd)
+    results = [summary(size, "generate", [time.perf_counter() - start])]
+    results[0]["rows"] = counts
+
+    for name, command, cmd_args in READ_COMMANDS:
+        timings = [invoke(command, cmd_args, template)
+                   for _ in range(args.runs)]
+        results.append(summary(size, name, timings))
+
+    # Changes on a copy, each run adds, modifies, completes and undoes
+    path = os.path.join(workdir, "bench_{}_write.sqlite3".format(size))
+    shutil.copyfile(template, path)
+    writes = {"add": [], "modify": [], "done": [], "undo": []}
+    for _ in range(args.runs):
+        task_id = "id:{}".format(rnd.randint(1, pending))
+        writes["add"].append(invoke(add, ["-de", "Benchmark add", "-gr",
+                                          "AREA1.PROJ2", "-tg", "tag1"],
+                                    path))
+        writes["modify"].append(invoke(modify, [task_id, "-pr", "H"], path))
+        writes["done"].append(invoke(done, [task_id], path))
+        writes["undo"].append(invoke(undo, [], path))
+    results.extend(summary(size, name, timings)
+                   for name, timings in writes.items())
+
+    timings = []
+    for _ in range(args.runs):
+        shutil.copyfile(template, path)
+        drop_recent_instances(path, RECUR_DAYS_AWAY)
+        start = time.perf_counter()
+        db.connect_to_tasksdb(full_db_path=path)
+        timings.append(time.perf_counter() - start)
+        db.discard_db_resources()
+    results.append(summary(size, "recur catch-up {}d".format(RECUR_DAYS_AWAY),
+                           timings))
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit, "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version, "platform": platform.platform()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma separated numbers of tasks")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--pending", type=float, default=0.4,
+                        help="Share of the tasks which are pending")
+    parser.add_argument("--binned", type=float, default=0.05,
+                        help="Share of the tasks which are in the bin")
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--group-depth", type=int, default=3)
+    parser.add_argument("--recurring-per", type=int, default=200,
+                        help="Tasks per recurring base task")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Path to write the results to")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    results = []
+    print("{:>8} {:<28} {:>12} {:>12} {:>12}"
+          .format("tasks", "command", "min", "median", "max"))
+    try:
+        for size in [int(size) for size in args.sizes.split(",")]:
+            for row in bench_size(size, args, workdir):
+                results.append(row)
+                print("{:>8} {:<28} {:>10.1f}ms {:>10.1f}ms {:>10.1f}ms"
+                      .format(row["size"], row["command"], row["min_ms"],
+                              row["median_ms"], row["max_ms"]))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "args": vars(args),
+                       "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
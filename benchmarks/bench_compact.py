@@ -0,0 +1,99 @@
+"""Benchmark for the commands before and after the history is compacted.
+
+Generates a database with benchmarks/generator.py with many versions of each
+task, times the core commands on it, compacts it with 'admin --compact' and
+times them again on the compacted database. The size of the tasks database
+and of the archive are printed along with the timings.
+
+Usage:
+    python benchmarks/bench_compact.py [--tasks N] [--versions N] [--runs N]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from click.testing import CliRunner
+
+from benchmarks.generator import generate
+from src.mytcli.myt import view, stats, modify, admin
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+COMMANDS = [
+    ("view", view, []),
+    ("view gr:AREA1 tg:tag0", view, ["gr:AREA1", "tg:tag0"]),
+    ("view --history gr:AREA1", view, ["--history", "gr:AREA1"]),
+    ("stats", stats, []),
+    ("modify id:1", modify, ["id:1", "-pr", "H"]),
+]
+
+
+def timed(path, command, args, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = runner.invoke(command, args + ["-db", path])
+        timings.append(time.perf_counter() - start)
+        if result.exit_code != 0:
+            raise RuntimeError("{} failed: {}".format(command.name,
+                                                      result.output))
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--versions", type=int, default=10)
+    parser.add_argument("--days", type=int, default=30,
+                        help="Days of changes kept for undo")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "bench_compact.sqlite3")
+    try:
+        pending = args.tasks * 2 // 5
+        generate(path, pending, args.tasks - pending - args.tasks // 20,
+                 args.tasks // 20, args.versions,
+                 rnd=random.Random(args.seed))
+        before = {name: timed(path, command, cmd_args, args.runs)
+                  for name, command, cmd_args in COMMANDS}
+        size_before = os.path.getsize(path)
+        result = runner.invoke(admin, ["--compact", str(args.days), "-db",
+                                       path])
+        print(result.output.strip())
+        # The space freed is reused by later versions, vacuumed to size it
+        db.discard_db_resources()
+        db.connect_to_tasksdb(full_db_path=path)
+        db.SESSION.connection().exec_driver_sql("VACUUM")
+        db.discard_db_resources()
+        after = {name: timed(path, command, cmd_args, args.runs)
+                 for name, command, cmd_args in COMMANDS}
+        print("{:<26} {:>12} {:>12} {:>8}"
+              .format("command", "full", "compacted", "speedup"))
+        for name, _, _ in COMMANDS:
+            print("{:<26} {:>10.1f}ms {:>10.1f}ms {:>7.1f}x"
+                  .format(name, before[name] * 1000, after[name] * 1000,
+                          before[name] / after[name]))
+        print("{:<26} {:>10.1f}MB {:>10.1f}MB"
+              .format("tasks database", size_before / 2**20,
+                      os.path.getsize(path) / 2**20))
+        print("{:<26} {:>12} {:>10.1f}MB"
+              .format("archive", "",
+                      os.path.getsize(db.get_archive_path(path)) / 2**20))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
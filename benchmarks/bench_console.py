@@ -0,0 +1,97 @@
+"""Benchmark for the Console used by each command in the TUI and the server.
+
+Compares the overhead of a dispatch when a new Rich Console is built for
+every command, as done before the Consoles were pooled, against reusing
+the pooled Console. Timed for the switch of the Console alone and for the
+dispatch of a short listing and a 'view'.
+
+Usage:
+    python benchmarks/bench_console.py [--tasks N] [--runs N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+
+from benchmarks.bench_filters import seed
+from src.mytcli.myt import myt
+from src.mytcli.dispatcher import TUIDispatcher
+import src.mytcli.constants as constants
+import src.mytcli.db as db
+
+
+def set_target_new(self, file_obj, width=None):
+    self._console = Console(theme=self._theme, file=file_obj,
+                            force_terminal=True, width=width or 200)
+
+
+def reset_new(self):
+    self._console = Console(theme=self._theme)
+
+
+def switch_only():
+    constants.CONSOLE.set_target(StringIO(), width=120)
+    constants.CONSOLE.reset()
+
+
+def timed_each(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--versions", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_console.sqlite3")
+    print("Seeding {} tasks with {} versions each..."
+          .format(args.tasks, args.versions))
+    seed(path, args.tasks, args.versions, random.Random(args.seed))
+    constants.TUI_MODE = True
+    db.connect_to_tasksdb(full_db_path=path)
+    dispatcher = TUIDispatcher(myt)
+    cases = [
+        ("switch console", switch_only),
+        ("dispatch 'view --tags'",
+         lambda: dispatcher.dispatch("view --tags -db " + path,
+                                     width_override=120)),
+        ("dispatch 'view'",
+         lambda: dispatcher.dispatch("view -db " + path, width_override=120)),
+    ]
+
+    proxy = type(constants.CONSOLE)
+    set_target_pool, reset_pool = proxy.set_target, proxy.reset
+    print("{:<24} {:>12} {:>12} {:>8}"
+          .format("median of {} runs".format(args.runs), "new console",
+                  "pooled", "speedup"))
+    for name, func in cases:
+        proxy.set_target, proxy.reset = set_target_new, reset_new
+        func()
+        old_t = timed_each(func, args.runs)
+        proxy.set_target, proxy.reset = set_target_pool, reset_pool
+        func()
+        new_t = timed_each(func, args.runs)
+        print("{:<24} {:>10.3f}ms {:>10.3f}ms {:>7.1f}x"
+              .format(name, old_t * 1000, new_t * 1000, old_t / new_t))
+    db.discard_db_resources()
+
+
+if __name__ == "__main__":
+    main()
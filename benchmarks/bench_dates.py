@@ -0,0 +1,92 @@
+"""Benchmark for the date filters and the views which compare dates.
+
+Generates a database with benchmarks/generator.py and times the due and hide
+date filters, the overdue and today modifiers, the 7 day view and the stats
+on it. The query plan of the due date filter is printed to show whether it
+runs as a range scan on the integer due date index.
+
+Usage:
+    python benchmarks/bench_dates.py [--tasks N] [--versions N] [--runs N]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from click.testing import CliRunner
+from sqlalchemy import select
+
+from benchmarks.generator import generate
+from src.mytcli.myt import view, stats
+from src.mytcli.models import Workspace, epoch_day
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+COMMANDS = [
+    ("view du:lt:+7", view, ["du:lt:+7"]),
+    ("view du:bt:-7:+0", view, ["du:bt:-7:+0"]),
+    ("view hi:gt:+0", view, ["hi:gt:+0"]),
+    ("view OVERDUE", view, ["OVERDUE"]),
+    ("view TODAY", view, ["TODAY"]),
+    ("view --7day", view, ["--7day"]),
+    ("stats", stats, []),
+]
+
+
+def timed(path, command, args, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = runner.invoke(command, args + ["-db", path])
+        timings.append(time.perf_counter() - start)
+        if result.exit_code != 0:
+            raise RuntimeError("{} failed: {}".format(command.name,
+                                                      result.output))
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "bench_dates.sqlite3")
+    try:
+        pending = args.tasks * 2 // 5
+        generate(path, pending, args.tasks - pending - args.tasks // 20,
+                 args.tasks // 20, args.versions,
+                 rnd=random.Random(args.seed))
+        db.connect_to_tasksdb(full_db_path=path)
+        stmt = (select(Workspace.uuid)
+                .where(Workspace.due_day < epoch_day(datetime.now()) + 7))
+        compiled = stmt.compile(db.ENGINE,
+                                compile_kwargs={"literal_binds": True})
+        for row in (db.SESSION.connection()
+                    .exec_driver_sql("EXPLAIN QUERY PLAN {}"
+                                     .format(compiled))):
+            print("plan: {}".format(row[-1]))
+        db.discard_db_resources()
+        print("{:<26} {:>12}".format("command", "median"))
+        for name, command, cmd_args in COMMANDS:
+            print("{:<26} {:>10.1f}ms"
+                  .format(name, timed(path, command, cmd_args, args.runs)
+                          * 1000))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
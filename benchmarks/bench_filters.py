@@ -0,0 +1,160 @@
+"""Benchmark for the task filters.
+
+Compares the single statement compiled by get_task_uuid_n_ver() with the
+previous approach of running one query per filter and combining them with
+INTERSECT. Both are built from the same filter conditions so the results are
+checked to be identical before timing.
+
+Usage:
+    python benchmarks/bench_filters.py [--tasks N] [--versions N] [--runs N]
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_
+
+from src.mytcli.constants import (FMT_DATEONLY, FMT_DATETIME, TASK_TYPE_NRML,
+                                  TASK_STATUS_TODO, TASK_STATUS_STARTED,
+                                  TASK_STATUS_DONE, WS_AREA_PENDING,
+                                  WS_AREA_COMPLETED, WS_AREA_BIN,
+                                  TASK_OVERDUE, TASK_STARTED, TASK_COMPLETE,
+                                  TASK_TYPE_DRVD)
+from src.mytcli.models import Workspace, WorkspaceTags
+from src.mytcli.queries import (get_task_uuid_n_ver, get_filter_conditions,
+                                get_max_ver_sqr)
+from src.mytcli.utils import sync_latest_versions
+import src.mytcli.db as db
+
+GROUPS = ["HOME", "HOME.GARDEN", "WORK", "WORK.PROJ1", "WORK.PROJ2", None]
+CONTEXTS = ["phone", "desk", "errand", None]
+TAGS = ["urgent", "later", "waiting", "someday"]
+
+FILTER_CASES = [
+    {"group": "WORK"},
+    {"group": "WORK", "tag": "urgent"},
+    {"group": "HOME", "context": "desk", "desc": "task 1"},
+    {"due": ["lt", None, None], "tag": ""},
+    {"due": ["bt", None, None], "group": "WORK", "context": "phone"},
+    {TASK_OVERDUE: "yes", "group": "WORK"},
+    {TASK_STARTED: "yes", "tag": "later,waiting"},
+    {TASK_COMPLETE: "yes", "group": "HOME", "tag": "someday"},
+]
+
+
+def seed(path, tasks, versions, rnd):
+    db.connect_to_tasksdb(full_db_path=path)
+    today = datetime.now().date()
+    created = datetime.now().strftime(FMT_DATETIME)
+    next_id = 1
+    for i in range(tasks):
+        task_uuid = str(uuid.UUID(int=rnd.getrandbits(128)))
+        area = rnd.choices([WS_AREA_PENDING, WS_AREA_COMPLETED, WS_AREA_BIN],
+                           [6, 3, 1])[0]
+        for ver in range(1, versions + 1):
+            latest = ver == versions
+            if area == WS_AREA_PENDING and latest:
+                task_id = next_id
+                next_id = next_id + 1
+                status = rnd.choice([TASK_STATUS_TODO, TASK_STATUS_STARTED])
+            else:
+                task_id = "-"
+                status = TASK_STATUS_DONE
+            due = today + timedelta(days=rnd.randint(-30, 30))
+            db.SESSION.add(Workspace(
+                uuid=task_uuid, version=ver, id=task_id,
+                description="Benchmark task {}".format(i),
+                priority="N", status=status,
+                due=due.strftime(FMT_DATEONLY),
+                area=area if latest else WS_AREA_PENDING,
+                created=created, groups=rnd.choice(GROUPS),
+                context=rnd.choice(CONTEXTS),
+                event_id=str(uuid.UUID(int=rnd.getrandbits(128))),
+                now_flag=None, task_type=TASK_TYPE_NRML,
+                inception=created, duration=0,
+                dur_event=(created if status == TASK_STATUS_STARTED
+                           else None)))
+            for tag in rnd.sample(TAGS, rnd.randint(0, 2)):
+                db.SESSION.add(WorkspaceTags(uuid=task_uuid, version=ver,
+                                             tags=tag))
+        if i % 1000 == 0:
+            db.SESSION.flush()
+    sync_latest_versions()
+    db.SESSION.commit()
+
+
+def resolve_dates(filters, today):
+    """Fills in the due date bounds relative to the current date."""
+    due = filters.get("due")
+    if due is not None:
+        filters["due"] = [due[0], (today - timedelta(days=7))
+                          .strftime(FMT_DATEONLY),
+                          (today + timedelta(days=7)).strftime(FMT_DATEONLY)]
+    return filters
+
+
+def intersect_query(filters):
+    """The previous approach, one query per filter combined by INTERSECT."""
+    if filters.get(TASK_COMPLETE) is not None:
+        drvd_area = WS_AREA_COMPLETED
+    else:
+        drvd_area = WS_AREA_PENDING
+    curr_date = datetime.now().date()
+    queries = []
+    for condition in get_filter_conditions(filters, drvd_area, curr_date):
+        max_ver_sqr = get_max_ver_sqr([TASK_TYPE_DRVD, TASK_TYPE_NRML])
+        queries.append(db.SESSION.query(Workspace.uuid, Workspace.version)
+                       .join(max_ver_sqr,
+                             and_(Workspace.version == max_ver_sqr.c.maxver,
+                                  Workspace.uuid == max_ver_sqr.c.uuid))
+                       .filter(condition))
+    firstqr = queries.pop(0)
+    return firstqr.intersect(*queries).all()
+
+
+def timed(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_filters.sqlite3")
+    print("Seeding {} tasks with {} versions each..."
+          .format(args.tasks, args.versions))
+    seed(path, args.tasks, args.versions, random.Random(args.seed))
+
+    today = datetime.now().date()
+    print("{:<60} {:>8} {:>12} {:>12} {:>8}"
+          .format("filters", "rows", "intersect", "single", "speedup"))
+    for case in FILTER_CASES:
+        filters = resolve_dates(dict(case), today)
+        old, old_t = timed(lambda: intersect_query(filters), args.runs)
+        new, new_t = timed(lambda: get_task_uuid_n_ver(filters), args.runs)
+        assert sorted(map(tuple, old)) == sorted(map(tuple, new)), case
+        print("{:<60} {:>8} {:>10.2f}ms {:>10.2f}ms {:>7.1f}x"
+              .format(str(case)[:60], len(new), old_t * 1000, new_t * 1000,
+                      old_t / new_t))
+    db.discard_db_resources()
+
+
+if __name__ == "__main__":
+    main()
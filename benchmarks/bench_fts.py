@@ -0,0 +1,60 @@
+"""Benchmark for the description and notes filters.
+
+Compares the substring search run as a LIKE on the task versions, as done
+when the full text search index is not available, against the same search
+through the index. The results are checked to be identical before timing.
+
+Usage:
+    python benchmarks/bench_fts.py [--tasks N] [--versions N] [--runs N]
+"""
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_filters import seed, timed
+from src.mytcli.queries import get_task_uuid_n_ver
+import src.mytcli.db as db
+
+SEARCH_CASES = [
+    {"desc": "task 4242"},
+    {"desc": "task 12"},
+    {"desc": "benchmark", "group": "WORK"},
+    {"desc": "missing"},
+    {"notes": "missing"},
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_fts.sqlite3")
+    print("Seeding {} tasks with {} versions each..."
+          .format(args.tasks, args.versions))
+    seed(path, args.tasks, args.versions, random.Random(args.seed))
+
+    print("{:<40} {:>8} {:>12} {:>12} {:>8}"
+          .format("filters", "rows", "like", "fts", "speedup"))
+    for case in SEARCH_CASES:
+        db.FTS_ENABLED = False
+        old, old_t = timed(lambda: get_task_uuid_n_ver(case), args.runs)
+        db.FTS_ENABLED = True
+        new, new_t = timed(lambda: get_task_uuid_n_ver(case), args.runs)
+        assert sorted(map(tuple, old)) == sorted(map(tuple, new)), case
+        print("{:<40} {:>8} {:>10.2f}ms {:>10.2f}ms {:>7.1f}x"
+              .format(str(case)[:40], len(new), old_t * 1000, new_t * 1000,
+                      old_t / new_t))
+    db.discard_db_resources()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark for assigning task IDs over many sequential adds.
+
+Adds tasks one at a time, each in its own transaction as the 'add' command
+does, and completes every third task so the IDs freed are reused. Timed
+with the free task IDs table against the earlier allocator which read and
+sorted every ID in use for each new task. The time of the adds is printed
+for each block of tasks to show how it grows with the tasks in the pending
+area, with the time taken by the allocator alone in brackets. The database
+uses the 'bulk' profile, so the syncs to disk on each commit do not hide the
+time of the adds.
+
+Usage:
+    python benchmarks/bench_ids.py [--adds N] [--block N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mock
+from sqlalchemy import and_
+
+from src.mytcli.constants import (DB_PROFILE_BULK, WS_AREA_PENDING,
+                                  WS_AREA_COMPLETED,
+                                  TASK_TYPE_NRML, TASK_TYPE_DRVD,
+                                  TASK_STATUS_DONE, OPS_ADD, OPS_DONE)
+from src.mytcli.models import Workspace, WorkspaceLatest, stored_columns
+from src.mytcli.operations import add_task_and_tags
+from src.mytcli.utils import derive_task_id
+import src.mytcli.db as db
+
+
+def derive_task_id_scan():
+    """The allocator before the free task IDs table, for comparison."""
+    results = (db.SESSION.query(WorkspaceLatest.id)
+               .filter(and_(WorkspaceLatest.area == WS_AREA_PENDING,
+                            WorkspaceLatest.id != '-',
+                            WorkspaceLatest.task_type
+                                .in_([TASK_TYPE_NRML, TASK_TYPE_DRVD])))
+               .all())
+    id_list = [row[0] for row in results]
+    id_list.insert(0, 0)
+    id_list.sort()
+    available_list = sorted(set(range(id_list[0], id_list[-1]))
+                            - set(id_list))
+    return available_list[0] if available_list else id_list[-1] + 1
+
+
+def run_adds(adds, block, allocator):
+    path = os.path.join(tempfile.mkdtemp(), "bench_ids.sqlite3")
+    # Without the syncs to disk so the time is that of the adds
+    db.connect_to_tasksdb(full_db_path=path, profile=DB_PROFILE_BULK)
+    alloc_time = [0]
+
+    def timed_allocator():
+        alloc_start = time.perf_counter()
+        task_id = allocator()
+        alloc_time[0] = alloc_time[0] + time.perf_counter() - alloc_start
+        return task_id
+
+    timings = []
+    start = time.perf_counter()
+    with mock.patch("src.mytcli.operations.derive_task_id", timed_allocator):
+        for cnt in range(1, adds + 1):
+            ret, task, _ = add_task_and_tags(
+                Workspace(description="Benchmark task {}".format(cnt)),
+                None, None, OPS_ADD)
+            db.SESSION.commit()
+            if cnt % 3 == 0:
+                # Complete the task to free its ID, not timed
+                elapsed = time.perf_counter()
+                task = db.SESSION.get(Workspace, (task.uuid, task.version))
+                db.SESSION.expunge(task)
+                done = Workspace(**{col.name: getattr(task, col.name)
+                                    for col in
+                                    stored_columns(Workspace.__table__)})
+                done.id, done.area = "-", WS_AREA_COMPLETED
+                done.status = TASK_STATUS_DONE
+                add_task_and_tags(done, None, None, OPS_DONE)
+                db.SESSION.commit()
+                start = start + time.perf_counter() - elapsed
+            if cnt % block == 0:
+                timings.append((time.perf_counter() - start, alloc_time[0]))
+                start = time.perf_counter()
+                alloc_time[0] = 0
+    db.discard_db_resources()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--adds", type=int, default=10000)
+    parser.add_argument("--block", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("Adding {} tasks with the earlier allocator...".format(args.adds))
+    scan = run_adds(args.adds, args.block, derive_task_id_scan)
+    print("Adding {} tasks with the free task IDs...".format(args.adds))
+    free = run_adds(args.adds, args.block, derive_task_id)
+    print("{:>12} {:>24} {:>24}".format("", "add (of which ID)", ""))
+    print("{:>12} {:>24} {:>24}".format("adds", "full scan", "free IDs"))
+    rows = [("{}-{}".format((idx - 1) * args.block + 1, idx * args.block),
+             scan_t, free_t)
+            for idx, (scan_t, free_t) in enumerate(zip(scan, free), start=1)]
+    rows.append(("total", [sum(t) for t in zip(*scan)],
+                 [sum(t) for t in zip(*free)]))
+    for name, (scan_t, scan_id), (free_t, free_id) in rows:
+        print("{:>12} {:>10.1f}ms ({:>7.1f}ms) {:>10.1f}ms ({:>7.1f}ms)"
+              .format(name, scan_t * 1000, scan_id * 1000, free_t * 1000,
+                      free_id * 1000))
+
+
+if __name__ == "__main__":
+    main()
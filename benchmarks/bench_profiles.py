@@ -0,0 +1,67 @@
+"""Benchmark for the database connection profiles.
+
+Times the 'add' and 'modify' commands end to end, including connecting to
+the database, for each of the connection profiles. Use --dir to run against
+a directory on the file system of interest, for ex. a network home directory.
+
+Usage:
+    python benchmarks/bench_profiles.py [--tasks N] [--dir PATH]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from click.testing import CliRunner
+
+from src.mytcli.constants import DB_PROFILES
+from src.mytcli.myt import add, modify, admin
+
+runner = CliRunner()
+
+
+def timed_invoke(command, args):
+    start = time.perf_counter()
+    result = runner.invoke(command, args)
+    elapsed = time.perf_counter() - start
+    assert result.exit_code == 0, result.output
+    return elapsed
+
+
+def summary(timings):
+    timings = sorted(timings)
+    return (statistics.mean(timings) * 1000,
+            timings[len(timings) // 2] * 1000,
+            timings[int(len(timings) * 0.95)] * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--dir", default=None)
+    args = parser.parse_args()
+
+    print("{:<10} {:<8} {:>10} {:>10} {:>10}"
+          .format("profile", "command", "mean", "p50", "p95"))
+    for profile in DB_PROFILES:
+        path = os.path.join(tempfile.mkdtemp(dir=args.dir),
+                            "bench_profiles.sqlite3")
+        runner.invoke(admin, ["--profile", profile, "-db", path])
+        add_t = [timed_invoke(add, ["-de", "Benchmark task {}".format(i),
+                                    "-tg", "bench", "-du", "+1", "-db", path])
+                 for i in range(args.tasks)]
+        mod_t = [timed_invoke(modify, ["id:{}".format(i + 1), "-pr", "H",
+                                       "-db", path])
+                 for i in range(args.tasks)]
+        for command, timings in (("add", add_t), ("modify", mod_t)):
+            print("{:<10} {:<8} {:>8.2f}ms {:>8.2f}ms {:>8.2f}ms"
+                  .format(profile, command, *summary(timings)))
+
+
+if __name__ == "__main__":
+    main()
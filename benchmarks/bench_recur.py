@@ -0,0 +1,96 @@
+"""Benchmark for creating the recurring task instances on the first run of a
+day.
+
+Adds recurring tasks which are missing their instances for the last few days
+and times creating the instances one base task at a time, as
+prep_recurring_tasks does, against the set based create_recur_inst.
+
+Usage:
+    python benchmarks/bench_recur.py [--tasks N] [--days N]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from click.testing import CliRunner
+
+from src.mytcli.constants import FMT_DATEONLY, TASK_TYPE_DRVD
+from src.mytcli.models import (Workspace, WorkspaceTags, WorkspaceRecurDates,
+                               WorkspaceLatest)
+from src.mytcli.myt import add
+from src.mytcli.operations import create_recur_inst, prep_recurring_tasks
+from src.mytcli.queries import get_tasks, get_tags, get_task_uuid_n_ver
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+
+def seed(path, tasks, days):
+    for i in range(tasks):
+        runner.invoke(add, ["-de", "Benchmark recurring task {}".format(i),
+                            "-re", "D", "-du", "-{}".format(days + 5),
+                            "-tg", "bench", "-db", path])
+    # Remove the instances of the last few days as if they were not run
+    cutoff = (date.today() - timedelta(days=days)).strftime(FMT_DATEONLY)
+    db.connect_to_tasksdb(full_db_path=path)
+    inst = (db.SESSION.query(Workspace.uuid, Workspace.base_uuid,
+                             Workspace.due)
+            .filter(Workspace.task_type == TASK_TYPE_DRVD,
+                    Workspace.due >= cutoff)
+            .all())
+    for uuidn, base_uuid, due in inst:
+        for model in (WorkspaceTags, WorkspaceLatest, Workspace):
+            (db.SESSION.query(model).filter(model.uuid == uuidn)
+             .delete(synchronize_session=False))
+        (db.SESSION.query(WorkspaceRecurDates)
+         .filter(WorkspaceRecurDates.uuid == base_uuid,
+                 WorkspaceRecurDates.due == due)
+         .delete(synchronize_session=False))
+    db.SESSION.commit()
+    db.discard_db_resources()
+
+
+def per_task():
+    uuid_version_results = get_task_uuid_n_ver({"osrecur": "yes"})
+    for task in get_tasks(uuid_version_results):
+        prep_recurring_tasks(task, get_tags(task.uuid, task.version), True)
+
+
+def timed(path, func):
+    db.connect_to_tasksdb(full_db_path=path)
+    start = time.perf_counter()
+    func()
+    db.SESSION.commit()
+    elapsed = time.perf_counter() - start
+    count = (db.SESSION.query(Workspace)
+             .filter(Workspace.task_type == TASK_TYPE_DRVD).count())
+    db.discard_db_resources()
+    return elapsed, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--days", type=int, default=3)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_recur.sqlite3")
+    seed(path, args.tasks, args.days)
+    path_copy = path + ".copy"
+    shutil.copy(path, path_copy)
+    for name, db_path, func in (("per task", path_copy, per_task),
+                                ("set based", path, create_recur_inst)):
+        elapsed, count = timed(db_path, func)
+        print("{:<10} {:>10.2f}ms  instances: {}"
+              .format(name, elapsed * 1000, count))
+
+
+if __name__ == "__main__":
+    main()
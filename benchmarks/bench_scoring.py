@@ -0,0 +1,100 @@
+"""Benchmark for the task scores.
+
+Compares the batch scoring in calc_task_scores() with the previous per task
+scoring, which retrieved the tags of every task with its own query and parsed
+the due and inception dates of every task. Both are run on the same tasks and
+checked to return the same scores before timing.
+
+Usage:
+    python benchmarks/bench_scoring.py [--sizes 100,1000,10000,100000]
+"""
+
+import os
+import sys
+import math
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_filters import seed, timed
+
+from src.mytcli.constants import (PRIORITY_HIGH, PRIORITY_MEDIUM,
+                                  PRIORITY_LOW, PRIORITY_NORMAL,
+                                  TASK_STATUS_TODO, TASK_STATUS_STARTED,
+                                  WS_AREA_PENDING)
+from src.mytcli.models import Workspace, WorkspaceLatest
+from src.mytcli.queries import get_tags
+from src.mytcli.utils import calc_task_scores
+import src.mytcli.db as db
+
+
+def per_task_scores(task_list):
+    """The previous approach, one tag query and date parse per task."""
+    sc_priority = {PRIORITY_HIGH[0]: 100, PRIORITY_MEDIUM[0]: 95,
+                   PRIORITY_NORMAL[0]: 85, PRIORITY_LOW[0]: 70}
+    sc_status = {TASK_STATUS_STARTED: 100, TASK_STATUS_TODO: 75}
+    incep_sum = sum(task.incep_diff_now for task in task_list) or 1
+    scores = {}
+    for task in task_list:
+        tags = get_tags(task.uuid, task.version, expunge=False)
+        total = ((100 if task.now_flag == 1 else 0) * 15
+                 + (sc_priority.get(task.priority) or 0) * 15
+                 + (sc_status.get(task.status) or 0) * 14
+                 + (10 if task.groups else 0)
+                 + (10 if tags else 0)
+                 + (10 if task.notes else 0)
+                 + 100 * task.incep_diff_now / incep_sum * 3)
+        if task.due is not None:
+            d = int(task.due_diff_today)
+            if d == 0:
+                due_raw = 1.0
+            elif d > 0:
+                due_raw = math.exp(-d / 14.0)
+            else:
+                due_raw = 1.0 + (1.0 - math.exp(d / 7.0))
+            total = total + due_raw * 100 * 50
+        scores[task.uuid] = round(total / 100, 2)
+    return scores
+
+
+def pending_tasks():
+    return (db.SESSION.query(Workspace)
+            .join(WorkspaceLatest,
+                  (Workspace.uuid == WorkspaceLatest.uuid)
+                  & (Workspace.version == WorkspaceLatest.version))
+            .filter(WorkspaceLatest.area == WS_AREA_PENDING)
+            .all())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000,100000")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("{:>8} {:>8} {:>12} {:>12} {:>8}"
+          .format("tasks", "pending", "per task", "batch", "speedup"))
+    for size in [int(size) for size in args.sizes.split(",")]:
+        path = os.path.join(tempfile.mkdtemp(), "bench_scoring.sqlite3")
+        seed(path, size, 1, random.Random(args.seed))
+        task_list = pending_tasks()
+        old, old_t = timed(lambda: per_task_scores(task_list), args.runs)
+        new, new_t = timed(lambda: calc_task_scores(task_list), args.runs)
+        # The per task scores read the current time for every task, so
+        # allow for the inception share to differ in the last decimal
+        mismatched = [uuid for uuid in old if abs(old[uuid] - new[uuid])
+                      > 0.011]
+        assert not mismatched, mismatched[:10]
+        print("{:>8} {:>8} {:>10.2f}ms {:>10.2f}ms {:>7.1f}x"
+              .format(size, len(task_list), old_t * 1000, new_t * 1000,
+                      old_t / new_t))
+        db.discard_db_resources()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark for the server mode.
+
+Compares the latency of a 'view' run as a new process (cold) against the
+same command sent to a running 'myt serve' (warm), both through the thin
+client in a new process and through send_command in this process.
+
+Usage:
+    python benchmarks/bench_serve.py [--tasks N] [--runs N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_filters import seed
+from src.mytcli.client import send_command, SOCKET_ENV
+
+MYT_CMD = "from src.mytcli.myt import myt; myt()"
+CLIENT_CMD = "from src.mytcli.client import main; main()"
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return (timings[len(timings) // 2] * 1000,
+            timings[min(int(len(timings) * 0.99), len(timings) - 1)] * 1000)
+
+
+def timed_process(cmd, env):
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def wait_for_socket(path, timeout=30):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        try:
+            send_command(["version"], path)
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "bench_serve.sqlite3")
+    sock = os.path.join(tmp_dir, "myt.sock")
+    seed(path, args.tasks, 2, random.Random(1))
+    env = dict(os.environ, **{SOCKET_ENV: sock})
+    view_args = ["view", "-db", path]
+
+    cold = [timed_process([sys.executable, "-c", MYT_CMD] + view_args, env)
+            for _ in range(args.runs)]
+    server = subprocess.Popen([sys.executable, "-c", MYT_CMD, "serve", "-db",
+                               path, "-so", sock], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    try:
+        wait_for_socket(sock)
+        client = [timed_process([sys.executable, "-c", CLIENT_CMD]
+                                + view_args, env)
+                  for _ in range(args.runs)]
+        in_proc = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            send_command(view_args, sock, width=120)
+            in_proc.append(time.perf_counter() - start)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print("{:<20} {:>10} {:>10}".format("mode", "p50", "p99"))
+    for mode, timings in (("cold process", cold),
+                          ("warm, client", client),
+                          ("warm, in process", in_proc)):
+        print("{:<20} {:>8.2f}ms {:>8.2f}ms".format(mode,
+                                                    *percentiles(timings)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""Seeded generator of task databases for the benchmarks.
+
+Builds a database with a given number of pending, completed and binned
+tasks. Each task has between 1 and the given number of versions, the tags
+are drawn from a pool of a given size with a few tags used far more than the
+rest, and the groups are hierarchies up to a given depth. Recurring base
+tasks are added with their instances created by the application, as on the
+first run of a day. The rows are inserted in bulk and the derived tables are
+then rebuilt by the application, so the database is as the commands would
+have left it.
+
+Usage:
+    python benchmarks/generator.py PATH [--pending N] [--completed N] ...
+"""
+
+import os
+import sys
+import uuid
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+
+from src.mytcli.constants import (FMT_DATEONLY, FMT_DATETIME, FMT_EVENTID,
+                                  TASK_TYPE_NRML, TASK_TYPE_BASE,
+                                  TASK_TYPE_DRVD, TASK_STATUS_TODO,
+                                  TASK_STATUS_STARTED, TASK_STATUS_DONE,
+                                  TASK_STATUS_DELETED, WS_AREA_PENDING,
+                                  WS_AREA_COMPLETED, WS_AREA_BIN,
+                                  MODE_DAILY, MODE_WEEKLY, MODE_MONTHLY)
+from src.mytcli.models import (AppMetadata, Workspace, WorkspaceTags,
+                               WorkspaceLatest, WorkspaceGroups,
+                               WorkspaceRecurDates, WorkspaceEvents)
+from src.mytcli.operations import create_recur_inst
+from src.mytcli.utils import sync_latest_versions
+import src.mytcli.db as db
+
+CONTEXTS = ["phone", "desk", "errand", "home", "office", None, None]
+GROUP_LEVELS = ["AREA", "PROJ", "PART", "STEP", "ITEM"]
+WORDS = ["review", "budget", "plan", "call", "email", "report", "fix",
+         "garden", "invoice", "meeting", "draft", "update", "order", "book"]
+RECUR_MODES = [MODE_DAILY, MODE_WEEKLY, MODE_MONTHLY]
+BATCH_SIZE = 5000
+
+
+def get_group(rnd, depth):
+    """A group of up to depth levels, or None for no group."""
+    levels = rnd.randint(0, depth)
+    if levels == 0:
+        return None
+    return ".".join("{}{}".format(GROUP_LEVELS[lvl % len(GROUP_LEVELS)],
+                                  rnd.randint(1, 4))
+                    for lvl in range(levels))
+
+
+def get_tags(rnd, tag_pool):
+    """Up to 3 tags, the first tags of the pool are the most used."""
+    if not tag_pool:
+        return []
+    weights = [1 / (idx + 1) for idx in range(len(tag_pool))]
+    count = min(rnd.choices([0, 1, 2, 3], [3, 4, 2, 1])[0], len(tag_pool))
+    return list(dict.fromkeys(rnd.choices(tag_pool, weights, k=count)))
+
+
+def get_event_id(rnd, when):
+    return when.strftime(FMT_EVENTID) + str(uuid.UUID(int=rnd.getrandbits(128)))
+
+
+def task_versions(rnd, idx, area, task_id, versions, group_depth, tag_pool,
+                  now):
+    """The rows for all the versions of a task and the tags of each."""
+    task_uuid = str(uuid.UUID(int=rnd.getrandbits(128)))
+    created = now - timedelta(days=rnd.randint(1, 365),
+                              seconds=rnd.randint(0, 86399))
+    inception = created.strftime(FMT_DATETIME)
+    versions = rnd.randint(1, versions)
+    rows = []
+    tags = []
+    task = {
+        "uuid": task_uuid, "description": "Generated task {} to {} {}".format(
+            idx, rnd.choice(WORDS), rnd.choice(WORDS)),
+        "priority": rnd.choice(["H", "M", "L", "N", "N", "N"]),
+        "due": None, "hide": None, "groups": get_group(rnd, group_depth),
+        "context": rnd.choice(CONTEXTS), "now_flag": None,
+        "task_type": TASK_TYPE_NRML, "base_uuid": None, "recur_mode": None,
+        "recur_when": None, "recur_end": None, "inception": inception,
+        "duration": 0, "dur_event": None,
+        "notes": ("Notes on the {} for task {}".format(rnd.choice(WORDS), idx)
+                  if rnd.random() < 0.2 else None),
+    }
+    if rnd.random() < 0.6:
+        task["due"] = (now.date() + timedelta(days=rnd.randint(-30, 60))
+                       ).strftime(FMT_DATEONLY)
+    if task["due"] is not None and rnd.random() < 0.05:
+        task["hide"] = (now.date() + timedelta(days=rnd.randint(1, 10))
+                        ).strftime(FMT_DATEONLY)
+    task_tags = get_tags(rnd, tag_pool)
+    for ver in range(1, versions + 1):
+        latest = ver == versions
+        ver_created = created + timedelta(hours=ver - 1)
+        row = dict(task, version=ver,
+                   created=ver_created.strftime(FMT_DATETIME),
+                   event_id=get_event_id(rnd, ver_created))
+        if not latest or area == WS_AREA_PENDING:
+            row["id"] = task_id if area == WS_AREA_PENDING else "-"
+            row["area"] = WS_AREA_PENDING
+            row["status"] = TASK_STATUS_TODO
+            if latest and rnd.random() < 0.15:
+                row["status"] = TASK_STATUS_STARTED
+                row["dur_event"] = row["created"]
+        else:
+            row["id"] = "-"
+            row["area"] = area
+            row["status"] = (TASK_STATUS_DONE if area == WS_AREA_COMPLETED
+                             else TASK_STATUS_DELETED)
+        if ver > 1:
+            # Later versions change the priority and sometimes the tags
+            row["priority"] = rnd.choice(["H", "M", "L", "N"])
+            if rnd.random() < 0.3:
+                task_tags = get_tags(rnd, tag_pool)
+        rows.append(row)
+        tags.extend({"uuid": task_uuid, "version": ver, "tags": tag}
+                    for tag in task_tags)
+    return rows, tags
+
+
+def recur_base(rnd, idx, tag_pool, group_depth, now, days):
+    """The row for a recurring base task starting days ago and its tags."""
+    task_uuid = str(uuid.UUID(int=rnd.getrandbits(128)))
+    created = now - timedelta(days=days)
+    row = {
+        "uuid": task_uuid, "version": 1, "id": "*",
+        "description": "Generated recurring task {}".format(idx),
+        "priority": "N", "status": TASK_STATUS_TODO,
+        "due": created.date().strftime(FMT_DATEONLY), "hide": None,
+        "area": WS_AREA_PENDING, "created": created.strftime(FMT_DATETIME),
+        "groups": get_group(rnd, group_depth), "context": None,
+        "event_id": get_event_id(rnd, created), "now_flag": None,
+        "task_type": TASK_TYPE_BASE, "base_uuid": None,
+        "recur_mode": rnd.choice(RECUR_MODES), "recur_when": None,
+        "recur_end": None, "inception": created.strftime(FMT_DATETIME),
+        "duration": 0, "dur_event": None, "notes": None,
+    }
+    tags = [{"uuid": task_uuid, "version": 1, "tags": tag}
+            for tag in get_tags(rnd, tag_pool)]
+    return row, tags
+
+
+def generate(path, pending=1000, completed=1000, binned=100, versions=3,
+             tags=20, group_depth=3, recurring=10, recur_days=30, rnd=None):
+    """
+    Builds a new database at path with the generated tasks.
+
+    Parameters:
+        path(str): Path for the database, which should not exist
+        pending(int): Number of pending tasks
+        completed(int): Number of completed tasks
+        binned(int): Number of tasks in the bin
+        versions(int): Maximum number of versions of a task
+        tags(int): Number of distinct tags
+        group_depth(int): Maximum number of levels in the groups
+        recurring(int): Number of recurring base tasks
+        recur_days(int): Days since the recurring tasks started
+        rnd(Random): Source of the random values, seeded for repeatable
+                     databases
+
+    Returns:
+        dict: Number of rows in each of the tables
+    """
+    rnd = rnd or random.Random(42)
+    db.connect_to_tasksdb(full_db_path=path)
+    now = datetime.now()
+    tag_pool = ["tag{}".format(idx) for idx in range(tags)]
+    areas = ([WS_AREA_PENDING] * pending + [WS_AREA_COMPLETED] * completed
+             + [WS_AREA_BIN] * binned)
+    rnd.shuffle(areas)
+    rows, tag_rows = [], []
+    next_id = 1
+    for idx, area in enumerate(areas):
+        task_id = None
+        if area == WS_AREA_PENDING:
+            task_id = next_id
+            next_id = next_id + 1
+        task_rows, task_tags = task_versions(rnd, idx, area, task_id,
+                                             versions, group_depth,
+                                             tag_pool, now)
+        rows.extend(task_rows)
+        tag_rows.extend(task_tags)
+        if len(rows) >= BATCH_SIZE:
+            db.SESSION.execute(insert(Workspace), rows)
+            if tag_rows:
+                db.SESSION.execute(insert(WorkspaceTags), tag_rows)
+            rows, tag_rows = [], []
+    for idx in range(recurring):
+        row, task_tags = recur_base(rnd, idx, tag_pool, group_depth, now,
+                                    recur_days)
+        rows.append(row)
+        tag_rows.extend(task_tags)
+    if rows:
+        db.SESSION.execute(insert(Workspace), rows)
+    if tag_rows:
+        db.SESSION.execute(insert(WorkspaceTags), tag_rows)
+    # Journal of the generated versions, as the migration fills it
+    db.SESSION.execute(insert(WorkspaceEvents)
+                       .from_select(["event_id", "uuid", "version",
+                                     "created"],
+                                    select(Workspace.event_id, Workspace.uuid,
+                                           Workspace.version,
+                                           Workspace.created)))
+    sync_latest_versions()
+    db.SESSION.commit()
+    # Instances of the recurring tasks, as on the first run of the day
+    create_recur_inst()
+    db.SESSION.commit()
+    counts = {model.__tablename__: db.SESSION.query(model).count()
+              for model in (Workspace, WorkspaceTags, WorkspaceLatest,
+                            WorkspaceGroups, WorkspaceRecurDates,
+                            WorkspaceEvents)}
+    db.discard_db_resources()
+    return counts
+
+
+def drop_recent_instances(path, days):
+    """
+    Removes the recurring instances due in the last few days and marks the
+    instances as last created before them, as if the application was not
+    run for those days. The next connection then catches up on them.
+
+    Parameters:
+        path(str): Path of a generated database
+        days(int): Number of days to remove the instances for
+
+    Returns:
+        int: Number of instances removed
+    """
+    db.connect_to_tasksdb(full_db_path=path)
+    cutoff = (datetime.now().date() - timedelta(days=days))
+    inst = (db.SESSION.query(Workspace.uuid, Workspace.base_uuid,
+                             Workspace.due)
+            .filter(Workspace.task_type == TASK_TYPE_DRVD,
+                    Workspace.due >= cutoff.strftime(FMT_DATEONLY))
+            .all())
+    uuids = [row.uuid for row in inst]
+    for start in range(0, len(uuids), 500):
+        chunk = uuids[start:start + 500]
+        for model in (WorkspaceTags, WorkspaceGroups, WorkspaceLatest,
+                      WorkspaceEvents, Workspace):
+            (db.SESSION.query(model).filter(model.uuid.in_(chunk))
+             .delete(synchronize_session=False))
+    (db.SESSION.query(WorkspaceRecurDates)
+     .filter(WorkspaceRecurDates.due >= cutoff.strftime(FMT_DATEONLY))
+     .delete(synchronize_session=False))
+    (db.SESSION.query(AppMetadata)
+     .filter(AppMetadata.key == "LAST_RECUR_CREATE_DT")
+     .update({AppMetadata.value: (cutoff - timedelta(days=1))
+              .strftime(FMT_DATEONLY)}, synchronize_session=False))
+    db.SESSION.commit()
+    db.discard_db_resources()
+    return len(uuids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--pending", type=int, default=1000)
+    parser.add_argument("--completed", type=int, default=1000)
+    parser.add_argument("--binned", type=int, default=100)
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--tags", type=int, default=20)
+    parser.add_argument("--group-depth", type=int, default=3)
+    parser.add_argument("--recurring", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if os.path.exists(args.path):
+        parser.error("{} already exists".format(args.path))
+    counts = generate(args.path, args.pending, args.completed, args.binned,
+                      args.versions, args.tags, args.group_depth,
+                      args.recurring, rnd=random.Random(args.seed))
+    for table, count in counts.items():
+        print("{:<24} {:>10}".format(table, count))
+
+
+if __name__ == "__main__":
+    main()
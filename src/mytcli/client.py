@@ -0,0 +1,83 @@
+"""Thin client for the myt server.
+
+Forwards the command line arguments to a server started with 'myt serve' and
+prints the output sent back. Only the standard library is imported so the
+client starts quickly. If no server is running the command is run by myt
+directly.
+
+The socket can be set with the MYT_SOCKET environment variable.
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import socket
+from pathlib import Path
+
+# Same as constants.DEFAULT_SOCKET, which is not imported to start quickly
+DEFAULT_SOCKET = os.path.join(str(Path.home()), "myt-cli", "myt.sock")
+SOCKET_ENV = "MYT_SOCKET"
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def get_socket_path():
+    return os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET
+
+
+def send_command(argv, socket_path=None, width=None):
+    """
+    Sends a command to the server and returns its result.
+
+    Parameters:
+        argv(list): The command arguments, for ex. ['view', 'overdue']
+        socket_path(str): Path of the server's socket. Default is None
+        width(int): Width to render the output for. Default is None
+
+    Returns:
+        tuple: (exit code, output)
+
+    Raises:
+        OSError: If the server cannot be reached
+    """
+    request = {"argv": list(argv), "width": width}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path or get_socket_path())
+        sock.sendall((json.dumps(request) + "\n").encode())
+        with sock.makefile("rb") as rfile:
+            line = rfile.readline()
+    if not line:
+        raise ConnectionError("No response from the server")
+    response = json.loads(line)
+    return response["code"], response["output"]
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv:
+        try:
+            code, output = send_command(argv,
+                                        width=shutil.get_terminal_size()
+                                        .columns)
+        except (FileNotFoundError, ConnectionRefusedError):
+            # No server is running
+            code = None
+        except OSError as e:
+            # The command may have run, so it is not run again
+            sys.stderr.write("Error in communicating with the server: {}\n"
+                             .format(str(e)))
+            sys.exit(1)
+        if code is not None:
+            if not sys.stdout.isatty():
+                output = ANSI_ESCAPE.sub("", output)
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            sys.exit(code)
+    # No server or no command, so run myt directly
+    from src.mytcli.myt import myt
+    myt()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Custom prompt_toolkit Completer for the myt TUI."""
 
 import shlex
+import threading
 
 from prompt_toolkit.completion import Completer, Completion
 
@@ -28,9 +29,12 @@ COMMAND_FLAGS = {
     "reset": ["--help"],
     "now": ["--help"],
     "delete": ["--help"],
-    "undo": ["--help"],
+    "undo": ["--list", "-s", "--since", "--help"],
+    "redo": ["--help"],
     "urlopen": ["-ur", "--urlno", "--help"],
-    "admin": ["--empty", "--reinit", "--tags", "--groups", "--help"],
+    "admin": ["--empty", "--reinit", "--tags", "--groups", "--verify",
+              "--rebuild", "--compact", "--profile", "--recur-mode",
+              "--help"],
     "stats": ["--help"],
     "version": ["--help"],
 }
@@ -40,7 +44,8 @@ PRIORITY_FLAGS = {"-pr", "--priority"}
 PRIORITY_VALUES = ["H", "M", "L", "N"]
 
 # Flags that accept date-like values
-DATE_FLAGS = {"-du", "--due", "-hi", "--hide", "-en", "--end"}
+DATE_FLAGS = {"-du", "--due", "-hi", "--hide", "-en", "--end", "-s",
+              "--since"}
 DATE_HINTS = ["+0", "+1", "+2", "+7", "+14", "+30"]
 
 # Filter prefixes for view/modify and commands with filter arguments
@@ -55,6 +60,92 @@ FILTER_COMMANDS = {"view", "modify", "done", "start", "stop", "revert",
                    "reset", "now", "delete", "urlopen"}
 
 
+# Vocabulary used till one is read from the database
+EMPTY_VOCABULARY = {"groups": [], "contexts": [], "tags": [], "ids": []}
+
+
+class VocabularyCache:
+    """Snapshot of the groups, contexts, tags and IDs offered as completions.
+
+    The snapshot is kept along with the generation it was read at. Mutations
+    bump the generation, which starts a refresh in a background thread on a
+    session of its own. Completions keep using the previous snapshot till
+    the refresh is done, so they do not wait on the database after a change.
+    """
+
+    def __init__(self, background=True):
+        self._background = background
+        self._lock = threading.Lock()
+        self._generation = 0
+        # (generation, vocabulary) of the last read
+        self._snapshot = None
+        self._refreshing = False
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def bump(self):
+        """Marks the snapshot as stale and starts a refresh."""
+        with self._lock:
+            self._generation = self._generation + 1
+        self._start_refresh()
+
+    def get(self):
+        """Returns the latest snapshot. It is read here only if there is no
+        snapshot yet, a stale one is returned while it is refreshed."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh()
+            snapshot = self._snapshot
+        elif snapshot[0] != self._generation:
+            self._start_refresh()
+        return snapshot[1] if snapshot is not None else EMPTY_VOCABULARY
+
+    def refresh(self):
+        """Reads the vocabulary for the current generation."""
+        generation = self._generation
+        try:
+            import src.mytcli.db as db
+            from src.mytcli.queries import get_vocabulary
+            with db.session_scope(read_only=True) as session:
+                vocabulary = get_vocabulary(session)
+        except Exception as e:
+            LOGGER.debug("Unable to read the completions: {}".format(e))
+            return
+        if vocabulary is None:
+            return
+        with self._lock:
+            # A slower refresh of an older generation should not win
+            if self._snapshot is None or self._snapshot[0] <= generation:
+                self._snapshot = (generation, vocabulary)
+
+    def _start_refresh(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        if self._background:
+            threading.Thread(target=self._refresh_till_current,
+                             daemon=True).start()
+        else:
+            self._refresh_till_current()
+
+    def _refresh_till_current(self):
+        """Refreshes till the snapshot is of the latest generation, as
+        mutations may bump it during a refresh."""
+        while True:
+            generation = self._generation
+            self.refresh()
+            with self._lock:
+                snapshot = self._snapshot
+                if (snapshot is None or snapshot[0] < generation
+                        or generation == self._generation):
+                    # Done, or failed and retried on the next bump
+                    self._refreshing = False
+                    return
+
+
 class MytCompleter(Completer):
     """IDE-style autocomplete for the myt TUI.
 
@@ -66,60 +157,24 @@ class MytCompleter(Completer):
     5. Filter values (after gr: -> groups, after tg: -> tags)
     """
 
-    def __init__(self):
-        self._groups_cache = None
-        self._tags_cache = None
-        self._ids_cache = None
-        self._contexts_cache = None
+    def __init__(self, background=True):
+        self._vocabulary = VocabularyCache(background)
 
     def invalidate_cache(self):
-        self._groups_cache = None
-        self._tags_cache = None
-        self._ids_cache = None
-        self._contexts_cache = None
+        self._vocabulary.bump()
 
     def _get_groups(self):
-        if self._groups_cache is None:
-            try:
-                from src.mytcli.queries import get_all_groups
-                raw_groups = get_all_groups()
-                # Expand hierarchy: "A.B.C" -> "A", "A.B", "A.B.C"
-                expanded = set()
-                for g in raw_groups:
-                    parts = g.split(".")
-                    for i in range(1, len(parts) + 1):
-                        expanded.add(".".join(parts[:i]))
-                self._groups_cache = sorted(expanded)
-            except Exception:
-                self._groups_cache = []
-        return self._groups_cache
+        # Includes the parent groups: "A", "A.B", "A.B.C"
+        return self._vocabulary.get()["groups"]
 
     def _get_tags(self):
-        if self._tags_cache is None:
-            try:
-                from src.mytcli.queries import get_all_tags
-                self._tags_cache = get_all_tags()
-            except Exception:
-                self._tags_cache = []
-        return self._tags_cache
+        return self._vocabulary.get()["tags"]
 
     def _get_ids(self):
-        if self._ids_cache is None:
-            try:
-                from src.mytcli.queries import get_all_ids
-                self._ids_cache = get_all_ids()
-            except Exception:
-                self._ids_cache = []
-        return self._ids_cache
+        return self._vocabulary.get()["ids"]
 
     def _get_contexts(self):
-        if self._contexts_cache is None:
-            try:
-                from src.mytcli.queries import get_all_contexts
-                self._contexts_cache = get_all_contexts()
-            except Exception:
-                self._contexts_cache = []
-        return self._contexts_cache
+        return self._vocabulary.get()["contexts"]
 
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor
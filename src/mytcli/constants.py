@@ -14,29 +14,90 @@ class _ConsoleProxy:
     In TUI mode, set_target() swaps the underlying Console to write
     to a StringIO buffer so output can be captured and displayed
     in the prompt_toolkit layout.
+
+    Consoles for the targets are pooled by the type of target and width,
+    so the theme is parsed and the terminal detected once for each rather
+    than on every command. Only the file of a pooled Console is swapped.
     """
 
     def __init__(self, theme):
         self._theme = theme
-        self._console = Console(theme=theme)
+        self._default = Console(theme=theme)
+        self._console = self._default
+        self._pool = {}
 
     def set_target(self, file_obj, width=None):
-        self._console = Console(
-            theme=self._theme, file=file_obj,
-            force_terminal=True, width=width or 200,
-        )
+        key = (type(file_obj), width or 200)
+        console = self._pool.get(key)
+        if console is None:
+            console = Console(
+                theme=self._theme, file=file_obj,
+                force_terminal=True, width=width or 200,
+            )
+            self._pool[key] = console
+        else:
+            console.file = file_obj
+        self._console = console
 
     def reset(self):
-        self._console = Console(theme=self._theme)
+        if self._console is not self._default:
+            # Release the target till the Console is reused
+            self._console.file = None
+        self._console = self._default
 
     def __getattr__(self, name):
         return getattr(self._console, name)
 
 #Global - START
-DB_SCHEMA_VER = 0.2
+DB_SCHEMA_VER = 0.9
+# Earliest SQLite library with the generated columns used for the dates
+MIN_SQLITE_VER = (3, 31, 0)
 # SQL Connection Related
 DEFAULT_FOLDER = os.path.join(str(Path.home()), "myt-cli")
 DEFAULT_DB_NAME = "tasksdb.sqlite3"
+"""
+The archive of the versions of tasks moved out by 'myt admin --compact' is a
+database next to the tasks database, with the suffix added to its name. It
+is attached with the schema name only while it is used.
+"""
+ARCHIVE_DB_SUFFIX = "_archive"
+ARCHIVE_SCHEMA = "archive"
+"""
+SQLite connection profiles, applied as PRAGMAs on every new connection.
+    durable - Rollback journal with a full sync on every commit. The SQLite
+              defaults, safe for network file systems.
+    fast    - Write ahead log with a sync only at checkpoints, memory mapped
+              reads and a larger page cache. For local disks only as the
+              write ahead log needs shared memory.
+    bulk    - In memory journal with no syncs. For large imports, a crash can
+              corrupt the database.
+"""
+DB_PROFILE_DURABLE = "durable"
+DB_PROFILE_FAST = "fast"
+DB_PROFILE_BULK = "bulk"
+DB_PROFILES = {
+    DB_PROFILE_DURABLE: [("journal_mode", "DELETE"), ("synchronous", "FULL"),
+                         ("cache_size", "-2000"), ("mmap_size", "0"),
+                         ("temp_store", "DEFAULT")],
+    DB_PROFILE_FAST: [("journal_mode", "WAL"), ("synchronous", "NORMAL"),
+                      ("cache_size", "-16000"), ("mmap_size", "268435456"),
+                      ("temp_store", "MEMORY")],
+    DB_PROFILE_BULK: [("journal_mode", "MEMORY"), ("synchronous", "OFF"),
+                      ("cache_size", "-64000"), ("mmap_size", "268435456"),
+                      ("temp_store", "MEMORY")],
+}
+DEFAULT_DB_PROFILE = DB_PROFILE_DURABLE
+"""
+Modes to create the recurring task instances on the first run of a day.
+    sync       - Created before the command runs. The default.
+    background - For views, created by a separate process while the view runs
+                 on the tasks as they were. The instances are shown from the
+                 next command.
+"""
+RECUR_MODE_SYNC = "sync"
+RECUR_MODE_BG = "background"
+RECUR_MODES = [RECUR_MODE_SYNC, RECUR_MODE_BG]
+DEFAULT_RECUR_MODE = RECUR_MODE_SYNC
 # Return Statuses
 SUCCESS = 0
 FAILURE = 1
@@ -61,6 +122,9 @@ PRNT_CURR_VW_CNT = "CURR_VIEW_CNT"
 PRNT_TASK_DTLS = "TASK_DETAILS"
 # Clear string
 CLR_STR = "clr"
+# Description and notes filter values with this prefix are run as an FTS5
+# query, for ex. 'de:~budget AND review'
+FTS_QUERY_PREFIX = "~"
 """
 Domain Values for the application
 """
@@ -123,10 +187,24 @@ TUI_MODE = False
 # TUI interactive prompt callback — set by TUI to handle prompts
 TUI_PROMPT_CALLBACK = None
 TUI_DISPLAYED_COUNT = None
+# Rows of the last task table displayed in the TUI, with the ID, UUID and the
+# first and last line of each row in the output
+TUI_DISPLAYED_ROWS = None
+# Key in the style meta which tags the first cell of a row with its index
+TUI_ROW_META = "myt_row"
+# Offset and number of rows of the default view rendered in the TUI, and the
+# total rows in the view which are paged through
+TUI_VIEW_WINDOW = None
+TUI_VIEW_TOTAL = None
 COMPACT_VIEW = False
 # TUI Constants
 HISTORY_FILE = os.path.join(str(Path.home()), ".myt-cli", "history")
-REFRESH_INTERVAL = 60  # seconds
+# Interval to check the tasks for changes to refresh the view
+CHANGE_POLL_INTERVAL = 1  # seconds
+# Interval to redraw the spinner while a TUI command runs
+SPINNER_INTERVAL = 0.1  # seconds
+# Server Constants, the client in src.mytcli.client derives the same path
+DEFAULT_SOCKET = os.path.join(DEFAULT_FOLDER, "myt.sock")
 # Printable attributes
 PRINT_ATTR = ["description", "priority", "due", "hide", "groups", "context",
               "tags", "status", "now_flag", "recur_mode", "recur_when", "uuid",
@@ -154,6 +232,8 @@ FMT_DATETIME = "%Y-%m-%d %H:%M:%S"
 FMT_EVENTID = "%Y%m%d%H%M%S%f"
 FMT_DAY_DATEW = "%a %d%b%y"
 FMT_DATEW_TIME = "%d%b%y %H%M"
+# Start of the integer date columns, refer models.EPOCH_DAY_SQL
+EPOCH = datetime(1970, 1, 1)
 #Operations
 OPS_ADD = "add"
 OPS_MODIFY = "modify"
@@ -165,5 +245,11 @@ OPS_DELETE = "delete"
 OPS_NOW = "now"
 OPS_UNLINK = "unlink"
 OPS_DONE = "done"
+# Operations on at least this many tasks add the new versions in bulk
+BULK_MIN_TASKS = 2
+# Tasks per statement for the bulk operations
+BULK_CHUNK_SIZE = 500
+# Changes listed by 'undo --list' when no number or date is given
+UNDO_LIST_DEFAULT = 10
 # Changelog URL
 CHANGELOG = "https://github.com/nsmathew/myt-cli/blob/master/CHANGELOG.txt"
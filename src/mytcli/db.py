@@ -1,23 +1,84 @@
 import os
 import sys
+import sqlite3
 import logging
+import threading
+# Only to start run_recur_inst_bg, refer start_recur_inst_bg
+import subprocess  # nosec B404
+from functools import partial
+from contextlib import contextmanager
 from pathlib import Path
 from os.path import getsize
 from datetime import datetime
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, text, select, insert, and_
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.mytcli.constants import (SUCCESS, FAILURE, DEFAULT_FOLDER, DEFAULT_DB_NAME,
-                               DB_SCHEMA_VER, FMT_DATEONLY, LOGGER, CONSOLE)
+                               DB_SCHEMA_VER, FMT_DATEONLY, LOGGER, CONSOLE,
+                               DB_PROFILES, DEFAULT_DB_PROFILE,
+                               RECUR_MODES, RECUR_MODE_BG, DEFAULT_RECUR_MODE,
+                               ARCHIVE_DB_SUFFIX, ARCHIVE_SCHEMA,
+                               MIN_SQLITE_VER)
 import src.mytcli.constants as constants
-from src.mytcli.models import Base, AppMetadata
+from src.mytcli.models import (Base, AppMetadata, Workspace, WorkspaceTags,
+                               WorkspaceLatest, WorkspaceGroups, WorkspaceFts,
+                               WorkspaceFreeIds, WorkspaceEvents, WorkspaceRedo,
+                               WORKSPACE_FTS_DDL, WORKSPACE_FREE_IDS_DDL,
+                               ARCHIVE_METADATA)
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, the watermark alone prevents duplicates
+    fcntl = None
 
 # Global state
 ENGINE = None
+"""
+SESSION is the session of the current thread, each thread gets a session and
+connection of its own from the scoped session. Session creates sessions for
+units of work which need to be separate from the thread's, refer
+session_scope.
+"""
 SESSION = None
 Session = None
+# Process creating the recurring instances in the background, if any
+RECUR_PROC = None
+# If the full text search index for description and notes is available
+FTS_ENABLED = False
+# Connection kept to read the data version of the database, refer
+# get_data_version
+DATA_VERSION_CONN = None
+# Threads whose queries are to be interrupted, refer cancel_queries
+CANCELLED_THREADS = set()
+# SQLite virtual machine instructions run between checks for a cancel
+CANCEL_CHECK_OPS = 1000
+
+
+def check_sqlite_version():
+    """
+    Check if the SQLite library in use supports the generated columns which
+    hold the task dates as integers, refer models.EPOCH_DAY_SQL. These need
+    SQLite 3.31.0 or later, and the tasks database can neither be created nor
+    migrated to schema 0.9 without them.
+
+    Parameters:
+        None
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VER:
+        LOGGER.error("SQLite {} or later is required, the SQLite library in "
+                     "use is {}. Please upgrade it or use a Python build "
+                     "with a later SQLite library."
+                     .format(".".join(str(v) for v in MIN_SQLITE_VER),
+                             sqlite3.sqlite_version))
+        return FAILURE
+    return SUCCESS
 
 
 def check_valid_db(full_db_path):
@@ -49,45 +110,465 @@ def check_valid_db(full_db_path):
     else:
         return FAILURE
 
+def _register_functions(dbapi_conn, conn_record):
+    """
+    Registers the application's functions on every new SQLite connection so
+    they can be used in queries.
+
+        myt_task_age(inception, curr_time) - Age of a task in seconds
+        myt_task_score(now_flag, priority, status, groups, tagged, notes,
+                       age, age_sum, due, curr_date) - Score of a task
+
+    Parameters:
+        dbapi_conn(Connection): The sqlite3 connection
+        conn_record(_ConnectionRecord): The pool's record for the connection
+
+    Returns:
+        None
+    """
+    # Lazy import to avoid circular dependency
+    from src.mytcli.utils import calc_task_age, calc_due_score, calc_task_score
+
+    def _task_age(inception, curr_time):
+        return calc_task_age(inception, datetime.fromisoformat(curr_time))
+
+    def _task_score(now_flag, priority, status, groups, tagged, notes, age,
+                    age_sum, due, curr_date):
+        if due is not None:
+            due = calc_due_score(due, datetime.fromisoformat(curr_date)
+                                               .date())
+        return calc_task_score(now_flag, priority, status, groups, tagged,
+                               notes, age, age_sum, due)
+
+    dbapi_conn.create_function("myt_task_age", 2, _task_age,
+                               deterministic=True)
+    dbapi_conn.create_function("myt_task_score", 10, _task_score,
+                               deterministic=True)
+
+
+def _check_cancelled():
+    # A non zero return interrupts the query running on the connection
+    return bool(CANCELLED_THREADS) and \
+        threading.get_ident() in CANCELLED_THREADS
+
+
+def _register_cancel_check(dbapi_conn, conn_record):
+    """
+    Checks for a cancel of the queries run by the current thread every
+    CANCEL_CHECK_OPS instructions on every new SQLite connection. Refer
+    cancel_queries.
+
+    Parameters:
+        dbapi_conn(Connection): The sqlite3 connection
+        conn_record(_ConnectionRecord): The pool's record for the connection
+
+    Returns:
+        None
+    """
+    dbapi_conn.set_progress_handler(_check_cancelled, CANCEL_CHECK_OPS)
+
+
+def cancel_queries(thread_id):
+    """
+    Interrupts the query being run by a thread and any further queries it
+    runs till clear_cancel is called for the thread. An interrupted query
+    raises an OperationalError in that thread. Used by the TUI to cancel a
+    command running in its worker thread, queries of other threads such as
+    the completions refresh are not affected.
+
+    Parameters:
+        thread_id(int): Identifier of the thread, from threading.get_ident
+
+    Returns:
+        None
+    """
+    CANCELLED_THREADS.add(thread_id)
+
+
+def clear_cancel(thread_id):
+    """
+    Allows a thread to run queries again after cancel_queries.
+
+    Parameters:
+        thread_id(int): Identifier of the thread, from threading.get_ident
+
+    Returns:
+        None
+    """
+    CANCELLED_THREADS.discard(thread_id)
+
+
+def _apply_db_profile(dbapi_conn, conn_record, profile=None):
+    """
+    Applies the PRAGMAs of a connection profile on every new SQLite
+    connection. If no profile is provided then the profile stored for the
+    database in the 'app_metadata' table is used, or the default profile if
+    none is stored. Refer DB_PROFILES for the available profiles.
+
+    Parameters:
+        dbapi_conn(Connection): The sqlite3 connection
+        conn_record(_ConnectionRecord): The pool's record for the connection
+        profile(str): Name of the profile to apply. Default is None
+
+    Returns:
+        None
+    """
+    cursor = dbapi_conn.cursor()
+    if profile is None:
+        try:
+            cursor.execute("SELECT value FROM app_metadata WHERE key = ?",
+                           ("DB_PROFILE",))
+            row = cursor.fetchone()
+        except sqlite3.Error:
+            # New database with no tables yet
+            row = None
+        profile = row[0] if row is not None else DEFAULT_DB_PROFILE
+    if profile not in DB_PROFILES:
+        LOGGER.error("Unknown database profile '{}', using '{}'"
+                     .format(profile, DEFAULT_DB_PROFILE))
+        profile = DEFAULT_DB_PROFILE
+    LOGGER.debug("Applying database profile {}".format(profile))
+    for pragma, value in DB_PROFILES.get(profile):
+        try:
+            cursor.execute("PRAGMA {}={}".format(pragma, value))
+        except sqlite3.OperationalError as e:
+            """
+            The journal mode cannot be changed while another connection is
+            using the database. It is left as is and will be changed by the
+            next connection which has exclusive access.
+            """
+            LOGGER.debug("Unable to set {} to {}: {}"
+                         .format(pragma, value, str(e)))
+    cursor.close()
+
+
+def get_db_profile():
+    """
+    Returns the connection profile stored for the database.
+
+    Parameters:
+        None
+
+    Returns:
+        str: Name of the profile
+    """
+    row = (SESSION.query(AppMetadata.value)
+           .filter(AppMetadata.key == "DB_PROFILE")
+           .one_or_none())
+    return row[0] if row is not None else DEFAULT_DB_PROFILE
+
+
+def set_db_profile(profile):
+    """
+    Stores the connection profile for the database and applies it to the
+    current connections by disposing of the pooled ones. The profile is
+    then used for all future connections to this database.
+
+    Parameters:
+        profile(str): Name of the profile, refer DB_PROFILES
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    if profile not in DB_PROFILES:
+        LOGGER.error("Unknown database profile '{}'".format(profile))
+        return FAILURE
+    try:
+        meta = (SESSION.query(AppMetadata)
+                .filter(AppMetadata.key == "DB_PROFILE")
+                .one_or_none())
+        if meta:
+            meta.value = profile
+        else:
+            meta = AppMetadata(key="DB_PROFILE", value=profile)
+        SESSION.add(meta)
+        SESSION.commit()
+        SESSION.close()
+        ENGINE.dispose()
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    return SUCCESS
+
+
+def get_recur_mode():
+    """
+    Returns the mode stored for the database to create the recurring task
+    instances.
+
+    Parameters:
+        None
+
+    Returns:
+        str: Name of the mode
+    """
+    row = (SESSION.query(AppMetadata.value)
+           .filter(AppMetadata.key == "RECUR_MODE")
+           .one_or_none())
+    return row[0] if row is not None else DEFAULT_RECUR_MODE
+
+
+def set_recur_mode(mode):
+    """
+    Stores the mode to create the recurring task instances for the database.
+
+    Parameters:
+        mode(str): Name of the mode, refer RECUR_MODES
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    if mode not in RECUR_MODES:
+        LOGGER.error("Unknown recurrence mode '{}'".format(mode))
+        return FAILURE
+    try:
+        meta = (SESSION.query(AppMetadata)
+                .filter(AppMetadata.key == "RECUR_MODE")
+                .one_or_none())
+        if meta:
+            meta.value = mode
+        else:
+            meta = AppMetadata(key="RECUR_MODE", value=mode)
+        SESSION.add(meta)
+        SESSION.commit()
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    return SUCCESS
+
+
+def create_fts_index(populate=False):
+    """
+    Creates the full text search index for the description and notes of the
+    tasks, along with the triggers which keep it in sync, if they do not
+    exist. Refer WorkspaceFts. Changes are not committed.
+
+    Parameters:
+        populate(bool): Index the latest versions of the existing tasks.
+                        Default is False
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1) if the SQLite library does not support
+             the index
+    """
+    global FTS_ENABLED
+    try:
+        for ddl in WORKSPACE_FTS_DDL:
+            SESSION.execute(text(ddl))
+        if populate:
+            SESSION.execute(WorkspaceFts.delete())
+            latest_qr = (select(Workspace.uuid, Workspace.description,
+                                Workspace.notes)
+                         .join(WorkspaceLatest,
+                               and_(Workspace.uuid == WorkspaceLatest.uuid,
+                                    Workspace.version
+                                        == WorkspaceLatest.version)))
+            SESSION.execute(insert(WorkspaceFts)
+                            .from_select(["uuid", "description", "notes"],
+                                         latest_qr))
+    except SQLAlchemyError as e:
+        LOGGER.debug("Full text search is not available: {}".format(str(e)))
+        FTS_ENABLED = False
+        return FAILURE
+    FTS_ENABLED = True
+    return SUCCESS
+
+
+def create_free_ids():
+    """
+    Creates the table of free task IDs, along with the triggers which keep it
+    in sync, if they do not exist and fills it from the task IDs in use.
+    Refer WorkspaceFreeIds. Changes are not committed.
+
+    Parameters:
+        None
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    try:
+        Base.metadata.create_all(bind=SESSION.connection(),
+                                 tables=[WorkspaceFreeIds.__table__])
+        for ddl in WORKSPACE_FREE_IDS_DDL:
+            SESSION.execute(text(ddl))
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    # Lazy import to avoid circular dependency
+    from src.mytcli.utils import sync_free_ids
+    return sync_free_ids()
+
+
+def create_date_columns():
+    """
+    Adds the integer date columns generated from the date columns of the
+    tasks, refer models.EPOCH_DAY_SQL, if they do not exist and creates their
+    indexes. The text due date index is replaced by the integer one. Changes
+    are not committed.
+
+    Parameters:
+        None
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    try:
+        conn = SESSION.connection()
+        # Generated columns are hidden from table_info
+        existing = {row[1] for row in
+                    conn.exec_driver_sql("PRAGMA table_xinfo(workspace)")}
+        for col in Workspace.__table__.columns:
+            if col.computed is not None and col.name not in existing:
+                conn.execute(text("ALTER TABLE workspace ADD COLUMN {}"
+                                  .format(CreateColumn(col)
+                                          .compile(dialect=conn.dialect))))
+        conn.execute(text("DROP INDEX IF EXISTS idx_ws_due"))
+        for index in Workspace.__table__.indexes:
+            index.create(bind=conn, checkfirst=True)
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    return SUCCESS
+
+
+"""
+Indexes added by schema 0.4. The indexes of the tables and columns added by
+the later versions are created by the steps which add them.
+"""
+SCHEMA_0_4_INDEXES = ["idx_ws_event_id", "idx_ws_base_uuid_type",
+                      "idx_ws_now", "idx_ws_tg_tags",
+                      "idx_ws_lt_area_type_uuid_ver", "idx_ws_lt_pend_id"]
+
+
 def _apply_migrations():
-    """Apply schema migrations for existing databases."""
+    """
+    Apply schema migrations for existing databases.
+
+    Every step runs on the session's connection, as a second connection
+    would wait on the changes of the earlier steps which are not committed
+    yet. The schema version is updated only once all the steps succeed, else
+    the changes are rolled back and the steps are run again on the next
+    connection. The steps hence check for what already exists.
+    """
     global SESSION, ENGINE
-    from sqlalchemy import text, inspect as sa_inspect
+    from sqlalchemy import inspect as sa_inspect
+    # Printed once the migration is complete
+    messages = []
     try:
         ver_row = (SESSION.query(AppMetadata.value)
                    .filter(AppMetadata.key == "DB_SCHEMA_VERSION")
                    .one_or_none())
         current_ver = float(ver_row[0]) if ver_row else 0.1
+        if current_ver >= DB_SCHEMA_VER:
+            return
+        conn = SESSION.connection()
 
         if current_ver < 0.2:
             # Add context column if it doesn't exist
-            inspector = sa_inspect(ENGINE)
+            inspector = sa_inspect(conn)
             columns = [c["name"] for c in inspector.get_columns("workspace")]
             if "context" not in columns:
                 LOGGER.debug("Migrating schema to 0.2: adding context column")
-                with ENGINE.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE workspace ADD COLUMN context TEXT"))
-                    conn.commit()
-                CONSOLE.print("Database migrated: added 'context' column.",
-                              style="info")
+                conn.execute(text(
+                    "ALTER TABLE workspace ADD COLUMN context TEXT"))
+                messages.append("Database migrated: added 'context' column.")
+
+        if current_ver < 0.3:
+            # Add the latest version lookup table and populate it
+            LOGGER.debug("Migrating schema to 0.3: adding workspace_latest")
+            Base.metadata.create_all(bind=conn,
+                                     tables=[WorkspaceLatest.__table__])
+            # Lazy import to avoid circular dependency
+            from src.mytcli.utils import sync_latest_versions
+            # The group hierarchy and free IDs are added by later steps
+            if sync_latest_versions(sync_derived=False) == FAILURE:
+                raise RuntimeError("Latest versions lookup not built")
+            messages.append("Database migrated: added latest versions "
+                            "lookup.")
+
+        if current_ver < 0.4:
+            # Replace the area index on the latest versions with a covering
+            # one and add the indexes for the filter columns
+            LOGGER.debug("Migrating schema to 0.4: adding filter indexes")
+            conn.execute(text("DROP INDEX IF EXISTS idx_ws_lt_area_type"))
+            for table in [Workspace.__table__, WorkspaceTags.__table__,
+                          WorkspaceLatest.__table__]:
+                for index in table.indexes:
+                    if index.name in SCHEMA_0_4_INDEXES:
+                        index.create(bind=conn, checkfirst=True)
+            messages.append("Database migrated: added indexes for filters.")
+
+        if current_ver < 0.5:
+            # Add the full text search index for description and notes
+            LOGGER.debug("Migrating schema to 0.5: adding search index")
+            # Not available in all SQLite libraries, refer FTS_ENABLED
+            if create_fts_index(populate=True) == SUCCESS:
+                messages.append("Database migrated: added search index.")
+
+        if current_ver < 0.6:
+            # Add the group hierarchy of the tasks and populate it
+            LOGGER.debug("Migrating schema to 0.6: adding workspace_groups")
+            Base.metadata.create_all(bind=conn,
+                                     tables=[WorkspaceGroups.__table__])
+            # Lazy import to avoid circular dependency
+            from src.mytcli.utils import sync_group_paths
+            if sync_group_paths() == FAILURE:
+                raise RuntimeError("Group hierarchy not built")
+            messages.append("Database migrated: added group hierarchy.")
+
+        if current_ver < 0.7:
+            # Add the free task IDs to assign IDs without a scan of the IDs
+            LOGGER.debug("Migrating schema to 0.7: adding workspace_free_ids")
+            if create_free_ids() == FAILURE:
+                raise RuntimeError("Free task IDs not built")
+            messages.append("Database migrated: added free task IDs.")
+
+        if current_ver < 0.8:
+            # Add the events journal, filled from the versions of the tasks
+            LOGGER.debug("Migrating schema to 0.8: adding workspace_events")
+            # Along with the index on the journal, idx_ws_evt_uuid
+            Base.metadata.create_all(bind=conn,
+                                     tables=[WorkspaceEvents.__table__,
+                                             WorkspaceRedo.__table__])
+            # The operations of the earlier events are not known
+            SESSION.execute(insert(WorkspaceEvents)
+                            .prefix_with("OR IGNORE")
+                            .from_select(["event_id", "uuid", "version",
+                                          "created"],
+                                         select(Workspace.event_id,
+                                                Workspace.uuid,
+                                                Workspace.version,
+                                                Workspace.created)))
+            messages.append("Database migrated: added events journal.")
+
+        if current_ver < 0.9:
+            # Add the integer date columns for the date filters
+            LOGGER.debug("Migrating schema to 0.9: adding date columns")
+            if create_date_columns() == FAILURE:
+                raise RuntimeError("Integer date columns not added")
+            messages.append("Database migrated: added integer date columns.")
 
         # Update schema version
-        if current_ver < DB_SCHEMA_VER:
-            meta = (SESSION.query(AppMetadata)
-                    .filter(AppMetadata.key == "DB_SCHEMA_VERSION")
-                    .one_or_none())
-            if meta:
-                meta.value = str(DB_SCHEMA_VER)
-                SESSION.add(meta)
-            else:
-                SESSION.add(AppMetadata(key="DB_SCHEMA_VERSION",
-                                        value=str(DB_SCHEMA_VER)))
+        meta = (SESSION.query(AppMetadata)
+                .filter(AppMetadata.key == "DB_SCHEMA_VERSION")
+                .one_or_none())
+        if meta:
+            meta.value = str(DB_SCHEMA_VER)
+            SESSION.add(meta)
+        else:
+            SESSION.add(AppMetadata(key="DB_SCHEMA_VERSION",
+                                    value=str(DB_SCHEMA_VER)))
+        SESSION.commit()
     except Exception as e:
         LOGGER.error("Error during schema migration: {}".format(str(e)))
+        SESSION.rollback()
+        return
+    for message in messages:
+        CONSOLE.print(message, style="info")
 
 
-def connect_to_tasksdb(verbose=False, full_db_path=None):
+def connect_to_tasksdb(verbose=False, full_db_path=None, profile=None,
+                       read_only=False):
     """
     Connect to the tasks database and performs some startup functions
 
@@ -98,7 +579,9 @@ def connect_to_tasksdb(verbose=False, full_db_path=None):
     one, create the tables and then create a Session object.
 
     Post this it also check if any recurring instances of tasks have to be
-    created and calls the create_recur_inst() to do so.
+    created and calls the create_recur_inst() to do so. For commands which
+    only read the tasks this is done in the background if the database's
+    recurrence mode is 'background'.
 
     Parameters:
         verbose(bool): Indicates if logging should be verbose(debug mode).
@@ -106,10 +589,16 @@ def connect_to_tasksdb(verbose=False, full_db_path=None):
 
         full_db_path(str): The path to the database file. Default is None
 
+        profile(str): The connection profile to use instead of the one
+        stored for the database. Default is None
+
+        read_only(bool): Indicates if the command only reads the tasks.
+        Default is False
+
     Returns:
         int: SUCCESS(0) or FAILURE(1)
     """
-    global Session, SESSION, ENGINE
+    global Session, SESSION, ENGINE, FTS_ENABLED
     # Idempotent in TUI mode: if already connected, skip reconnection
     if constants.TUI_MODE and SESSION is not None and ENGINE is not None:
         return SUCCESS
@@ -123,7 +612,14 @@ def connect_to_tasksdb(verbose=False, full_db_path=None):
                      "Please use absolute path only.")
         return FAILURE
 
+    if check_sqlite_version() == FAILURE:
+        return FAILURE
+
     ENGINE = create_engine("sqlite:///"+full_db_path, echo=verbose)
+    event.listen(ENGINE, "connect", _register_functions)
+    event.listen(ENGINE, "connect", _register_cancel_check)
+    event.listen(ENGINE, "connect", partial(_apply_db_profile,
+                                            profile=profile))
     db_init = False
     if not os.path.exists(full_db_path):
         CONSOLE.print("No tasks database exists, intializing at {}"
@@ -156,7 +652,7 @@ def connect_to_tasksdb(verbose=False, full_db_path=None):
 
     try:
         Session = sessionmaker(bind=ENGINE)
-        SESSION = Session()
+        SESSION = scoped_session(Session)
     except SQLAlchemyError as e:
         LOGGER.error("Error in creating session")
         LOGGER.error(str(e))
@@ -164,6 +660,9 @@ def connect_to_tasksdb(verbose=False, full_db_path=None):
     try:
         curr_day = datetime.now().date()
         if db_init:
+            create_fts_index()
+            if create_free_ids() == FAILURE:
+                return FAILURE
             mtdt = AppMetadata(key="DB_SCHEMA_VERSION", value=DB_SCHEMA_VER)
             rcdt = AppMetadata(key="LAST_RECUR_CREATE_DT",
                                value=curr_day.strftime(FMT_DATEONLY))
@@ -172,23 +671,15 @@ def connect_to_tasksdb(verbose=False, full_db_path=None):
         else:
             # Apply schema migrations for existing databases
             _apply_migrations()
-        results = (SESSION.query(AppMetadata.value)
-                          .filter(AppMetadata.key == "LAST_RECUR_CREATE_DT")
-                          .all())
-        if results is not None:
-            last = datetime.strptime((results[0])[0], FMT_DATEONLY).date()
-            if last < curr_day:
-                # Lazy import to avoid circular dependency
-                from src.mytcli.operations import create_recur_inst
-                ret = create_recur_inst()
-                if ret == FAILURE:
-                    return ret
-                rcdt = (SESSION.query(AppMetadata)
-                        .filter(AppMetadata.key
-                                == "LAST_RECUR_CREATE_DT")
-                        .one())
-                rcdt.value = curr_day.strftime(FMT_DATEONLY)
-                SESSION.add(rcdt)
+            FTS_ENABLED = (SESSION.execute(text(
+                                "SELECT 1 FROM sqlite_master WHERE "
+                                "name = 'workspace_fts'")).first()
+                           is not None)
+        if (read_only and is_recur_inst_due()
+                and get_recur_mode() == RECUR_MODE_BG):
+            start_recur_inst_bg(full_db_path)
+        elif create_recur_inst_if_due() == FAILURE:
+            return FAILURE
         SESSION.commit()
     except SQLAlchemyError as e:
         LOGGER.error("Error in executing post intialization acitivities")
@@ -197,6 +688,230 @@ def connect_to_tasksdb(verbose=False, full_db_path=None):
     return SUCCESS
 
 
+def is_recur_inst_due():
+    """
+    Checks if the recurring instances of tasks have not been created yet
+    today using the 'LAST_RECUR_CREATE_DT' watermark in the 'app_metadata'
+    table.
+
+    Parameters:
+        None
+
+    Returns:
+        bool: True if the instances are due to be created
+    """
+    curr_day = datetime.now().date()
+    results = (SESSION.query(AppMetadata.value)
+                      .filter(AppMetadata.key == "LAST_RECUR_CREATE_DT")
+                      .all())
+    if not results:
+        return False
+    last = datetime.strptime((results[0])[0], FMT_DATEONLY).date()
+    return last < curr_day
+
+
+def create_recur_inst_if_due():
+    """
+    Creates the recurring instances of tasks if they have not been created
+    yet today. Uses the 'LAST_RECUR_CREATE_DT' in the 'app_metadata' table to
+    determine if this is the first connection for the day. Changes are not
+    committed.
+
+    The watermark is moved to today with a conditional update in the same
+    transaction as the instances. When several processes race only the one
+    whose update succeeds creates the instances, the others find the
+    watermark already moved once the first one commits.
+
+    Parameters:
+        None
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    if not is_recur_inst_due():
+        return SUCCESS
+    curr_day = datetime.now().date().strftime(FMT_DATEONLY)
+    claimed = (SESSION.query(AppMetadata)
+               .filter(AppMetadata.key == "LAST_RECUR_CREATE_DT",
+                       AppMetadata.value < curr_day)
+               .update({AppMetadata.value: curr_day},
+                       synchronize_session=False))
+    if not claimed:
+        LOGGER.debug("Recurring instances already created by another run")
+        return SUCCESS
+    # Lazy import to avoid circular dependency
+    from src.mytcli.operations import create_recur_inst
+    return create_recur_inst()
+
+
+def start_recur_inst_bg(full_db_path):
+    """
+    Starts a detached process to create the recurring instances of tasks so
+    the current command does not wait for them. Refer run_recur_inst_bg.
+
+    Parameters:
+        full_db_path(str): The path to the database file
+
+    Returns:
+        None
+    """
+    global RECUR_PROC
+    # The process imports this package from the same location
+    pkg_root = os.path.dirname(os.path.dirname(os.path.dirname(
+                                    os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [pkg_root,
+                                                     env.get("PYTHONPATH")]))
+    LOGGER.debug("Starting background creation of recurring instances")
+    """
+    The command is this Python interpreter running a fixed statement, without
+    a shell. The only other argument is the path to the database, which the
+    process reads as a value in sys.argv.
+    """
+    try:
+        RECUR_PROC = subprocess.Popen(  # nosec B603
+            [sys.executable, "-c",
+             "import sys; from src.mytcli.db import run_recur_inst_bg; "
+             "sys.exit(run_recur_inst_bg(sys.argv[1]))", full_db_path],
+            env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True)
+    except OSError as e:
+        # The next command will create them
+        LOGGER.error("Unable to start creation of recurring instances")
+        LOGGER.error(str(e))
+
+
+def run_recur_inst_bg(full_db_path):
+    """
+    Creates the recurring instances of tasks in the background process
+    started by start_recur_inst_bg. A lock on a file next to the database
+    lets only one such process run at a time. Connecting to the database
+    creates the instances.
+
+    Parameters:
+        full_db_path(str): The path to the database file
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    with open(full_db_path + ".recur.lock", "w") as lock_file:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                LOGGER.debug("Recurring instances are being created by "
+                             "another process")
+                return SUCCESS
+        ret = connect_to_tasksdb(full_db_path=full_db_path)
+        discard_db_resources()
+    return ret
+
+
+@contextmanager
+def session_scope(read_only=False):
+    """
+    Provides a session of its own for a unit of work, for ex. in a
+    background thread, separate from the thread's session in SESSION.
+
+    A read session runs with 'PRAGMA query_only' so any change made through
+    it fails, and its transaction is ended on exit. With the 'fast' profile's
+    write ahead log it reads the last committed state without waiting on a
+    writer, and the writer does not wait on it. A write session is committed
+    on exit. Both are rolled back if there is an exception.
+
+    Parameters:
+        read_only(bool): Indicates if the session only reads the tasks.
+        Default is False
+
+    Returns:
+        Session: The session, closed on exit
+    """
+    session = Session()
+    try:
+        if read_only:
+            session.execute(text("PRAGMA query_only = ON"))
+        yield session
+        if read_only:
+            session.rollback()
+        else:
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        try:
+            if read_only:
+                # The connection goes back to the pool for other sessions
+                session.execute(text("PRAGMA query_only = OFF"))
+        finally:
+            session.close()
+
+
+def get_archive_path(full_db_path=None):
+    """
+    Returns the path of the archive database of a tasks database, which is
+    next to it with ARCHIVE_DB_SUFFIX added to its name.
+
+    Parameters:
+        full_db_path(str): The path to the tasks database file. Default is
+        None for the database connected to
+
+    Returns:
+        str: The path to the archive database file
+    """
+    if full_db_path is None:
+        full_db_path = ENGINE.url.database
+    root, ext = os.path.splitext(full_db_path)
+    return root + ARCHIVE_DB_SUFFIX + ext
+
+
+@contextmanager
+def archive_scope(create=False):
+    """
+    Provides a session with the archive database attached as
+    ARCHIVE_SCHEMA, for the units of work which need the archived versions
+    of tasks. The archive is attached to a connection of its own and
+    detached before the connection goes back to the pool, so the other
+    commands never open it. The session is committed on exit and rolled
+    back if there is an exception.
+
+    Parameters:
+        create(bool): Create the archive database and its tables if they do
+        not exist. Default is False
+
+    Returns:
+        Session: The session, closed on exit, or None if there is no
+                 archive and create is False
+    """
+    archive_path = get_archive_path()
+    if not create and not os.path.exists(archive_path):
+        yield None
+        return
+    conn = ENGINE.connect()
+    # Bound to the connection so the session does not use another one
+    session = Session(bind=conn)
+    try:
+        session.execute(text("ATTACH DATABASE :path AS {}"
+                             .format(ARCHIVE_SCHEMA)), {"path": archive_path})
+        if create:
+            ARCHIVE_METADATA.create_all(bind=session.connection())
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        try:
+            conn.exec_driver_sql("DETACH DATABASE {}".format(ARCHIVE_SCHEMA))
+            conn.commit()
+        except SQLAlchemyError as e:
+            # Not attached or still in use, the connection is not reused
+            LOGGER.debug("Unable to detach the archive: {}".format(str(e)))
+            conn.invalidate()
+        conn.close()
+
+
 def exit_app(stat=0):
     LOGGER.debug("Preparing to exit app...")
     if constants.TUI_MODE:
@@ -212,10 +927,46 @@ def exit_app(stat=0):
         sys.exit(0)
 
 
+def get_data_version():
+    """
+    Returns a marker for changes to the tasks database. It is the SQLite
+    data_version read on a connection kept only for this, which changes
+    whenever any other connection commits a change, including those from
+    other processes and from the global session. Reading it does not read
+    any tables, so it is cheap enough to poll every second.
+
+    Parameters:
+        None
+
+    Returns:
+        int: The data version or None if there is an exception
+    """
+    global DATA_VERSION_CONN
+    if ENGINE is None:
+        return None
+    try:
+        if DATA_VERSION_CONN is None:
+            DATA_VERSION_CONN = ENGINE.raw_connection()
+        cursor = DATA_VERSION_CONN.cursor()
+        try:
+            cursor.execute("PRAGMA data_version")
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+    except (SQLAlchemyError, sqlite3.Error) as e:
+        LOGGER.debug("Unable to read the data version: {}".format(str(e)))
+        return None
+
+
 def discard_db_resources():
-    global ENGINE
+    global ENGINE, DATA_VERSION_CONN
     LOGGER.debug("Atempting to remove sessions and db engines...")
     try:
+        if DATA_VERSION_CONN is not None:
+            DATA_VERSION_CONN.close()
+            DATA_VERSION_CONN = None
+        if SESSION is not None:
+            SESSION.remove()
         if ENGINE is not None:
             ENGINE.dispose()
     except Exception as e:
@@ -234,6 +985,8 @@ def reinitialize_db(verbose, full_db_path=None):
         if os.path.exists(full_db_path):
             discard_db_resources()
             os.remove(full_db_path)
+        if os.path.exists(get_archive_path(full_db_path)):
+            os.remove(get_archive_path(full_db_path))
     except OSError as e:
         LOGGER.error("Unable to remove database.")
         LOGGER.error(str(e))
@@ -16,7 +16,7 @@ from src.mytcli.shorthand import expand_shorthand
 # Commands that mutate data and should trigger a view refresh
 MUTATION_COMMANDS = {
     "add", "modify", "delete", "done", "start", "stop",
-    "revert", "reset", "now", "undo",
+    "revert", "reset", "now", "undo", "redo",
 }
 
 # Commands that show interactive prompts and must run in a background thread
@@ -73,6 +73,8 @@ class TUIDispatcher:
                 cmd_name, ", ".join(sorted(self._myt.commands.keys()))
             ), False)
 
+        constants.TUI_DISPLAYED_ROWS = None
+        constants.TUI_VIEW_TOTAL = None
         buf = StringIO()
         render_width = width_override if width_override is not None else self._width
         constants.CONSOLE.set_target(buf, width=render_width)
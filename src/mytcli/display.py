@@ -1,17 +1,20 @@
 import sys
 from io import StringIO
-from operator import itemgetter
 from datetime import datetime, timedelta
 from copy import copy
 
 from dateutil.relativedelta import relativedelta
-from sqlalchemy import and_, or_, case, func, tuple_, distinct, cast, Numeric
+from sqlalchemy import (and_, or_, case, func, tuple_, distinct, cast, String,
+                        desc, literal, select, union_all)
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql.functions import coalesce
 from sqlalchemy.exc import SQLAlchemyError
 from rich.table import Table as RichTable, box
 from rich.panel import Panel
 from rich.columns import Columns
-import plotext as pltxt
+from rich.segment import Segment, Segments
+from rich.style import Style
+from rich.text import Text
 
 import src.mytcli.constants as constants
 from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
@@ -28,11 +31,17 @@ from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
                                FMT_DATEW_TIME,
                                INDC_PR_HIGH, INDC_PR_MED, INDC_PR_NRML,
                                INDC_PR_LOW, INDC_NOW, INDC_NOTES, INDC_RECUR,
-                               PRNT_CURR_VW_CNT, TASK_TOMMR, FUTDT)
-from src.mytcli.models import Workspace, WorkspaceTags, WorkspaceRecurDates
+                               PRNT_CURR_VW_CNT, TASK_TOMMR, FUTDT,
+                               TUI_ROW_META)
+from src.mytcli.models import (Workspace, WorkspaceTags, WorkspaceRecurDates,
+                               ArchiveWorkspace, ArchiveWorkspaceTags,
+                               stored_columns, epoch_day)
 import src.mytcli.db as db
-from src.mytcli.queries import get_tasks, get_tags, get_task_uuid_n_ver
-from src.mytcli.utils import (calc_task_scores, calc_next_inst_date,
+from src.mytcli.queries import (get_tasks, get_tags, get_task_uuid_n_ver,
+                                get_task_uuid_n_ver_qr, get_max_ver_sqr, get_score_xpr,
+                                get_all_groups, get_group_counts,
+                                get_events)
+from src.mytcli.utils import (calc_next_inst_date,
                            convert_time_unit, get_and_print_task_count,
                            reflect_object_n_print)
 
@@ -123,8 +132,7 @@ def display_7day(potential_filters, pager):
                                   PRNT_CURR_VW_CNT: 0})
         return SUCCESS
     try:
-        drvd_due = case((cast(Workspace.due_diff_today,
-                                         Numeric(10, 0))<0,
+        drvd_due = case((Workspace.due_diff_today < 0,
                             datetime.now().date().strftime('%Y-%m-%d')),
                          (Workspace.due == None, "No Due Date"),
                          else_=Workspace.due).label("drvd_due")
@@ -132,8 +140,7 @@ def display_7day(potential_filters, pager):
                            else_=Workspace.groups)
         is_recur = case((Workspace.task_type == TASK_TYPE_DRVD, "1"),
                            else_=0)
-        task_list = (db.SESSION.query(case((cast(Workspace.due_diff_today,
-                                         Numeric(10, 0))<0, 1),
+        task_list = (db.SESSION.query(case((Workspace.due_diff_today < 0, 1),
                                     else_=0).label("is_overdue"),
                                drvd_due.label("drvd_due"),
                                Workspace.id.label("id"),
@@ -144,9 +151,9 @@ def display_7day(potential_filters, pager):
                                Workspace.status.label("status"))
                      .filter(and_(tuple_(Workspace.uuid, Workspace.version)
                              .in_(uuid_version_results),
-                             or_(Workspace.due == None,
-                                 cast(Workspace.due_diff_today,
-                                             Numeric(10, 0)) <= 7),
+                             or_(Workspace.due_day == None,
+                                 Workspace.due_day
+                                 <= epoch_day(datetime.now()) + 7),
                              Workspace.area == WS_AREA_PENDING))
                      .order_by(drvd_due.asc(), drvd_groups.asc(),
                                Workspace.context.asc())
@@ -299,7 +306,8 @@ def display_notes(potential_filters, pager=False, top=None):
                                (Workspace.due == curr_day, TASK_TODAY),
                                (Workspace.due == tommr, TASK_TOMMR),
                                (Workspace.due != None,
-                                Workspace.due_diff_today + " DAYS"),
+                                cast(Workspace.due_diff_today, String)
+                                + " DAYS"),
                               else_=""))
         # Main query
         task_list = (db.SESSION.query(id_xpr.label("id_or_uuid"),
@@ -543,66 +551,80 @@ def display_history(potential_filters, pager=False, top=None):
     curr_day = datetime.now().date()
     tommr = curr_day + relativedelta(days=1)
     try:
-        due_xpr = (case((Workspace.due == None, None),
-                        else_=Workspace.due))
-        hide_xpr = (case((Workspace.hide == None, None),
-                         else_=Workspace.hide))
-        groups_xpr = (case((Workspace.groups == None, None),
-                           else_=Workspace.groups))
-        context_xpr = (case((Workspace.context == None, None),
-                            else_=Workspace.context))
-        now_flag_xpr = (case((Workspace.now_flag == True, INDC_NOW),
-                             else_=""))
-        recur_xpr = (case((Workspace.recur_mode != None, Workspace.recur_mode
-                            + " " + func.ifnull(Workspace.recur_when, "")),
-                          else_=None))
-        end_xpr = (case((Workspace.recur_end == None, None),
-                        else_=Workspace.recur_end))
-        pri_xpr = (case((Workspace.priority == PRIORITY_HIGH[0],
-                          INDC_PR_HIGH),
-                         (Workspace.priority == PRIORITY_MEDIUM[0],
-                          INDC_PR_MED),
-                         (Workspace.priority == PRIORITY_LOW[0],
-                          INDC_PR_LOW),
-                        else_=INDC_PR_NRML))
-
-        # Sub Query for Tags - START
-        tags_subqr = (db.SESSION.query(WorkspaceTags.uuid, WorkspaceTags.version,
-                                    func.group_concat(WorkspaceTags.tags, " ")
-                                    .label("tags"))
-                      .group_by(WorkspaceTags.uuid,
-                                WorkspaceTags.version)
-                      .subquery())
-        # Sub Query for Tags - END
-        # Main query
-        task_list = (db.SESSION.query(Workspace.uuid.label("uuid"),
-                                   Workspace.id.label("id"),
-                                   Workspace.description.label("description"),
-                                   due_xpr.label("due"),
-                                   recur_xpr.label("recur"),
-                                   end_xpr.label("end"),
-                                   groups_xpr.label("groups"),
-                                   context_xpr.label("context"),
-                                   case((tags_subqr.c.tags == None, None),
-                                        else_=tags_subqr.c.tags).label("tags"),
-                                   Workspace.status.label("status"),
-                                   pri_xpr.label("priority_flg"),
-                                   now_flag_xpr.label("now"),
-                                   hide_xpr.label("hide"),
-                                   Workspace.version.label("version"),
-                                   Workspace.inception.label("inception"),
-                                   Workspace.created.label("created"),
-                                   Workspace.event_id.label("eventid"),
-                                   Workspace.area.label("area"))
-                     .outerjoin(tags_subqr,
-                                and_(Workspace.uuid ==
-                                     tags_subqr.c.uuid,
-                                     Workspace.version ==
-                                     tags_subqr.c.version))
-                     .filter(Workspace.uuid
-                             .in_(uuid_list))
-                     .order_by(Workspace.uuid, Workspace.version.desc())
-                     .all())
+        # The archived versions of the tasks are included if there are any
+        with db.archive_scope() as archive_session:
+            session, ws, ws_tags = db.SESSION, Workspace, WorkspaceTags
+            if archive_session is not None:
+                session = archive_session
+                ws = aliased(Workspace,
+                             union_all(select(*stored_columns(
+                                           Workspace.__table__)),
+                                       select(ArchiveWorkspace)).subquery())
+                ws_tags = aliased(WorkspaceTags,
+                                  union_all(select(WorkspaceTags.__table__),
+                                            select(ArchiveWorkspaceTags))
+                                  .subquery())
+            due_xpr = (case((ws.due == None, None),
+                            else_=ws.due))
+            hide_xpr = (case((ws.hide == None, None),
+                             else_=ws.hide))
+            groups_xpr = (case((ws.groups == None, None),
+                               else_=ws.groups))
+            context_xpr = (case((ws.context == None, None),
+                                else_=ws.context))
+            now_flag_xpr = (case((ws.now_flag == True, INDC_NOW),
+                                 else_=""))
+            recur_xpr = (case((ws.recur_mode != None, ws.recur_mode
+                                + " " + func.ifnull(ws.recur_when, "")),
+                              else_=None))
+            end_xpr = (case((ws.recur_end == None, None),
+                            else_=ws.recur_end))
+            pri_xpr = (case((ws.priority == PRIORITY_HIGH[0],
+                              INDC_PR_HIGH),
+                             (ws.priority == PRIORITY_MEDIUM[0],
+                              INDC_PR_MED),
+                             (ws.priority == PRIORITY_LOW[0],
+                              INDC_PR_LOW),
+                            else_=INDC_PR_NRML))
+
+            # Sub Query for Tags - START
+            tags_subqr = (session.query(ws_tags.uuid, ws_tags.version,
+                                        func.group_concat(ws_tags.tags, " ")
+                                        .label("tags"))
+                          .group_by(ws_tags.uuid,
+                                    ws_tags.version)
+                          .subquery())
+            # Sub Query for Tags - END
+            # Main query
+            task_list = (session.query(ws.uuid.label("uuid"),
+                                       ws.id.label("id"),
+                                       ws.description.label("description"),
+                                       due_xpr.label("due"),
+                                       recur_xpr.label("recur"),
+                                       end_xpr.label("end"),
+                                       groups_xpr.label("groups"),
+                                       context_xpr.label("context"),
+                                       case((tags_subqr.c.tags == None, None),
+                                            else_=tags_subqr.c.tags)
+                                       .label("tags"),
+                                       ws.status.label("status"),
+                                       pri_xpr.label("priority_flg"),
+                                       now_flag_xpr.label("now"),
+                                       hide_xpr.label("hide"),
+                                       ws.version.label("version"),
+                                       ws.inception.label("inception"),
+                                       ws.created.label("created"),
+                                       ws.event_id.label("eventid"),
+                                       ws.area.label("area"))
+                         .outerjoin(tags_subqr,
+                                    and_(ws.uuid ==
+                                         tags_subqr.c.uuid,
+                                         ws.version ==
+                                         tags_subqr.c.version))
+                         .filter(ws.uuid
+                                 .in_(uuid_list))
+                         .order_by(ws.uuid, ws.version.desc())
+                         .all())
     except SQLAlchemyError as e:
         LOGGER.error(str(e))
         return FAILURE
@@ -821,9 +843,9 @@ def display_by_groups(potential_filters, pager=False, top=None):
         integer: Status of Success=0 or Failure=1
     """
     """
-    The groups are not natievly split by hierarchy and stored in the Workspace
-    table. This view breaks it down by hierarchy and display the count. This
-    is acheived in the python code without relying on SQL.
+    The groups of the tasks are broken down by hierarchy in the
+    'workspace_groups' table, so the counts are rolled up through the
+    hierarchy in SQL.
     """
     uuid_version_results = get_task_uuid_n_ver(potential_filters)
     if not uuid_version_results:
@@ -833,21 +855,19 @@ def display_by_groups(potential_filters, pager=False, top=None):
         return SUCCESS
     if not constants.TUI_MODE:
         CONSOLE.print("Preparing view...", style="default")
-    task_list = get_tasks(uuid_version_results)
-    area = task_list[0].area
+    group_counts = get_group_counts(uuid_version_results)
+    if group_counts is None:
+        CONSOLE.print("Error while trying to display the groups")
+        return FAILURE
+    # All the tasks are from the same area
+    area = (db.SESSION.query(Workspace.area)
+            .filter(Workspace.uuid == uuid_version_results[0][0],
+                    Workspace.version == uuid_version_results[0][1])
+            .scalar())
     # task_cnt: {grp: {context: {status: count}}}
     task_cnt = {}
-    for task in task_list:
-        cx = task.context if task.context is not None else "@NONE"
-        grp_key = task.groups if task.groups is not None else "+NONE"
-        grp_list = grp_key.split(".") if task.groups is not None else [grp_key]
-        accumulated_grp = ""
-        for item in grp_list:
-            accumulated_grp = (accumulated_grp + "." + item
-                               if accumulated_grp else item)
-            cx_cnt = task_cnt.setdefault(accumulated_grp, {})
-            status_cnt = cx_cnt.setdefault(cx, {})
-            status_cnt[task.status] = (status_cnt.get(task.status) or 0) + 1
+    for grp, cx, status, count in group_counts:
+        task_cnt.setdefault(grp, {}).setdefault(cx, {})[status] = count
     LOGGER.debug("Total grps to print {}".format(len(task_cnt)))
     table = RichTable(box=box.HORIZONTALS, show_header=True,
                       header_style="header", expand=False)
@@ -912,16 +932,15 @@ def display_stats():
     Returns:
         integer: Status of Success=0 or Failure=1
     """
+    # Lazy import as plotext is only needed for the stats charts
+    import plotext as pltxt
     CONSOLE.print("----------------------------------------------")
     CONSOLE.print("1. Preparing stats view for all tasks by task status...",
                   style="default")
     CONSOLE.print("----------------------------------------------")
 
     try:
-        max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                func.max(Workspace.version)
-                                        .label("maxver"))
-                               .group_by(Workspace.uuid).subquery())
+        max_ver_sqr = get_max_ver_sqr()
         task_status_cnt = (db.SESSION.query(Workspace.status,
                                     Workspace.area,
                                     func.count(Workspace.uuid).label("count"))
@@ -978,32 +997,26 @@ def display_stats():
     CONSOLE.print("----------------------------------------------")
 
     try:
-        today_cnt_xpr = func.sum(case((cast(Workspace.due_diff_today,
-                                            Numeric(10, 0)) == 0, 1),
+        today_cnt_xpr = func.sum(case((Workspace.due_diff_today == 0, 1),
                                       else_=0))
-        overdue_cnt_xpr = func.sum(case((cast(Workspace.due_diff_today,
-                                              Numeric(10, 0)) < 0, 1),
+        overdue_cnt_xpr = func.sum(case((Workspace.due_diff_today < 0, 1),
                                         else_=0))
-        future_cnt_xpr = func.sum(case((cast(Workspace.due_diff_today,
-                                             Numeric(10, 0)) > 0, 1),
+        future_cnt_xpr = func.sum(case((Workspace.due_diff_today > 0, 1),
                                        else_=0))
         nodue_cnt_xpr = func.sum(case((Workspace.due == None, 1),
                                       else_=0))
         today_todo_cnt_xpr = func.sum(case((
-                            and_(cast(Workspace.due_diff_today,
-                                        Numeric(10, 0)) == 0,
+                            and_(Workspace.due_diff_today == 0,
                                     Workspace.hide == None,
                                     Workspace.status==TASK_STATUS_TODO), 1),
                                         else_=0))
         overdue_todo_cnt_xpr = func.sum(case((
-                            and_(cast(Workspace.due_diff_today,
-                                        Numeric(10, 0)) < 0,
+                            and_(Workspace.due_diff_today < 0,
                                     Workspace.hide == None,
                                     Workspace.status==TASK_STATUS_TODO), 1),
                                         else_=0))
         future_todo_cnt_xpr = func.sum(case((
-                            and_(cast(Workspace.due_diff_today,
-                                        Numeric(10, 0)) > 0,
+                            and_(Workspace.due_diff_today > 0,
                                     Workspace.hide == None,
                                     Workspace.status==TASK_STATUS_TODO), 1),
                                         else_=0))
@@ -1013,20 +1026,17 @@ def display_stats():
                                     Workspace.status==TASK_STATUS_TODO), 1),
                                         else_=0))
         today_started_cnt_xpr = func.sum(case((
-                        and_(cast(Workspace.due_diff_today,
-                                    Numeric(10, 0)) == 0,
+                        and_(Workspace.due_diff_today == 0,
                                 Workspace.hide == None,
                                 Workspace.status == TASK_STATUS_STARTED), 1),
                                       else_=0))
         overdue_started_cnt_xpr = func.sum(case((
-                        and_(cast(Workspace.due_diff_today,
-                                    Numeric(10, 0)) < 0,
+                        and_(Workspace.due_diff_today < 0,
                                 Workspace.hide == None,
                                 Workspace.status == TASK_STATUS_STARTED), 1),
                                         else_=0))
         future_started_cnt_xpr = func.sum(case((
-                        and_(cast(Workspace.due_diff_today,
-                                    Numeric(10, 0)) > 0,
+                        and_(Workspace.due_diff_today > 0,
                                 Workspace.hide == None,
                                 Workspace.status == TASK_STATUS_STARTED), 1),
                                        else_=0))
@@ -1036,20 +1046,17 @@ def display_stats():
                                 Workspace.status == TASK_STATUS_STARTED), 1),
                                       else_=0))
         today_hid_todo_cnt_xpr = func.sum(case((
-                            and_(cast(Workspace.due_diff_today,
-                                        Numeric(10, 0)) == 0,
+                            and_(Workspace.due_diff_today == 0,
                                     Workspace.hide != None,
                                     Workspace.status==TASK_STATUS_TODO), 1),
                                         else_=0))
         overdue_hid_todo_cnt_xpr = func.sum(case((
-                            and_(cast(Workspace.due_diff_today,
-                                        Numeric(10, 0)) < 0,
+                            and_(Workspace.due_diff_today < 0,
                                     Workspace.hide != None,
                                     Workspace.status==TASK_STATUS_TODO), 1),
                                         else_=0))
         future_hid_todo_cnt_xpr = func.sum(case((
-                            and_(cast(Workspace.due_diff_today,
-                                        Numeric(10, 0)) > 0,
+                            and_(Workspace.due_diff_today > 0,
                                     Workspace.hide != None,
                                     Workspace.status==TASK_STATUS_TODO), 1),
                                         else_=0))
@@ -1059,20 +1066,17 @@ def display_stats():
                                     Workspace.status==TASK_STATUS_TODO), 1),
                                         else_=0))
         today_hid_str_cnt_xpr = func.sum(case((
-                        and_(cast(Workspace.due_diff_today,
-                                    Numeric(10, 0)) == 0,
+                        and_(Workspace.due_diff_today == 0,
                                 Workspace.hide != None,
                                 Workspace.status==TASK_STATUS_STARTED), 1),
                                         else_=0))
         overdue_hid_str_cnt_xpr = func.sum(case((
-                        and_(cast(Workspace.due_diff_today,
-                                    Numeric(10, 0)) < 0,
+                        and_(Workspace.due_diff_today < 0,
                                 Workspace.hide != None,
                                 Workspace.status==TASK_STATUS_STARTED), 1),
                                         else_=0))
         future_hid_str_cnt_xpr = func.sum(case((
-                        and_(cast(Workspace.due_diff_today,
-                                    Numeric(10, 0)) > 0,
+                        and_(Workspace.due_diff_today > 0,
                                 Workspace.hide != None,
                                 Workspace.status==TASK_STATUS_STARTED), 1),
                                         else_=0))
@@ -1238,7 +1242,8 @@ def display_stats():
     CONSOLE.print("3. Preparing completion trend...",
                   style="default")
     CONSOLE.print("----------------------------------------------")
-    back_lmt_day = int(datetime.now().date().strftime('%Y%m%d')) - 8
+    # Start of the day 7 days back
+    back_lmt_sec = (epoch_day(datetime.now()) - 7) * 86400
 
     try:
 
@@ -1253,10 +1258,7 @@ def display_stats():
                                                         TASK_TYPE_NRML]
                                                     )))
                             .filter(and_(Workspace.area == WS_AREA_COMPLETED,
-                                         cast(func.replace(Workspace.created,
-                                                           '-',
-                                                           ''),
-                                              Numeric(10, 0)) > back_lmt_day))
+                                         Workspace.created_sec >= back_lmt_sec))
                             .group_by(Workspace.ver_crt_diff_now)
                             .all())
     except SQLAlchemyError as e:
@@ -1292,17 +1294,15 @@ def display_stats():
     CONSOLE.print("4. Preparing new tasks trend...",
                   style="default")
     CONSOLE.print("----------------------------------------------")
-    back_lmt_day = int(datetime.now().date().strftime('%Y%m%d')) - 8
+    # Start of the day 7 days back
+    back_lmt_sec = (epoch_day(datetime.now()) - 7) * 86400
 
     try:
 
         new_trend = (db.SESSION.query(Workspace.ver_crt_diff_now,
                                     func.count(Workspace.uuid).label('count'))
                             .filter(and_(Workspace.area != WS_AREA_BIN,
-                                         cast(func.replace(Workspace.created,
-                                                           '-',
-                                                           ''),
-                                              Numeric(10, 0)) > back_lmt_day,
+                                         Workspace.created_sec >= back_lmt_sec,
                                         Workspace.task_type.in_(
                                                 [TASK_TYPE_DRVD,
                                                 TASK_TYPE_NRML]),
@@ -1355,16 +1355,44 @@ def display_default(potential_filters, pager=False, top=None):
     Returns:
         integer: Status of Success=0 or Failure=1
     """
-    uuid_version_results = get_task_uuid_n_ver(potential_filters)
-    if not uuid_version_results:
+    """
+    The filters are run as a subquery of the query for the tasks, so only the
+    'top' tasks by score are retrieved. The filtered tasks are counted for
+    the TUI window and the number of tasks in the view.
+    """
+    uuid_ver_qr = get_task_uuid_n_ver_qr(potential_filters)
+    view_cnt = 0
+    if uuid_ver_qr is not None:
+        try:
+            view_cnt = uuid_ver_qr.count()
+        except SQLAlchemyError as e:
+            LOGGER.error(str(e))
+    if top is not None:
+        top = int(top)
+    """
+    In the TUI only the window of rows on the screen is fetched and rendered,
+    the pager and the CLI render all the tasks.
+    """
+    window = None
+    if constants.TUI_MODE and not pager:
+        window = constants.TUI_VIEW_WINDOW
+    if window is not None:
+        constants.TUI_VIEW_TOTAL = view_cnt
+        if top is not None:
+            constants.TUI_VIEW_TOTAL = min(top, constants.TUI_VIEW_TOTAL)
+    if not view_cnt:
         CONSOLE.print("No tasks to display...", style="default")
         get_and_print_task_count({WS_AREA_PENDING: "yes",
                                   PRNT_CURR_VW_CNT: 0})
         return SUCCESS
     if not constants.TUI_MODE:
         CONSOLE.print("Preparing view...", style="default")
-    curr_day = datetime.now().date()
+    curr_time = datetime.now()
+    curr_day = curr_time.date()
     tommr = curr_day + relativedelta(days=1)
+    #Tasks are scored only when displaying pending tasks
+    pend_view = (potential_filters.get(TASK_COMPLETE) is None
+                 and potential_filters.get(TASK_BIN) is None)
     try:
         id_xpr = (case((Workspace.area == WS_AREA_PENDING, Workspace.id),
                         (Workspace.area.in_([WS_AREA_COMPLETED, WS_AREA_BIN]),
@@ -1414,10 +1442,21 @@ def display_default(potential_filters, pager=False, top=None):
                                (Workspace.due == curr_day, TASK_TODAY),
                                (Workspace.due == tommr, TASK_TOMMR),
                                (Workspace.due != None,
-                                Workspace.due_diff_today + " DAYS"),
+                                cast(Workspace.due_diff_today, String)
+                                + " DAYS"),
                               else_=""))
+        """
+        Pending tasks are sorted by their score, which is calculated in the
+        database so only the 'top' tasks need to be retrieved. Others are
+        sorted by the created date of their latest version.
+        """
+        if pend_view:
+            score_xpr = get_score_xpr(tags_subqr.c.tags != None, curr_time)
+        else:
+            score_xpr = literal(None)
+        uuid_ver_sqr = uuid_ver_qr.subquery()
         # Main query
-        task_list = (db.SESSION.query(id_xpr.label("id_or_uuid"),
+        task_qr = (db.SESSION.query(id_xpr.label("id_or_uuid"),
                                    Workspace.description.label("description"),
                                    addl_info_xpr.label("due_in"),
                                    due_xpr.label("due"),
@@ -1437,28 +1476,38 @@ def display_default(potential_filters, pager=False, top=None):
                                    Workspace.created.label("created"),
                                    dur_xpr.label("duration"),
                                    Workspace.incep_diff_now.label("age"),
-                                   Workspace.uuid.label("uuid"))
+                                   Workspace.uuid.label("uuid"),
+                                   score_xpr.label("score"))
                      .outerjoin(tags_subqr,
                                 and_(Workspace.uuid ==
                                      tags_subqr.c.uuid,
                                      Workspace.version ==
                                      tags_subqr.c.version))
-                     .filter(tuple_(Workspace.uuid, Workspace.version)
-                             .in_(uuid_version_results))
-                     .order_by(Workspace.created.desc())
-                     .all())
+                     .join(uuid_ver_sqr,
+                           and_(Workspace.uuid == uuid_ver_sqr.c.uuid,
+                                Workspace.version ==
+                                uuid_ver_sqr.c.version)))
+        # UUID as the last sort key keeps the order stable across windows
+        if pend_view:
+            task_qr = task_qr.order_by(desc("score"),
+                                       Workspace.created.desc(),
+                                       Workspace.uuid)
+        else:
+            task_qr = task_qr.order_by(Workspace.created.desc(),
+                                       Workspace.uuid)
+        if window is not None:
+            offset, size = window
+            if top is not None:
+                size = max(min(size, top - offset), 0)
+            task_qr = task_qr.offset(offset)
+            top = size
+        task_list = task_qr.limit(top).all()
     except SQLAlchemyError as e:
         LOGGER.error(str(e))
         return FAILURE
-    #Calculate the task score if we are displaying pending tasks
-    if task_list[0].area == WS_AREA_PENDING:
-        LOGGER.debug("Attempting to get scores for tasks for Pending area")
-        #score_list = None
-        score_list = calc_task_scores(get_tasks(uuid_version_results,
-                                                expunge=False))
-    else:
-        LOGGER.debug("Not Pending area, so no scores to be calculated")
-        score_list = None
+    if not task_list:
+        CONSOLE.print("No tasks to display...", style="default")
+        return SUCCESS
     LOGGER.debug("Task Details for display:\n{}".format(task_list))
     table = RichTable(box=box.HORIZONTALS, show_header=True,
                       header_style="header", expand=True)
@@ -1492,14 +1541,9 @@ def display_default(potential_filters, pager=False, top=None):
         else:
             table.add_column("modifed_date", justify="left")
         table.add_column("score", justify="right")
-    if top is None:
-        top = len(task_list)
-    else:
-        top = int(top)
     tdata = []
-    for cnt, task in enumerate(task_list, start=1):
-        if cnt > top:
-            break
+    row_keys = []
+    for task in task_list:
         # Format the dates to
         # YYYY-MM-DD
         # 0:4 - YYYY, 5:7 - MM, 8: - DD
@@ -1527,8 +1571,8 @@ def display_default(potential_filters, pager=False, top=None):
                            int(task.created[14:16])).strftime(FMT_DATEW_TIME)
         age = convert_time_unit(task.age)
         duration = convert_time_unit(task.duration)
-        if score_list is not None:
-            score = str(score_list.get(task.uuid))
+        if pend_view:
+            score = str(task.score)
         else:
             #Not a view on pending tasks, so do not look for a score
             score = ""
@@ -1541,18 +1585,16 @@ def display_default(potential_filters, pager=False, top=None):
                 "".join([task.now,task.notes, task.priority_flg]),
                 str(task.version), age, created, score]
         tdata.append(trow)
-    #Now sort the list depending on which area we are displaying
-    if task_list[0].area == WS_AREA_PENDING:
-        #based on score, descending
-        tdata = sorted(tdata, key=itemgetter(16), reverse=True)
-    else:
-        #hidden or bin task, so based on created date
-        tdata = sorted(tdata, key=itemgetter(15), reverse=True)
+        row_keys.append((trow[0], task.uuid))
 
     _COMPACT_HIDDEN = frozenset({5, 10, 11, 13, 14, 15, 16})
-    for trow in tdata:
+    for row_idx, trow in enumerate(tdata):
         row = ([v for i, v in enumerate(trow) if i not in _COMPACT_HIDDEN]
                if constants.COMPACT_VIEW else trow)
+        if constants.TUI_MODE:
+            # Tag the first cell to find the row's lines once rendered
+            row = [Text(row[0], style=Style(meta={TUI_ROW_META: row_idx}))
+                   ] + row[1:]
         # Next Display the tasks with formatting based on various conditions
         if trow[9] == TASK_STATUS_DONE:
             table.add_row(*row, style="done")
@@ -1593,12 +1635,15 @@ def display_default(potential_filters, pager=False, top=None):
         with CONSOLE.pager(styles=True):
             CONSOLE.print(table, soft_wrap=True)
             CONSOLE.print(grid, justify="right")
+    elif constants.TUI_MODE:
+        print_tui_table(table, row_keys)
+        CONSOLE.print(grid, justify="right")
     else:
         CONSOLE.print(table, soft_wrap=True)
         CONSOLE.print(grid, justify="right")
 
     print_dict = {}
-    print_dict[PRNT_CURR_VW_CNT] = len(task_list)
+    print_dict[PRNT_CURR_VW_CNT] = view_cnt
     print_dict[WS_AREA_PENDING] = "yes"
     if potential_filters.get(TASK_COMPLETE) == "yes":
         print_dict[WS_AREA_COMPLETED] = "yes"
@@ -1608,6 +1653,52 @@ def display_default(potential_filters, pager=False, top=None):
     return SUCCESS
 
 
+def print_tui_table(table, row_keys):
+    """
+    Prints the task table in TUI mode and records the lines taken by each
+    task's row in constants.TUI_DISPLAYED_ROWS. The first cell of each row is
+    tagged with the row's index in the style's meta, so the rows are located
+    in the rendered lines instead of being parsed back out of the output.
+
+    Parameters:
+        table(RichTable): Table of tasks with the first cell of rows tagged
+        row_keys(list): Tuples of the ID shown and the UUID for each row
+
+    Returns:
+        None
+    """
+    lines = CONSOLE.render_lines(table, CONSOLE.options, pad=True,
+                                 new_lines=False)
+    # Lines already printed to the output ahead of the table
+    try:
+        offset = CONSOLE.file.getvalue().count("\n")
+    except AttributeError:
+        offset = 0
+    starts = {}
+    for line_no, line in enumerate(lines):
+        for segment in line:
+            if segment.style is None:
+                continue
+            row_idx = segment.style.meta.get(TUI_ROW_META)
+            if row_idx is not None:
+                starts.setdefault(row_idx, line_no)
+                break
+    rows = []
+    for row_idx, (task_id, uuid) in enumerate(row_keys):
+        if row_idx not in starts:
+            continue
+        # A row runs till the next row or the table's bottom edge
+        end = starts.get(row_idx + 1, len(lines) - 1) - 1
+        rows.append({"id": task_id, "uuid": uuid,
+                     "start": offset + starts[row_idx], "end": offset + end})
+    segments = []
+    for line in lines:
+        segments.extend(line)
+        segments.append(Segment.line())
+    CONSOLE.print(Segments(segments), soft_wrap=True, end="")
+    constants.TUI_DISPLAYED_ROWS = rows
+
+
 def display_all_tags():
     """
     Displays a list of the tags used in pending and completed tasks.
@@ -1620,14 +1711,8 @@ def display_all_tags():
         integer: Status of Success=0 or Failure=1
     """
     try:
-        max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                func.max(Workspace.version)
-                                .label("maxver"))
-                               .filter(and_(Workspace.area.in_(
-                                                            [WS_AREA_PENDING,
-                                                            WS_AREA_COMPLETED]
-                                                            )))
-                               .group_by(Workspace.uuid).subquery())
+        max_ver_sqr = get_max_ver_sqr(areas=[WS_AREA_PENDING,
+                                             WS_AREA_COMPLETED])
         tags_list = (db.SESSION.query(distinct(WorkspaceTags.tags).label("tags"))
                             .filter(and_(WorkspaceTags.uuid
                                                     == max_ver_sqr.c.uuid,
@@ -1656,6 +1741,56 @@ def display_all_tags():
     return SUCCESS
 
 
+def display_events(since=None, count=None):
+    """
+    Displays the changes made to the tasks from the events journal, latest
+    first, with the tasks changed by each of them. These are the changes
+    which can be undone in turn.
+
+    Parameters:
+        since(str): Date as YYYY-MM-DD from which to display the changes.
+                    Default is None for all changes
+        count(int): Number of latest changes to display. Default is None for
+                    all changes
+
+    Returns:
+        integer: Status of Success=0 or Failure=1
+    """
+    event_list = get_events(since, count)
+    if event_list is None:
+        CONSOLE.print("Error while trying to display the changes")
+        return FAILURE
+    if not event_list:
+        CONSOLE.print("No changes to display.", style="default")
+        return SUCCESS
+    table = RichTable(box=box.HORIZONTALS, show_header=True,
+                      header_style="header", expand=False)
+    table.add_column("changed", justify="left")
+    table.add_column("operation", justify="left")
+    table.add_column("id", justify="right")
+    table.add_column("description", justify="left")
+    table.add_column("version", justify="right")
+    table.add_column("uuid", justify="right", width=36)
+    last_event_id = None
+    event_cnt = 0
+    for event in event_list:
+        changed = ""
+        if last_event_id != event.event_id:
+            if last_event_id is not None:
+                #Empty row to separate the changes
+                table.add_row(*([None] * 6))
+            last_event_id = event.event_id
+            event_cnt = event_cnt + 1
+            changed = (datetime.strptime(event.created, FMT_DATETIME)
+                       .strftime(FMT_DATEW_TIME))
+        table.add_row(changed, event.operation or "", str(event.id or ""),
+                      event.description or "", str(event.version),
+                      event.uuid, style="default")
+    CONSOLE.print("Total number of changes: {}".format(event_cnt))
+    CONSOLE.print(table, soft_wrap=True)
+    return SUCCESS
+
+
 def display_all_groups():
     """
     Displays a list of the groups used in pending and completed tasks.
@@ -1668,49 +1803,17 @@ def display_all_groups():
     Returns:
         integer: Status of Success=0 or Failure=1
     """
-    try:
-        max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                func.max(Workspace.version)
-                                        .label("maxver"))
-                               .group_by(Workspace.uuid).subquery())
-        groups_list = (db.SESSION.query(distinct(Workspace.groups)
-                                        .label("groups"))
-                              .join(max_ver_sqr, and_(max_ver_sqr.c.uuid
-                                                            == Workspace.uuid,
-                                                            max_ver_sqr.c.maxver
-                                                            == Workspace.version))
-                              .filter(and_(Workspace.area.in_(
-                                                            [WS_AREA_PENDING,
-                                                            WS_AREA_COMPLETED]
-                                                            )))
-                              .order_by(Workspace.groups).all())
-    except SQLAlchemyError as e:
-        CONSOLE.print("Error while trying to display all groups")
-        LOGGER.error(str(e))
-        return FAILURE
-    if not groups_list:
+    all_groups = get_all_groups()
+    if not all_groups:
         LOGGER.debug("No groups found")
         CONSOLE.print("No groups added to tasks.")
         return SUCCESS
-    LOGGER.debug("Total groups to print before breaking "
-                 " into hierarchy {}".format(len(groups_list)))
     table = RichTable(box=box.HORIZONTALS, show_header=True,
                       header_style="header", expand=False)
     table.add_column("groups", justify="left")
-    all_groups = set()
-    for group in groups_list:
-        if group is not None and group[0] is not None:
-            grp_split = str(group[0]).split(".")
-            grp = ""
-            for item in grp_split:
-                grp = grp + "." + item
-                grp = grp.lstrip(".")
-                if grp.lstrip(".") not in all_groups:
-                    LOGGER.debug("Group: " + grp)
-                    trow = []
-                    trow.append(grp)
-                    table.add_row(*trow, style="default")
-                    all_groups.add(grp)
+    for grp in all_groups:
+        LOGGER.debug("Group: " + grp)
+        table.add_row(grp, style="default")
     CONSOLE.print("Total number of groups: {}".format(len(all_groups)))
     LOGGER.debug("Total grps to print {}".format(len(all_groups)))
     CONSOLE.print(table, soft_wrap=True)
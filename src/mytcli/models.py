@@ -1,24 +1,90 @@
 from datetime import datetime
 
-from sqlalchemy import (Column, Integer, String, Index,
-                        ForeignKeyConstraint, BOOLEAN, func)
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import (Column, Integer, String, Index, MetaData, Table,
+                        ForeignKeyConstraint, BOOLEAN, Computed, table, column)
+from sqlalchemy.orm import DeclarativeBase, deferred
 from sqlalchemy.ext.hybrid import hybrid_property
 
-from src.mytcli.constants import FMT_DATEONLY, FMT_DATETIME
+from src.mytcli.constants import (FMT_DATEONLY, FMT_DATETIME, WS_AREA_PENDING,
+                                  ARCHIVE_SCHEMA, EPOCH)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+"""
+The dates are also held as integer days, and the date times as integer
+seconds, since the Unix epoch, refer EPOCH. They are virtual generated
+columns which SQLite computes from the date columns on every write, so the
+date filters and differences are integer comparisons which can use an index
+instead of julianday() on every row. The columns are deferred so they are
+never loaded into, and hence never written from, the task objects.
+"""
+EPOCH_DAY_SQL = "CAST(strftime('%s', {}) AS INTEGER) / 86400"
+EPOCH_SEC_SQL = "CAST(strftime('%s', {}) AS INTEGER)"
+
+
+def epoch_day(value):
+    """
+    Returns a date as days since the epoch, as computed by EPOCH_DAY_SQL.
+
+    Parameters:
+        value(date|datetime|str): Date, or date in FMT_DATEONLY
+
+    Returns:
+        int: Days since the epoch, None if no date is provided
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.strptime(value, FMT_DATEONLY)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    return (value - EPOCH).days
+
+
+def epoch_column(sql, name):
+    """
+    Returns a deferred virtual column generated from a date column.
+
+    Parameters:
+        sql(str): EPOCH_DAY_SQL or EPOCH_SEC_SQL
+        name(str): Name of the date column
+
+    Returns:
+        ColumnProperty: Deferred integer column
+    """
+    return deferred(Column(Integer, Computed(sql.format(name),
+                                             persisted=False)))
+
+
+def stored_columns(tbl):
+    """
+    Returns the columns of a table which are written, i.e. without the
+    generated columns.
+
+    Parameters:
+        tbl(Table): Table of a model
+
+    Returns:
+        list: List of Column
+    """
+    return [col for col in tbl.columns if col.computed is None]
+
+
 class Workspace(Base):
     """
     ORM for the 'workspace' table which holds all primary information
     for the tasks.
 
         Primary Key: uuid, version
-        Indexes: idx_ws_due(due)
+        Indexes: idx_ws_due_day(due_day)
+                 idx_ws_hide_day(hide_day)
+                 idx_ws_created_sec(created_sec)
+                 idx_ws_event_id(event_id)
+                 idx_ws_base_uuid_type(base_uuid, task_type)
+                 idx_ws_now(uuid, version) where now_flag is set
     """
     __tablename__ = "workspace"
     uuid = Column(String, primary_key=True)
@@ -44,6 +110,11 @@ class Workspace(Base):
     duration = Column(Integer, default=0)
     dur_event = Column(String)
     notes = Column(String)
+    due_day = epoch_column(EPOCH_DAY_SQL, "due")
+    hide_day = epoch_column(EPOCH_DAY_SQL, "hide")
+    created_sec = epoch_column(EPOCH_SEC_SQL, "created")
+    inception_sec = epoch_column(EPOCH_SEC_SQL, "inception")
+    dur_event_sec = epoch_column(EPOCH_SEC_SQL, "dur_event")
 
     # To get due date difference to today
     @hybrid_property
@@ -54,16 +125,7 @@ class Workspace(Base):
 
     @due_diff_today.expression
     def due_diff_today(cls):
-        curr_date = datetime.now().date().strftime(FMT_DATEONLY)
-        # julianday is an sqlite function
-        date_diff = func.julianday(cls.due) - func.julianday(curr_date)
-        """
-        For some reason cast as Integer forces an addition in the sql
-        when trying to concatenate with a string. Forcing as string causes
-        the expression to be returned as a literal string rather than the
-        result. Hence using substr and instr instead.
-        """
-        return func.substr(date_diff, 1, func.instr(date_diff, ".")-1)
+        return cls.due_day - epoch_day(datetime.now())
 
     # To get time difference of inception to now in seconds
     @hybrid_property
@@ -74,12 +136,8 @@ class Workspace(Base):
 
     @incep_diff_now.expression
     def incep_diff_now(cls):
-        #curr_date = datetime.now().date().strftime(FMT_DATEONLY)
-        curr_date = datetime.now()
-        # julianday is an sqlite function
-        date_diff = func.round(((func.julianday(curr_date)
-                        - func.julianday(cls.inception)) * 24 * 60 * 60))
-        return date_diff
+        curr_sec = round((datetime.now() - EPOCH).total_seconds())
+        return curr_sec - cls.inception_sec
 
     # To get time difference of version created to now in days
     @hybrid_property
@@ -90,16 +148,7 @@ class Workspace(Base):
 
     @ver_crt_diff_now.expression
     def ver_crt_diff_now(cls):
-        curr_date = datetime.now().date().strftime(FMT_DATEONLY)
-        # julianday is an sqlite function
-        date_diff = func.julianday(func.substr(cls.created, 0, 11)) - func.julianday(curr_date)
-        """
-        For some reason cast as Integer forces an addition in the sql
-        when trying to concatenate with a string. Forcing as string causes
-        the expression to be returned as a literal string rather than the
-        result. Hence using substr and instr instead.
-        """
-        return func.substr(date_diff, 1, func.instr(date_diff, ".")-1)
+        return cls.created_sec // 86400 - epoch_day(datetime.now())
 
     # To get time difference of duration event to now in seconds
     @hybrid_property
@@ -110,13 +159,20 @@ class Workspace(Base):
 
     @dur_ev_diff_now.expression
     def dur_ev_diff_now(cls):
-        curr_time = datetime.now()
-        # julianday is an sqlite function
-        date_diff = func.round(((func.julianday(curr_time)
-                        - func.julianday(cls.dur_event)) * 24 * 60 * 60))
-        return date_diff
+        curr_sec = round((datetime.now() - EPOCH).total_seconds())
+        return curr_sec - cls.dur_event_sec
 
-Index("idx_ws_due", Workspace.due)
+# For the due, hide and version created date filters
+Index("idx_ws_due_day", Workspace.due_day)
+Index("idx_ws_hide_day", Workspace.hide_day)
+Index("idx_ws_created_sec", Workspace.created_sec)
+# For undo which works off the latest event
+Index("idx_ws_event_id", Workspace.event_id)
+# For recurring task lookups of derived tasks by their base task
+Index("idx_ws_base_uuid_type", Workspace.base_uuid, Workspace.task_type)
+# Only the current NOW task, if any, has the flag set
+Index("idx_ws_now", Workspace.uuid, Workspace.version,
+      sqlite_where=Workspace.now_flag == True)
 
 
 class WorkspaceTags(Base):
@@ -127,6 +183,7 @@ class WorkspaceTags(Base):
         Primary Key: uuid, version, tag
         Foreign Key: uuid->workspace.uuid, version->workspace.version
         Indexes: idx_ws_tg_uuid_ver(uuid, version)
+                 idx_ws_tg_tags(tags)
     """
     __tablename__ = "workspace_tags"
     uuid = Column(String, primary_key=True)
@@ -138,6 +195,7 @@ class WorkspaceTags(Base):
 
 
 Index("idx_ws_tg_uuid_ver", WorkspaceTags.uuid, WorkspaceTags.version)
+Index("idx_ws_tg_tags", WorkspaceTags.tags)
 
 """
 Additional note on WorkspaceRecurDates. The rows for this table are created in
@@ -180,6 +238,219 @@ Index("idx_ws_recr_uuid_ver", WorkspaceRecurDates.uuid,
       WorkspaceRecurDates.version)
 
 
+class WorkspaceEvents(Base):
+    """
+    ORM for the table 'workspace_events' which is the journal of the events
+    which changed the tasks. Every version of a task added by an event is a
+    row with the operation which added it, so the versions of the latest
+    events and the changes since a point in time are read from its primary
+    key. The rows are added along with the versions of the tasks and removed
+    when the versions are undone or the bin is emptied.
+
+        Primary Key: event_id, uuid, version
+        Indexes: idx_ws_evt_uuid(uuid)
+    """
+    __tablename__ = "workspace_events"
+    event_id = Column(String, primary_key=True)
+    uuid = Column(String, primary_key=True)
+    version = Column(Integer, primary_key=True)
+    operation = Column(String)
+    created = Column(String, nullable=False)
+
+
+# For removing the events of tasks when the bin is emptied
+Index("idx_ws_evt_uuid", WorkspaceEvents.uuid)
+
+
+class WorkspaceRedo(Base):
+    """
+    ORM for the table 'workspace_redo' which holds the events undone, so they
+    can be redone. Each event is a row with the versions of the tasks, their
+    tags, recurring due dates and journal rows as a JSON document. The table
+    is emptied when a new event changes the tasks.
+
+        Primary Key: event_id
+    """
+    __tablename__ = "workspace_redo"
+    event_id = Column(String, primary_key=True)
+    rows = Column(String, nullable=False)
+
+
+"""
+Tables of the archive database, which holds the versions of tasks moved out
+of 'workspace', 'workspace_tags' and 'workspace_recur_dates' when the
+history is compacted. They are copies of those tables in the archive's
+schema and have their own metadata, so they are created only in the archive
+and only when it is attached, refer db.archive_scope. The generated date
+columns are left out as the archive is not filtered on dates.
+"""
+ARCHIVE_METADATA = MetaData()
+ArchiveWorkspace = Table(Workspace.__tablename__, ARCHIVE_METADATA,
+                         *[col._copy() for col in
+                           stored_columns(Workspace.__table__)],
+                         schema=ARCHIVE_SCHEMA)
+ArchiveWorkspaceTags = WorkspaceTags.__table__.to_metadata(
+    ARCHIVE_METADATA, schema=ARCHIVE_SCHEMA)
+ArchiveWorkspaceRecurDates = WorkspaceRecurDates.__table__.to_metadata(
+    ARCHIVE_METADATA, schema=ARCHIVE_SCHEMA)
+# The archive is only read by task, which the primary keys cover
+for archive_table in ARCHIVE_METADATA.tables.values():
+    archive_table.indexes.clear()
+
+
+class WorkspaceLatest(Base):
+    """
+    ORM for the table 'workspace_latest' which holds the latest version of
+    every task along with the attributes most used to look up current tasks.
+    It is a projection of the 'workspace' table which is maintained on every
+    write so that lookups for current tasks do not need a max(version)
+    aggregate over the complete version history.
+
+        Primary Key: uuid
+        Foreign Key: uuid->workspace.uuid, version->workspace.version
+        Indexes: idx_ws_lt_area_type_uuid_ver(area, task_type, uuid, version)
+                 idx_ws_lt_pend_id(task_type, id) where area is pending
+    """
+    __tablename__ = "workspace_latest"
+    uuid = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False)
+    id = Column(Integer)
+    area = Column(String, nullable=False)
+    task_type = Column(String, nullable=False)
+    __table_args__ = (
+        ForeignKeyConstraint(["uuid", "version"],
+                             ["workspace.uuid", "workspace.version"]), {})
+
+
+# Covers the latest version lookups by area and task type
+Index("idx_ws_lt_area_type_uuid_ver", WorkspaceLatest.area,
+      WorkspaceLatest.task_type, WorkspaceLatest.uuid, WorkspaceLatest.version)
+# Task IDs are only assigned in the pending area
+Index("idx_ws_lt_pend_id", WorkspaceLatest.task_type, WorkspaceLatest.id,
+      sqlite_where=WorkspaceLatest.area == WS_AREA_PENDING)
+
+
+class WorkspaceFreeIds(Base):
+    """
+    ORM for the table 'workspace_free_ids' which holds the task IDs free to
+    be assigned to tasks in the pending area. It has every free ID up to its
+    largest ID, which is above every ID in use, so the smallest ID in the
+    table is the next task ID. The triggers on 'workspace_latest' keep it in
+    sync as tasks enter and leave the pending area, refer
+    WORKSPACE_FREE_IDS_DDL.
+
+        Primary Key: id
+    """
+    __tablename__ = "workspace_free_ids"
+    id = Column(Integer, primary_key=True)
+
+
+"""
+Triggers on 'workspace_latest' which keep 'workspace_free_ids' in sync. A task
+ID is in use by a normal or derived task in the pending area, i.e.
+WS_AREA_PENDING and TASK_TYPE_NRML or TASK_TYPE_DRVD. An ID which is no
+longer in use is added back. An ID put in use is removed, and when it was the
+largest ID in the table the next ID is added after it.
+"""
+WORKSPACE_FREE_IDS_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS trg_ws_lt_ids_ins
+       AFTER INSERT ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_free_ids WHERE id = NEW.id
+               AND NEW.area = 'pending'
+               AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-';
+           INSERT OR IGNORE INTO workspace_free_ids(id)
+               SELECT NEW.id + 1 WHERE NEW.area = 'pending'
+               AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-'
+               AND NOT EXISTS (SELECT 1 FROM workspace_free_ids
+                               WHERE id > NEW.id);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_ws_lt_ids_upd
+       AFTER UPDATE OF id, area, task_type ON workspace_latest
+       WHEN OLD.id IS NOT NEW.id OR OLD.area IS NOT NEW.area
+            OR OLD.task_type IS NOT NEW.task_type
+       BEGIN
+           INSERT OR IGNORE INTO workspace_free_ids(id)
+               SELECT OLD.id WHERE OLD.area = 'pending'
+               AND OLD.task_type IN ('NORMAL', 'DERIVED') AND OLD.id != '-';
+           DELETE FROM workspace_free_ids WHERE id = NEW.id
+               AND NEW.area = 'pending'
+               AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-';
+           INSERT OR IGNORE INTO workspace_free_ids(id)
+               SELECT NEW.id + 1 WHERE NEW.area = 'pending'
+               AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-'
+               AND NOT EXISTS (SELECT 1 FROM workspace_free_ids
+                               WHERE id > NEW.id);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_ws_lt_ids_del
+       AFTER DELETE ON workspace_latest
+       BEGIN
+           INSERT OR IGNORE INTO workspace_free_ids(id)
+               SELECT OLD.id WHERE OLD.area = 'pending'
+               AND OLD.task_type IN ('NORMAL', 'DERIVED') AND OLD.id != '-';
+       END""",
+]
+
+
+class WorkspaceGroups(Base):
+    """
+    ORM for the table 'workspace_groups' which holds the group hierarchy of
+    the latest version of every task. A task is in its group and every
+    parent of it, so a task in 'WORK.PROJA.SUB' has a row each for 'WORK',
+    'WORK.PROJA' and 'WORK.PROJA.SUB'. Tasks without a group have no rows.
+    It is maintained along with the 'workspace_latest' table so filters on a
+    group and the rollup of counts by group do not split the group names.
+
+        Primary Key: uuid, path
+        Indexes: idx_ws_grp_path_uuid(path, uuid)
+    """
+    __tablename__ = "workspace_groups"
+    uuid = Column(String, primary_key=True)
+    # Groups are matched case insensitive
+    path = Column(String(collation="NOCASE"), primary_key=True)
+
+
+# For the tasks in a group and its sub groups
+Index("idx_ws_grp_path_uuid", WorkspaceGroups.path, WorkspaceGroups.uuid)
+
+
+"""
+Full text search index over the description and notes of the latest version
+of every task. It is an FTS5 table with the trigram tokenizer, so a LIKE
+'%term%' on its columns is answered by the index, as are FTS5 MATCH queries.
+The triggers on 'workspace_latest' keep it in sync, as that table is
+maintained on every write. The UUID column is indexed too, so a task's row
+can be found with GLOB on the UUID without scanning the table. The table is
+not created if the SQLite library does not support FTS5 with trigrams.
+"""
+WorkspaceFts = table("workspace_fts", column("uuid"), column("description"),
+                     column("notes"))
+WORKSPACE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS workspace_fts
+       USING fts5(uuid, description, notes, tokenize='trigram')""",
+    """CREATE TRIGGER IF NOT EXISTS trg_ws_lt_fts_ins
+       AFTER INSERT ON workspace_latest
+       BEGIN
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_ws_lt_fts_upd
+       AFTER UPDATE OF version ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_ws_lt_fts_del
+       AFTER DELETE ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+       END""",
+]
+
+
 class AppMetadata(Base):
     """
     ORM for the table 'app_metadata' which holds application metadata.
@@ -1,8 +1,6 @@
-from importlib import metadata
 import logging
 
 import click
-from dateutil.parser import parse
 
 import src.mytcli.constants as constants
 from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
@@ -10,25 +8,11 @@ from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
                                TASK_UNRECOGNIZED, HL_FILTERS_ONLY,
                                WS_AREA_PENDING,
                                TASK_TYPE_NRML, TASK_STATUS_TODO, CLR_STR,
-                               OPS_ADD, PRNT_TASK_DTLS, CHANGELOG)
-from src.mytcli.models import Workspace
-import src.mytcli.db as db
-from src.mytcli.db import (connect_to_tasksdb, exit_app, reinitialize_db,
-                        set_versbose_logging)
-from src.mytcli.queries import get_tasks
-from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
-                           convert_date, convert_date_rel, generate_tags,
-                           get_and_print_task_count, parse_n_validate_recur)
-from src.mytcli.operations import (prep_recurring_tasks, add_task_and_tags,
-                                prep_modify, prep_delete, start_task,
-                                stop_task, complete_task, revert_task,
-                                reset_task, toggle_now, perform_undo,
-                                process_url, empty_bin)
-from src.mytcli.display import (display_default, display_full, display_history,
-                             display_by_tags, display_by_groups,
-                             display_dates, display_notes, display_7day,
-                             display_stats, display_all_tags,
-                             display_all_groups)
+                               OPS_ADD, PRNT_TASK_DTLS, CHANGELOG,
+                               DB_PROFILES, RECUR_MODES, UNDO_LIST_DEFAULT)
+# The db, queries, utils and operations modules import sqlalchemy, dateutil
+# and rich.prompt so each command imports what it needs from them, keeping the
+# startup of commands such as 'version' short. Refer tests/test_startup.py
 
 
 # Start Commands Config
@@ -56,10 +40,10 @@ def version():
     Prints the application version number
     """
     global CHANGELOG
+    from importlib import metadata
     CONSOLE.print(metadata.version('myt-cli'))
     CONSOLE.print("Visit {} for the change log.".format(CHANGELOG))
     CONSOLE.print()
-    exit_app(SUCCESS)
 
 # Add
 @myt.command()
@@ -221,6 +205,15 @@ def add(desc, priority, due, hide, group, context, tag, recur, end, notes,
     value will be calculated based on the date difference between provided hide
     and the original due date.
     """
+    import src.mytcli.db as db
+    from dateutil.parser import parse
+    from src.mytcli.models import Workspace
+    from src.mytcli.db import connect_to_tasksdb, exit_app
+    from src.mytcli.queries import get_tasks
+    from src.mytcli.utils import (get_event_id, convert_date, convert_date_rel,
+                                  generate_tags, get_and_print_task_count,
+                                  parse_n_validate_recur)
+    from src.mytcli.operations import (prep_recurring_tasks, add_task_and_tags)
     if verbose:
         LOGGER.setLevel(level=logging.DEBUG)
     if connect_to_tasksdb(verbose, full_db_path) == FAILURE:
@@ -407,8 +400,9 @@ def modify(filters, desc, priority, due, hide, group, context, tag, recur, end,
     descriptions. Can be combined with other filters. Ex - de:fitness or
     desc:fitness
 
-    groups - Filter on tasks by the group name. Can be combined with other
-    filters. Ex - gr:HOME.BILLS or group:HOME.BILLS
+    groups - Filter on tasks by the group name. Includes the tasks in the
+    sub groups, so gr:HOME also has the tasks in HOME.BILLS. Can be combined
+    with other filters. Ex - gr:HOME.BILLS or group:HOME.BILLS
 
     tags - Filter tasks on tags, can be provided as comman separated. Can be
     combined with other filters. Ex - tg:bills,finance or tag:bills,finance
@@ -519,6 +513,14 @@ def modify(filters, desc, priority, due, hide, group, context, tag, recur, end,
     Ex: modify id:5 !H ~-3 @phone
 
     """
+    import src.mytcli.db as db
+    from src.mytcli.models import Workspace
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
+                                  convert_date, get_and_print_task_count,
+                                  parse_n_validate_recur)
+    from src.mytcli.operations import prep_modify
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
@@ -638,6 +640,12 @@ def now(ctx, filters, verbose, full_db_path=None):
     myt now id:1 - This will remove 'now' for task 1. At this point there will be
     no tasks set as 'now'
     """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
+                                  get_and_print_task_count)
+    from src.mytcli.operations import toggle_now
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
@@ -733,6 +741,12 @@ def start(filters, verbose, full_db_path=None):
     Please refer the help for the 'modify' command for information on
     available filters
     """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
+                                  get_and_print_task_count)
+    from src.mytcli.operations import start_task
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
@@ -800,6 +814,12 @@ def done(filters, verbose, full_db_path=None):
     Please refer the help for the 'modify' command for information on
     available filters
     """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
+                                  get_and_print_task_count)
+    from src.mytcli.operations import complete_task
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
@@ -874,6 +894,12 @@ def revert(filters, verbose, full_db_path=None):
     not have a task ID you will need to use the uuid instead. This can be
     viewed using the 'myt view complete' command
     """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
+                                  get_and_print_task_count)
+    from src.mytcli.operations import revert_task
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
@@ -936,6 +962,12 @@ def reset(filters, verbose, full_db_path=None):
     myt reset tg:planning - Reset all tasks in STARTED status with a tag as
     'planning'
     """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
+                                  get_and_print_task_count)
+    from src.mytcli.operations import reset_task
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
@@ -1003,6 +1035,12 @@ def stop(filters, verbose, full_db_path=None):
     myt stop id:12 - Stops a task with task id as 12
 
     """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
+                                  get_and_print_task_count)
+    from src.mytcli.operations import stop_task
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
@@ -1132,12 +1170,21 @@ def view(filters, verbose, pager, top, viewmode, full_db_path=None):
     myt view --top 10 - If you have a lot of tasks captured and would like to
     see the top 10 tasks only.
     """
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import parse_filters
     ret = SUCCESS
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
-    if connect_to_tasksdb(verbose, full_db_path) == FAILURE:
+    if connect_to_tasksdb(verbose, full_db_path,
+                          read_only=True) == FAILURE:
         exit_app(FAILURE)
+    # Lazy import as the display module is only needed for the views
+    from src.mytcli.display import (display_default, display_full,
+                                    display_history, display_by_tags,
+                                    display_by_groups, display_dates,
+                                    display_notes, display_7day)
     if viewmode == "default":
         ret = display_default(potential_filters, pager, top)
     elif viewmode == "full":
@@ -1202,6 +1249,12 @@ def delete(filters, verbose, full_db_path=None):
 
     myt delete id:12 - Stops a task with task id as 12
     """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import (parse_filters, confirm_prompt, get_event_id,
+                                  get_and_print_task_count)
+    from src.mytcli.operations import prep_delete
     if verbose:
         set_versbose_logging()
     potential_filters = parse_filters(filters)
@@ -1248,6 +1301,40 @@ def delete(filters, verbose, full_db_path=None):
               help=("View all groups available across pending and completed "
                     "tasks."),
               )
+@click.option("--verify",
+              is_flag=True,
+              help=("Verify the lookup tables maintained for the latest "
+                    "version of tasks against the task history and the "
+                    "free task IDs against the IDs in use."),
+              )
+@click.option("--rebuild",
+              is_flag=True,
+              help=("Rebuild the lookup tables maintained for the latest "
+                    "version of tasks from the task history and the free "
+                    "task IDs from the IDs in use."),
+              )
+@click.option("--compact",
+              type=click.IntRange(min=0),
+              metavar="DAYS",
+              help=("Move the earlier versions of tasks to the archive "
+                    "database next to the tasks database. Changes made in "
+                    "the given number of days can still be undone. The "
+                    "archived versions are shown only by 'view --history'."),
+              )
+@click.option("--profile",
+              type=click.Choice(list(DB_PROFILES.keys())),
+              help=("Set the connection profile for the database. 'durable' "
+                    "syncs every change to disk, 'fast' uses a write ahead "
+                    "log and should be used only on local disks, 'bulk' "
+                    "does not sync and is meant for large imports."),
+              )
+@click.option("--recur-mode",
+              type=click.Choice(RECUR_MODES),
+              help=("Set when the recurring task instances are created on "
+                    "the first run of a day. 'sync' creates them before the "
+                    "command runs, 'background' creates them in a separate "
+                    "process while a view or stats runs."),
+              )
 @click.option("--verbose",
               "-v",
               is_flag=True,
@@ -1258,12 +1345,19 @@ def delete(filters, verbose, full_db_path=None):
               type=str,
               help="Full path to tasks database file",
               )
-def admin(verbose, empty, reinit, tags, groups, full_db_path=None):
+def admin(verbose, empty, reinit, tags, groups, verify, rebuild, compact,
+          profile, recur_mode, full_db_path=None):
     """
     Allows to run admin related operations on the tasks database. This includes
     reinitialization of database and emptying the bin area. Refer to the
     options for more information.
     """
+    from src.mytcli.db import (connect_to_tasksdb, exit_app, reinitialize_db,
+                               set_versbose_logging, set_db_profile,
+                               set_recur_mode)
+    from src.mytcli.utils import confirm_prompt
+    from src.mytcli.operations import (empty_bin, rebuild_latest_versions,
+                                       verify_latest_versions, compact_history)
     ret = SUCCESS
     if verbose:
         set_versbose_logging()
@@ -1278,13 +1372,48 @@ def admin(verbose, empty, reinit, tags, groups, full_db_path=None):
     if empty:
         ret = empty_bin()
     if tags:
+        from src.mytcli.display import display_all_tags
         ret = display_all_tags()
     if groups:
+        from src.mytcli.display import display_all_groups
         ret = display_all_groups()
+    if rebuild:
+        ret = rebuild_latest_versions()
+    if verify:
+        ret = verify_latest_versions()
+    if compact is not None:
+        ret = compact_history(compact)
+    if profile:
+        ret = set_db_profile(profile)
+        if ret == SUCCESS:
+            CONSOLE.print("Database profile set to '{}'.".format(profile),
+                          style="info")
+    if recur_mode:
+        ret = set_recur_mode(recur_mode)
+        if ret == SUCCESS:
+            CONSOLE.print("Recurrence mode set to '{}'.".format(recur_mode),
+                          style="info")
     exit_app(ret)
 
 
 @myt.command()
+@click.argument("steps",
+                type=click.IntRange(min=1),
+                required=False,
+                )
+@click.option("--list",
+              "list_",
+              is_flag=True,
+              help=("List the changes which can be undone, latest first, "
+                    "instead of undoing them. The last 10 changes unless "
+                    "a number of changes or --since is given."),
+              )
+@click.option("--since",
+              "-s",
+              type=str,
+              help=("With --list, list the changes made on or after this "
+                    "date. Can be a date or relative to today, for ex. -7"),
+              )
 @click.option("--verbose",
               "-v",
               is_flag=True,
@@ -1295,22 +1424,50 @@ def admin(verbose, empty, reinit, tags, groups, full_db_path=None):
               type=str,
               help="Full path to tasks database file",
               )
-def undo(verbose, full_db_path=None):
+def undo(steps, list_, since, verbose, full_db_path=None):
     """
     Performs an undo operation.
 
     The last operation requested by the user and any associated internal
     events are removed. The state of the tasks are restored to what the state
-    was prior to the last operation.
+    was prior to the last operation. Provide a number to undo as many of the
+    last operations, one after the other. Operations undone can be redone
+    using 'myt redo' till the tasks are changed again.
 
     A point to note, the task IDs could be different from what was assigned
     to a task prior to running of the undo.
+
+    --- EXAMPLES ---
+
+    myt undo 3 - Undo the last 3 operations
+
+    myt undo --list --since -7 - List the operations made in the last week
     """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import convert_date
+    from src.mytcli.operations import perform_undo
     if verbose:
         set_versbose_logging()
-    if connect_to_tasksdb(verbose, full_db_path) == FAILURE:
+    if since is not None and not list_:
+        CONSOLE.print("Since is only applicable with --list, ignoring.")
+    if connect_to_tasksdb(verbose, full_db_path,
+                          read_only=list_) == FAILURE:
         exit_app(FAILURE)
-    ret = perform_undo()
+    if list_:
+        since_dt = None
+        if since is not None:
+            since_dt = convert_date(since)
+            if since_dt is None:
+                CONSOLE.print("Since date is not a valid date.",
+                              style="default")
+                exit_app(FAILURE)
+        elif steps is None:
+            steps = UNDO_LIST_DEFAULT
+        from src.mytcli.display import display_events
+        exit_app(display_events(since_dt, steps))
+    ret = perform_undo(steps or 1)
     if ret == FAILURE:
         CONSOLE.print("Error while performing undo operation")
     else:
@@ -1318,6 +1475,50 @@ def undo(verbose, full_db_path=None):
     exit_app(ret)
 
 
+@myt.command()
+@click.argument("steps",
+                type=click.IntRange(min=1),
+                default=1,
+                )
+@click.option("--verbose",
+              "-v",
+              is_flag=True,
+              help="Enable verbose Logging.",
+              )
+@click.option("--full-db-path",
+              "-db",
+              type=str,
+              help="Full path to tasks database file",
+              )
+def redo(steps, verbose, full_db_path=None):
+    """
+    Performs a redo operation.
+
+    The last operation undone is applied again, so the tasks are as they
+    were before the undo. Provide a number to redo as many of the
+    operations undone, one after the other. Operations can only be redone
+    till the tasks are changed again.
+
+    --- EXAMPLES ---
+
+    myt redo 2 - Redo the last 2 operations undone
+    """
+    import src.mytcli.db as db
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.operations import perform_redo
+    if verbose:
+        set_versbose_logging()
+    if connect_to_tasksdb(verbose, full_db_path) == FAILURE:
+        exit_app(FAILURE)
+    ret = perform_redo(steps)
+    if ret == FAILURE:
+        CONSOLE.print("Error while performing redo operation")
+    else:
+        db.SESSION.commit()
+    exit_app(ret)
+
+
 @myt.command()
 @click.argument("filters",
                 nargs=-1,
@@ -1374,6 +1575,10 @@ def urlopen(filters, urlno, verbose, full_db_path=None):
     open the 3rd URL mentioned in the notes without a user prompt. If there
     is no 3rd URL then it will display available URLs for the user to choose.
     """
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
+    from src.mytcli.utils import parse_filters
+    from src.mytcli.operations import process_url
     if verbose:
         set_versbose_logging()
     if connect_to_tasksdb(verbose, full_db_path) == FAILURE:
@@ -1403,10 +1608,66 @@ def stats(verbose, full_db_path=None):
     Additionally also shows the trend for tasks completed and tasks created
     over the last 7 days.
     """
+    from src.mytcli.db import (connect_to_tasksdb, exit_app,
+                               set_versbose_logging)
     ret = SUCCESS
     if verbose:
         set_versbose_logging()
-    if connect_to_tasksdb(verbose, full_db_path) == FAILURE:
+    if connect_to_tasksdb(verbose, full_db_path,
+                          read_only=True) == FAILURE:
         exit_app(FAILURE)
+    from src.mytcli.display import display_stats
     display_stats()
     exit_app(ret)
+
+# Serve
+@myt.command()
+@click.option("--socket",
+              "-so",
+              "socket_path",
+              type=str,
+              help="Path of the Unix socket to listen on",
+              )
+@click.option("--verbose",
+              "-v",
+              is_flag=True,
+              help="Enable verbose Logging.",
+              )
+@click.option("--full-db-path",
+              "-db",
+              type=str,
+              help="Full path to tasks database file",
+              )
+def serve(socket_path, verbose, full_db_path=None):
+    """
+    Runs a server which keeps the tasks database connection open and listens
+    for commands on a Unix socket. Commands sent using the 'mytc' client are
+    then run by the server, skipping the application's startup each time. If
+    no server is running 'mytc' runs the command like 'myt'.
+
+    Commands which ask for a confirmation are declined when run through the
+    server. The socket can be changed for 'mytc' using the environment
+    variable MYT_SOCKET.
+
+    --- EXAMPLES ---
+
+    myt serve - Start a server for the default tasks database
+
+    mytc view overdue - View overdue tasks using the server
+    """
+    from src.mytcli.db import exit_app, set_versbose_logging
+    if constants.TUI_MODE:
+        CONSOLE.print("The server cannot be run from the TUI.",
+                      style="info")
+        exit_app(FAILURE)
+    if verbose:
+        set_versbose_logging()
+    from src.mytcli.server import MytServer
+    server = MytServer(socket_path, full_db_path)
+    if server.start() == FAILURE:
+        server.close()
+        exit_app(FAILURE)
+    CONSOLE.print("Serving on {}. Press Ctrl+C to stop."
+                  .format(server.socket_path), style="info")
+    server.serve_forever()
+    exit_app(SUCCESS)
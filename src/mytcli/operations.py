@@ -1,12 +1,15 @@
 import re
+import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import click
 from dateutil.parser import parse
 from dateutil.relativedelta import relativedelta
-from sqlalchemy import and_, func, cast, Numeric, tuple_, inspect
-from sqlalchemy.orm import make_transient
+from sqlalchemy import (and_, func, distinct, cast, Numeric, tuple_, inspect,
+                        insert, delete, select, literal, Integer, String)
+from sqlalchemy.orm import make_transient, aliased
+from sqlalchemy.sql.elements import ClauseElement
 from sqlalchemy.exc import SQLAlchemyError
 from rich.prompt import Prompt
 
@@ -20,24 +23,45 @@ from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
                                TASK_TYPE_BASE, TASK_TYPE_DRVD, TASK_TYPE_NRML,
                                TASK_STATUS_TODO, TASK_STATUS_STARTED,
                                TASK_STATUS_DONE, TASK_STATUS_DELETED,
-                               FMT_DATEONLY, FMT_DATETIME,
+                               FMT_DATEONLY, FMT_DATETIME, FMT_EVENTID,
                                OPS_ADD, OPS_MODIFY, OPS_START, OPS_STOP,
                                OPS_REVERT, OPS_RESET, OPS_DELETE, OPS_NOW,
                                OPS_UNLINK, OPS_DONE,
-                               UNTIL_WHEN, PRIORITY_NORMAL)
-from src.mytcli.models import Workspace, WorkspaceTags, WorkspaceRecurDates
+                               UNTIL_WHEN, PRIORITY_NORMAL,
+                               BULK_MIN_TASKS, BULK_CHUNK_SIZE)
+from src.mytcli.models import (Workspace, WorkspaceTags, WorkspaceRecurDates,
+                               WorkspaceLatest, WorkspaceGroups, WorkspaceFts,
+                               WorkspaceEvents, WorkspaceRedo,
+                               ArchiveWorkspace, ArchiveWorkspaceTags,
+                               ArchiveWorkspaceRecurDates, stored_columns)
 import src.mytcli.db as db
-from src.mytcli.queries import get_tasks, get_tags, get_task_uuid_n_ver
+from src.mytcli.queries import (get_tasks, get_tags, get_task_uuid_n_ver,
+                                get_max_ver_sqr, get_latest_mismatches,
+                                get_free_id_mismatches)
 from src.mytcli.utils import (open_url, confirm_prompt, get_event_id,
                            convert_date, convert_date_rel, convert_time_unit,
                            translate_priority, carryover_recur_dates,
-                           generate_tags, derive_task_id, get_task_new_version,
+                           generate_tags, derive_task_id, derive_task_ids,
+                           get_task_new_version,
                            reflect_object_n_print, calc_duration,
                            reset_now_flag, calc_next_inst_date,
-                           parse_n_validate_recur, is_date_short_format)
+                           calc_recur_inst_dates,
+                           parse_n_validate_recur, is_date_short_format,
+                           set_latest_version, sync_latest_versions,
+                           get_group_path_rows, add_event_versions)
 
 
 def create_recur_inst():
+    """
+    Creates the recurring task instances which are due for all outstanding
+    recurring tasks. Called on the first run of the day.
+
+    Parameters:
+        None
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
     LOGGER.debug("In create_recur_tasks now")
     potential_filters = {}
     potential_filters["osrecur"] = "yes"
@@ -45,68 +69,317 @@ def create_recur_inst():
     if uuid_version_results is None:
         LOGGER.debug("No recurring tasks instances to create in first "
                      "run of the day")
-        return
-    tasks_list = get_tasks(uuid_version_results)
-    for task in tasks_list:
-        LOGGER.debug("Trying to add recurring tasks as part of startup for "
-                     " UUID {} and version {}".format(task.uuid, task.version))
-        ws_tags_list = get_tags(task.uuid, task.version)
-        ret, return_list = prep_recurring_tasks(task,
-                                                ws_tags_list,
-                                                True)
-        if ret == FAILURE:
-            return ret
+        return SUCCESS
+    base_list = get_tasks(uuid_version_results)
+    return add_recur_instances(base_list)
+
+
+def add_recur_instances(base_list):
+    """
+    Adds the due instances for a list of recurring base tasks as a set.
+
+    Equivalent to calling prep_recurring_tasks with add_recur_inst for each
+    base task, but the last due dates, the existing pending instances and the
+    tags are each retrieved with one query for all the base tasks. The
+    instances are then inserted in bulk.
+
+    Parameters:
+        base_list(list): Latest versions of the base tasks
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    base_uuid_ver = [(base.uuid, base.version) for base in base_list]
+    base_uuids = [base.uuid for base in base_list]
+    try:
+        # Due date of the last instance created for each base task
+        last_due = dict(db.SESSION.query(WorkspaceRecurDates.uuid,
+                                         func.max(WorkspaceRecurDates.due))
+                        .filter(tuple_(WorkspaceRecurDates.uuid,
+                                       WorkspaceRecurDates.version)
+                                .in_(base_uuid_ver))
+                        .group_by(WorkspaceRecurDates.uuid)
+                        .all())
+        # Base tasks which have an instance in the pending area
+        max_ver_d_sqr = get_max_ver_sqr([TASK_TYPE_DRVD], [WS_AREA_PENDING])
+        pend_bases = {row[0] for row in
+                      (db.SESSION.query(Workspace.base_uuid)
+                       .join(max_ver_d_sqr,
+                             and_(Workspace.uuid == max_ver_d_sqr.c.uuid,
+                                  Workspace.version == max_ver_d_sqr.c.maxver))
+                       .filter(Workspace.base_uuid.in_(base_uuids))
+                       .distinct()
+                       .all())}
+        base_tags = {}
+        for uuidn, tag in (db.SESSION.query(WorkspaceTags.uuid,
+                                            WorkspaceTags.tags)
+                           .filter(tuple_(WorkspaceTags.uuid,
+                                          WorkspaceTags.version)
+                                   .in_(base_uuid_ver))
+                           .all()):
+            base_tags.setdefault(uuidn, []).append(tag)
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    # Due dates of the instances for each base task
+    inst_list = []
+    event_ids = {}
+    for base in base_list:
+        # Event ID remains same as the base task
+        event_ids[base.uuid] = base.event_id or get_event_id()
+        if base.recur_end is not None:
+            end_dt = datetime.strptime(base.recur_end, FMT_DATEONLY).date()
+        else:
+            end_dt = FUTDT
+        if last_due.get(base.uuid) is not None:
+            start_dt = datetime.strptime(last_due[base.uuid],
+                                         FMT_DATEONLY).date()
+            inst_dates = calc_recur_inst_dates(base.recur_mode,
+                                               base.recur_when, start_dt,
+                                               end_dt, True,
+                                               base.uuid not in pend_bases)
+        else:
+            start_dt = datetime.strptime(base.due, FMT_DATEONLY).date()
+            inst_dates = calc_recur_inst_dates(base.recur_mode,
+                                               base.recur_when, start_dt,
+                                               end_dt, False, True)
+        inst_list.extend([(base, inst_dt) for inst_dt in inst_dates])
+    if not inst_list:
+        return SUCCESS
+    id_list = derive_task_ids(len(inst_list))
+    if id_list is None:
+        return FAILURE
+    now = datetime.now().strftime(FMT_DATETIME)
+    ws_rows = []
+    tags_rows = []
+    rec_dt_rows = []
+    latest_rows = []
+    group_rows = []
+    for (base, inst_dt), task_id in zip(inst_list, id_list):
+        LOGGER.debug("Adding a recurring instance with due as {} for base "
+                     "task {}".format(inst_dt, base.uuid))
+        task_uuid = str(uuid.uuid4())
+        due = inst_dt.strftime(FMT_DATEONLY)
+        if base.hide is not None:
+            # Keep the base task's difference of hide to due
+            hide_due_diff = (datetime.strptime(base.hide, FMT_DATEONLY)
+                             - datetime.strptime(base.due, FMT_DATEONLY)).days
+            hide = ((inst_dt + relativedelta(days=hide_due_diff))
+                    .strftime(FMT_DATEONLY))
+        else:
+            hide = None
+        ws_rows.append({"uuid": task_uuid, "version": 1, "id": task_id,
+                        "description": base.description,
+                        "priority": translate_priority(base.priority),
+                        "status": base.status or TASK_STATUS_TODO,
+                        "due": due, "hide": hide, "area": WS_AREA_PENDING,
+                        "created": now, "groups": base.groups,
+                        "context": base.context,
+                        "event_id": event_ids[base.uuid],
+                        "now_flag": base.now_flag,
+                        "task_type": TASK_TYPE_DRVD, "base_uuid": base.uuid,
+                        "recur_mode": base.recur_mode,
+                        "recur_when": base.recur_when,
+                        "recur_end": base.recur_end, "inception": now,
+                        "duration": 0, "dur_event": now,
+                        "notes": base.notes})
+        tags_rows.extend([{"uuid": task_uuid, "version": 1, "tags": tag}
+                          for tag in base_tags.get(base.uuid, [])])
+        rec_dt_rows.append({"uuid": base.uuid, "version": base.version,
+                            "due": due})
+        latest_rows.append({"uuid": task_uuid, "version": 1, "id": task_id,
+                            "area": WS_AREA_PENDING,
+                            "task_type": TASK_TYPE_DRVD})
+        group_rows.extend(get_group_path_rows(task_uuid, base.groups))
+    try:
+        db.SESSION.execute(insert(Workspace), ws_rows)
+        if tags_rows:
+            db.SESSION.execute(insert(WorkspaceTags), tags_rows)
+        db.SESSION.execute(insert(WorkspaceRecurDates), rec_dt_rows)
+        db.SESSION.execute(insert(WorkspaceLatest), latest_rows)
+        if group_rows:
+            db.SESSION.execute(insert(WorkspaceGroups), group_rows)
+    except SQLAlchemyError as e:
+        db.SESSION.rollback()
+        LOGGER.error(str(e))
+        return FAILURE
+    # The instances are not a change by the user, so the redo is kept
+    if add_event_versions([(row["event_id"], row["uuid"], row["version"],
+                            row["created"]) for row in ws_rows],
+                          OPS_ADD, clear_redo=False) == FAILURE:
+        db.SESSION.rollback()
+        return FAILURE
+    LOGGER.debug("Added {} recurring instances".format(len(ws_rows)))
     return SUCCESS
 
 
-def perform_undo():
+def perform_undo(steps=1):
     """
-    Deletes all task data that have been created as part of the latest event.
-    Using the latest event ID the corresponding task UUID and Version are
-    identified. Then these are deleted from Workspace, WorkspaceTags and
-    WorkspaceRecurDates.
+    Undo the latest events, one after the other. The task versions added by
+    an event are read from the events journal, 'workspace_events', and are
+    deleted from Workspace, WorkspaceTags and WorkspaceRecurDates along with
+    their journal rows. They are kept in 'workspace_redo' so the event can
+    be redone.
     Post deletion the latest versions of tasks in the pending area are assigned
     appropriate IDs.
 
     Parameters:
-        None
+        steps(int): Number of events to undo. Default is 1
 
     Returns:
         int: 0 if successful else 1
     """
-    #Get latest event ID
-    res = db.SESSION.query(func.max(Workspace.event_id)).all()
-    if res is not None:
-        max_evt_id = (res[0])[0]
-    else:
+    undone = 0
+    for _ in range(steps):
+        try:
+            #Get latest event ID, from the journal's primary key
+            max_evt_id = (db.SESSION.query(func.max(WorkspaceEvents.event_id))
+                          .scalar())
+            if max_evt_id is None:
+                CONSOLE.print("No more undo actions available")
+                break
+            uuid_version_results = [tuple(row) for row in
+                                    (db.SESSION.query(WorkspaceEvents.uuid,
+                                                      WorkspaceEvents.version)
+                                     .filter(WorkspaceEvents.event_id
+                                             == max_evt_id)
+                                     .all())]
+            #Versions before the event might have been archived, refer
+            #compact_history
+            needed = (set(uuid_version_results)
+                      | {(uuidn, ver - 1) for uuidn, ver
+                         in uuid_version_results if ver > 1})
+            if (db.SESSION.query(func.count())
+                    .select_from(Workspace)
+                    .filter(tuple_(Workspace.uuid, Workspace.version)
+                            .in_(needed))
+                    .scalar()) < len(needed):
+                CONSOLE.print("No more undo actions available, the earlier "
+                              "versions of the tasks are archived")
+                break
+            #Keep the rows of the event to redo it
+            rows = {}
+            for model in [Workspace, WorkspaceTags, WorkspaceRecurDates,
+                          WorkspaceEvents]:
+                rows[model.__tablename__] = [
+                    dict(row) for row in
+                    db.SESSION.execute(select(*stored_columns(
+                                                model.__table__))
+                                       .where(tuple_(model.uuid,
+                                                     model.version)
+                                              .in_(uuid_version_results)))
+                    .mappings().all()]
+            db.SESSION.add(WorkspaceRedo(event_id=max_evt_id,
+                                         rows=json.dumps(rows)))
+            #Attempt to delete the tasks using the UUID and version
+            for model in [WorkspaceRecurDates, WorkspaceTags, Workspace,
+                          WorkspaceEvents]:
+                (db.SESSION.query(model)
+                    .filter(tuple_(model.uuid, model.version)
+                                    .in_(uuid_version_results))
+                    .delete(synchronize_session=False))
+        except SQLAlchemyError as e:
+            LOGGER.error(str(e))
+            LOGGER.error("Error while performing delete as part of undo")
+            return FAILURE
+        #Previous versions of these tasks are now the latest versions
+        if sync_latest_versions([uuidn for uuidn, _ in
+                                 uuid_version_results]) == FAILURE:
+            return FAILURE
+        undone = undone + 1
+    if undone == 0:
         return SUCCESS
-    potential_filters = {}
-    potential_filters["eventid"] = max_evt_id
-    uuid_version_results = get_task_uuid_n_ver(potential_filters)
-    if uuid_version_results is None:
-        CONSOLE.print("No more undo actions available")
+    #Next for the max versions of task in pending area assign a task ID.
+    if _assign_missing_ids() == FAILURE:
+        return FAILURE
+    CONSOLE.print("Undone {} change(s).".format(undone), style="info")
+    CONSOLE.print("NOTE: Tasks IDs might differ from the pre-undo state...")
+    return SUCCESS
+
+
+def perform_redo(steps=1):
+    """
+    Redo the events undone last, one after the other. The task versions,
+    tags, recurring due dates and journal rows of an event are added back
+    from 'workspace_redo' and become the latest versions of the tasks. The
+    task IDs they had are kept unless another task uses them now, in which
+    case they are assigned a new ID.
+
+    Parameters:
+        steps(int): Number of events to redo. Default is 1
+
+    Returns:
+        int: 0 if successful else 1
+    """
+    redone = 0
+    for _ in range(steps):
+        try:
+            #The event undone last is the earliest one, refer perform_undo
+            redo = (db.SESSION.query(WorkspaceRedo)
+                    .order_by(WorkspaceRedo.event_id)
+                    .first())
+            if redo is None:
+                CONSOLE.print("No more redo actions available")
+                break
+            rows = json.loads(redo.rows)
+            uuid_list = list({row["uuid"] for row
+                              in rows[Workspace.__tablename__]})
+            ids_in_use = {row[0] for row in
+                          (db.SESSION.query(WorkspaceLatest.id)
+                           .filter(and_(WorkspaceLatest.area
+                                            == WS_AREA_PENDING,
+                                        WorkspaceLatest.id != '-',
+                                        WorkspaceLatest.task_type
+                                            .in_([TASK_TYPE_NRML,
+                                                  TASK_TYPE_DRVD]),
+                                        WorkspaceLatest.uuid
+                                            .notin_(uuid_list)))
+                           .all())}
+            for row in rows[Workspace.__tablename__]:
+                if row["id"] in ids_in_use:
+                    row["id"] = "-"
+            for model in [Workspace, WorkspaceTags, WorkspaceRecurDates,
+                          WorkspaceEvents]:
+                if rows[model.__tablename__]:
+                    db.SESSION.execute(insert(model.__table__),
+                                       rows[model.__tablename__])
+            #For all older entries remove the task_id
+            latest_ws = aliased(Workspace)
+            (db.SESSION.query(Workspace)
+             .filter(Workspace.uuid.in_(uuid_list),
+                     Workspace.id != "-",
+                     Workspace.version
+                        < (select(func.max(latest_ws.version))
+                           .where(latest_ws.uuid == Workspace.uuid)
+                           .scalar_subquery()))
+             .update({Workspace.id: "-"}, synchronize_session=False))
+            db.SESSION.delete(redo)
+        except SQLAlchemyError as e:
+            LOGGER.error(str(e))
+            LOGGER.error("Error while adding back the tasks as part of redo")
+            return FAILURE
+        if sync_latest_versions(uuid_list) == FAILURE:
+            return FAILURE
+        redone = redone + 1
+    if redone == 0:
         return SUCCESS
-    #Attempt to delete the tasks using the UUID and version
-    try:
-        (db.SESSION.query(WorkspaceRecurDates)
-            .filter(tuple_(WorkspaceRecurDates.uuid,
-                           WorkspaceRecurDates.version)
-                            .in_(uuid_version_results))
-            .delete(synchronize_session=False))
-
-        (db.SESSION.query(WorkspaceTags)
-            .filter(tuple_(WorkspaceTags.uuid, WorkspaceTags.version)
-                            .in_(uuid_version_results))
-            .delete(synchronize_session=False))
-        (db.SESSION.query(Workspace)
-            .filter(tuple_(Workspace.uuid, Workspace.version)
-                            .in_(uuid_version_results))
-            .delete(synchronize_session=False))
-    except SQLAlchemyError as e:
-        LOGGER.error(str(e))
-        LOGGER.error("Error while performing delete as part of undo")
+    if _assign_missing_ids() == FAILURE:
         return FAILURE
-    #Next for the max versions of task in pending area assign a task ID.
+    CONSOLE.print("Redone {} change(s).".format(redone), style="info")
+    return SUCCESS
+
+
+def _assign_missing_ids():
+    """
+    Assign task IDs to the latest versions of tasks in the pending area
+    which do not have one, as after an undo or redo. Base tasks get '*'.
+
+    Parameters:
+        None
+
+    Returns:
+        int: 0 if successful else 1
+    """
     potential_filters = {}
     potential_filters["missingid"] = "yes"
     uuid_version_results = get_task_uuid_n_ver(potential_filters)
@@ -114,14 +387,19 @@ def perform_undo():
         #Nothing to do
         return SUCCESS
     task_list = get_tasks(uuid_version_results)
+    id_list = derive_task_ids(len(task_list))
+    if id_list is None:
+        return FAILURE
+    id_iter = iter(id_list)
     for task in task_list:
         if task.task_type in [TASK_TYPE_DRVD, TASK_TYPE_NRML]:
-            task.id = derive_task_id()
+            task.id = next(id_iter)
         else:
             #If Base  task then use '*' instead
             task.id = "*"
         db.SESSION.add(task)
-    CONSOLE.print("NOTE: Tasks IDs might differ from the pre-undo state...")
+        if set_latest_version(task) == FAILURE:
+            return FAILURE
     return SUCCESS
 
 
@@ -281,13 +559,34 @@ def empty_bin():
             (db.SESSION.query(WorkspaceTags)
              .filter(WorkspaceTags.uuid.in_(uuid_list))
              .delete(synchronize_session=False))
+            (db.SESSION.query(WorkspaceGroups)
+             .filter(WorkspaceGroups.uuid.in_(uuid_list))
+             .delete(synchronize_session=False))
+            (db.SESSION.query(WorkspaceLatest)
+             .filter(WorkspaceLatest.uuid.in_(uuid_list))
+             .delete(synchronize_session=False))
             (db.SESSION.query(Workspace)
              .filter(Workspace.uuid.in_(uuid_list))
              .delete(synchronize_session=False))
+            (db.SESSION.query(WorkspaceEvents)
+             .filter(WorkspaceEvents.uuid.in_(uuid_list))
+             .delete(synchronize_session=False))
+            # The events undone could have versions of these tasks
+            db.SESSION.query(WorkspaceRedo).delete(synchronize_session=False)
         except SQLAlchemyError as e:
             LOGGER.error(str(e))
             return FAILURE
         db.SESSION.commit()
+        try:
+            with db.archive_scope() as session:
+                if session is not None:
+                    for archive in [ArchiveWorkspaceRecurDates,
+                                    ArchiveWorkspaceTags, ArchiveWorkspace]:
+                        session.execute(delete(archive)
+                                        .where(archive.c.uuid.in_(uuid_list)))
+        except SQLAlchemyError as e:
+            LOGGER.error(str(e))
+            return FAILURE
         CONSOLE.print("Bin emptied!", style="info")
         return SUCCESS
     else:
@@ -295,6 +594,149 @@ def empty_bin():
         return SUCCESS
 
 
+def rebuild_latest_versions():
+    """
+    Rebuild the latest version lookup table, 'workspace_latest', from the
+    complete version history of the tasks and the free task IDs table,
+    'workspace_free_ids', from the task IDs in use.
+
+    Parameters:
+        None
+
+    Returns:
+        int: 0 if successful else 1
+    """
+    """
+    The full text search index is kept in sync by triggers on the latest
+    version table, so it is rebuilt along with it. It is created if missing
+    and emptied first, as removing the rows from the index one at a time
+    through the triggers is slow for the entire table.
+    """
+    if db.create_fts_index() == SUCCESS:
+        db.SESSION.execute(WorkspaceFts.delete())
+    if sync_latest_versions() == FAILURE:
+        CONSOLE.print("Error while rebuilding the latest versions of tasks")
+        return FAILURE
+    db.SESSION.commit()
+    CONSOLE.print("Latest versions of tasks rebuilt.", style="info")
+    return SUCCESS
+
+
+def verify_latest_versions():
+    """
+    Verify that the latest version lookup table, 'workspace_latest', agrees
+    with the complete version history of the tasks and that the free task IDs
+    table, 'workspace_free_ids', agrees with the task IDs in use. Any
+    mismatched task UUIDs and task IDs are printed and can be corrected using
+    the rebuild option.
+
+    Parameters:
+        None
+
+    Returns:
+        int: 0 if consistent else 1
+    """
+    mismatch_list = get_latest_mismatches()
+    if mismatch_list is None:
+        CONSOLE.print("Error while verifying the latest versions of tasks")
+        return FAILURE
+    ret = SUCCESS
+    if mismatch_list:
+        CONSOLE.print("Latest versions out of sync for {} task(s):"
+                      .format(len(mismatch_list)), style="info")
+        for uuidn in mismatch_list:
+            CONSOLE.print(uuidn, style="default")
+        ret = FAILURE
+    else:
+        CONSOLE.print("Latest versions of tasks are consistent.",
+                      style="info")
+    id_mismatch_list = get_free_id_mismatches()
+    if id_mismatch_list is None:
+        CONSOLE.print("Error while verifying the free task IDs")
+        return FAILURE
+    if id_mismatch_list:
+        CONSOLE.print("Free task IDs out of sync for {} ID(s):"
+                      .format(len(id_mismatch_list)), style="info")
+        CONSOLE.print(", ".join(str(task_id) for task_id in id_mismatch_list),
+                      style="default")
+        ret = FAILURE
+    else:
+        CONSOLE.print("Free task IDs are consistent.", style="info")
+    if ret == FAILURE:
+        CONSOLE.print("Use 'myt admin --rebuild' to correct these.",
+                      style="info")
+    return ret
+
+
+def compact_history(days):
+    """
+    Move the versions of tasks which are only needed to view the history of
+    the tasks to the archive database, along with their tags and recurring
+    due dates. A version is moved once the version after it was added by an
+    event older than the given number of days. The latest version of every
+    task stays, as do the versions which the events of those days can be
+    undone to. The history view includes the archived versions.
+
+    Parameters:
+        days(int): Number of days of events which can still be undone
+
+    Returns:
+        int: 0 if successful else 1
+    """
+    if days < 0:
+        CONSOLE.print("Number of days to keep should not be negative.",
+                      style="default")
+        return FAILURE
+    # Event IDs begin with the time of the event, refer get_event_id
+    cutoff = (datetime.now() - timedelta(days=days)).strftime(FMT_EVENTID)
+    superseded_sqr = (select(Workspace.uuid,
+                             func.max(Workspace.version).label("version"))
+                      .where(Workspace.event_id < cutoff)
+                      .group_by(Workspace.uuid)
+                      .subquery())
+    moved_qr = (select(Workspace.uuid, Workspace.version)
+                .join(superseded_sqr,
+                      and_(Workspace.uuid == superseded_sqr.c.uuid,
+                           Workspace.version < superseded_sqr.c.version)))
+    moved_sqr = moved_qr.subquery()
+    try:
+        ver_cnt, task_cnt = db.SESSION.execute(
+            select(func.count(), func.count(distinct(moved_sqr.c.uuid)))
+            .select_from(moved_sqr)).one()
+        # Ends the read so the connection with the archive can write
+        db.SESSION.commit()
+        if ver_cnt == 0:
+            CONSOLE.print("No versions of tasks to archive.",
+                          style="default")
+            return SUCCESS
+        with db.archive_scope(create=True) as session:
+            # Replaced if left behind by an earlier compaction
+            for model, archive in [(Workspace, ArchiveWorkspace),
+                                   (WorkspaceTags, ArchiveWorkspaceTags),
+                                   (WorkspaceRecurDates,
+                                    ArchiveWorkspaceRecurDates)]:
+                session.execute(insert(archive).prefix_with("OR REPLACE")
+                                .from_select(
+                                    [col.name for col in
+                                     stored_columns(model.__table__)],
+                                    select(*stored_columns(model.__table__))
+                                    .where(tuple_(model.uuid, model.version)
+                                           .in_(moved_qr))))
+            # The versions go last as they identify the rows to move
+            for model in [WorkspaceTags, WorkspaceRecurDates, Workspace]:
+                session.execute(delete(model)
+                                .where(tuple_(model.uuid, model.version)
+                                       .in_(moved_qr)))
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        CONSOLE.print("Error while archiving the versions of tasks")
+        return FAILURE
+    CONSOLE.print("Archived {} version(s) of {} task(s) to {}"
+                  .format(ver_cnt, task_cnt, db.get_archive_path()),
+                  style="info")
+    return SUCCESS
+
+
 def delete_tasks(ws_task):
     """
     Delete the task by creating a new version for the task with status as
@@ -320,6 +762,7 @@ def delete_tasks(ws_task):
     """
     if ws_task.status == TASK_STATUS_STARTED:
         uuidn = ws_task.uuid
+        event_id = ws_task.event_id
         potential_filters = {}
         potential_filters["uuid"] = uuidn
         ret, innr_tsk_tgs_prnt = stop_task(potential_filters, ws_task.event_id)
@@ -332,6 +775,9 @@ def delete_tasks(ws_task):
         ws_task = innr_task_list[0]
         make_transient(ws_task)
         ws_task.uuid = uuidn
+        #The stopped version has the task's earlier event ID, the deletion
+        #uses the event ID for this deletion
+        ws_task.event_id = event_id
     #Proceed to complete the task
     ws_task.id = "-"
     ws_task.status = TASK_STATUS_DELETED
@@ -392,6 +838,30 @@ def prep_delete(potential_filters, event_id, delete_all=False):
         CONSOLE.print("No applicable tasks to delete", style="default")
         return SUCCESS, None
     task_list = get_tasks(uuid_version_results)
+    bulk_list = [task for task in task_list
+                 if task.task_type == TASK_TYPE_NRML]
+    if len(bulk_list) >= BULK_MIN_TASKS:
+        """
+        Normal tasks need no decisions on recurrence and are moved to the bin
+        in bulk, the started ones are stopped first as for a single task.
+        """
+        task_list = [task for task in task_list
+                     if task.task_type != TASK_TYPE_NRML]
+        started_list = [task for task in bulk_list
+                        if task.status == TASK_STATUS_STARTED]
+        if started_list:
+            ret, _ = stop_tasks_bulk(started_list, event_id)
+            if ret == FAILURE:
+                CONSOLE.print("Error while trying to stop task...")
+                return ret, None
+        ret, task_tags_print = bulk_add_versions(
+                                bulk_list, OPS_DELETE,
+                                {"id": "-", "status": TASK_STATUS_DELETED,
+                                 "area": WS_AREA_BIN, "now_flag": False,
+                                 "event_id": event_id})
+        if ret == FAILURE:
+            LOGGER.error("Error encountered while deleting tasks")
+            return ret, None
     for task in task_list:
         LOGGER.debug("Working on Task UUID {} and Task ID {}"
                      .format(task.uuid, task.id))
@@ -533,13 +1003,7 @@ def prep_delete(potential_filters, event_id, delete_all=False):
                 #Main Query
                 LOGGER.debug("Checking if there are no more instances in "
                              "pending area.")
-                max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                            func.max(Workspace.version)
-                                                .label("maxver"))
-                                    .filter(Workspace.task_type
-                                                == TASK_TYPE_DRVD)
-                                    .group_by(Workspace.uuid)
-                                    .subquery())
+                max_ver_sqr = get_max_ver_sqr([TASK_TYPE_DRVD])
                 results = (db.SESSION.query(Workspace.uuid, Workspace.version)
                                 .join(max_ver_sqr,
                                         and_(Workspace.uuid
@@ -756,6 +1220,7 @@ def start_task(potential_filters, event_id):
         return SUCCESS, None
     task_list = get_tasks(uuid_version_results)
     LOGGER.debug("Total Tasks to Start {}".format(len(task_list)))
+    bulk_list = []
     for task in task_list:
         LOGGER.debug("Working on Task UUID {} and Task ID {}"
                      .format(task.uuid, task.id))
@@ -763,6 +1228,10 @@ def start_task(potential_filters, event_id):
             CONSOLE.print("{}, {} - This task is already in STARTED status..."
                         .format(task.description, task.due))
             continue
+        if (len(task_list) >= BULK_MIN_TASKS
+                and task.task_type in [TASK_TYPE_NRML, TASK_TYPE_DRVD]):
+            bulk_list.append(task)
+            continue
         make_transient(task)
         ws_task = task
         ws_task.status = TASK_STATUS_STARTED
@@ -779,6 +1248,17 @@ def start_task(potential_filters, event_id):
         if ret == FAILURE:
             LOGGER.error("Error encountered in adding task version, stopping")
             return ret, None
+    if bulk_list:
+        ret, bulk_tags_print = bulk_add_versions(
+                                bulk_list, OPS_START,
+                                {"status": TASK_STATUS_STARTED,
+                                 "event_id": func.coalesce(Workspace.event_id,
+                                                           event_id)})
+        if ret == FAILURE:
+            LOGGER.error("Error encountered in adding task versions, "
+                         "stopping")
+            return ret, None
+        task_tags_print = task_tags_print + bulk_tags_print
     return SUCCESS, task_tags_print
 
 
@@ -790,6 +1270,7 @@ def stop_task(potential_filters, event_id):
         return SUCCESS, None
     task_list = get_tasks(uuid_version_results)
     LOGGER.debug("Total Tasks to Stop {}".format(len(task_list)))
+    bulk_list = []
     for task in task_list:
         LOGGER.debug("Working on Task UUID {} and Task ID {}"
                      .format(task.uuid, task.id))
@@ -797,6 +1278,10 @@ def stop_task(potential_filters, event_id):
             CONSOLE.print("{}, {} - This task is not STARTED yet..."
                         .format(task.description, task.due))
             continue
+        if (len(task_list) >= BULK_MIN_TASKS
+                and task.task_type in [TASK_TYPE_NRML, TASK_TYPE_DRVD]):
+            bulk_list.append(task)
+            continue
         make_transient(task)
         ws_task = task
         ws_task.status = TASK_STATUS_TODO
@@ -813,9 +1298,36 @@ def stop_task(potential_filters, event_id):
         if ret == FAILURE:
             LOGGER.error("Error encountered in adding task version, stopping")
             return ret, None
+    if bulk_list:
+        ret, bulk_tags_print = stop_tasks_bulk(bulk_list, event_id)
+        if ret == FAILURE:
+            LOGGER.error("Error encountered in adding task versions, "
+                         "stopping")
+            return ret, None
+        task_tags_print = task_tags_print + bulk_tags_print
     return SUCCESS, task_tags_print
 
 
+def stop_tasks_bulk(task_list, event_id):
+    """
+    Stop the started tasks in bulk, the same as stop_task does for each task.
+    Used before completing or deleting started tasks in bulk as well.
+
+    Parameters:
+        task_list(list): Workspace objects for the started tasks
+        event_id(text): Event ID for tasks which do not have one
+
+    Returns:
+        integer: 0 for successful execution, else 1 for any failures
+        list: List of tuples of (Workspace - Stopped Tasks, String - Comma
+        separated string of tags for the task)
+    """
+    return bulk_add_versions(task_list, OPS_STOP,
+                             {"status": TASK_STATUS_TODO,
+                              "event_id": func.coalesce(Workspace.event_id,
+                                                        event_id)})
+
+
 def complete_task(potential_filters, event_id):
     task_tags_print = []
     base_uuids = set()
@@ -824,6 +1336,35 @@ def complete_task(potential_filters, event_id):
         CONSOLE.print("No applicable tasks to complete", style="default")
         return SUCCESS, None
     task_list = get_tasks(uuid_version_results)
+    if len(task_list) >= BULK_MIN_TASKS:
+        bulk_list = [task for task in task_list
+                     if task.task_type in [TASK_TYPE_NRML, TASK_TYPE_DRVD]]
+        task_list = [task for task in task_list
+                     if task.task_type not in [TASK_TYPE_NRML,
+                                               TASK_TYPE_DRVD]]
+        """
+        As for a single task, the started tasks are stopped first so that the
+        duration is recorded and then all tasks are marked as complete.
+        """
+        started_list = [task for task in bulk_list
+                        if task.status == TASK_STATUS_STARTED]
+        if started_list:
+            ret, _ = stop_tasks_bulk(started_list, event_id)
+            if ret == FAILURE:
+                CONSOLE.print("Error while trying to stop task...")
+                return ret, None
+        if bulk_list:
+            ret, task_tags_print = bulk_add_versions(
+                                    bulk_list, OPS_DONE,
+                                    {"id": "-", "area": WS_AREA_COMPLETED,
+                                     "status": TASK_STATUS_DONE,
+                                     "event_id": event_id, "now_flag": None})
+            if ret == FAILURE:
+                LOGGER.error("Error encountered in adding task versions, "
+                             "stopping")
+                return ret, None
+            base_uuids.update(task.base_uuid for task in bulk_list
+                              if task.task_type == TASK_TYPE_DRVD)
     for task in task_list:
         LOGGER.debug("Working on Task UUID {} and Task ID {}"
                      .format(task.uuid, task.id))
@@ -922,12 +1463,7 @@ def complete_task(potential_filters, event_id):
             """
             LOGGER.debug("Checking if there are no more instances in "
                             "pending area.")
-            max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                        func.max(Workspace.version)
-                                            .label("maxver"))
-                                .filter(Workspace.task_type == TASK_TYPE_DRVD)
-                                .group_by(Workspace.uuid)
-                                .subquery())
+            max_ver_sqr = get_max_ver_sqr([TASK_TYPE_DRVD])
             results = (db.SESSION.query(Workspace.uuid, Workspace.version)
                             .join(max_ver_sqr,
                                     and_(Workspace.uuid == max_ver_sqr.c.uuid,
@@ -1066,6 +1602,13 @@ def prep_modify(potential_filters, ws_task_src, tag):
         CONSOLE.print("No applicable tasks to modify", style="default")
         return SUCCESS, None
     task_list = get_tasks(uuid_version_results)
+    if (len(task_list) >= BULK_MIN_TASKS
+            and all(task.task_type == TASK_TYPE_NRML for task in task_list)):
+        changes = get_bulk_modify_changes(ws_task_src)
+        if changes is not None:
+            LOGGER.debug("Modifying {} NORMAL tasks in bulk"
+                         .format(len(task_list)))
+            return bulk_add_versions(task_list, OPS_MODIFY, changes, tag)
     for ws_task in task_list:
         r_tsk_tg_prnt = []
         uuidn = ws_task.uuid
@@ -1361,6 +1904,71 @@ def prep_modify(potential_filters, ws_task_src, tag):
     return ret, task_tags_print
 
 
+def get_bulk_modify_changes(ws_task_src):
+    """
+    Returns the user's changes for modify as the changes for
+    bulk_add_versions, resulting in the same values that modify_task merges
+    into each normal task.
+
+    Parameters:
+        ws_task_src(Workspace): The changes requested by the user
+
+    Returns:
+        dict: The changes by column name or None when the new value depends
+        on each task, as for a hide date relative to the due date of the task
+    """
+    changes = {}
+    if ws_task_src.description is not None:
+        changes["description"] = ws_task_src.description
+    if ws_task_src.priority == CLR_STR:
+        changes["priority"] = translate_priority(PRIORITY_NORMAL)
+    elif ws_task_src.priority is not None:
+        changes["priority"] = translate_priority(ws_task_src.priority)
+    if ws_task_src.due == CLR_STR:
+        changes["due"] = None
+    elif ws_task_src.due is not None:
+        changes["due"] = convert_date(ws_task_src.due)
+    if ws_task_src.hide == CLR_STR:
+        changes["hide"] = None
+    elif ws_task_src.hide is not None:
+        if changes.get("due") is not None:
+            eff_due = parse(changes["due"])
+        elif (is_date_short_format(ws_task_src.hide)
+                and ws_task_src.hide.startswith("-")
+                and "due" not in changes):
+            return None
+        else:
+            eff_due = None
+        converted = convert_date_rel(ws_task_src.hide, eff_due)
+        if converted is not None:
+            changes["hide"] = converted
+    if ws_task_src.groups == CLR_STR:
+        changes["groups"] = None
+    elif ws_task_src.groups is not None:
+        changes["groups"] = ws_task_src.groups
+    if ws_task_src.context == CLR_STR:
+        changes["context"] = None
+    elif ws_task_src.context is not None:
+        changes["context"] = ws_task_src.context
+    if ws_task_src.notes == CLR_STR:
+        changes["notes"] = None
+    elif ws_task_src.notes is not None:
+        #Appended to the notes, without a prefix for tasks without notes
+        changes["notes"] = func.ltrim(func.coalesce(Workspace.notes, "")
+                                      .concat(" " + ws_task_src.notes), " ")
+    if ws_task_src.recur_end == CLR_STR:
+        changes["recur_end"] = None
+    elif ws_task_src.recur_end is not None:
+        changes["recur_end"] = ws_task_src.recur_end
+    if ws_task_src.recur_mode is not None:
+        changes["recur_mode"] = ws_task_src.recur_mode
+    if ws_task_src.recur_when is not None:
+        changes["recur_when"] = ws_task_src.recur_when
+    if ws_task_src.event_id is not None:
+        changes["event_id"] = ws_task_src.event_id
+    return changes
+
+
 def modify_task(ws_task_src, ws_task, tag, multi_change, rec_chg, due_chg,
                 hide_chg):
     """
@@ -1550,11 +2158,7 @@ def prep_recurring_tasks(ws_task_src, ws_tags_list, add_recur_inst):
     if add_recur_inst:
         # Get last done or pending task whichever is the latest. Create
         # the next occurence from the next due date
-        max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                     func.max(Workspace.version)
-                                     .label("maxver"))
-                       .filter(Workspace.task_type == TASK_TYPE_BASE)
-                       .group_by(Workspace.uuid).subquery())
+        max_ver_sqr = get_max_ver_sqr([TASK_TYPE_BASE])
         results = (db.SESSION.query(func.max(WorkspaceRecurDates.due))
                    .join(max_ver_sqr, and_(WorkspaceRecurDates.version ==
                                            max_ver_sqr.c.maxver,
@@ -1564,12 +2168,7 @@ def prep_recurring_tasks(ws_task_src, ws_tags_list, add_recur_inst):
                            ws_task_base.uuid)
                    .all())
 
-        max_ver_d_sqr = (db.SESSION.query(Workspace.uuid,
-                                     func.max(Workspace.version)
-                                        .label("maxver"))
-                              .filter(Workspace.task_type == TASK_TYPE_DRVD)
-                              .group_by(Workspace.uuid)
-                              .subquery())
+        max_ver_d_sqr = get_max_ver_sqr([TASK_TYPE_DRVD])
         #Check if there are any derived tasks in 'pending' area
         #If none then create atleast one.
         task_exists = (db.SESSION.query(Workspace.uuid)
@@ -1853,8 +2452,155 @@ def add_task_and_tags(ws_task_src, ws_tags_list=None, ws_rec_dt=None,
                                          ws_task.version)
          .update({Workspace.id: "-"},
                  synchronize_session=False))
+        # Point the latest version lookup to this version
+        if set_latest_version(ws_task) == FAILURE:
+            db.SESSION.rollback()
+            return FAILURE, None, None
+        if add_event_versions([(ws_task.event_id, ws_task.uuid,
+                                ws_task.version, ws_task.created)],
+                              src_ops) == FAILURE:
+            db.SESSION.rollback()
+            return FAILURE, None, None
     except SQLAlchemyError as e:
         db.SESSION.rollback()
         LOGGER.error(str(e))
         return FAILURE, None, None
     return SUCCESS, ws_task, tags_str
+
+
+def bulk_add_versions(task_list, src_ops, changes=None, tag=None):
+    """
+    Add a new version for each of the tasks with a few set based statements
+    for all of the tasks rather than calling add_task_and_tags for each task.
+    The new versions, tags and latest version lookups are the same as those
+    from add_task_and_tags for the operation. The same changes apply to all
+    of the tasks and only normal and derived tasks are supported. Changes are
+    not committed.
+
+    Parameters:
+        task_list(list): Workspace objects for the latest versions of the
+                         tasks
+        src_ops(str): The operation, one of OPS_START, OPS_STOP, OPS_DONE,
+                      OPS_DELETE or OPS_MODIFY
+        changes(dict): New values for the task's attributes, by the column
+                       name. A value can be an SQL expression on the columns
+                       of the current version.
+        tag(str): Comma separated tags to add or, when prefixed with '-',
+                  remove as done by modify_task. CLR_STR removes all tags.
+
+    Returns:
+        integer: 0 for successful execution, else 1 for any failures
+        list: List of tuples of (Workspace - New version of the task, String
+        - Comma separated string of tags for the task)
+    """
+    changes = changes or {}
+    now = datetime.now().strftime(FMT_DATETIME)
+    columns = stored_columns(Workspace.__table__)
+    values = {col.name: getattr(Workspace, col.name) for col in columns}
+    values["version"] = Workspace.version + 1
+    values["created"] = literal(now, String)
+    if src_ops == OPS_STOP:
+        # As in calc_duration, add the time since the task was started
+        values["duration"] = (Workspace.duration
+                              + cast(func.strftime("%s", now), Integer)
+                              - Workspace.dur_event_sec)
+        values["dur_event"] = literal(now, String)
+    elif src_ops == OPS_START:
+        values["dur_event"] = literal(now, String)
+    for name, value in changes.items():
+        if not isinstance(value, ClauseElement):
+            value = literal(value, Workspace.__table__.c[name].type)
+        values[name] = value
+    latest_join = and_(Workspace.uuid == WorkspaceLatest.uuid,
+                       Workspace.version == WorkspaceLatest.version)
+    latest_updates = {WorkspaceLatest.version: WorkspaceLatest.version + 1}
+    for name in ["id", "area"]:
+        if name in changes:
+            latest_updates[getattr(WorkspaceLatest, name)] = changes[name]
+    uuids = [task.uuid for task in task_list]
+    tags_strs = {}
+    new_tasks = {}
+    try:
+        for start in range(0, len(uuids), BULK_CHUNK_SIZE):
+            chunk = uuids[start:start + BULK_CHUNK_SIZE]
+            # Tags of the current versions, in the order get_tags returns
+            # them
+            tag_lists = {uuidn: [] for uuidn in chunk}
+            for uuidn, tag_name in (db.SESSION
+                                    .query(WorkspaceTags.uuid,
+                                           WorkspaceTags.tags)
+                                    .join(WorkspaceLatest,
+                                          and_(WorkspaceTags.uuid
+                                                == WorkspaceLatest.uuid,
+                                               WorkspaceTags.version
+                                                == WorkspaceLatest.version))
+                                    .filter(WorkspaceLatest.uuid.in_(chunk))
+                                    .order_by(WorkspaceTags.uuid,
+                                              WorkspaceTags.tags)
+                                    .all()):
+                tag_lists[uuidn].append(tag_name)
+            if tag == CLR_STR:
+                tag_lists = {uuidn: [] for uuidn in chunk}
+            elif tag is not None:
+                for tag_u in tag_lists.values():
+                    for t in tag.split(","):
+                        if t[0] == "-":
+                            if t[1:] in tag_u:
+                                tag_u.remove(t[1:])
+                        elif t not in tag_u:
+                            tag_u.append(t)
+            # Insert the new versions from the current versions
+            db.SESSION.execute(
+                insert(Workspace)
+                .from_select([col.name for col in columns],
+                             select(*[values[col.name] for col in columns])
+                             .join(WorkspaceLatest, latest_join)
+                             .where(WorkspaceLatest.uuid.in_(chunk))))
+            # For all older entries remove the task_id
+            (db.SESSION.query(Workspace)
+             .filter(Workspace.uuid.in_(chunk),
+                     Workspace.id != "-",
+                     Workspace.version
+                        <= (select(WorkspaceLatest.version)
+                            .where(WorkspaceLatest.uuid == Workspace.uuid)
+                            .scalar_subquery()))
+             .update({Workspace.id: "-"}, synchronize_session=False))
+            # Point the latest version lookup to the new versions
+            (db.SESSION.query(WorkspaceLatest)
+             .filter(WorkspaceLatest.uuid.in_(chunk))
+             .update(latest_updates, synchronize_session=False))
+            chunk_tasks = (db.SESSION.query(Workspace)
+                           .join(WorkspaceLatest, latest_join)
+                           .filter(WorkspaceLatest.uuid.in_(chunk))
+                           .all())
+            db.SESSION.expunge_all()
+            for task in chunk_tasks:
+                new_tasks[task.uuid] = task
+            if add_event_versions([(task.event_id, task.uuid, task.version,
+                                    task.created) for task in chunk_tasks],
+                                  src_ops) == FAILURE:
+                db.SESSION.rollback()
+                return FAILURE, None
+            # Insert the tags for the new versions
+            tag_rows = [{"uuid": uuidn, "version": new_tasks[uuidn].version,
+                         "tags": t}
+                        for uuidn, tag_u in tag_lists.items() for t in tag_u]
+            if tag_rows:
+                db.SESSION.execute(insert(WorkspaceTags), tag_rows)
+            if "groups" in changes:
+                (db.SESSION.query(WorkspaceGroups)
+                 .filter(WorkspaceGroups.uuid.in_(chunk))
+                 .delete(synchronize_session=False))
+                group_rows = [row for uuidn in chunk for row in
+                              get_group_path_rows(uuidn, changes["groups"])]
+                if group_rows:
+                    db.SESSION.execute(insert(WorkspaceGroups), group_rows)
+            for uuidn, tag_u in tag_lists.items():
+                tags_strs[uuidn] = "".join("," + t for t in tag_u)
+    except SQLAlchemyError as e:
+        db.SESSION.rollback()
+        LOGGER.error(str(e))
+        return FAILURE, None
+    LOGGER.debug("Added {} versions in bulk for {}"
+                 .format(len(new_tasks), src_ops))
+    return SUCCESS, [(new_tasks[uuidn], tags_strs[uuidn]) for uuidn in uuids]
@@ -1,8 +1,8 @@
 from datetime import datetime
 
-from sqlalchemy import (and_, or_, case, func, tuple_, distinct,
-                        cast, Numeric)
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import (and_, or_, case, func, tuple_, select, literal,
+                        literal_column, union, Integer)
+from sqlalchemy.exc import SQLAlchemyError, OperationalError
 
 from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
                                TASK_OVERDUE, TASK_TODAY, TASK_HIDDEN,
@@ -13,11 +13,40 @@ from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
                                TASK_STATUS_TODO, TASK_STATUS_STARTED,
                                TASK_STATUS_DONE, TASK_STATUS_DELETED,
                                FMT_DATEONLY, PRIORITY_HIGH, PRIORITY_MEDIUM,
-                               PRIORITY_LOW, PRIORITY_NORMAL)
-from src.mytcli.models import Workspace, WorkspaceTags, WorkspaceRecurDates
+                               PRIORITY_LOW, PRIORITY_NORMAL,
+                               FTS_QUERY_PREFIX)
+from src.mytcli.models import (Workspace, WorkspaceTags, WorkspaceRecurDates,
+                               WorkspaceLatest, WorkspaceGroups, WorkspaceFts,
+                               WorkspaceFreeIds, WorkspaceEvents, epoch_day)
 import src.mytcli.db as db
 
 
+def get_max_ver_sqr(task_types=None, areas=None):
+    """
+    Returns a subquery with the latest version for each task UUID.
+
+    The subquery reads from the 'workspace_latest' table, which is maintained
+    on every write, instead of aggregating max(version) over the full version
+    history. The columns are named 'uuid' and 'maxver' so the subquery can be
+    joined to Workspace, WorkspaceTags or WorkspaceRecurDates on both.
+
+    Parameters:
+        task_types(list): Optional list of task types to restrict the tasks
+        areas(list): Optional list of areas to restrict the tasks
+
+    Returns:
+        Subquery: Subquery with columns 'uuid' and 'maxver'
+    """
+    max_ver_qr = db.SESSION.query(WorkspaceLatest.uuid,
+                                  WorkspaceLatest.version.label("maxver"))
+    if task_types is not None:
+        max_ver_qr = max_ver_qr.filter(WorkspaceLatest.task_type
+                                       .in_(task_types))
+    if areas is not None:
+        max_ver_qr = max_ver_qr.filter(WorkspaceLatest.area.in_(areas))
+    return max_ver_qr.subquery()
+
+
 def get_tasks(uuid_version=None, expunge=True):
     """
     Returns the task details for a list of task uuid and versions.
@@ -76,9 +105,249 @@ def get_tags(task_uuid, task_version, expunge=True):
         return ws_tags_list
 
 
-def get_task_uuid_n_ver(potential_filters):
+def get_score_xpr(tagged_xpr, curr_time):
+    """
+    Returns the SQL expression for the task score as calculated by
+    calc_task_scores. It uses the functions registered on the database
+    connection, so scores in the database are identical to those calculated
+    in python. The inception component is relative to all tasks in the query
+    and hence uses a window over the complete result before any LIMIT.
+
+    Parameters:
+        tagged_xpr(ColumnElement): Expression which is true if the task has
+                                   tags
+        curr_time(datetime): Time to calculate the task scores at
+
+    Returns:
+        Function: Expression for the task score
+    """
+    curr_time_str = curr_time.isoformat(sep=" ")
+    age_xpr = func.myt_task_age(Workspace.inception, curr_time_str)
+    return func.myt_task_score(Workspace.now_flag, Workspace.priority,
+                               Workspace.status, Workspace.groups, tagged_xpr,
+                               Workspace.notes, age_xpr,
+                               func.sum(age_xpr).over(), Workspace.due,
+                               curr_time_str)
+
+
+def get_tagged_tasks(uuid_version):
+    """
+    Returns the tasks, from the provided list of task uuid and versions,
+    which have at least one tag. Uses a single grouped query so callers
+    working on a list of tasks do not need to retrieve the tags task by task.
+
+    Parameters:
+        uuid_version(list): List of tuples of uuid and versions
+
+    Returns:
+        set: Set of tuples of (task UUID,Version) which have tags or None if
+             there is an exception
+    """
+    try:
+        results = (db.SESSION.query(WorkspaceTags.uuid, WorkspaceTags.version)
+                   .filter(tuple_(WorkspaceTags.uuid, WorkspaceTags.version)
+                           .in_(uuid_version))
+                   .group_by(WorkspaceTags.uuid, WorkspaceTags.version)
+                   .all())
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return None
+    else:
+        return set(map(tuple, results))
+
+
+def get_date_filter_condition(column, comp_list):
+    """
+    Returns the condition for a date filter on the provided column.
+
+    Parameters:
+        column(Column): The Workspace date column to filter on. The dates
+                        are converted to days for the integer date columns
+        comp_list(list): List of operator and 1 or 2 dates as returned by
+                         parse_date_filters
+
+    Returns:
+        BinaryExpression: The condition for the date filter
+    """
+    if isinstance(column.type, Integer):
+        comp_list = [comp_list[0]] + [epoch_day(dt) for dt in comp_list[1:]]
+    opr = comp_list[0]
+    if opr == "eq":
+        return column == comp_list[1]
+    elif opr == "gt":
+        return column > comp_list[1]
+    elif opr == "ge":
+        return column >= comp_list[1]
+    elif opr == "lt":
+        return column < comp_list[1]
+    elif opr == "le":
+        return column <= comp_list[1]
+    elif opr == "bt":
+        return and_(column >= comp_list[1], column <= comp_list[2])
+    else:
+        #No valid filter, so any task that has the date
+        return column != None
+
+
+def get_text_filter_condition(column_name, value):
+    """
+    Returns the condition for the description and notes filters.
+
+    The value is searched for as a case insensitive substring. If the value
+    starts with FTS_QUERY_PREFIX, '~', then the rest of it is run as an FTS5
+    query on the column, for ex. 'de:~budget AND review'. The query syntax
+    allows double quotes for a phrase, '*' for a prefix, parentheses and
+    AND, OR, NOT. If the full text search index is not available or the
+    query is not valid, then the rest of the value is searched for as a
+    substring instead. The substring search uses the full text search index
+    if available, else it is run as a LIKE on the task versions.
+
+    Parameters:
+        column_name(str): 'description' or 'notes'
+        value(str): Value provided for the filter
+
+    Returns:
+        BinaryExpression: Condition on the Workspace table
+    """
+    if value.startswith(FTS_QUERY_PREFIX):
+        value = value[len(FTS_QUERY_PREFIX):]
+        if db.FTS_ENABLED:
+            fts_xpr = (literal_column(WorkspaceFts.name).op("MATCH")
+                       ("{} : ({})".format(column_name, value)))
+            try:
+                # The query is only parsed by FTS5 when it is run
+                (db.SESSION.execute(select(WorkspaceFts.c.uuid)
+                                    .where(fts_xpr).limit(1))
+                           .all())
+            except OperationalError as e:
+                LOGGER.debug("Not a valid search query, searching for it as"
+                             " text: {}".format(str(e)))
+            else:
+                return Workspace.uuid.in_(select(WorkspaceFts.c.uuid)
+                                          .where(fts_xpr))
+    if not db.FTS_ENABLED:
+        return getattr(Workspace, column_name).like("%"+value+"%")
+    fts_xpr = WorkspaceFts.c[column_name].like("%"+value+"%")
+    return Workspace.uuid.in_(select(WorkspaceFts.c.uuid).where(fts_xpr))
+
+
+def get_filter_conditions(potential_filters, drvd_area, curr_date):
+    """
+    Compiles the task property filters and the modifiers for the pending
+    area into a list of conditions on the Workspace table. Each condition
+    includes the area it applies to, so the conditions can be combined into
+    a single WHERE clause, or run as separate queries.
+
+    The ID, UUID, NOW and internal filters are not compiled here as they are
+    handled on their own by get_task_uuid_n_ver.
+
+    Parameters:
+        potential_filters(dict): Dictionary with the various types of
+                                 filters
+        drvd_area(str): Area the task property filters apply to
+        curr_date(date): Date for the overdue, today and hidden modifiers
+
+    Returns:
+        list: List of conditions, empty if no applicable filters
+    """
+    filter_list = []
+    group = potential_filters.get("group")
+    context = potential_filters.get("context")
+    tag = potential_filters.get("tag")
+    notes = potential_filters.get("notes")
+    desc = potential_filters.get("desc")
+    if group is not None:
+        #Groups from all 3 areas. Will be case insensitive and include the
+        #sub groups, for ex. 'WORK' matches 'WORK' and 'WORK.PROJA'
+        group = group.rstrip(".")
+        LOGGER.debug("Inside group filter with below params")
+        LOGGER.debug(group)
+        group_sqr = (select(WorkspaceGroups.uuid)
+                     .where(WorkspaceGroups.path == group))
+        filter_list.append(and_(Workspace.uuid.in_(group_sqr),
+                                Workspace.area == drvd_area))
+    if context is not None:
+        LOGGER.debug("Inside context filter with below params")
+        LOGGER.debug("%" + context + "%")
+        filter_list.append(and_(Workspace.context.like("%"+context+"%"),
+                                Workspace.area == drvd_area))
+    if tag is not None:
+        #Tags from all 3 areas
+        tag_list = tag.split(",")
+        LOGGER.debug("Inside tag filter with below params")
+        LOGGER.debug(tag_list)
+        tags_xpr = and_(WorkspaceTags.uuid == Workspace.uuid,
+                        WorkspaceTags.version == Workspace.version)
+        if tag:
+            #If tag is provided search by tag
+            tags_xpr = and_(tags_xpr, WorkspaceTags.tags.in_(tag_list))
+        #No tag provided, so any task that has a tag
+        filter_list.append(and_(db.SESSION.query(WorkspaceTags.uuid)
+                                              .filter(tags_xpr)
+                                              .exists(),
+                                Workspace.area == drvd_area))
+    if notes is not None:
+        #Notes from all 3 areas. Will be case insensitive
+        LOGGER.debug("Inside notes filter with below params")
+        LOGGER.debug("%" + notes + "%")
+        filter_list.append(and_(get_text_filter_condition("notes", notes),
+                                Workspace.area == drvd_area))
+    if desc is not None:
+        #Description as a substring. Will be case insensitive
+        LOGGER.debug("Inside description filter with below params")
+        LOGGER.debug("%" + desc + "%")
+        filter_list.append(and_(get_text_filter_condition("description",
+                                                          desc),
+                                Workspace.area == drvd_area))
+    for key, column in (("due", Workspace.due_day),
+                        ("hide", Workspace.hide_day),
+                        ("end", Workspace.recur_end)):
+        comp_list = potential_filters.get(key)
+        if comp_list is not None and comp_list[0] is not None:
+            LOGGER.debug("Inside {} filter with below params".format(key))
+            LOGGER.debug(comp_list)
+            filter_list.append(and_(get_date_filter_condition(column,
+                                                              comp_list),
+                                    Workspace.area == drvd_area))
     """
-    Return task UUID and version by applying filters on tasks
+    Look for modifiers that work in the pending area
+    """
+    overdue_task = potential_filters.get(TASK_OVERDUE)
+    today_task = potential_filters.get(TASK_TODAY)
+    hidden_task = potential_filters.get(TASK_HIDDEN)
+    started_task = potential_filters.get(TASK_STARTED)
+    LOGGER.debug("Status for OVERDUE {}, TODAY {}, HIDDEN {}, STARTED{}"
+                .format(overdue_task, today_task, hidden_task,
+                        started_task))
+    curr_day = epoch_day(curr_date)
+    visible_xpr = or_(Workspace.hide_day <= curr_day,
+                      Workspace.hide_day == None)
+    if overdue_task is not None:
+        LOGGER.debug("Inside overdue filter")
+        filter_list.append(and_(Workspace.area == WS_AREA_PENDING,
+                                Workspace.due_day < curr_day,
+                                visible_xpr))
+    if today_task is not None:
+        LOGGER.debug("Inside today filter")
+        filter_list.append(and_(Workspace.area == WS_AREA_PENDING,
+                                Workspace.due_day == curr_day,
+                                visible_xpr))
+    if hidden_task is not None:
+        LOGGER.debug("Inside hidden filter")
+        filter_list.append(and_(Workspace.area == WS_AREA_PENDING,
+                                Workspace.hide_day > curr_day,
+                                Workspace.hide_day != None))
+    if started_task is not None:
+        LOGGER.debug("Inside started filter")
+        filter_list.append(and_(Workspace.area == WS_AREA_PENDING,
+                                Workspace.status == TASK_STATUS_STARTED))
+    return filter_list
+
+
+def get_task_uuid_n_ver_qr(potential_filters):
+    """
+    Return the query for the task UUID and version by applying filters on
+    tasks
 
     Using a list of filters identify the relevant task UUIDs and their
     latest versions. When all pending tasks are requested, i.e. no other
@@ -136,17 +405,17 @@ def get_task_uuid_n_ver(potential_filters):
                                  filters
 
     Returns:
-        list: List of tuples of (task UUID,Version) or None if there
-              is an exception or no results found
+        Query: Query for the task UUID and Version, or None if no filters
+               apply
     """
 
     """
-    The filters work  by running an intersect across all applicable filters.
+    The filters are compiled into a single query. All applicable filters are
+    combined into one WHERE clause over a single join to the latest versions.
     For ex. if the ask is to filter where group is 'HOME' in the completed
     area then it will run the query as
-    all tasks where group like 'HOME%'
-    INTERSECT
-    all tasks in the 'completed' area
+    all latest versions in the 'completed' area
+    WHERE group like '%HOME%' AND area is 'completed'
     """
     LOGGER.debug("Incoming Filters: ")
     LOGGER.debug(potential_filters)
@@ -161,14 +430,6 @@ def get_task_uuid_n_ver(potential_filters):
     now_task = potential_filters.get(TASK_NOW)
     idn = potential_filters.get("id")
     uuidn = potential_filters.get("uuid")
-    group = potential_filters.get("group")
-    context = potential_filters.get("context")
-    notes = potential_filters.get("notes")
-    tag = potential_filters.get("tag")
-    desc = potential_filters.get("desc")
-    due_list = potential_filters.get("due")
-    hide_list = potential_filters.get("hide")
-    end_list = potential_filters.get("end")
     bybaseuuid = potential_filters.get("bybaseuuid")
     baseuuidonly = potential_filters.get("baseuuidonly")
     osrecur = potential_filters.get("osrecur")
@@ -181,12 +442,6 @@ def get_task_uuid_n_ver(potential_filters):
     need to deviate from this then they will use their own max_ver sub queries.
 
     """
-    max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                 func.max(Workspace.version)
-                                 .label("maxver"))
-                   .filter(Workspace.task_type.in_([TASK_TYPE_DRVD,
-                                                    TASK_TYPE_NRML]))
-                   .group_by(Workspace.uuid).subquery())
     if done_task is not None:
         drvd_area = WS_AREA_COMPLETED
     elif bin_task is not None:
@@ -194,6 +449,15 @@ def get_task_uuid_n_ver(potential_filters):
     else:
         drvd_area = WS_AREA_PENDING
     LOGGER.debug("Derived area is {}".format(drvd_area))
+    """
+    The area is also applied on the latest versions so that the lookup is
+    driven by the area index of the 'workspace_latest' table. Filters which
+    work only in the pending area use pend_ver_sqr.
+    """
+    max_ver_sqr = get_max_ver_sqr([TASK_TYPE_DRVD, TASK_TYPE_NRML],
+                                  [drvd_area])
+    pend_ver_sqr = get_max_ver_sqr([TASK_TYPE_DRVD, TASK_TYPE_NRML],
+                                   [WS_AREA_PENDING])
     if all_tasks:
         """
         When no filter is provided retrieve all tasks from pending area.
@@ -201,13 +465,14 @@ def get_task_uuid_n_ver(potential_filters):
         """
         LOGGER.debug("Inside all_tasks filter")
         innrqr_all = (db.SESSION.query(Workspace.uuid, Workspace.version)
-                    .join(max_ver_sqr, and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
+                    .join(pend_ver_sqr, and_(Workspace.version ==
+                                            pend_ver_sqr.c.maxver,
                                             Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
+                                            pend_ver_sqr.c.uuid))
                     .filter(and_(Workspace.area == WS_AREA_PENDING,
-                                or_(Workspace.hide <= curr_date,
-                                    Workspace.hide == None))))
+                                or_(Workspace.hide_day <=
+                                    epoch_day(curr_date),
+                                    Workspace.hide_day == None))))
         innrqr_list.append(innrqr_all)
     elif idn is not None:
         """
@@ -218,10 +483,10 @@ def get_task_uuid_n_ver(potential_filters):
         LOGGER.debug("Inside id filter with below params")
         LOGGER.debug(id_list)
         innrqr_idn = (db.SESSION.query(Workspace.uuid, Workspace.version)
-                    .join(max_ver_sqr, and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
+                    .join(pend_ver_sqr, and_(Workspace.version ==
+                                            pend_ver_sqr.c.maxver,
                                             Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
+                                            pend_ver_sqr.c.uuid))
                     .filter(and_(Workspace.area == WS_AREA_PENDING,
                                 Workspace.id.in_(id_list))))
         innrqr_list.append(innrqr_idn)
@@ -241,11 +506,8 @@ def get_task_uuid_n_ver(potential_filters):
         innrqr_list.append(innrqr_now)
     elif osrecur is not None:
         LOGGER.debug("Inside Outstanding Recurring Tasks filter")
-        max_ver_sqr1 = (db.SESSION.query(Workspace.uuid,
-                                        func.max(Workspace.version)
-                                        .label("maxver"))
-                        .filter(Workspace.task_type == TASK_TYPE_BASE)
-                        .group_by(Workspace.uuid).subquery())
+        max_ver_sqr1 = get_max_ver_sqr([TASK_TYPE_BASE],
+                                       [WS_AREA_PENDING])
         innrqr_osrecr = (db.SESSION.query(Workspace.uuid, Workspace.version)
                     .join(max_ver_sqr1,
                             and_(Workspace.version ==
@@ -280,11 +542,7 @@ def get_task_uuid_n_ver(potential_filters):
     elif bybaseuuid is not None:
         LOGGER.debug("Inside By Base UUID filter with below params")
         LOGGER.debug(bybaseuuid)
-        max_ver_sqr1 = (db.SESSION.query(Workspace.uuid,
-                                        func.max(Workspace.version)
-                                        .label("maxver"))
-                        .filter(Workspace.task_type.in_([TASK_TYPE_DRVD]))
-                        .group_by(Workspace.uuid).subquery())
+        max_ver_sqr1 = get_max_ver_sqr([TASK_TYPE_DRVD], [drvd_area])
         innrqr_buuid = (db.SESSION.query(Workspace.uuid, Workspace.version)
                         .join(max_ver_sqr1, and_(Workspace.version ==
                                                 max_ver_sqr1.c.maxver,
@@ -298,11 +556,7 @@ def get_task_uuid_n_ver(potential_filters):
     elif baseuuidonly is not None:
         LOGGER.debug("Inside Base UUID Only filter with below params")
         LOGGER.debug(baseuuidonly)
-        max_ver_sqr1 = (db.SESSION.query(Workspace.uuid,
-                                        func.max(Workspace.version)
-                                        .label("maxver"))
-                        .filter(Workspace.task_type == TASK_TYPE_BASE)
-                        .group_by(Workspace.uuid).subquery())
+        max_ver_sqr1 = get_max_ver_sqr([TASK_TYPE_BASE], [drvd_area])
         innrqr_buuido = (db.SESSION.query(Workspace.uuid, Workspace.version)
                             .join(max_ver_sqr1, and_(Workspace.version ==
                                                     max_ver_sqr1.c.maxver,
@@ -321,10 +575,7 @@ def get_task_uuid_n_ver(potential_filters):
     elif missingid is not None:
         LOGGER.debug("Inside Missing ID filter with below params")
         LOGGER.debug(baseuuidonly)
-        max_ver_sqr1 = (db.SESSION.query(Workspace.uuid,
-                                        func.max(Workspace.version)
-                                        .label("maxver"))
-                        .group_by(Workspace.uuid).subquery())
+        max_ver_sqr1 = get_max_ver_sqr(areas=[WS_AREA_PENDING])
         innrqr_missid = (db.SESSION.query(Workspace.uuid, Workspace.version)
                             .join(max_ver_sqr1, and_(Workspace.version ==
                                                     max_ver_sqr1.c.maxver,
@@ -334,471 +585,60 @@ def get_task_uuid_n_ver(potential_filters):
                                         Workspace.area == WS_AREA_PENDING)))
         innrqr_list.append(innrqr_missid)
     else:
-        if group is not None:
-            """
-            Query to get a list of uuid and version for matchiing groups
-            from all 3 areas. Will be case insensitive
-            """
-            LOGGER.debug("Inside group filter with below params")
-            LOGGER.debug("%" + group + "%")
-            innrqr_groups = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.groups
-                                                    .like("%"+group+"%"),
-                                            Workspace.area == drvd_area)))
-            innrqr_list.append(innrqr_groups)
-        if context is not None:
-            LOGGER.debug("Inside context filter with below params")
-            LOGGER.debug("%" + context + "%")
-            innrqr_context = (db.SESSION.query(Workspace.uuid,
-                                               Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.context
-                                                    .like("%"+context+"%"),
-                                            Workspace.area == drvd_area)))
-            innrqr_list.append(innrqr_context)
-        if tag is not None:
-            """
-            Query to get a list of uuid and version for matchiing tags
-            from all 3 areas
-            """
-            tag_list = tag.split(",")
-            LOGGER.debug("Inside tag filter with below params")
-            LOGGER.debug(tag_list)
-            if tag:
-                #If tag is provided search by tag
-                innrqr_tags = (db.SESSION.query(WorkspaceTags.uuid,
-                                            WorkspaceTags.version)
-                            .join(max_ver_sqr,
-                                    and_(WorkspaceTags.version ==
-                                        max_ver_sqr.c.maxver,
-                                        WorkspaceTags.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .join(Workspace, and_(Workspace.uuid ==
-                                                    WorkspaceTags.uuid,
-                                                  Workspace.version ==
-                                                    WorkspaceTags.version))
-                            .filter(and_(WorkspaceTags.tags.in_(tag_list),
-                                         Workspace.area == drvd_area)))
-            else:
-                #No tag provided, so any task that has a tag
-                innrqr_tags = (db.SESSION.query(WorkspaceTags.uuid,
-                                            WorkspaceTags.version)
-                            .join(max_ver_sqr,
-                                    and_(WorkspaceTags.version ==
-                                        max_ver_sqr.c.maxver,
-                                        WorkspaceTags.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .join(Workspace, and_(Workspace.uuid ==
-                                                    WorkspaceTags.uuid,
-                                                  Workspace.version ==
-                                                    WorkspaceTags.version))
-                            .filter(Workspace.area == drvd_area))
-            innrqr_list.append(innrqr_tags)
-        if notes is not None:
-            """
-            Query to get a list of uuid and version based on notes
-            from all 3 areas. Will be case insensitive
-            """
-            LOGGER.debug("Inside notes filter with below params")
-            LOGGER.debug("%" + notes + "%")
-            innrqr_notes = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.notes
-                                                    .like("%"+notes+"%"),
-                                            Workspace.area == drvd_area)))
-            innrqr_list.append(innrqr_notes)
-        if desc is not None:
-            """
-            Query to get a list of uuid and version for tasks which match
-            the description as a substring. Will be case insensitive
-            """
-            LOGGER.debug("Inside description filter with below params")
-            LOGGER.debug("%" + desc + "%")
-            innrqr_desc = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.description
-                                                    .like("%"+desc+"%"),
-                                            Workspace.area == drvd_area)))
-            innrqr_list.append(innrqr_desc)
-        if due_list is not None and due_list[0] is not None:
-            """
-            Query to get a list of uuid and version for tasks which meet
-            the due date filters provided
-            """
-            LOGGER.debug("Inside due filter with below params")
-            LOGGER.debug(due_list)
-            if due_list[0] == "eq":
-                #If tag is provided search by tag
-                innrqr_due = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.due == due_list[1],
-                                            Workspace.area == drvd_area)))
-            elif due_list[0] == "gt":
-                innrqr_due = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.due > due_list[1],
-                                            Workspace.area == drvd_area)))
-            elif due_list[0] == "ge":
-                innrqr_due = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.due >= due_list[1],
-                                            Workspace.area == drvd_area)))
-            elif due_list[0] == "lt":
-                innrqr_due = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.due < due_list[1],
-                                            Workspace.area == drvd_area)))
-            elif due_list[0] == "le":
-                innrqr_due = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.due <= due_list[1],
-                                            Workspace.area == drvd_area)))
-            elif due_list[0] == "bt":
-                innrqr_due = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                                        .join(max_ver_sqr,
-                                        and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
-                                            Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
-                                        .filter(and_(Workspace.due
-                                                        >= due_list[1],
-                                                    Workspace.due
-                                                        <= due_list[2],
-                                                    Workspace.area
-                                                        == drvd_area)))
-            else:
-                #No valid due filter, so any task that has a due date
-                innrqr_due = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
-                                            Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.due != None,
-                                                Workspace.area == drvd_area)))
-            innrqr_list.append(innrqr_due)
-        if hide_list is not None and hide_list[0] is not None:
-            """
-            Query to get a list of uuid and version for tasks which meet
-            the hide date filters provided
-            """
-            LOGGER.debug("Inside hdie filter with below params")
-            LOGGER.debug(hide_list)
-            if hide_list[0] == "eq":
-                #If tag is provided search by tag
-                innrqr_hide = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.hide == hide_list[1],
-                                            Workspace.area == drvd_area)))
-            elif hide_list[0] == "gt":
-                innrqr_hide = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.hide > hide_list[1],
-                                            Workspace.area == drvd_area)))
-            elif hide_list[0] == "ge":
-                innrqr_hide = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.hide >= hide_list[1],
-                                            Workspace.area == drvd_area)))
-            elif hide_list[0] == "lt":
-                innrqr_hide = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.hide < hide_list[1],
-                                            Workspace.area == drvd_area)))
-            elif hide_list[0] == "le":
-                innrqr_hide = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                            .join(max_ver_sqr,
-                                and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.hide <= hide_list[1],
-                                            Workspace.area == drvd_area)))
-            elif hide_list[0] == "bt":
-                innrqr_hide = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                                        .join(max_ver_sqr,
-                                        and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
-                                            Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
-                                        .filter(and_(Workspace.hide
-                                                        >= hide_list[1],
-                                                    Workspace.hide
-                                                        <= hide_list[2],
-                                                    Workspace.area
-                                                        == drvd_area)))
-            else:
-                #No valid hide filter, so any task that has a hide date
-                innrqr_hide = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
-                                            Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.hide != None,
-                                                Workspace.area == drvd_area)))
-            innrqr_list.append(innrqr_hide)
-        if end_list is not None and end_list[0] is not None:
+        filter_list = get_filter_conditions(potential_filters, drvd_area,
+                                            curr_date)
+        if not filter_list:
+            #If no filter has been compiled check if the HL area filters for
+            #done or bin are provided
+            if done_task is None and bin_task is None:
+                #No valid filters, so return None
+                return None
             """
-            Query to get a list of uuid and version for tasks which meet
-            the recur end date filters provided
+            If no modifiers provided and if done or bin filters provided
+            then create a default query for all tasks from completed  or
+            bin area
             """
-            LOGGER.debug("Inside recur end filter with below params")
-            LOGGER.debug(end_list)
-            if end_list[0] == "eq":
-                #If tag is provided search by tag
-                innrqr_end = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                                        .join(max_ver_sqr,
-                                            and_(Workspace.version ==
-                                                    max_ver_sqr.c.maxver,
-                                                Workspace.uuid ==
-                                                    max_ver_sqr.c.uuid))
-                                        .filter(and_(Workspace.recur_end
-                                                        == end_list[1],
-                                                        Workspace.area
-                                                        == drvd_area)))
-            elif end_list[0] == "gt":
-                innrqr_end = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                                    .join(max_ver_sqr,
-                                        and_(Workspace.version ==
-                                                max_ver_sqr.c.maxver,
-                                                Workspace.uuid ==
-                                                max_ver_sqr.c.uuid))
-                                    .filter(and_(and_(Workspace.recur_end
-                                                        > end_list[1],
-                                                        Workspace.area
-                                                        == drvd_area))))
-            elif end_list[0] == "ge":
-                innrqr_end = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                                    .join(max_ver_sqr,
-                                        and_(Workspace.version ==
-                                                max_ver_sqr.c.maxver,
-                                                Workspace.uuid ==
-                                                max_ver_sqr.c.uuid))
-                                    .filter(and_(Workspace.recur_end
-                                                    >= end_list[1],
-                                                    Workspace.area
-                                                    == drvd_area)))
-            elif end_list[0] == "lt":
-                innrqr_end = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                                    .join(max_ver_sqr,
-                                        and_(Workspace.version ==
-                                                max_ver_sqr.c.maxver,
-                                                Workspace.uuid ==
-                                                max_ver_sqr.c.uuid))
-                                    .filter(and_(Workspace.recur_end
-                                                    < end_list[1],
-                                                    Workspace.area
-                                                    == drvd_area)))
-            elif end_list[0] == "le":
-                innrqr_end = (db.SESSION.query(Workspace.uuid,
-                                        Workspace.version)
-                                    .join(max_ver_sqr,
-                                        and_(Workspace.version ==
-                                                max_ver_sqr.c.maxver,
-                                                Workspace.uuid ==
-                                                max_ver_sqr.c.uuid))
-                                    .filter(and_(Workspace.recur_end
-                                                    <= end_list[1],
-                                                    Workspace.area
-                                                    == drvd_area)))
-            elif end_list[0] == "bt":
-                innrqr_end = (db.SESSION.query(Workspace.uuid,
-                                                    Workspace.version)
-                                        .join(max_ver_sqr,
-                                        and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
-                                            Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
-                                        .filter(and_(Workspace.recur_end
-                                                    >= end_list[1],
-                                                Workspace.recur_end
-                                                    <= end_list[2],
-                                                Workspace.area
-                                                    == drvd_area)))
-            else:
-                #No valid recur end filter, so any task that has a
-                #recur end date
-                innrqr_end = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
-                                            Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.recur_end != None,
-                                                Workspace.area == drvd_area)))
-            innrqr_list.append(innrqr_end)
+            LOGGER.debug("Inside default filter")
+            filter_list = [Workspace.area == drvd_area]
         """
-        Look for modifiers that work in the pending area
+        Modifiers which work only in the pending area look up the latest
+        versions in the pending area, the rest use the derived area.
         """
-        LOGGER.debug("Status for OVERDUE {}, TODAY {}, HIDDEN {}, STARTED{}"
-                    .format(overdue_task, today_task, hidden_task,
-                            started_task))
-        if overdue_task is not None:
-            LOGGER.debug("Inside overdue filter")
-            innrqr_overdue = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
-                                            Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.area ==
-                                            WS_AREA_PENDING,
-                                            Workspace.due < curr_date,
-                                            or_(Workspace.hide <=
-                                                curr_date,
-                                                Workspace.hide ==
-                                                None))))
-            innrqr_list.append(innrqr_overdue)
-        if today_task is not None:
-            LOGGER.debug("Inside today filter")
-            innrqr_today = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                            .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(and_(Workspace.area ==
-                                            WS_AREA_PENDING,
-                                            Workspace.due == curr_date,
-                                            or_(Workspace.hide <=
-                                                curr_date,
-                                                Workspace.hide ==
-                                                None))))
-            innrqr_list.append(innrqr_today)
-        if hidden_task is not None:
-            LOGGER.debug("Inside hidden filter")
-            innrqr_hidden = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
-                                        Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.area ==
-                                            WS_AREA_PENDING,
-                                            and_(Workspace.hide >
-                                                curr_date,
-                                                Workspace.hide !=
-                                                None))))
-            innrqr_list.append(innrqr_hidden)
-        if started_task is not None:
-            LOGGER.debug("Inside started filter")
-            innrqr_started = (db.SESSION.query(Workspace.uuid,
-                                            Workspace.version)
-                                .join(max_ver_sqr,
+        if (overdue_task is not None or today_task is not None
+                or hidden_task is not None or started_task is not None):
+            filter_ver_sqr = pend_ver_sqr
+        else:
+            filter_ver_sqr = max_ver_sqr
+        innrqr_filters = (db.SESSION.query(Workspace.uuid, Workspace.version)
+                            .join(filter_ver_sqr,
                                     and_(Workspace.version ==
-                                            max_ver_sqr.c.maxver,
-                                            Workspace.uuid ==
-                                            max_ver_sqr.c.uuid))
-                                .filter(and_(Workspace.area ==
-                                            WS_AREA_PENDING,
-                                            Workspace.status ==
-                                            TASK_STATUS_STARTED
-                                            )))
-            innrqr_list.append(innrqr_started)
-        if not innrqr_list:
-            #If no query has been created check if the HL area filters for
-            #done or bin are provided
-            if done_task is not None or bin_task is not None:
-                """
-                If no modifiers provided and if done or bin filters provided
-                then create a default query for all tasks from completed  or
-                bin area
-                """
-                LOGGER.debug("Inside default filter")
-                innrqr_all = (db.SESSION.query(Workspace.uuid, Workspace.version)
-                            .join(max_ver_sqr,
-                                    and_(Workspace.version ==
-                                        max_ver_sqr.c.maxver,
+                                        filter_ver_sqr.c.maxver,
                                         Workspace.uuid ==
-                                        max_ver_sqr.c.uuid))
-                            .filter(Workspace.area == drvd_area))
-                innrqr_list.append(innrqr_all)
-            else:
-                #No valid filters, so return None
-                return None
+                                        filter_ver_sqr.c.uuid))
+                            .filter(and_(*filter_list)))
+        innrqr_list.append(innrqr_filters)
+    return innrqr_list[0]
+
+
+def get_task_uuid_n_ver(potential_filters):
+    """
+    Return task UUID and version by applying filters on tasks. Refer
+    get_task_uuid_n_ver_qr for the filters.
+
+    Parameters:
+        potential_filters(dict): Dictionary with the various types of
+                                 filters
+
+    Returns:
+        list: List of tuples of (task UUID,Version) or None if there
+              is an exception or no results found
+    """
+    uuid_ver_qr = get_task_uuid_n_ver_qr(potential_filters)
+    if uuid_ver_qr is None:
+        return None
     try:
-        firstqr = innrqr_list.pop(0)
         # Returns Tuple of rows, UUID,Version
-        results = firstqr.intersect(*innrqr_list).all()
+        results = uuid_ver_qr.all()
     except (SQLAlchemyError) as e:
         LOGGER.error(str(e))
         return None
@@ -808,86 +648,259 @@ def get_task_uuid_n_ver(potential_filters):
         return results
 
 
-def get_all_groups():
-    """Returns distinct non-null group names from pending and done areas."""
+def get_latest_mismatches():
+    """
+    Returns the UUIDs of tasks for which the 'workspace_latest' table does
+    not agree with the latest version of the task in the 'workspace' table.
+    This includes tasks missing from either of the tables.
+
+    Parameters:
+        None
+
+    Returns:
+        list: Sorted list of mismatched task UUIDs or None if there is an
+              exception
+    """
     try:
-        max_ver_sqr = (db.SESSION.query(
-            Workspace.uuid,
-            func.max(Workspace.version).label("maxver"))
-            .group_by(Workspace.uuid)
-            .subquery())
-        results = (db.SESSION.query(distinct(Workspace.groups))
-                   .join(max_ver_sqr,
-                         and_(Workspace.version == max_ver_sqr.c.maxver,
-                              Workspace.uuid == max_ver_sqr.c.uuid))
-                   .filter(and_(Workspace.area.in_(
-                                    [WS_AREA_PENDING, WS_AREA_COMPLETED]),
-                                Workspace.groups.isnot(None)))
+        max_ver_sqr = (db.SESSION.query(Workspace.uuid,
+                                        func.max(Workspace.version)
+                                        .label("maxver"))
+                       .group_by(Workspace.uuid).subquery())
+        expected = (db.SESSION.query(Workspace.uuid, Workspace.version,
+                                     Workspace.id, Workspace.area,
+                                     Workspace.task_type)
+                    .join(max_ver_sqr,
+                          and_(Workspace.uuid == max_ver_sqr.c.uuid,
+                               Workspace.version == max_ver_sqr.c.maxver))
+                    .all())
+        actual = (db.SESSION.query(WorkspaceLatest.uuid,
+                                   WorkspaceLatest.version,
+                                   WorkspaceLatest.id, WorkspaceLatest.area,
+                                   WorkspaceLatest.task_type)
+                  .all())
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return None
+    diff = set(map(tuple, expected)) ^ set(map(tuple, actual))
+    return sorted(set(row[0] for row in diff))
+
+
+def get_task_ids_in_use():
+    """
+    Returns the task IDs in use by the normal and derived tasks in the
+    pending area.
+
+    Parameters:
+        None
+
+    Returns:
+        set: The task IDs or None if there is an exception
+    """
+    try:
+        results = (db.SESSION.query(WorkspaceLatest.id)
+                   .filter(and_(WorkspaceLatest.area == WS_AREA_PENDING,
+                                WorkspaceLatest.id != '-',
+                                WorkspaceLatest.task_type
+                                    .in_([TASK_TYPE_NRML, TASK_TYPE_DRVD])))
                    .all())
-        return [r[0] for r in results if r[0]]
-    except SQLAlchemyError:
-        return []
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return None
+    return set(row[0] for row in results)
 
 
-def get_all_contexts():
-    """Returns list of distinct non-null context names from pending area."""
+def get_free_id_mismatches():
+    """
+    Returns the task IDs for which the 'workspace_free_ids' table does not
+    agree with the task IDs in use. These are IDs in use which are in the
+    table and free IDs below the table's largest ID which are missing from
+    it. The largest ID needs to be above all IDs in use as well.
+
+    Parameters:
+        None
+
+    Returns:
+        list: Sorted list of mismatched task IDs or None if there is an
+              exception
+    """
+    used = get_task_ids_in_use()
+    if used is None:
+        return None
+    try:
+        free = set(row[0] for row in
+                   db.SESSION.query(WorkspaceFreeIds.id).all())
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return None
+    top = max(max(free, default=0), max(used, default=0) + 1)
+    expected = set(range(1, top + 1)) - used
+    return sorted(expected ^ free)
+
+
+def get_events(since=None, count=None):
+    """
+    Returns the task versions added by the events in the events journal,
+    latest event first. The events are read from the journal's primary key,
+    a date is a range on it as the event IDs begin with the time of the
+    event.
+
+    Parameters:
+        since(str): Date as YYYY-MM-DD from which to return the events.
+                    Default is None for all events
+        count(int): Number of latest events to return. Default is None for
+                    all events
+
+    Returns:
+        list: Rows with the event ID, time, operation, UUID and version and
+              the task ID and description of the version, which are None if
+              the version is archived. None if there is an exception
+    """
+    evt_filter = []
+    if since is not None:
+        evt_filter.append(WorkspaceEvents.event_id >= since.replace("-", ""))
+    if count is not None:
+        latest_evt_sqr = (select(WorkspaceEvents.event_id)
+                          .where(*evt_filter)
+                          .distinct()
+                          .order_by(WorkspaceEvents.event_id.desc())
+                          .limit(count)
+                          .subquery())
+        evt_filter.append(WorkspaceEvents.event_id
+                          .in_(select(latest_evt_sqr.c.event_id)))
     try:
-        max_ver_sqr = (db.SESSION.query(
-            Workspace.uuid,
-            func.max(Workspace.version).label("maxver"))
-            .group_by(Workspace.uuid)
-            .subquery())
-        results = (db.SESSION.query(distinct(Workspace.context))
-                   .join(max_ver_sqr,
-                         and_(Workspace.version == max_ver_sqr.c.maxver,
-                              Workspace.uuid == max_ver_sqr.c.uuid))
-                   .filter(and_(Workspace.area == WS_AREA_PENDING,
-                                Workspace.context.isnot(None)))
+        results = (db.SESSION.query(WorkspaceEvents.event_id,
+                                    WorkspaceEvents.created,
+                                    WorkspaceEvents.operation,
+                                    WorkspaceEvents.uuid,
+                                    WorkspaceEvents.version,
+                                    Workspace.id, Workspace.description)
+                   .outerjoin(Workspace,
+                              and_(Workspace.uuid == WorkspaceEvents.uuid,
+                                   Workspace.version
+                                    == WorkspaceEvents.version))
+                   .filter(*evt_filter)
+                   .order_by(WorkspaceEvents.event_id.desc(),
+                             WorkspaceEvents.uuid, WorkspaceEvents.version)
                    .all())
-        return [r[0] for r in results if r[0]]
-    except SQLAlchemyError:
-        return []
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return None
+    return results
 
 
-def get_all_tags():
-    """Returns distinct tag names from pending and done areas."""
+def get_group_counts(uuid_version):
+    """
+    Returns the count of tasks by group, context and status for a list of
+    task UUIDs and versions. Tasks are counted in their group and in each of
+    its parents, so the counts are rolled up through the group hierarchy.
+    Tasks without a group are counted under '+NONE' and tasks without a
+    context under '@NONE'.
+
+    Parameters:
+        uuid_version(list): List of tuples of uuid and versions
+
+    Returns:
+        list: List of tuples of group, context, status and count or None if
+              there is an exception
+    """
+    context_xpr = func.coalesce(Workspace.context, "@NONE")
+    group_xpr = func.coalesce(WorkspaceGroups.path, "+NONE")
     try:
-        max_ver_sqr = (db.SESSION.query(
-            Workspace.uuid,
-            func.max(Workspace.version).label("maxver"))
-            .group_by(Workspace.uuid)
-            .subquery())
-        results = (db.SESSION.query(distinct(WorkspaceTags.tags))
-                   .join(Workspace, and_(
-                       WorkspaceTags.uuid == Workspace.uuid,
-                       WorkspaceTags.version == Workspace.version))
-                   .join(max_ver_sqr,
-                         and_(Workspace.version == max_ver_sqr.c.maxver,
-                              Workspace.uuid == max_ver_sqr.c.uuid))
-                   .filter(Workspace.area.in_(
-                               [WS_AREA_PENDING, WS_AREA_COMPLETED]))
+        results = (db.SESSION.query(group_xpr, context_xpr, Workspace.status,
+                                    func.count(Workspace.uuid))
+                   .outerjoin(WorkspaceGroups,
+                              WorkspaceGroups.uuid == Workspace.uuid)
+                   .filter(tuple_(Workspace.uuid, Workspace.version)
+                           .in_(uuid_version))
+                   .group_by(group_xpr, context_xpr, Workspace.status)
                    .all())
-        return [r[0] for r in results if r[0]]
-    except SQLAlchemyError:
-        return []
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return None
+    return [tuple(row) for row in results]
+
+
+def get_vocabulary(session=None):
+    """
+    Returns the values offered by the TUI completions, in a single query.
+    These are the groups, including the parent groups, and the tags of the
+    tasks in the pending and completed areas, and the contexts and IDs of
+    the tasks in the pending area.
+
+    Parameters:
+        session(Session): Session to run the query on, for ex. from a
+                          background thread. Default is the global session
+
+    Returns:
+        dict: Sorted lists of the 'groups', 'contexts', 'tags' and 'ids' or
+              None if there is an exception
+    """
+    if session is None:
+        session = db.SESSION
+    curr_areas = [WS_AREA_PENDING, WS_AREA_COMPLETED]
+    groups_qr = (select(literal("groups"),
+                        WorkspaceGroups.path.collate("BINARY"))
+                 .join(WorkspaceLatest,
+                       WorkspaceLatest.uuid == WorkspaceGroups.uuid)
+                 .where(WorkspaceLatest.area.in_(curr_areas)))
+    contexts_qr = (select(literal("contexts"),
+                          Workspace.context.collate("BINARY"))
+                   .join(WorkspaceLatest,
+                         and_(Workspace.uuid == WorkspaceLatest.uuid,
+                              Workspace.version == WorkspaceLatest.version))
+                   .where(WorkspaceLatest.area == WS_AREA_PENDING,
+                          Workspace.context.isnot(None)))
+    tags_qr = (select(literal("tags"),
+                      WorkspaceTags.tags.collate("BINARY"))
+               .join(WorkspaceLatest,
+                     and_(WorkspaceTags.uuid == WorkspaceLatest.uuid,
+                          WorkspaceTags.version == WorkspaceLatest.version))
+               .where(WorkspaceLatest.area.in_(curr_areas)))
+    ids_qr = (select(literal("ids"), WorkspaceLatest.id)
+              .where(WorkspaceLatest.area == WS_AREA_PENDING,
+                     WorkspaceLatest.id.isnot(None)))
+    try:
+        # UNION also removes the duplicate values. It compares them with the
+        # collation of the first query's column, so the text values are
+        # BINARY to keep the ones which only differ in case, as the tag
+        # filter does
+        results = session.execute(union(groups_qr, contexts_qr, tags_qr,
+                                        ids_qr)).all()
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return None
+    vocabulary = {"groups": [], "contexts": [], "tags": [], "ids": []}
+    for kind, value in results:
+        if value:
+            vocabulary[kind].append(str(value))
+    for kind in ("groups", "contexts", "tags"):
+        vocabulary[kind].sort(key=str.lower)
+    # Only the numeric IDs can be used in the ID filter
+    vocabulary["ids"] = sorted((task_id for task_id in vocabulary["ids"]
+                                if task_id.isdigit()), key=int)
+    return vocabulary
+
+
+def get_all_groups():
+    """Returns distinct group names from pending and done areas, including
+    every parent group in the hierarchy, sorted by name."""
+    vocabulary = get_vocabulary()
+    return vocabulary["groups"] if vocabulary is not None else []
+
+
+def get_all_contexts():
+    """Returns list of distinct non-null context names from pending area."""
+    vocabulary = get_vocabulary()
+    return vocabulary["contexts"] if vocabulary is not None else []
+
+
+def get_all_tags():
+    """Returns distinct tag names from pending and done areas."""
+    vocabulary = get_vocabulary()
+    return vocabulary["tags"] if vocabulary is not None else []
 
 
 def get_all_ids():
     """Returns list of current task IDs from pending area."""
-    try:
-        max_ver_sqr = (db.SESSION.query(
-            Workspace.uuid,
-            func.max(Workspace.version).label("maxver"))
-            .group_by(Workspace.uuid)
-            .subquery())
-        results = (db.SESSION.query(Workspace.id)
-                   .join(max_ver_sqr,
-                         and_(Workspace.version == max_ver_sqr.c.maxver,
-                              Workspace.uuid == max_ver_sqr.c.uuid))
-                   .filter(and_(Workspace.area == WS_AREA_PENDING,
-                                Workspace.id.isnot(None)))
-                   .order_by(cast(Workspace.id, Numeric))
-                   .all())
-        return [str(r[0]) for r in results if r[0]]
-    except SQLAlchemyError:
-        return []
+    vocabulary = get_vocabulary()
+    return vocabulary["ids"] if vocabulary is not None else []
@@ -0,0 +1,205 @@
+"""Server mode for myt.
+
+Keeps the database engine, session and caches warm in a long lived process
+which listens on a Unix socket. Commands are received from the thin client in
+src.mytcli.client, run through the TUIDispatcher and the captured output is
+sent back to the client.
+
+Protocol, one JSON object per line in each direction:
+    request:  {"argv": ["view", "overdue"], "width": 120}
+    response: {"code": 0, "output": "..."}
+"""
+
+import os
+import json
+import shlex
+import socket
+import socketserver
+from pathlib import Path
+
+from sqlalchemy.exc import SQLAlchemyError
+
+import src.mytcli.constants as constants
+from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
+                                  DEFAULT_FOLDER, DEFAULT_DB_NAME,
+                                  DEFAULT_SOCKET)
+import src.mytcli.db as db
+from src.mytcli.dispatcher import TUIDispatcher
+
+# Commands which cannot be run through the server
+SERVER_EXCLUDED = {"serve"}
+# Options to provide the database path
+DB_PATH_OPTIONS = {"-db", "--full-db-path"}
+
+
+def get_db_path_arg(argv):
+    """
+    Returns the database path provided in the command arguments.
+
+    Parameters:
+        argv(list): The command arguments
+
+    Returns:
+        str: The database path or None if not provided
+    """
+    for idx, arg in enumerate(argv):
+        if arg in DB_PATH_OPTIONS and idx + 1 < len(argv):
+            return argv[idx + 1]
+        if arg.startswith("--full-db-path="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def decline_prompt(message, choices, default):
+    """
+    Answers the prompts of the commands run through the server, which cannot
+    ask the client. The prompt is declined with its default, for ex. 'none'
+    or 'no', as a command run with 'myt' does when no choice is made.
+
+    Parameters:
+        message(str): The prompt
+        choices(list): The choices for the prompt
+        default(str): The default choice
+
+    Returns:
+        str: The default choice
+    """
+    CONSOLE.print("{} → Declined with '{}' as prompts cannot be answered "
+                  "through the server. Run the command with 'myt' to answer "
+                  "it.".format(message, default))
+    return default
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads a request line and writes back the response line."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"code": FAILURE,
+                        "output": "Invalid request: {}\n".format(str(e))}
+        else:
+            response = self.server.myt_server.handle(request)
+        self.wfile.write((json.dumps(response) + "\n").encode())
+
+
+class MytServer:
+    """Runs myt commands received on a Unix socket against a warm session."""
+
+    def __init__(self, socket_path=None, full_db_path=None):
+        self._socket_path = socket_path or DEFAULT_SOCKET
+        self._db_path = full_db_path or os.path.join(DEFAULT_FOLDER,
+                                                     DEFAULT_DB_NAME)
+        self._dispatcher = None
+        self._server = None
+
+    @property
+    def socket_path(self):
+        return self._socket_path
+
+    def handle(self, request):
+        """Runs a single request and returns the response.
+
+        Args:
+            request: Dictionary with the command arguments in 'argv' and
+                     optionally the terminal width in 'width'.
+
+        Returns:
+            Dictionary with the exit 'code' and the captured 'output'.
+        """
+        argv = request.get("argv") or []
+        if not argv:
+            return {"code": FAILURE, "output": "No command provided.\n"}
+        if argv[0] in SERVER_EXCLUDED:
+            return {"code": FAILURE,
+                    "output": "'{}' cannot be run through the server.\n"
+                              .format(argv[0])}
+        db_path = get_db_path_arg(argv)
+        if db_path is not None and db_path != self._db_path:
+            return {"code": FAILURE,
+                    "output": "Server is running for the database at {}.\n"
+                              .format(self._db_path)}
+        try:
+            # The server may run across days, so check on every request
+            if db.create_recur_inst_if_due() == FAILURE:
+                return {"code": FAILURE,
+                        "output": "Error in creating recurring tasks.\n"}
+            db.SESSION.commit()
+            code, output, _ = self._dispatcher.dispatch(
+                shlex.join(argv), width_override=request.get("width"))
+        except SQLAlchemyError as e:
+            LOGGER.error(str(e))
+            return {"code": FAILURE, "output": "Error: {}\n".format(str(e))}
+        finally:
+            # Discard any changes not committed by a failed command, as the
+            # end of the process would for a command run from the shell
+            db.SESSION.rollback()
+        return {"code": code, "output": output}
+
+    def _check_socket(self):
+        """Removes a stale socket file. Fails if a server is using it."""
+        if not os.path.exists(self._socket_path):
+            return SUCCESS
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self._socket_path)
+        except OSError:
+            os.unlink(self._socket_path)
+            return SUCCESS
+        finally:
+            sock.close()
+        LOGGER.error("A server is already running on {}"
+                     .format(self._socket_path))
+        return FAILURE
+
+    def start(self):
+        """Connects to the database and binds the socket.
+
+        Returns:
+            SUCCESS(0) or FAILURE(1)
+        """
+        if db.connect_to_tasksdb(full_db_path=self._db_path) == FAILURE:
+            return FAILURE
+        # Reuse the TUI's handling of a long lived session and prompts
+        constants.TUI_MODE = True
+        constants.TUI_PROMPT_CALLBACK = decline_prompt
+        # Lazy import to avoid circular dependency
+        from src.mytcli.myt import myt as myt_group
+        self._dispatcher = TUIDispatcher(myt_group)
+        if self._check_socket() == FAILURE:
+            return FAILURE
+        Path(os.path.dirname(self._socket_path)).mkdir(parents=True,
+                                                       exist_ok=True)
+        self._server = socketserver.UnixStreamServer(self._socket_path,
+                                                     _RequestHandler)
+        self._server.myt_server = self
+        return SUCCESS
+
+    def serve_forever(self):
+        """Serves requests, one at a time, till stopped."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def stop(self):
+        """Stops serving requests. To be called from another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self):
+        """Releases the socket and the database resources."""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+        db.discard_db_resources()
+        constants.TUI_MODE = False
+        constants.TUI_PROMPT_CALLBACK = None
@@ -2,11 +2,14 @@
 
 import asyncio
 import os
+import queue
 import re
 import subprocess
 import tempfile
 import threading
-from datetime import datetime
+import time
+from datetime import datetime, date
+from functools import partial
 from pathlib import Path
 
 from prompt_toolkit import Application
@@ -18,16 +21,19 @@ from prompt_toolkit.layout.containers import (
 from prompt_toolkit.layout.controls import FormattedTextControl, BufferControl
 from prompt_toolkit.layout.layout import Layout
 from prompt_toolkit.layout.menus import CompletionsMenu
-from prompt_toolkit.formatted_text import ANSI
+from prompt_toolkit.formatted_text import ANSI, to_formatted_text
+from prompt_toolkit.formatted_text.utils import split_lines
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.application import run_in_terminal
 from prompt_toolkit.history import FileHistory
 from prompt_toolkit.widgets import SearchToolbar
 
 import src.mytcli.constants as constants
-from src.mytcli.constants import (LOGGER, HISTORY_FILE, REFRESH_INTERVAL,
-                                  SUCCESS)
-from src.mytcli.db import connect_to_tasksdb
+from src.mytcli.constants import (LOGGER, HISTORY_FILE, CHANGE_POLL_INTERVAL,
+                                  SPINNER_INTERVAL, SUCCESS)
+import src.mytcli.db as db
+from src.mytcli.db import (connect_to_tasksdb, get_data_version,
+                           cancel_queries, clear_cancel)
 from src.mytcli.dispatcher import TUIDispatcher, MUTATION_COMMANDS, PROMPT_COMMANDS
 from src.mytcli.completer import MytCompleter
 
@@ -37,9 +43,16 @@ class MytTUI:
 
     def __init__(self):
         self._display_text = ""
+        # Display text parsed into fragments once, with the index of the
+        # first fragment of each line
+        self._display_fragments = []
+        self._line_offsets = []
         self._filter_args = []
         self._last_command = None  # last command that produced the display
         self._last_refresh = None
+        # Data version and date the display was last rendered for
+        self._data_version = None
+        self._data_date = None
         self._status_message = ""
         self._completer = MytCompleter()
         self._dispatcher = None
@@ -48,7 +61,12 @@ class MytTUI:
         self._input_window = None
         self._table_focused = False
         self._selected_row = 0
-        self._data_row_indices = []
+        # Rows of the task table displayed, from the view's output
+        self._rows = []
+        # Window of the default view on the screen, the total rows in the
+        # view are known once it is rendered
+        self._view_offset = 0
+        self._view_total = None
         # Dialog state
         self._dialog_visible = False
         self._dialog_float = None
@@ -57,13 +75,21 @@ class MytTUI:
         self._dialog_selected = 0
         self._prompt_event = threading.Event()
         self._prompt_result = None
-        self._dispatching = False
+        # Commands run one at a time on a worker thread as the global
+        # session is not thread safe. The sequence number of the latest
+        # command, results of older ones are dropped.
+        self._jobs = None
+        self._worker_id = None
+        self._command_seq = 0
+        self._running = None
+        self._spinning = False
+        self._task_counts = (None, None)
         # Notification popup state (F8)
         self._notification_visible = False
         self._notification_float = None
 
     def _get_task_counts(self):
-        """Get pending task counts for the toolbar."""
+        """Get pending task counts for the toolbar, on the worker thread."""
         try:
             from sqlalchemy import and_, func, distinct, case
             from src.mytcli.models import Workspace
@@ -76,10 +102,8 @@ class MytTUI:
                                     Workspace.hide != None),
                                "HIDDEN"), else_="VISIBLE")
                          .label("VISIBILITY"))
-            max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                            func.max(Workspace.version)
-                                            .label("maxver"))
-                           .group_by(Workspace.uuid).subquery())
+            from src.mytcli.queries import get_max_ver_sqr
+            max_ver_sqr = get_max_ver_sqr()
             results = (db.SESSION.query(visib_xpr,
                                         func.count(distinct(Workspace.uuid))
                                         .label("CNT"))
@@ -105,7 +129,7 @@ class MytTUI:
     def _get_toolbar_text(self):
         filter_str = " ".join(self._filter_args) if self._filter_args else "(none)"
         refresh_str = self._last_refresh or "--:--:--"
-        total, hidden = self._get_task_counts()
+        total, hidden = self._task_counts
         counts = ""
         if total is not None:
             displayed = constants.TUI_DISPLAYED_COUNT
@@ -115,11 +139,24 @@ class MytTUI:
             else:
                 counts = " | Pending: {} | Hidden: {}".format(total, hidden)
         status = ""
-        if self._status_message:
+        if self._running is not None:
+            elapsed = time.monotonic() - self._running["started"]
+            status = "  |  {} {} {:.1f}s".format(
+                self._SPINNER[int(elapsed / SPINNER_INTERVAL)
+                              % len(self._SPINNER)],
+                self._running["label"], elapsed)
+            if self._running["cancellable"]:
+                status += "  [Ctrl-C] cancel"
+        elif self._status_message:
             status = "  |  " + self._status_message + "  [F8]"
         nav = ""
+        if self._view_total and self._rows and (
+                self._view_offset or len(self._rows) < self._view_total):
+            nav += " | Rows: {}-{} of {} [PgUp/PgDn]".format(
+                self._view_offset + 1, self._view_offset + len(self._rows),
+                self._view_total)
         if self._table_focused:
-            nav = " | [F5] TABLE NAV"
+            nav += " | [F5] TABLE NAV"
         if constants.COMPACT_VIEW:
             nav += " | [F7] COMPACT"
         return [
@@ -127,65 +164,41 @@ class MytTUI:
                 filter_str, refresh_str, counts, status, nav)),
         ]
 
-    def _parse_data_rows(self):
-        """Identify line indices in display text that are data rows."""
-        if not self._display_text:
-            self._data_row_indices = []
-            return
-        lines = self._display_text.split("\n")
-        indices = []
-        # Strip ANSI to inspect content
-        ansi_re = re.compile(r"\x1b\[[0-9;]*m")
-        header_found = False
-        past_header_sep = False
-        in_data = False
-        id_col_end = 6  # fallback
-        for i, line in enumerate(lines):
-            plain = ansi_re.sub("", line).strip()
-            if not plain:
-                continue
-            is_separator = all(c in "─ " for c in plain)
-            if not header_found and not is_separator:
-                header_found = True
-                # Derive ID column width from the header line.
-                # The header has "id" (or "uuid") followed by spaces then
-                # the next column name like "description".  Everything up
-                # to that second column belongs to the ID column area.
-                plain_raw = ansi_re.sub("", line)
-                desc_pos = plain_raw.lower().find("desc")
-                if desc_pos > 0:
-                    id_col_end = desc_pos
-                continue
-            if header_found and not past_header_sep and is_separator:
-                past_header_sep = True
-                in_data = True
-                continue
-            if in_data:
-                if is_separator:
-                    # Closing separator — end of data rows
-                    break
-                # Only count lines that start a new task row (ID column has a digit).
-                # Wrapped continuation lines have blank space in the ID column area.
-                plain_raw = ansi_re.sub("", line)
-                if any(c.isdigit() for c in plain_raw[:id_col_end]):
-                    indices.append(i)
-        self._data_row_indices = indices
+    def _set_display_fragments(self, text):
+        """Parse the display text into fragments once per display."""
+        self._display_fragments = []
+        self._line_offsets = []
+        for line in split_lines(to_formatted_text(ANSI(text))):
+            if self._line_offsets:
+                self._display_fragments.append(("", "\n"))
+            self._line_offsets.append(len(self._display_fragments))
+            self._display_fragments.extend(line)
 
     def _get_display_text(self):
         if not self._display_text:
             return [("", "Type 'view' to see your tasks, or any myt command.\n"
                         "Tab: autocomplete | Ctrl-R: refresh | Ctrl-Q: quit\n"
                         "F6: open pager for scrolling (j/k/arrows/search)")]
-        if self._table_focused and self._data_row_indices:
-            lines = self._display_text.split("\n")
-            idx = self._data_row_indices[self._selected_row]
-            if idx < len(lines):
-                # Highlight with background color, re-applying after resets
-                hl = "\x1b[48;5;238m"
-                lines[idx] = hl + lines[idx].replace(
-                    "\x1b[0m", "\x1b[0m" + hl) + "\x1b[49m"
-            return ANSI("\n".join(lines))
-        return ANSI(self._display_text)
+        if self._table_focused and self._rows:
+            row = self._rows[self._selected_row]
+            if row["end"] < len(self._line_offsets):
+                # Highlight all the lines of the row with a background color
+                first = self._line_offsets[row["start"]]
+                if row["end"] + 1 < len(self._line_offsets):
+                    last = self._line_offsets[row["end"] + 1] - 1
+                else:
+                    last = len(self._display_fragments)
+                highlight = [(frag[0] + " bg:#444444", frag[1])
+                             for frag in self._display_fragments[first:last]]
+                return (self._display_fragments[:first] + highlight
+                        + self._display_fragments[last:])
+        return self._display_fragments
+
+    # Lines of the screen taken by the toolbar, the input, and the table's
+    # header and legend
+    _SCREEN_CHROME_LINES = 12
+
+    _SPINNER = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
 
     _NON_TABLE_FLAGS = frozenset({
         "--full", "--history", "--tags", "--groups",
@@ -197,19 +210,19 @@ class MytTUI:
         """True when the current view is the default table view."""
         return not any(f in self._NON_TABLE_FLAGS for f in self._filter_args)
 
-    def _update_display(self, text):
+    def _update_display(self, text, rows=None):
         self._display_text = text
         self._last_refresh = datetime.now().strftime("%H:%M:%S")
-        self._parse_data_rows()
+        self._set_display_fragments(text)
+        self._rows = rows or []
         # Disable table nav and compact mode for non-table views
         if not self._is_table_view:
             self._table_focused = False
             if constants.COMPACT_VIEW:
                 constants.COMPACT_VIEW = False
         # Clamp selected row to valid range
-        if self._data_row_indices:
-            self._selected_row = min(self._selected_row,
-                                     len(self._data_row_indices) - 1)
+        if self._rows:
+            self._selected_row = min(self._selected_row, len(self._rows) - 1)
         else:
             self._selected_row = 0
         if self._app:
@@ -222,27 +235,214 @@ class MytTUI:
         except OSError:
             return 120
 
+    def _get_page_size(self):
+        """Number of task rows which fit on the screen."""
+        try:
+            lines = os.get_terminal_size().lines
+        except OSError:
+            lines = 60
+        return max(lines - self._SCREEN_CHROME_LINES, 5)
+
+    def _run_command(self, text):
+        """Dispatch a command, rendering only the window of the default
+        view which is on the screen. Runs on the worker thread.
+
+        Returns:
+            (exit_code, output_text, is_mutation, displayed_rows)
+        """
+        width = self._get_terminal_width()
+        page_size = self._get_page_size()
+        constants.TUI_VIEW_WINDOW = (self._view_offset, page_size)
+        try:
+            result = self._dispatcher.dispatch(text, width_override=width)
+            total = constants.TUI_VIEW_TOTAL
+            if total and self._view_offset >= total:
+                # Tasks were removed from the view, show its last page
+                self._view_offset = (total - 1) // page_size * page_size
+                constants.TUI_VIEW_WINDOW = (self._view_offset, page_size)
+                result = self._dispatcher.dispatch(text, width_override=width)
+                total = constants.TUI_VIEW_TOTAL
+        finally:
+            constants.TUI_VIEW_WINDOW = None
+        self._view_total = total
+        # Taken here as the next command resets them
+        return result + (constants.TUI_DISPLAYED_ROWS,)
+
+    def _start_worker(self):
+        """Start the thread which runs the commands."""
+        self._jobs = queue.Queue()
+        worker = threading.Thread(target=self._work, daemon=True,
+                                  name="myt-tui-worker")
+        worker.start()
+
+    def _work(self):
+        """Run the queued commands and post their results to the event
+        loop."""
+        self._worker_id = threading.get_ident()
+        while True:
+            seq, func, finish = self._jobs.get()
+            result = self._execute(func)
+            self._app.loop.call_soon_threadsafe(finish, seq, result)
+
+    def _execute(self, func):
+        """Run a command and refresh the task counts for the toolbar."""
+        thread_id = threading.get_ident()
+        clear_cancel(thread_id)
+        try:
+            result = func()
+        except Exception as e:
+            LOGGER.error("Command error: %s", e, exc_info=True)
+            result = (1, "Error: {}".format(e), False, None)
+        if thread_id in db.CANCELLED_THREADS:
+            # End the read transaction of the interrupted queries
+            clear_cancel(thread_id)
+            db.SESSION.rollback()
+        self._task_counts = self._get_task_counts()
+        return result
+
+    def _submit(self, label, func, on_result, cancellable=True):
+        """Run a command on the worker thread, the input stays responsive
+        while it runs. A running command which can be cancelled is
+        superseded, its queries are interrupted and its result dropped.
+        Before the TUI starts the command is run inline.
+
+        Parameters:
+            label(str): Shown with the spinner while the command runs
+            func(callable): Runs the command, returns its result
+            on_result(callable): Called on the event loop with the result
+            cancellable(bool): If the command can be cancelled. Commands
+                               which change the tasks can not be.
+        """
+        if self._running is not None and self._running["cancellable"]:
+            self._cancel_command(notify=False)
+        self._command_seq += 1
+        seq = self._command_seq
+        self._running = {"label": label, "cancellable": cancellable,
+                         "started": time.monotonic()}
+
+        def _finish(done_seq, result):
+            if done_seq != self._command_seq:
+                # Superseded by a newer command or cancelled
+                return
+            self._running = None
+            on_result(result)
+            if self._app:
+                self._app.invalidate()
+
+        if self._app is None or not self._app.is_running:
+            _finish(seq, self._execute(func))
+            return
+        self._jobs.put((seq, func, _finish))
+        if not self._spinning:
+            self._spinning = True
+            self._app.create_background_task(self._spin())
+
+    def _cancel_command(self, notify=True):
+        """Cancel the running command, interrupting its queries. The
+        worker is free once the command returns."""
+        if self._worker_id is not None:
+            cancel_queries(self._worker_id)
+        self._command_seq += 1
+        if notify:
+            self._status_message = "Cancelled: {}".format(
+                self._running["label"])
+        self._running = None
+
+    async def _spin(self):
+        """Redraw the spinner in the toolbar while a command runs."""
+        try:
+            while self._running is not None:
+                self._app.invalidate()
+                await asyncio.sleep(SPINNER_INTERVAL)
+        finally:
+            self._spinning = False
+            self._app.invalidate()
+
+    def _change_page(self, pages):
+        """Move the window of the view by a number of pages and render it.
+
+        Returns:
+            True if the window moved
+        """
+        if not self._last_command or not self._view_total:
+            return False
+        page_size = self._get_page_size()
+        offset = self._view_offset + pages * page_size
+        offset = min(max(offset, 0),
+                     (self._view_total - 1) // page_size * page_size)
+        if offset == self._view_offset:
+            return False
+        self._view_offset = offset
+        self._take_data_version()
+        self._submit(self._last_command,
+                     partial(self._run_command, self._last_command),
+                     lambda result: self._update_display(result[1],
+                                                         result[3]))
+        return True
+
+    def _take_data_version(self):
+        """Record the data version and date before rendering the display.
+
+        Taken before the command runs, so a change made while it runs is
+        picked up by the next check rather than missed.
+        """
+        self._data_version = get_data_version()
+        self._data_date = date.today()
+
+    def _has_changes(self):
+        """True if the tasks changed, in this or any other process, or the
+        day changed since the display was rendered."""
+        return (get_data_version() != self._data_version
+                or date.today() != self._data_date)
+
+    def _refresh_if_changed(self):
+        """Re-run the last command only if there are changes to show.
+
+        Returns:
+            True if the display was refreshed
+        """
+        if (not self._last_command or self._running is not None
+                or self._dialog_visible or not self._has_changes()):
+            return False
+        self._take_data_version()
+        self._submit(self._last_command,
+                     partial(self._run_command, self._last_command),
+                     lambda result: self._update_display(result[1],
+                                                         result[3]))
+        return True
+
     def _refresh_view(self):
         """Re-run the view command with saved filters."""
         filter_str = " ".join(self._filter_args)
         cmd = "view {}".format(filter_str) if filter_str else "view"
         self._last_command = cmd
-        width = self._get_terminal_width()
-        code, output, _ = self._dispatcher.dispatch(cmd, width_override=width)
-        self._update_display(output)
+        self._take_data_version()
+        self._submit(cmd, partial(self._run_command, cmd),
+                     lambda result: self._update_display(result[1],
+                                                         result[3]))
 
-    async def _open_pager(self):
+    def _open_pager(self):
         """Open current display content in a pager (less).
 
         Re-renders the last command at full 200-col width for the pager.
+        The render can not be cancelled, as new input would otherwise drop
+        it. If it is superseded anyway the pager is just not opened.
         """
+        if self._running is not None:
+            return
         if self._last_command:
-            code, pager_text, _ = self._dispatcher.dispatch(
-                self._last_command, width_override=200)
+            self._submit(self._last_command,
+                         partial(self._dispatcher.dispatch,
+                                 self._last_command, width_override=200),
+                         lambda result: self._app.create_background_task(
+                             self._show_in_pager(result[1])),
+                         cancellable=False)
         elif self._display_text:
-            pager_text = self._display_text
-        else:
-            return
+            self._app.create_background_task(
+                self._show_in_pager(self._display_text))
+
+    async def _show_in_pager(self, pager_text):
+        """Write the text to a temporary file and open it in the pager."""
         pager = os.environ.get("PAGER", "less")
         with tempfile.NamedTemporaryFile(mode="w", suffix=".txt",
                                          delete=False) as f:
@@ -264,8 +464,8 @@ class MytTUI:
         if not text:
             return
 
-        # Ignore input while a command is being dispatched in a thread
-        if self._dispatching:
+        # Ignore input while a change to the tasks is being made
+        if self._running is not None and not self._running["cancellable"]:
             return
 
         # Special exit commands
@@ -276,6 +476,8 @@ class MytTUI:
         # Special: clear
         if text == "clear":
             self._display_text = ""
+            self._set_display_fragments("")
+            self._rows = []
             self._status_message = ""
             if self._app:
                 self._app.invalidate()
@@ -283,50 +485,34 @@ class MytTUI:
 
         cmd_name = text.split()[0] if text.split() else ""
 
-        # Check if this command might need interactive prompts
-        if cmd_name in MUTATION_COMMANDS or cmd_name in PROMPT_COMMANDS:
-            self._dispatch_in_thread(text, cmd_name)
-        else:
-            self._dispatch_sync(text, cmd_name)
-
-    def _dispatch_sync(self, text, cmd_name):
-        """Dispatch a command synchronously (no dialog support needed)."""
-        width = self._get_terminal_width()
-        code, output, is_mutation = self._dispatcher.dispatch(text, width_override=width)
-        self._apply_result(text, cmd_name, output, is_mutation)
+        self._dispatch(text, cmd_name)
 
-    def _dispatch_in_thread(self, text, cmd_name):
-        """Dispatch a mutation command in a background thread.
+    def _dispatch(self, text, cmd_name):
+        """Dispatch a command typed in on the worker thread.
 
-        This allows the command to block on _tui_prompt_callback while the
-        main event loop keeps rendering (and showing dialogs).
+        Commands which change the tasks or can prompt are not cancelled, so
+        they can block on _tui_prompt_callback while the main event loop
+        keeps rendering (and showing dialogs).
         """
-        self._dispatching = True
-
-        def _run():
-            try:
-                width = self._get_terminal_width()
-                code, output, is_mutation = self._dispatcher.dispatch(
-                    text, width_override=width)
-            except Exception as e:
-                code, output, is_mutation = 1, "Error: {}".format(e), False
-
-            # Post the result back to the main loop
-            def _finish():
-                self._dispatching = False
-                self._apply_result(text, cmd_name, output, is_mutation)
-            self._app.loop.call_soon_threadsafe(_finish)
-
-        thread = threading.Thread(target=_run, daemon=True)
-        thread.start()
-
-    def _apply_result(self, text, cmd_name, output, is_mutation):
+        if text != self._last_command:
+            # A new command starts from the top of its view
+            self._view_offset = 0
+            self._selected_row = 0
+        self._take_data_version()
+        cancellable = (cmd_name not in MUTATION_COMMANDS
+                       and cmd_name not in PROMPT_COMMANDS)
+        self._submit(text, partial(self._run_command, text),
+                     lambda result: self._apply_result(text, cmd_name,
+                                                       *result[1:]),
+                     cancellable=cancellable)
+
+    def _apply_result(self, text, cmd_name, output, is_mutation, rows=None):
         """Apply command results to the display."""
         if cmd_name == "view":
             parts = text.split()[1:]
             self._filter_args = parts
             self._last_command = text
-            self._update_display(output)
+            self._update_display(output, rows)
             self._status_message = ""
         elif is_mutation:
             # Strip ANSI escapes — the toolbar renders plain text fragments
@@ -359,7 +545,7 @@ class MytTUI:
             self._app.invalidate()
         else:
             self._last_command = text
-            self._update_display(output)
+            self._update_display(output, rows)
 
     def _tui_prompt_callback(self, message, choices, default):
         """Called from operations code (in a worker thread) when user input is needed.
@@ -583,6 +769,11 @@ class MytTUI:
 
         @kb.add("c-c")
         def exit_cc(event):
+            """Ctrl-C: cancel the running command, else exit."""
+            if self._running is not None and self._running["cancellable"]:
+                self._cancel_command()
+                event.app.invalidate()
+                return
             event.app.exit()
 
         @kb.add("c-r")
@@ -634,9 +825,9 @@ class MytTUI:
         def toggle_table_focus(event):
             """F5: toggle table row navigation."""
             self._table_focused = not self._table_focused
-            if self._table_focused and self._data_row_indices:
+            if self._table_focused and self._rows:
                 self._selected_row = min(self._selected_row,
-                                         len(self._data_row_indices) - 1)
+                                         len(self._rows) - 1)
             event.app.invalidate()
 
         @kb.add("up", filter=Condition(lambda: self._table_focused
@@ -647,21 +838,40 @@ class MytTUI:
             if self._selected_row > 0:
                 self._selected_row -= 1
                 event.app.invalidate()
+            elif self._change_page(-1):
+                # Continue from the last row of the previous page
+                self._selected_row = max(len(self._rows) - 1, 0)
 
         @kb.add("down", filter=Condition(lambda: self._table_focused
                                          and not self._dialog_visible))
         @kb.add("j", filter=Condition(lambda: self._table_focused
                                       and not self._dialog_visible))
         def nav_down(event):
-            if (self._data_row_indices and
-                    self._selected_row < len(self._data_row_indices) - 1):
+            if (self._rows and
+                    self._selected_row < len(self._rows) - 1):
                 self._selected_row += 1
                 event.app.invalidate()
+            elif self._change_page(1):
+                self._selected_row = 0
+
+        @kb.add("pagedown", filter=Condition(lambda: self._is_table_view
+                                             and not self._dialog_visible))
+        def page_down(event):
+            """PgDn: render the next page of the view."""
+            if self._change_page(1):
+                self._selected_row = 0
+
+        @kb.add("pageup", filter=Condition(lambda: self._is_table_view
+                                           and not self._dialog_visible))
+        def page_up(event):
+            """PgUp: render the previous page of the view."""
+            if self._change_page(-1):
+                self._selected_row = 0
 
         @kb.add("f6")
-        async def open_pager(event):
+        def open_pager(event):
             """F6: open current display in pager for scrolling."""
-            await self._open_pager()
+            self._open_pager()
 
         @kb.add("f7", filter=Condition(lambda: bool(self._display_text)
                                        and self._is_table_view))
@@ -702,6 +912,8 @@ class MytTUI:
 
         from src.mytcli.myt import myt as myt_group
         self._dispatcher = TUIDispatcher(myt_group)
+        # Read the completions in the background while the view renders
+        self._completer.invalidate_cache()
 
         # Register the prompt callback so operations can show dialogs
         constants.TUI_PROMPT_CALLBACK = self._tui_prompt_callback
@@ -720,13 +932,20 @@ class MytTUI:
         )
 
         self._refresh_view()
+        self._start_worker()
         try:
             self._app.run()
         finally:
+            if self._running is not None and self._running["cancellable"]:
+                self._cancel_command(notify=False)
             constants.TUI_PROMPT_CALLBACK = None
 
     def _auto_refresh_once(self, app):
-        """Set up auto-refresh after first render (called once)."""
+        """Set up auto-refresh after first render (called once).
+
+        Polls the data version, which is cheap, and only re-runs the last
+        command when the tasks or the day changed.
+        """
         if hasattr(self, "_refresh_task_started"):
             return
         self._refresh_task_started = True
@@ -735,11 +954,7 @@ class MytTUI:
 
         async def _refresh_loop():
             while True:
-                await asyncio.sleep(REFRESH_INTERVAL)
-                if self._last_command:
-                    width = self._get_terminal_width()
-                    code, output, _ = self._dispatcher.dispatch(
-                        self._last_command, width_override=width)
-                    self._update_display(output)
+                await asyncio.sleep(CHANGE_POLL_INTERVAL)
+                self._refresh_if_changed()
 
         asyncio.ensure_future(_refresh_loop())
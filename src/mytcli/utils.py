@@ -11,7 +11,9 @@ from dateutil.relativedelta import relativedelta
 from dateutil.parser import parse
 from dateutil.rrule import *
 from rich.prompt import Prompt
-from sqlalchemy import and_, or_, case, func, distinct, cast, Numeric
+from sqlalchemy import (and_, or_, case, func, distinct, cast, Numeric,
+                        select, insert)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import make_transient
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import inspect
@@ -34,10 +36,14 @@ from src.mytcli.constants import (LOGGER, CONSOLE, SUCCESS, FAILURE,
                                OPS_UNLINK, OPS_DONE,
                                MODE_DAILY, MODE_WEEKLY, MODE_MONTHLY,
                                MODE_YEARLY, MODE_WKDAY, MODE_MTHDYS,
-                               MODE_MONTHS, VALID_MODES,
+                               MODE_MONTHS, VALID_MODES, UNTIL_WHEN,
                                WHEN_WEEKDAYS, WHEN_MONTHDAYS, WHEN_MONTHS,
                                PRINT_ATTR, PRNT_TASK_DTLS, PRNT_CURR_VW_CNT)
-from src.mytcli.models import Workspace, WorkspaceTags, WorkspaceRecurDates
+from src.mytcli.models import (Workspace, WorkspaceTags, WorkspaceRecurDates,
+                               WorkspaceLatest, WorkspaceGroups,
+                               WorkspaceFreeIds, WorkspaceEvents,
+                               WorkspaceRedo)
+from src.mytcli.queries import get_task_ids_in_use
 import src.mytcli.db as db
 
 
@@ -441,7 +447,96 @@ def generate_tags(tags):
     return None
 
 
-def calc_task_scores(task_list):
+# Task score weights and components, refer calc_task_scores
+SCORE_DUE_LAMBDA_FUTURE = 14.0   # characteristic days for future decay
+SCORE_DUE_MU_PAST = 7.0          # characteristic days for overdue rise
+SCORE_NOW = {1: 100}
+SCORE_PRIORITY = {PRIORITY_HIGH[0]: 100, PRIORITY_MEDIUM[0]: 95,
+                  PRIORITY_NORMAL[0]: 85, PRIORITY_LOW[0]: 70}
+SCORE_STATUS = {TASK_STATUS_STARTED: 100, TASK_STATUS_TODO: 75}
+SCORE_GROUPS = {"yes": 10}
+SCORE_TAGS = {"yes": 10}
+SCORE_NOTES = {"yes": 10}
+SCORE_WEIGHTS = {"now": 15, "due": 50, "priority": 15, "status": 14,
+                 "inception": 3, "groups": 1, "tags": 1, "notes": 1}
+
+
+def calc_task_age(inception, curr_time):
+    """
+    Returns the age of a task in seconds from its inception till the
+    provided time.
+
+    Parameters:
+        inception(str): Inception date and time of the task in FMT_DATETIME
+        curr_time(datetime): Time to calculate the age till
+
+    Returns:
+        int: Age of the task in seconds
+    """
+    return round((curr_time - datetime.fromisoformat(inception))
+                 .total_seconds())
+
+
+def calc_due_score(due, curr_date):
+    """
+    Returns the raw due date score of a task, before weights. Refer
+    calc_task_scores for the exponential decay used.
+
+    Parameters:
+        due(str): Due date of the task in FMT_DATEONLY
+        curr_date(date): Date to calculate the days till due from
+
+    Returns:
+        float: Raw due date score between 0 and 2
+    """
+    d = (date.fromisoformat(due) - curr_date).days
+    if d == 0:
+        return 1.0
+    elif d > 0:
+        return math.exp(-d / SCORE_DUE_LAMBDA_FUTURE)
+    else:
+        return 1.0 + (1.0 - math.exp(d / SCORE_DUE_MU_PAST))
+
+
+def calc_task_score(now_flag, priority, status, groups, tagged, notes, age,
+                    age_sum, due_score):
+    """
+    Returns the score of a task from its properties. Refer calc_task_scores
+    for the weights used.
+
+    Parameters:
+        now_flag(int): Is the task marked as NOW
+        priority(str): Priority of the task
+        status(str): Status of the task
+        groups(str): Groups of the task
+        tagged(bool): Does the task have tags
+        notes(str): Notes of the task
+        age(int): Age of the task in seconds
+        age_sum(int): Sum of the ages of all tasks being scored
+        due_score(float): Raw due date score or None if no due date
+
+    Returns:
+        float: Score of the task rounded to 2 decimals
+    """
+    score = {}
+    score["now"] = (SCORE_NOW.get(now_flag) or 0) * SCORE_WEIGHTS["now"]
+    score["pri"] = ((SCORE_PRIORITY.get(priority) or 0)
+                    * SCORE_WEIGHTS["priority"])
+    score["sts"] = (SCORE_STATUS.get(status) or 0) * SCORE_WEIGHTS["status"]
+    if groups:
+        score["grp"] = SCORE_GROUPS["yes"] * SCORE_WEIGHTS["groups"]
+    if tagged:
+        score["tag"] = SCORE_TAGS["yes"] * SCORE_WEIGHTS["tags"]
+    if notes:
+        score["notes"] = SCORE_NOTES["yes"] * SCORE_WEIGHTS["notes"]
+    score["incp"] = (100 * age / (age_sum or 1)) * SCORE_WEIGHTS["inception"]
+    if due_score is not None:
+        score["due"] = due_score * 100 * SCORE_WEIGHTS["due"]
+    LOGGER.debug(score)
+    return round(sum(score.values()) / 100, 2)
+
+
+def calc_task_scores(task_list, tagged_tasks=None):
     """
     Assigns a score to each task based on weighted properties.
     Final score = sum(components) / 100.
@@ -467,59 +562,53 @@ def calc_task_scores(task_list):
     DUE_LAMBDA_FUTURE = 14 days  (score halves roughly every ~10 days)
     DUE_MU_PAST       =  7 days  (overdue urgency rises steeply in first week)
 
+    The tasks are scored as a batch. Tag presence for all tasks comes from a
+    single grouped query, unless provided by the caller, and the due and
+    inception dates are evaluated against a single current time with every
+    distinct date parsed only once. The score of each task is calculated by
+    calc_task_score which is also registered as an SQLite function so views
+    can sort and limit tasks by score in the database.
+
     Parameters:
         task_list(list): List of Workspace objects to score.
+        tagged_tasks(set): Set of (uuid, version) tuples of the tasks which
+                           have tags. Default is None in which case it is
+                           retrieved from the database.
 
     Returns:
         dict: {uuid: score} mapping, or None on error.
     """
-    from src.mytcli.queries import get_tags
-
-    DUE_LAMBDA_FUTURE = 14.0   # characteristic days for future decay
-    DUE_MU_PAST = 7.0          # characteristic days for overdue rise
+    from src.mytcli.queries import get_tagged_tasks
 
-    sc_now = {1: 100}
-    sc_priority = {PRIORITY_HIGH[0]: 100, PRIORITY_MEDIUM[0]: 95,
-                   PRIORITY_NORMAL[0]: 85, PRIORITY_LOW[0]: 70}
-    sc_status = {TASK_STATUS_STARTED: 100, TASK_STATUS_TODO: 75}
-    sc_groups = {"yes": 10}
-    sc_tags = {"yes": 10}
-    sc_notes = {"yes": 10}
-    weights = {"now": 15, "due": 50, "priority": 15, "status": 14,
-               "inception": 3, "groups": 1, "tags": 1, "notes": 1}
+    if tagged_tasks is None:
+        tagged_tasks = get_tagged_tasks([(task.uuid, task.version)
+                                         for task in task_list])
+        if tagged_tasks is None:
+            return None
+    curr_time = datetime.now()
+    curr_date = curr_time.date()
+    due_scores = {}
+    ages = {}
+    for task in task_list:
+        if task.due is not None and task.due not in due_scores:
+            due_scores[task.due] = calc_due_score(task.due, curr_date)
+        if task.inception not in ages:
+            ages[task.inception] = calc_task_age(task.inception, curr_time)
 
-    incep_sum = sum(task.incep_diff_now for task in task_list) or 1
+    age_sum = sum(ages[task.inception] for task in task_list)
 
     ret_score_list = {}
     for task in task_list:
-        tags = get_tags(task.uuid, task.version, expunge=False)
-        score = {}
+        LOGGER.debug("Score for task id {} as below".format(task.uuid))
         try:
-            score["now"] = (sc_now.get(task.now_flag) or 0) * weights["now"]
-            score["pri"] = (sc_priority.get(task.priority) or 0) * weights["priority"]
-            score["sts"] = (sc_status.get(task.status) or 0) * weights["status"]
-            if task.groups:
-                score["grp"] = sc_groups["yes"] * weights["groups"]
-            if tags:
-                score["tag"] = sc_tags["yes"] * weights["tags"]
-            if task.notes:
-                score["notes"] = sc_notes["yes"] * weights["notes"]
-            score["incp"] = (100 * task.incep_diff_now / incep_sum) * weights["inception"]
-            if task.due is not None:
-                d = int(task.due_diff_today)
-                if d == 0:
-                    due_raw = 1.0
-                elif d > 0:
-                    due_raw = math.exp(-d / DUE_LAMBDA_FUTURE)
-                else:
-                    due_raw = 1.0 + (1.0 - math.exp(d / DUE_MU_PAST))
-                score["due"] = due_raw * 100 * weights["due"]
+            ret_score_list[task.uuid] = calc_task_score(
+                task.now_flag, task.priority, task.status, task.groups,
+                (task.uuid, task.version) in tagged_tasks, task.notes,
+                ages[task.inception], age_sum,
+                due_scores.get(task.due))
         except ZeroDivisionError:
             CONSOLE.print("Unable to calculate task scores...")
             return None
-        LOGGER.debug("Score for task id {} as below".format(task.uuid))
-        LOGGER.debug(score)
-        ret_score_list[task.uuid] = round(sum(score.values()) / 100, 2)
     return ret_score_list
 
 
@@ -603,6 +692,7 @@ def get_and_print_task_count(print_dict):
         return
 
     # Print Pending, Complted and Bin Tasks
+    from src.mytcli.queries import get_max_ver_sqr
     curr_day = datetime.now()
     try:
         # Pending Tasks
@@ -614,10 +704,7 @@ def get_and_print_task_count(print_dict):
                                "HIDDEN"), else_="VISIBLE")
                          .label("VISIBILITY"))
             # Inner query to match max version for a UUID
-            max_ver_sqr = (db.SESSION.query(Workspace.uuid,
-                                         func.max(Workspace.version)
-                                         .label("maxver"))
-                           .group_by(Workspace.uuid).subquery())
+            max_ver_sqr = get_max_ver_sqr()
             # Final Query
             results_pend = (db.SESSION.query(visib_xpr,
                                           func.count(distinct(Workspace.uuid))
@@ -658,22 +745,11 @@ def get_and_print_task_count(print_dict):
                                 .format(total, hid), style="info")
         # Completed Tasks
         if print_dict.get(WS_AREA_COMPLETED) == "yes":
-            # Get count of completed tasks
-            # Inner query to match max version for a UUID
-            max_ver2_xpr = (db.SESSION.query(Workspace.uuid,
-                                          func.max(Workspace.version)
-                                          .label("maxver"))
-                            .filter(Workspace.area != WS_AREA_COMPLETED)
-                            .group_by(Workspace.uuid).subquery())
-            # Final Query
-            results_compl = (db.SESSION.query(func.count(distinct(Workspace.uuid))
-                                           .label("CNT"))
-                                    .join(max_ver2_xpr, Workspace.uuid ==
-                                          max_ver2_xpr.c.uuid)
-                                    .filter(and_(Workspace.area ==
-                                                 WS_AREA_COMPLETED,
-                                                 Workspace.version >
-                                                 max_ver2_xpr.c.maxver))
+            # Get count of completed tasks using their latest versions
+            results_compl = (db.SESSION.query(func.count(WorkspaceLatest.uuid)
+                                              .label("CNT"))
+                                    .filter(WorkspaceLatest.area ==
+                                            WS_AREA_COMPLETED)
                                     .all())
             LOGGER.debug("Completed: {}".format(results_compl))
             compl = (results_compl[0])[0]
@@ -681,21 +757,10 @@ def get_and_print_task_count(print_dict):
                             .format(compl), style="info")
         # Bin Tasks
         if print_dict.get(WS_AREA_BIN) == "yes":
-            # Get count of tasks in bin
-            # Inner query to match max version for a UUID
-            max_ver3_xpr = (db.SESSION.query(Workspace.uuid,
-                                          func.max(Workspace.version)
-                                          .label("maxver"))
-                            .filter(Workspace.area != WS_AREA_BIN)
-                            .group_by(Workspace.uuid).subquery())
-            # Final Query
-            results_bin = (db.SESSION.query(func.count(distinct(Workspace.uuid))
-                                         .label("CNT"))
-                           .join(max_ver3_xpr, Workspace.uuid ==
-                                 max_ver3_xpr.c.uuid)
-                           .filter(and_(Workspace.area == WS_AREA_BIN,
-                                        Workspace.version
-                                            > max_ver3_xpr.c.maxver))
+            # Get count of tasks in bin using their latest versions
+            results_bin = (db.SESSION.query(func.count(WorkspaceLatest.uuid)
+                                            .label("CNT"))
+                           .filter(WorkspaceLatest.area == WS_AREA_BIN)
                            .all())
             LOGGER.debug("Bin: {}".format(results_bin))
             binn = (results_bin[0])[0]
@@ -709,26 +774,65 @@ def get_and_print_task_count(print_dict):
 
 def derive_task_id():
     """Get next available task ID from pending area in the workspace"""
+    id_list = derive_task_ids(1)
+    if id_list is None:
+        return None
+    return id_list[0]
+
+
+def derive_task_ids(count):
+    """
+    Get the next available task IDs from pending area in the workspace. The
+    IDs are the smallest ones in the free task IDs table, which are the same
+    as calling derive_task_id for each task added in turn. The IDs are taken
+    off the table only once the tasks are added, refer WorkspaceFreeIds.
+
+    Parameters:
+        count(int): Number of task IDs required
+
+    Returns:
+        list: The task IDs in ascending order or None in case of an error
+    """
     try:
-        results = (db.SESSION.query(Workspace.id)
-                          .filter(and_(Workspace.area == WS_AREA_PENDING,
-                                       Workspace.id != '-',
-                                       Workspace.task_type
-                                                .in_([TASK_TYPE_NRML,
-                                                      TASK_TYPE_DRVD])))
-                          .all())
+        results = (db.SESSION.query(WorkspaceFreeIds.id)
+                   .order_by(WorkspaceFreeIds.id)
+                   .limit(count)
+                   .all())
     except SQLAlchemyError as e:
         LOGGER.error(str(e))
         return None
 
-    LOGGER.debug("Returned list of task IDs {}".format(results))
+    LOGGER.debug("Returned list of free task IDs {}".format(results))
     id_list = [row[0] for row in results]
-    id_list.insert(0, 0)
-    id_list.sort()
-    available_list = sorted(set(range(id_list[0], id_list[-1]))-set(id_list))
-    if not available_list:  # If no tasks exist/no available intermediate seq
-        return id_list[-1] + 1
-    return available_list[0]
+    # The largest free ID is above all IDs in use, continue after it
+    last_id = id_list[-1] if id_list else 0
+    id_list.extend(range(last_id + 1, last_id + 1 + count - len(id_list)))
+    return id_list
+
+
+def sync_free_ids():
+    """
+    Rebuild the 'workspace_free_ids' table from the task IDs in use, with
+    every free ID below the largest ID in use and the ID after it.
+
+    Parameters:
+        None
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    used = get_task_ids_in_use()
+    if used is None:
+        return FAILURE
+    free_ids = sorted(set(range(1, max(used, default=0) + 2)) - used)
+    try:
+        db.SESSION.query(WorkspaceFreeIds).delete(synchronize_session=False)
+        db.SESSION.execute(insert(WorkspaceFreeIds),
+                           [{"id": free_id} for free_id in free_ids])
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    return SUCCESS
 
 
 def get_task_new_version(task_uuid):
@@ -748,6 +852,184 @@ def get_task_new_version(task_uuid):
         return "1"
 
 
+def set_latest_version(ws_task):
+    """
+    Record the provided task version as the latest version of the task in
+    the 'workspace_latest' table. Inserts a row for a new task or overwrites
+    the existing row for the task's UUID. The task's rows in the
+    'workspace_groups' table are replaced as well.
+
+    Parameters:
+        ws_task(Workspace): The task version which was just added
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    stmt = (sqlite_insert(WorkspaceLatest)
+            .values(uuid=ws_task.uuid, version=ws_task.version,
+                    id=ws_task.id, area=ws_task.area,
+                    task_type=ws_task.task_type))
+    stmt = stmt.on_conflict_do_update(
+                index_elements=[WorkspaceLatest.uuid],
+                set_={"version": stmt.excluded.version,
+                      "id": stmt.excluded.id,
+                      "area": stmt.excluded.area,
+                      "task_type": stmt.excluded.task_type})
+    try:
+        db.SESSION.execute(stmt)
+        (db.SESSION.query(WorkspaceGroups)
+         .filter(WorkspaceGroups.uuid == ws_task.uuid)
+         .delete(synchronize_session=False))
+        group_rows = get_group_path_rows(ws_task.uuid, ws_task.groups)
+        if group_rows:
+            db.SESSION.execute(insert(WorkspaceGroups), group_rows)
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    return SUCCESS
+
+
+def add_event_versions(version_list, operation, clear_redo=True):
+    """
+    Record the task versions added by an event in the events journal, the
+    'workspace_events' table. The events undone cannot be redone once the
+    tasks are changed again, so the 'workspace_redo' table is emptied.
+
+    Parameters:
+        version_list(list): Tuples of the event ID, UUID, version and
+                            created time of the versions added
+        operation(str): The operation which added the versions, for ex.
+                        OPS_ADD
+        clear_redo(bool): Empty the 'workspace_redo' table. False for the
+                          changes not made by the user, such as the
+                          recurring instances created on the first run of
+                          the day. Default is True
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    if not version_list:
+        return SUCCESS
+    try:
+        db.SESSION.execute(insert(WorkspaceEvents),
+                           [{"event_id": event_id, "uuid": task_uuid,
+                             "version": version, "operation": operation,
+                             "created": created}
+                            for event_id, task_uuid, version, created
+                            in version_list])
+        if clear_redo:
+            (db.SESSION.query(WorkspaceRedo)
+             .delete(synchronize_session=False))
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    return SUCCESS
+
+
+def get_group_path_rows(task_uuid, groups):
+    """
+    Returns the rows for the 'workspace_groups' table for a task, one for
+    the task's group and one for each of its parents.
+
+    Parameters:
+        task_uuid(str): UUID of the task
+        groups(str): Group of the task, for ex. 'WORK.PROJA.SUB'
+
+    Returns:
+        list: List of dictionaries with the 'uuid' and 'path', empty if the
+              task has no group
+    """
+    if not groups:
+        return []
+    grp_list = groups.split(".")
+    return [{"uuid": task_uuid, "path": ".".join(grp_list[:depth])}
+            for depth in range(1, len(grp_list) + 1)]
+
+
+def sync_group_paths(uuid_list=None):
+    """
+    Rebuild rows in the 'workspace_groups' table from the latest versions of
+    the tasks in the 'workspace_latest' table.
+
+    Parameters:
+        uuid_list(list): UUIDs for which to rebuild the rows. When None the
+                         entire table is rebuilt.
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    try:
+        del_qr = db.SESSION.query(WorkspaceGroups)
+        groups_qr = (db.SESSION.query(Workspace.uuid, Workspace.groups)
+                     .join(WorkspaceLatest,
+                           and_(Workspace.uuid == WorkspaceLatest.uuid,
+                                Workspace.version == WorkspaceLatest.version))
+                     .filter(Workspace.groups.isnot(None)))
+        if uuid_list is not None:
+            del_qr = del_qr.filter(WorkspaceGroups.uuid.in_(uuid_list))
+            groups_qr = groups_qr.filter(WorkspaceLatest.uuid.in_(uuid_list))
+        del_qr.delete(synchronize_session=False)
+        group_rows = []
+        for task_uuid, groups in groups_qr.all():
+            group_rows.extend(get_group_path_rows(task_uuid, groups))
+        if group_rows:
+            db.SESSION.execute(insert(WorkspaceGroups), group_rows)
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    return SUCCESS
+
+
+def sync_latest_versions(uuid_list=None, sync_derived=True):
+    """
+    Rebuild rows in the 'workspace_latest' table from the 'workspace' table.
+    Used when task versions are removed, as in undo or emptying the bin, or
+    when task IDs are reassigned in place. UUIDs which no longer have any
+    versions are removed from the table. The 'workspace_groups' table is
+    rebuilt for the same UUIDs.
+
+    Parameters:
+        uuid_list(list): UUIDs for which to rebuild the rows. When None the
+                         entire table is rebuilt.
+        sync_derived(bool): Also rebuild the free task IDs and the group
+                            hierarchy. False when migrating databases which
+                            do not have them yet. Default is True
+
+    Returns:
+        int: SUCCESS(0) or FAILURE(1)
+    """
+    try:
+        # Flush pending changes since the rebuild is done in SQL
+        db.SESSION.flush()
+        del_qr = db.SESSION.query(WorkspaceLatest)
+        max_ver_qr = db.SESSION.query(Workspace.uuid,
+                                      func.max(Workspace.version)
+                                      .label("maxver"))
+        if uuid_list is not None:
+            del_qr = del_qr.filter(WorkspaceLatest.uuid.in_(uuid_list))
+            max_ver_qr = max_ver_qr.filter(Workspace.uuid.in_(uuid_list))
+        del_qr.delete(synchronize_session=False)
+        max_ver_sqr = max_ver_qr.group_by(Workspace.uuid).subquery()
+        latest_qr = (select(Workspace.uuid, Workspace.version, Workspace.id,
+                            Workspace.area, Workspace.task_type)
+                     .join(max_ver_sqr,
+                           and_(Workspace.uuid == max_ver_sqr.c.uuid,
+                                Workspace.version == max_ver_sqr.c.maxver)))
+        db.SESSION.execute(insert(WorkspaceLatest)
+                           .from_select(["uuid", "version", "id", "area",
+                                         "task_type"], latest_qr))
+    except SQLAlchemyError as e:
+        LOGGER.error(str(e))
+        return FAILURE
+    if not sync_derived:
+        return SUCCESS
+    # The triggers keep the free task IDs in sync for a few tasks, for the
+    # entire table they are rebuilt as IDs may have been set outside of them
+    if uuid_list is None and sync_free_ids() == FAILURE:
+        return FAILURE
+    return sync_group_paths(uuid_list)
+
+
 def reflect_object_n_print(src_object, to_print=False, print_all=False):
     if src_object is None:
         return "-"
@@ -758,7 +1040,9 @@ def reflect_object_n_print(src_object, to_print=False, print_all=False):
     """
     dummy = "..."
     inst = inspect(src_object)
-    attr_names = [c_attr.key for c_attr in inst.mapper.column_attrs]
+    # The generated date columns are not loaded into the objects
+    attr_names = [c_attr.key for c_attr in inst.mapper.column_attrs
+                  if c_attr.columns[0].computed is None]
     if not print_all:
         for attr in attr_names:
             if attr in PRINT_ATTR:
@@ -836,78 +1120,140 @@ def reset_now_flag():
     return SUCCESS
 
 
-def calc_next_inst_date(recur_mode, recur_when, start_dt, end_dt, cnt=2):
+def get_recur_rule(recur_mode, recur_when, start_dt, cnt=None):
     """
-    Returns the next occurence date in a recurring rule.
-
-    Uses the datetime.rrule library. Accepts the recur mode and recur when
-    and translates this into a recurring rule which rrule can intepret and
-    determine the first 2 dates in the recurrence.
+    Returns the recurring rule for a recurrence mode and when.
 
-    No validations are performed on the recurrence mode and when values.
+    Translates the recur mode and recur when into a dateutil rrule starting
+    from the start date. No validations are performed on the recurrence mode
+    and when values.
 
     Params:
         recur_mode(str): A valid recurrence mode
         recur_when(str): A comma separted string of valid 'when' values
                          that correspond to the recur mode
         start_dt(date): The date from which the recurrence rule should be run
+        cnt(int): Number of dates in the rule, unbounded if None
 
     Returns:
-        (list of datetime): First 2 dates in the recurrence rule for the start
-                            date
+        (rrule): The recurring rule or None for an unknown mode
     """
     #Start with the BASIC modes (which do not need a 'when')
-    next_due = None
     if recur_mode == MODE_DAILY:
         if recur_when is None:
-            next_due = (list(rrule(DAILY, count=cnt, dtstart=start_dt)))
+            return rrule(DAILY, count=cnt, dtstart=start_dt)
         else:
             rec_intvl = int(recur_when[1:])
-            next_due = (list(rrule(DAILY, interval=rec_intvl, count=cnt,
-                                   dtstart=start_dt)))
+            return rrule(DAILY, interval=rec_intvl, count=cnt,
+                         dtstart=start_dt)
     elif recur_mode == MODE_WEEKLY:
         if recur_when is None:
-            next_due = (list(rrule(WEEKLY, count=cnt, dtstart=start_dt)))
+            return rrule(WEEKLY, count=cnt, dtstart=start_dt)
         else:
             rec_intvl = int(recur_when[1:])
-            next_due = (list(rrule(WEEKLY, interval=rec_intvl, count=cnt,
-                                   dtstart=start_dt)))
+            return rrule(WEEKLY, interval=rec_intvl, count=cnt,
+                         dtstart=start_dt)
     elif recur_mode == MODE_MONTHLY:
         if recur_when is None:
-            next_due = (list(rrule(MONTHLY, count=cnt, dtstart=start_dt)))
+            return rrule(MONTHLY, count=cnt, dtstart=start_dt)
         else:
             rec_intvl = int(recur_when[1:])
-            next_due = (list(rrule(MONTHLY, interval=rec_intvl, count=cnt,
-                                   dtstart=start_dt)))
+            return rrule(MONTHLY, interval=rec_intvl, count=cnt,
+                         dtstart=start_dt)
     elif recur_mode == MODE_YEARLY:
         if recur_when is None:
-            next_due = (list(rrule(YEARLY, count=cnt, dtstart=start_dt)))
+            return rrule(YEARLY, count=cnt, dtstart=start_dt)
         else:
             rec_intvl = int(recur_when[1:])
-            next_due = (list(rrule(YEARLY, interval=rec_intvl, count=cnt,
-                                   dtstart=start_dt)))
-    else:
-        #EXTENDED Modes
-        #Parse the when list and check for modes which require a when
-        when_list = [int(day) for day in recur_when.split(",")]
-        when_list.sort()
-        if recur_mode == MODE_WKDAY:
-            #Adjust the when days by -1 to factor the 0 vs 1 index
-            when_list = [day - 1 for day in when_list]
-            next_due = (list(rrule(DAILY, count=cnt, byweekday=when_list,
-                                   dtstart=start_dt)))
-        elif recur_mode == MODE_MTHDYS:
-            next_due = (list(rrule(DAILY, count=cnt, bymonthday=when_list,
-                                   dtstart=start_dt)))
-        elif recur_mode == MODE_MONTHS:
-            next_due = (list(rrule(MONTHLY, count=cnt, bymonth=when_list,
-                                   dtstart=start_dt)))
-    if next_due is not None:
+            return rrule(YEARLY, interval=rec_intvl, count=cnt,
+                         dtstart=start_dt)
+    #EXTENDED Modes
+    #Parse the when list and check for modes which require a when
+    when_list = [int(day) for day in recur_when.split(",")]
+    when_list.sort()
+    if recur_mode == MODE_WKDAY:
+        #Adjust the when days by -1 to factor the 0 vs 1 index
+        when_list = [day - 1 for day in when_list]
+        return rrule(DAILY, count=cnt, byweekday=when_list, dtstart=start_dt)
+    elif recur_mode == MODE_MTHDYS:
+        return rrule(DAILY, count=cnt, bymonthday=when_list, dtstart=start_dt)
+    elif recur_mode == MODE_MONTHS:
+        return rrule(MONTHLY, count=cnt, bymonth=when_list, dtstart=start_dt)
+    return None
+
+
+def calc_next_inst_date(recur_mode, recur_when, start_dt, end_dt, cnt=2):
+    """
+    Returns the next occurence date in a recurring rule.
+
+    Uses the datetime.rrule library. Accepts the recur mode and recur when
+    and translates this into a recurring rule which rrule can intepret and
+    determine the first 2 dates in the recurrence.
+
+    No validations are performed on the recurrence mode and when values.
+
+    Params:
+        recur_mode(str): A valid recurrence mode
+        recur_when(str): A comma separted string of valid 'when' values
+                         that correspond to the recur mode
+        start_dt(date): The date from which the recurrence rule should be run
+
+    Returns:
+        (list of datetime): First 2 dates in the recurrence rule for the start
+                            date
+    """
+    rule = get_recur_rule(recur_mode, recur_when, start_dt, cnt)
+    if rule is not None:
+        next_due = list(rule)
         if end_dt is not None:
             next_due = [d for d in next_due if d.date() <= end_dt]
         return [day.date() for day in next_due]
 
 
+def calc_recur_inst_dates(recur_mode, recur_when, start_dt, end_dt,
+                          skip_start, create_one):
+    """
+    Returns the due dates of all the instances to be created for a recurring
+    task in one pass over its recurring rule.
+
+    Instances are created until the due date is more than the UNTIL_WHEN
+    number of days for the mode from today or the end date is reached. If
+    create_one is set then the first date is included irrespective of how far
+    ahead it is. This gives the same dates as repeatedly calling
+    calc_next_inst_date from the previous instance's due date.
+
+    Params:
+        recur_mode(str): A valid recurrence mode
+        recur_when(str): A comma separted string of valid 'when' values
+                         that correspond to the recur mode
+        start_dt(date): The date from which the recurrence rule should be run
+        end_dt(date): The end date for the recurrence
+        skip_start(bool): Skip the first date, which is the due date of the
+                          last instance created
+        create_one(bool): Include the first date irrespective of today
+
+    Returns:
+        (list of date): Due dates for the instances to be created
+    """
+    curr_date = datetime.now().date()
+    until_when = UNTIL_WHEN.get(recur_mode)
+    inst_dates = []
+    rule = get_recur_rule(recur_mode, recur_when, start_dt)
+    if rule is None:
+        return inst_dates
+    for idx, inst_dt in enumerate(rule):
+        if skip_start and idx == 0:
+            continue
+        inst_dt = inst_dt.date()
+        if (inst_dt > end_dt
+                or not (create_one
+                        or (inst_dt - curr_date).days < until_when)):
+            break
+        inst_dates.append(inst_dt)
+        create_one = False
+    return inst_dates
+
+
 def parse_n_validate_recur(recur):
     errmsg = ("Insufficient input for recurrence. Check 'myt add --help' for "
              "more info and examples.")
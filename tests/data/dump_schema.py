@@ -0,0 +1,102 @@
+"""Writes the tasks database of a past schema version as an SQL script.
+
+Run from a checkout of the commit which introduced the schema version, the
+script creates a database with the same tasks as every other version using
+that checkout's myt commands, and writes its schema and rows to
+tests/data/schema_<version>.sql of this checkout. The scripts are read by
+tests/test_migrations.py to start from a database with the real schema of
+each version.
+
+The full text search index is written as its virtual table and rows rather
+than its shadow tables, and the triggers are created after the rows so they
+do not fire on load.
+
+Usage:
+    git worktree add /tmp/myt-0.3 <commit>
+    python tests/data/dump_schema.py /tmp/myt-0.3
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+OUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def create_tasks(path):
+    """Adds the tasks with the commands of the checkout on the path."""
+    from click.testing import CliRunner
+    from src.mytcli.myt import add, modify, done, delete, start
+    runner = CliRunner()
+
+    def run(command, args):
+        result = runner.invoke(command, args + ["--full-db-path", path],
+                               input="yes\n")
+        if result.exit_code != 0:
+            raise RuntimeError(result.output)
+
+    run(add, ["--desc", "Task one", "--group", "WORK.PROJA", "--tag",
+              "t1,t2", "--due", "2030-01-15"])
+    run(modify, ["id:1", "--priority", "H"])
+    run(add, ["--desc", "Budget review", "--group", "HOME", "--due",
+              "2020-01-10", "--notes", "Quarterly numbers"])
+    run(add, ["--desc", "Task three", "--group", "WORK"])
+    run(add, ["--desc", "Task four"])
+    run(add, ["--desc", "Hidden task", "--due", "2030-02-01", "--hide",
+              "2030-01-20"])
+    run(add, ["--desc", "Started task", "--context", "OFFICE"])
+    run(done, ["id:3"])
+    run(delete, ["id:4"])
+    run(start, ["id:6"])
+
+
+def dump(path):
+    """Returns the SQL script for the schema and rows of the database."""
+    conn = sqlite3.connect(path)
+    objects = conn.execute("SELECT type, name, sql FROM sqlite_master "
+                           "WHERE sql IS NOT NULL "
+                           "AND name NOT LIKE 'workspace_fts_%' "
+                           "ORDER BY rowid").fetchall()
+    lines = []
+    for obj_type, _, sql in objects:
+        if obj_type in ("table", "index"):
+            lines.append(sql + ";")
+    for obj_type, name, sql in objects:
+        if obj_type != "table":
+            continue
+        cols = [row[1] for row in
+                conn.execute("PRAGMA table_info({})".format(name))]
+        for row in conn.execute("SELECT {} FROM {} ORDER BY rowid"
+                                .format(", ".join(cols), name)):
+            values = ", ".join("NULL" if val is None else
+                               str(val) if isinstance(val, int) else
+                               "'{}'".format(str(val).replace("'", "''"))
+                               for val in row)
+            lines.append("INSERT INTO {}({}) VALUES ({});"
+                         .format(name, ", ".join(cols), values))
+    for obj_type, _, sql in objects:
+        if obj_type == "trigger":
+            lines.append(sql + ";")
+    version = conn.execute("SELECT value FROM app_metadata "
+                           "WHERE key = 'DB_SCHEMA_VERSION'").fetchone()[0]
+    conn.close()
+    return version, "\n".join(lines) + "\n"
+
+
+def main():
+    checkout = os.path.abspath(sys.argv[1])
+    os.chdir(checkout)
+    sys.path.insert(0, checkout)
+    path = os.path.join(tempfile.mkdtemp(), "tasksdb.sqlite3")
+    create_tasks(path)
+    version, script = dump(path)
+    out_path = os.path.join(OUT_DIR, "schema_{}.sql"
+                            .format(version.replace(".", "_")))
+    with open(out_path, "w") as out:
+        out.write(script)
+    print("Wrote {}".format(out_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+CREATE TABLE workspace (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	description VARCHAR, 
+	priority VARCHAR, 
+	status VARCHAR NOT NULL, 
+	due VARCHAR, 
+	hide VARCHAR, 
+	area VARCHAR NOT NULL, 
+	created VARCHAR NOT NULL, 
+	groups VARCHAR, 
+	context VARCHAR, 
+	event_id VARCHAR NOT NULL, 
+	now_flag BOOLEAN, 
+	task_type VARCHAR NOT NULL, 
+	base_uuid VARCHAR, 
+	recur_mode VARCHAR, 
+	recur_when VARCHAR, 
+	recur_end VARCHAR, 
+	inception VARCHAR NOT NULL, 
+	duration INTEGER, 
+	dur_event VARCHAR, 
+	notes VARCHAR, 
+	PRIMARY KEY (uuid, version)
+);
+CREATE INDEX idx_ws_due ON workspace (due);
+CREATE TABLE app_metadata (
+	"key" VARCHAR NOT NULL, 
+	value VARCHAR, 
+	PRIMARY KEY ("key")
+);
+CREATE TABLE workspace_tags (
+	uuid VARCHAR NOT NULL, 
+	tags VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	PRIMARY KEY (uuid, tags, version), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_tg_uuid_ver ON workspace_tags (uuid, version);
+CREATE TABLE workspace_recur_dates (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	due VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid, version, due), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_recr_uuid_ver ON workspace_recur_dates (uuid, version);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('dcea4619-5ced-45c7-bfc1-c46dc8420989', 1, '-', 'Task one', 'N', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:35', 'WORK.PROJA', NULL, '20261017161835635182bb6fab82-0d9c-4f22-85f6-5d71f54aad9f', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('dcea4619-5ced-45c7-bfc1-c46dc8420989', 2, 1, 'Task one', 'H', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:35', 'WORK.PROJA', NULL, '202610171618356931711130b400-4f77-4644-8ed0-22997e3c9d58', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('2da02eb7-96a7-4b80-a14e-c5dc704cfa1e', 1, 2, 'Budget review', 'N', 'TO_DO', '2020-01-10', NULL, 'pending', '2026-10-17 16:18:35', 'HOME', NULL, '202610171618357661707dc5a658-7729-4f2a-b266-61e04c882395', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', 'Quarterly numbers');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('e8019cc5-b33f-4ea9-a250-0f1fa748ccc1', 1, '-', 'Task three', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:35', 'WORK', NULL, '20261017161835815036e3c726b3-20f0-4a41-8f4a-82ef8f3f8fd7', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('c9db5086-3094-4782-8ca8-988f2283cab5', 1, '-', 'Task four', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:35', NULL, NULL, '202610171618358577121a00948b-45ad-42a8-9414-22293f56788a', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('79645701-cacb-4783-879b-be2cd91e101e', 1, 5, 'Hidden task', 'N', 'TO_DO', '2030-02-01', '2030-01-20', 'pending', '2026-10-17 16:18:35', NULL, NULL, '202610171618359036284959a8a5-fbcc-4efa-8eb5-c17846de5ed4', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('8a562d64-329d-4394-bb57-fe68e6c1b41e', 1, '-', 'Started task', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:35', NULL, 'OFFICE', '202610171618359485009f8caa1a-0b2b-4ac7-bed7-4b07c71b0222', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('e8019cc5-b33f-4ea9-a250-0f1fa748ccc1', 2, '-', 'Task three', 'N', 'DONE', NULL, NULL, 'completed', '2026-10-17 16:18:36', 'WORK', NULL, '20261017161835991678213c319d-0139-452d-b98b-3e8449d33d92', NULL, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('c9db5086-3094-4782-8ca8-988f2283cab5', 2, '-', 'Task four', 'N', 'DELETED', NULL, NULL, 'bin', '2026-10-17 16:18:36', NULL, NULL, '202610171618360447718cf08de4-2d42-44ba-99e6-c7823be819a0', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:35', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('8a562d64-329d-4394-bb57-fe68e6c1b41e', 2, 6, 'Started task', 'N', 'STARTED', NULL, NULL, 'pending', '2026-10-17 16:18:36', NULL, 'OFFICE', '202610171618359485009f8caa1a-0b2b-4ac7-bed7-4b07c71b0222', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:35', 0, '2026-10-17 16:18:36', NULL);
+INSERT INTO app_metadata(key, value) VALUES ('LAST_RECUR_CREATE_DT', '2026-10-17');
+INSERT INTO app_metadata(key, value) VALUES ('DB_SCHEMA_VERSION', '0.2');
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('dcea4619-5ced-45c7-bfc1-c46dc8420989', 't1', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('dcea4619-5ced-45c7-bfc1-c46dc8420989', 't2', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('dcea4619-5ced-45c7-bfc1-c46dc8420989', 't1', 2);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('dcea4619-5ced-45c7-bfc1-c46dc8420989', 't2', 2);
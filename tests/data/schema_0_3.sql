@@ -0,0 +1,80 @@
+CREATE TABLE workspace (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	description VARCHAR, 
+	priority VARCHAR, 
+	status VARCHAR NOT NULL, 
+	due VARCHAR, 
+	hide VARCHAR, 
+	area VARCHAR NOT NULL, 
+	created VARCHAR NOT NULL, 
+	groups VARCHAR, 
+	context VARCHAR, 
+	event_id VARCHAR NOT NULL, 
+	now_flag BOOLEAN, 
+	task_type VARCHAR NOT NULL, 
+	base_uuid VARCHAR, 
+	recur_mode VARCHAR, 
+	recur_when VARCHAR, 
+	recur_end VARCHAR, 
+	inception VARCHAR NOT NULL, 
+	duration INTEGER, 
+	dur_event VARCHAR, 
+	notes VARCHAR, 
+	PRIMARY KEY (uuid, version)
+);
+CREATE INDEX idx_ws_due ON workspace (due);
+CREATE TABLE app_metadata (
+	"key" VARCHAR NOT NULL, 
+	value VARCHAR, 
+	PRIMARY KEY ("key")
+);
+CREATE TABLE workspace_tags (
+	uuid VARCHAR NOT NULL, 
+	tags VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	PRIMARY KEY (uuid, tags, version), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_tg_uuid_ver ON workspace_tags (uuid, version);
+CREATE TABLE workspace_recur_dates (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	due VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid, version, due), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_recr_uuid_ver ON workspace_recur_dates (uuid, version);
+CREATE TABLE workspace_latest (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	area VARCHAR NOT NULL, 
+	task_type VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_lt_area_type ON workspace_latest (area, task_type);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('fca9ffa9-4c91-473d-a23a-e92df75958d9', 1, '-', 'Task one', 'N', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:36', 'WORK.PROJA', NULL, '2026101716183698154473712f2a-c979-49b4-9241-ecfe5418c694', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:36', 0, '2026-10-17 16:18:36', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('fca9ffa9-4c91-473d-a23a-e92df75958d9', 2, 1, 'Task one', 'H', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:37', 'WORK.PROJA', NULL, '20261017161837037817fe54276b-b033-43d3-a2dd-5e984f1b3f49', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:36', 0, '2026-10-17 16:18:36', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('bf6343bd-4192-4358-9846-3798fe2b405c', 1, 2, 'Budget review', 'N', 'TO_DO', '2020-01-10', NULL, 'pending', '2026-10-17 16:18:37', 'HOME', NULL, '20261017161837111566ae632e11-6c6a-4c67-ae1e-653a44062183', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:37', 0, '2026-10-17 16:18:37', 'Quarterly numbers');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('5c83e138-dae4-4ac1-8382-8a711d7ebef9', 1, '-', 'Task three', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:37', 'WORK', NULL, '20261017161837155672d26cff89-323f-49ca-accf-4099f9b9b510', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:37', 0, '2026-10-17 16:18:37', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('963ad9ff-0e14-4760-9244-f9c512486118', 1, '-', 'Task four', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:37', NULL, NULL, '202610171618371969843f753621-3b20-49a4-861a-21de566a8c03', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:37', 0, '2026-10-17 16:18:37', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('559498ff-be00-4088-ac8c-f500af75ef73', 1, 5, 'Hidden task', 'N', 'TO_DO', '2030-02-01', '2030-01-20', 'pending', '2026-10-17 16:18:37', NULL, NULL, '20261017161837237807341ac86a-1a23-48ee-81da-646dd8ec1235', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:37', 0, '2026-10-17 16:18:37', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('967ec3b1-0c6b-49d2-bad5-621a17a28d82', 1, '-', 'Started task', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:37', NULL, 'OFFICE', '20261017161837280268986fef8d-18f5-48ee-9694-ef1881370f5b', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:37', 0, '2026-10-17 16:18:37', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('5c83e138-dae4-4ac1-8382-8a711d7ebef9', 2, '-', 'Task three', 'N', 'DONE', NULL, NULL, 'completed', '2026-10-17 16:18:37', 'WORK', NULL, '202610171618373239607b10555e-ecfc-4f2e-94ef-32bcde40d554', NULL, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:37', 0, '2026-10-17 16:18:37', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('963ad9ff-0e14-4760-9244-f9c512486118', 2, '-', 'Task four', 'N', 'DELETED', NULL, NULL, 'bin', '2026-10-17 16:18:37', NULL, NULL, '202610171618373724773795efe7-7cb5-4380-8a62-568327dda83b', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:37', 0, '2026-10-17 16:18:37', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('967ec3b1-0c6b-49d2-bad5-621a17a28d82', 2, 6, 'Started task', 'N', 'STARTED', NULL, NULL, 'pending', '2026-10-17 16:18:37', NULL, 'OFFICE', '20261017161837280268986fef8d-18f5-48ee-9694-ef1881370f5b', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:37', 0, '2026-10-17 16:18:37', NULL);
+INSERT INTO app_metadata(key, value) VALUES ('LAST_RECUR_CREATE_DT', '2026-10-17');
+INSERT INTO app_metadata(key, value) VALUES ('DB_SCHEMA_VERSION', '0.3');
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('fca9ffa9-4c91-473d-a23a-e92df75958d9', 't1', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('fca9ffa9-4c91-473d-a23a-e92df75958d9', 't2', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('fca9ffa9-4c91-473d-a23a-e92df75958d9', 't1', 2);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('fca9ffa9-4c91-473d-a23a-e92df75958d9', 't2', 2);
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('fca9ffa9-4c91-473d-a23a-e92df75958d9', 2, 1, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('bf6343bd-4192-4358-9846-3798fe2b405c', 1, 2, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('5c83e138-dae4-4ac1-8382-8a711d7ebef9', 2, '-', 'completed', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('963ad9ff-0e14-4760-9244-f9c512486118', 2, '-', 'bin', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('559498ff-be00-4088-ac8c-f500af75ef73', 1, 5, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('967ec3b1-0c6b-49d2-bad5-621a17a28d82', 2, 6, 'pending', 'NORMAL');
@@ -0,0 +1,85 @@
+CREATE TABLE workspace (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	description VARCHAR, 
+	priority VARCHAR, 
+	status VARCHAR NOT NULL, 
+	due VARCHAR, 
+	hide VARCHAR, 
+	area VARCHAR NOT NULL, 
+	created VARCHAR NOT NULL, 
+	groups VARCHAR, 
+	context VARCHAR, 
+	event_id VARCHAR NOT NULL, 
+	now_flag BOOLEAN, 
+	task_type VARCHAR NOT NULL, 
+	base_uuid VARCHAR, 
+	recur_mode VARCHAR, 
+	recur_when VARCHAR, 
+	recur_end VARCHAR, 
+	inception VARCHAR NOT NULL, 
+	duration INTEGER, 
+	dur_event VARCHAR, 
+	notes VARCHAR, 
+	PRIMARY KEY (uuid, version)
+);
+CREATE INDEX idx_ws_event_id ON workspace (event_id);
+CREATE INDEX idx_ws_now ON workspace (uuid, version) WHERE now_flag = 1;
+CREATE INDEX idx_ws_due ON workspace (due);
+CREATE INDEX idx_ws_base_uuid_type ON workspace (base_uuid, task_type);
+CREATE TABLE app_metadata (
+	"key" VARCHAR NOT NULL, 
+	value VARCHAR, 
+	PRIMARY KEY ("key")
+);
+CREATE TABLE workspace_tags (
+	uuid VARCHAR NOT NULL, 
+	tags VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	PRIMARY KEY (uuid, tags, version), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_tg_tags ON workspace_tags (tags);
+CREATE INDEX idx_ws_tg_uuid_ver ON workspace_tags (uuid, version);
+CREATE TABLE workspace_recur_dates (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	due VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid, version, due), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_recr_uuid_ver ON workspace_recur_dates (uuid, version);
+CREATE TABLE workspace_latest (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	area VARCHAR NOT NULL, 
+	task_type VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_lt_area_type_uuid_ver ON workspace_latest (area, task_type, uuid, version);
+CREATE INDEX idx_ws_lt_pend_id ON workspace_latest (task_type, id) WHERE area = 'pending';
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('1265490e-a336-43ef-830f-594e8284ce86', 1, '-', 'Task one', 'N', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:38', 'WORK.PROJA', NULL, '20261017161838335344e4f61b32-bc8b-4cf7-84c5-06097e582993', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('1265490e-a336-43ef-830f-594e8284ce86', 2, 1, 'Task one', 'H', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:38', 'WORK.PROJA', NULL, '202610171618383910678f9b563b-661c-4af7-b612-3d5885f85e10', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('53d3cda0-84ef-44a7-b844-ab89097ef460', 1, 2, 'Budget review', 'N', 'TO_DO', '2020-01-10', NULL, 'pending', '2026-10-17 16:18:38', 'HOME', NULL, '202610171618384618257e45c09c-fd54-4573-b5a4-263ad2282f42', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', 'Quarterly numbers');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('227ff2f6-649a-4420-a62c-472c91cb2e23', 1, '-', 'Task three', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:38', 'WORK', NULL, '202610171618385028689b8399fb-edd1-4167-9ecb-544ed656b661', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('ddea7053-c46c-4954-8d44-cb0ea12baa99', 1, '-', 'Task four', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:38', NULL, NULL, '2026101716183854644526517ad9-f1c0-4c1b-beb2-47a4ac165956', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('8c5b4ba4-585f-47fa-887e-2017c0de3217', 1, 5, 'Hidden task', 'N', 'TO_DO', '2030-02-01', '2030-01-20', 'pending', '2026-10-17 16:18:38', NULL, NULL, '2026101716183859367356499b9d-6317-4ab5-97f9-6f9c6765aced', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('4805a757-913a-4144-945d-e84378d2443a', 1, '-', 'Started task', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:38', NULL, 'OFFICE', '20261017161838636875b32a1ee1-c034-4096-bbca-dd6128ff23a8', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('227ff2f6-649a-4420-a62c-472c91cb2e23', 2, '-', 'Task three', 'N', 'DONE', NULL, NULL, 'completed', '2026-10-17 16:18:38', 'WORK', NULL, '20261017161838681445d8e377ce-e6e8-446c-9875-75a01189f137', NULL, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('ddea7053-c46c-4954-8d44-cb0ea12baa99', 2, '-', 'Task four', 'N', 'DELETED', NULL, NULL, 'bin', '2026-10-17 16:18:38', NULL, NULL, '20261017161838729607cb99ea00-6ea2-4777-8e2e-e60441321263', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('4805a757-913a-4144-945d-e84378d2443a', 2, 6, 'Started task', 'N', 'STARTED', NULL, NULL, 'pending', '2026-10-17 16:18:38', NULL, 'OFFICE', '20261017161838636875b32a1ee1-c034-4096-bbca-dd6128ff23a8', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:38', 0, '2026-10-17 16:18:38', NULL);
+INSERT INTO app_metadata(key, value) VALUES ('LAST_RECUR_CREATE_DT', '2026-10-17');
+INSERT INTO app_metadata(key, value) VALUES ('DB_SCHEMA_VERSION', '0.4');
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('1265490e-a336-43ef-830f-594e8284ce86', 't1', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('1265490e-a336-43ef-830f-594e8284ce86', 't2', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('1265490e-a336-43ef-830f-594e8284ce86', 't1', 2);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('1265490e-a336-43ef-830f-594e8284ce86', 't2', 2);
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('1265490e-a336-43ef-830f-594e8284ce86', 2, 1, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('53d3cda0-84ef-44a7-b844-ab89097ef460', 1, 2, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('227ff2f6-649a-4420-a62c-472c91cb2e23', 2, '-', 'completed', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('ddea7053-c46c-4954-8d44-cb0ea12baa99', 2, '-', 'bin', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('8c5b4ba4-585f-47fa-887e-2017c0de3217', 1, 5, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('4805a757-913a-4144-945d-e84378d2443a', 2, 6, 'pending', 'NORMAL');
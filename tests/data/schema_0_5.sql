@@ -0,0 +1,113 @@
+CREATE TABLE workspace (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	description VARCHAR, 
+	priority VARCHAR, 
+	status VARCHAR NOT NULL, 
+	due VARCHAR, 
+	hide VARCHAR, 
+	area VARCHAR NOT NULL, 
+	created VARCHAR NOT NULL, 
+	groups VARCHAR, 
+	context VARCHAR, 
+	event_id VARCHAR NOT NULL, 
+	now_flag BOOLEAN, 
+	task_type VARCHAR NOT NULL, 
+	base_uuid VARCHAR, 
+	recur_mode VARCHAR, 
+	recur_when VARCHAR, 
+	recur_end VARCHAR, 
+	inception VARCHAR NOT NULL, 
+	duration INTEGER, 
+	dur_event VARCHAR, 
+	notes VARCHAR, 
+	PRIMARY KEY (uuid, version)
+);
+CREATE INDEX idx_ws_due ON workspace (due);
+CREATE INDEX idx_ws_event_id ON workspace (event_id);
+CREATE INDEX idx_ws_base_uuid_type ON workspace (base_uuid, task_type);
+CREATE INDEX idx_ws_now ON workspace (uuid, version) WHERE now_flag = 1;
+CREATE TABLE app_metadata (
+	"key" VARCHAR NOT NULL, 
+	value VARCHAR, 
+	PRIMARY KEY ("key")
+);
+CREATE TABLE workspace_tags (
+	uuid VARCHAR NOT NULL, 
+	tags VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	PRIMARY KEY (uuid, tags, version), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_tg_uuid_ver ON workspace_tags (uuid, version);
+CREATE INDEX idx_ws_tg_tags ON workspace_tags (tags);
+CREATE TABLE workspace_recur_dates (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	due VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid, version, due), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_recr_uuid_ver ON workspace_recur_dates (uuid, version);
+CREATE TABLE workspace_latest (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	area VARCHAR NOT NULL, 
+	task_type VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_lt_pend_id ON workspace_latest (task_type, id) WHERE area = 'pending';
+CREATE INDEX idx_ws_lt_area_type_uuid_ver ON workspace_latest (area, task_type, uuid, version);
+CREATE VIRTUAL TABLE workspace_fts
+       USING fts5(uuid, description, notes, tokenize='trigram');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('7062df47-6403-43f9-92a8-28577a8e9151', 1, '-', 'Task one', 'N', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:39', 'WORK.PROJA', NULL, '2026101716183965611707b4c2eb-8233-4888-bf24-d6ea109d3e02', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('7062df47-6403-43f9-92a8-28577a8e9151', 2, 1, 'Task one', 'H', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:39', 'WORK.PROJA', NULL, '20261017161839713348048729bc-de53-4ae4-90ac-c3a2229ae53f', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('245bdae1-1cd0-43a1-a2b2-e798b2b6aa24', 1, 2, 'Budget review', 'N', 'TO_DO', '2020-01-10', NULL, 'pending', '2026-10-17 16:18:39', 'HOME', NULL, '20261017161839785813d0ad49cc-23a1-4df0-b268-c9add7807d07', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', 'Quarterly numbers');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('1f841e78-932e-4115-abbb-89f7f69dc4f2', 1, '-', 'Task three', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:39', 'WORK', NULL, '2026101716183983036140459a8f-3096-4cd3-badd-466001e22fa2', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('26ab7273-2fe0-4a3b-a470-98bad214a671', 1, '-', 'Task four', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:39', NULL, NULL, '20261017161839878527618e3532-d98f-46d4-9513-db96977cade7', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('527b6884-694a-40a4-b6ef-02fd93524d82', 1, 5, 'Hidden task', 'N', 'TO_DO', '2030-02-01', '2030-01-20', 'pending', '2026-10-17 16:18:39', NULL, NULL, '20261017161839925154a5c9e7db-a50f-4a5e-b70e-afbf7955fe63', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('1d51ba32-af90-4de3-9bce-afee97361ed7', 1, '-', 'Started task', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:39', NULL, 'OFFICE', '202610171618399721913b4549d8-a434-40db-9e9d-aefb4ac50958', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('1f841e78-932e-4115-abbb-89f7f69dc4f2', 2, '-', 'Task three', 'N', 'DONE', NULL, NULL, 'completed', '2026-10-17 16:18:40', 'WORK', NULL, '202610171618400161994d4950e1-39ca-43b8-b9ca-4c165b85e896', NULL, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('26ab7273-2fe0-4a3b-a470-98bad214a671', 2, '-', 'Task four', 'N', 'DELETED', NULL, NULL, 'bin', '2026-10-17 16:18:40', NULL, NULL, '20261017161840065941a626ddc6-c71d-4568-9514-8fe28da8a728', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:39', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('1d51ba32-af90-4de3-9bce-afee97361ed7', 2, 6, 'Started task', 'N', 'STARTED', NULL, NULL, 'pending', '2026-10-17 16:18:40', NULL, 'OFFICE', '202610171618399721913b4549d8-a434-40db-9e9d-aefb4ac50958', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:39', 0, '2026-10-17 16:18:40', NULL);
+INSERT INTO app_metadata(key, value) VALUES ('LAST_RECUR_CREATE_DT', '2026-10-17');
+INSERT INTO app_metadata(key, value) VALUES ('DB_SCHEMA_VERSION', '0.5');
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('7062df47-6403-43f9-92a8-28577a8e9151', 't1', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('7062df47-6403-43f9-92a8-28577a8e9151', 't2', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('7062df47-6403-43f9-92a8-28577a8e9151', 't1', 2);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('7062df47-6403-43f9-92a8-28577a8e9151', 't2', 2);
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('7062df47-6403-43f9-92a8-28577a8e9151', 2, 1, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('245bdae1-1cd0-43a1-a2b2-e798b2b6aa24', 1, 2, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('1f841e78-932e-4115-abbb-89f7f69dc4f2', 2, '-', 'completed', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('26ab7273-2fe0-4a3b-a470-98bad214a671', 2, '-', 'bin', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('527b6884-694a-40a4-b6ef-02fd93524d82', 1, 5, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('1d51ba32-af90-4de3-9bce-afee97361ed7', 2, 6, 'pending', 'NORMAL');
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('7062df47-6403-43f9-92a8-28577a8e9151', 'Task one', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('245bdae1-1cd0-43a1-a2b2-e798b2b6aa24', 'Budget review', 'Quarterly numbers');
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('527b6884-694a-40a4-b6ef-02fd93524d82', 'Hidden task', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('1f841e78-932e-4115-abbb-89f7f69dc4f2', 'Task three', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('26ab7273-2fe0-4a3b-a470-98bad214a671', 'Task four', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('1d51ba32-af90-4de3-9bce-afee97361ed7', 'Started task', NULL);
+CREATE TRIGGER trg_ws_lt_fts_ins
+       AFTER INSERT ON workspace_latest
+       BEGIN
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END;
+CREATE TRIGGER trg_ws_lt_fts_upd
+       AFTER UPDATE OF version ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END;
+CREATE TRIGGER trg_ws_lt_fts_del
+       AFTER DELETE ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+       END;
@@ -0,0 +1,123 @@
+CREATE TABLE workspace (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	description VARCHAR, 
+	priority VARCHAR, 
+	status VARCHAR NOT NULL, 
+	due VARCHAR, 
+	hide VARCHAR, 
+	area VARCHAR NOT NULL, 
+	created VARCHAR NOT NULL, 
+	groups VARCHAR, 
+	context VARCHAR, 
+	event_id VARCHAR NOT NULL, 
+	now_flag BOOLEAN, 
+	task_type VARCHAR NOT NULL, 
+	base_uuid VARCHAR, 
+	recur_mode VARCHAR, 
+	recur_when VARCHAR, 
+	recur_end VARCHAR, 
+	inception VARCHAR NOT NULL, 
+	duration INTEGER, 
+	dur_event VARCHAR, 
+	notes VARCHAR, 
+	PRIMARY KEY (uuid, version)
+);
+CREATE INDEX idx_ws_due ON workspace (due);
+CREATE INDEX idx_ws_now ON workspace (uuid, version) WHERE now_flag = 1;
+CREATE INDEX idx_ws_base_uuid_type ON workspace (base_uuid, task_type);
+CREATE INDEX idx_ws_event_id ON workspace (event_id);
+CREATE TABLE workspace_groups (
+	uuid VARCHAR NOT NULL, 
+	path VARCHAR COLLATE "NOCASE" NOT NULL, 
+	PRIMARY KEY (uuid, path)
+);
+CREATE INDEX idx_ws_grp_path_uuid ON workspace_groups (path, uuid);
+CREATE TABLE app_metadata (
+	"key" VARCHAR NOT NULL, 
+	value VARCHAR, 
+	PRIMARY KEY ("key")
+);
+CREATE TABLE workspace_tags (
+	uuid VARCHAR NOT NULL, 
+	tags VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	PRIMARY KEY (uuid, tags, version), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_tg_uuid_ver ON workspace_tags (uuid, version);
+CREATE INDEX idx_ws_tg_tags ON workspace_tags (tags);
+CREATE TABLE workspace_recur_dates (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	due VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid, version, due), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_recr_uuid_ver ON workspace_recur_dates (uuid, version);
+CREATE TABLE workspace_latest (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	area VARCHAR NOT NULL, 
+	task_type VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_lt_pend_id ON workspace_latest (task_type, id) WHERE area = 'pending';
+CREATE INDEX idx_ws_lt_area_type_uuid_ver ON workspace_latest (area, task_type, uuid, version);
+CREATE VIRTUAL TABLE workspace_fts
+       USING fts5(uuid, description, notes, tokenize='trigram');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 1, '-', 'Task one', 'N', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:41', 'WORK.PROJA', NULL, '2026101716184100053074bfd454-9582-4aa0-82a5-729c01e961c2', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 2, 1, 'Task one', 'H', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:41', 'WORK.PROJA', NULL, '20261017161841060760b779a53b-a5af-46be-b30e-953ff1f67a07', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('351630d6-c3f7-4d0a-8995-240ca0b7a6f8', 1, 2, 'Budget review', 'N', 'TO_DO', '2020-01-10', NULL, 'pending', '2026-10-17 16:18:41', 'HOME', NULL, '202610171618411355725e35d7e9-a4ae-41ec-8349-238c36721621', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', 'Quarterly numbers');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('82fb4943-a450-42a9-a71f-7406624af4f1', 1, '-', 'Task three', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:41', 'WORK', NULL, '2026101716184118210935b10b67-3e7f-4377-8193-ef7ef0bf4a8e', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('a0c0cf53-adc4-494d-8309-8e23d5f812f9', 1, '-', 'Task four', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:41', NULL, NULL, '202610171618412318840c5724d1-5a38-43fb-a923-db59e71921fa', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('f5d129c7-82d0-4706-8eab-32e666b2bdb1', 1, 5, 'Hidden task', 'N', 'TO_DO', '2030-02-01', '2030-01-20', 'pending', '2026-10-17 16:18:41', NULL, NULL, '2026101716184127442887f8f882-50d2-4b60-b216-2756f62e129f', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('9eb3ef9b-709b-43cd-bb89-7827940c4573', 1, '-', 'Started task', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:41', NULL, 'OFFICE', '202610171618413207720e0b16bf-e00f-4aa9-aeb4-a92a4ce03ee6', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('82fb4943-a450-42a9-a71f-7406624af4f1', 2, '-', 'Task three', 'N', 'DONE', NULL, NULL, 'completed', '2026-10-17 16:18:41', 'WORK', NULL, '202610171618413657417c03bad4-3398-4dc8-bf5e-b69c5d0b7bfc', NULL, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('a0c0cf53-adc4-494d-8309-8e23d5f812f9', 2, '-', 'Task four', 'N', 'DELETED', NULL, NULL, 'bin', '2026-10-17 16:18:41', NULL, NULL, '20261017161841421158df44164f-a435-493c-8b26-05e5c725d93e', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('9eb3ef9b-709b-43cd-bb89-7827940c4573', 2, 6, 'Started task', 'N', 'STARTED', NULL, NULL, 'pending', '2026-10-17 16:18:41', NULL, 'OFFICE', '202610171618413207720e0b16bf-e00f-4aa9-aeb4-a92a4ce03ee6', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:41', 0, '2026-10-17 16:18:41', NULL);
+INSERT INTO workspace_groups(uuid, path) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 'WORK');
+INSERT INTO workspace_groups(uuid, path) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 'WORK.PROJA');
+INSERT INTO workspace_groups(uuid, path) VALUES ('351630d6-c3f7-4d0a-8995-240ca0b7a6f8', 'HOME');
+INSERT INTO workspace_groups(uuid, path) VALUES ('82fb4943-a450-42a9-a71f-7406624af4f1', 'WORK');
+INSERT INTO app_metadata(key, value) VALUES ('LAST_RECUR_CREATE_DT', '2026-10-17');
+INSERT INTO app_metadata(key, value) VALUES ('DB_SCHEMA_VERSION', '0.6');
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 't1', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 't2', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 't1', 2);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 't2', 2);
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 2, 1, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('351630d6-c3f7-4d0a-8995-240ca0b7a6f8', 1, 2, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('82fb4943-a450-42a9-a71f-7406624af4f1', 2, '-', 'completed', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('a0c0cf53-adc4-494d-8309-8e23d5f812f9', 2, '-', 'bin', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('f5d129c7-82d0-4706-8eab-32e666b2bdb1', 1, 5, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('9eb3ef9b-709b-43cd-bb89-7827940c4573', 2, 6, 'pending', 'NORMAL');
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('bf67cf4f-fc51-426f-9c85-f6e12185bade', 'Task one', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('351630d6-c3f7-4d0a-8995-240ca0b7a6f8', 'Budget review', 'Quarterly numbers');
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('f5d129c7-82d0-4706-8eab-32e666b2bdb1', 'Hidden task', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('82fb4943-a450-42a9-a71f-7406624af4f1', 'Task three', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('a0c0cf53-adc4-494d-8309-8e23d5f812f9', 'Task four', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('9eb3ef9b-709b-43cd-bb89-7827940c4573', 'Started task', NULL);
+CREATE TRIGGER trg_ws_lt_fts_ins
+       AFTER INSERT ON workspace_latest
+       BEGIN
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END;
+CREATE TRIGGER trg_ws_lt_fts_upd
+       AFTER UPDATE OF version ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END;
+CREATE TRIGGER trg_ws_lt_fts_del
+       AFTER DELETE ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+       END;
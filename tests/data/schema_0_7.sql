@@ -0,0 +1,148 @@
+CREATE TABLE workspace (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	description VARCHAR, 
+	priority VARCHAR, 
+	status VARCHAR NOT NULL, 
+	due VARCHAR, 
+	hide VARCHAR, 
+	area VARCHAR NOT NULL, 
+	created VARCHAR NOT NULL, 
+	groups VARCHAR, 
+	context VARCHAR, 
+	event_id VARCHAR NOT NULL, 
+	now_flag BOOLEAN, 
+	task_type VARCHAR NOT NULL, 
+	base_uuid VARCHAR, 
+	recur_mode VARCHAR, 
+	recur_when VARCHAR, 
+	recur_end VARCHAR, 
+	inception VARCHAR NOT NULL, 
+	duration INTEGER, 
+	dur_event VARCHAR, 
+	notes VARCHAR, 
+	PRIMARY KEY (uuid, version)
+);
+CREATE INDEX idx_ws_due ON workspace (due);
+CREATE INDEX idx_ws_now ON workspace (uuid, version) WHERE now_flag = 1;
+CREATE INDEX idx_ws_event_id ON workspace (event_id);
+CREATE INDEX idx_ws_base_uuid_type ON workspace (base_uuid, task_type);
+CREATE TABLE workspace_free_ids (
+	id INTEGER NOT NULL, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE workspace_groups (
+	uuid VARCHAR NOT NULL, 
+	path VARCHAR COLLATE "NOCASE" NOT NULL, 
+	PRIMARY KEY (uuid, path)
+);
+CREATE INDEX idx_ws_grp_path_uuid ON workspace_groups (path, uuid);
+CREATE TABLE app_metadata (
+	"key" VARCHAR NOT NULL, 
+	value VARCHAR, 
+	PRIMARY KEY ("key")
+);
+CREATE TABLE workspace_tags (
+	uuid VARCHAR NOT NULL, 
+	tags VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	PRIMARY KEY (uuid, tags, version), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_tg_tags ON workspace_tags (tags);
+CREATE INDEX idx_ws_tg_uuid_ver ON workspace_tags (uuid, version);
+CREATE TABLE workspace_recur_dates (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	due VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid, version, due), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_recr_uuid_ver ON workspace_recur_dates (uuid, version);
+CREATE TABLE workspace_latest (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	area VARCHAR NOT NULL, 
+	task_type VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_lt_area_type_uuid_ver ON workspace_latest (area, task_type, uuid, version);
+CREATE INDEX idx_ws_lt_pend_id ON workspace_latest (task_type, id) WHERE area = 'pending';
+CREATE VIRTUAL TABLE workspace_fts
+       USING fts5(uuid, description, notes, tokenize='trigram');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 1, '-', 'Task one', 'N', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:42', 'WORK.PROJA', NULL, '2026101716184235567192b48b99-a59c-4b9d-a972-fe6e6a258afd', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 2, 1, 'Task one', 'H', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:42', 'WORK.PROJA', NULL, '2026101716184241372006a7eec3-bd36-4f04-a058-fbbd0ad1ab98', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('473c5997-ac22-4b2e-8d36-33985b9a8863', 1, 2, 'Budget review', 'N', 'TO_DO', '2020-01-10', NULL, 'pending', '2026-10-17 16:18:42', 'HOME', NULL, '202610171618424875166da10317-5191-4cf5-8d56-64efbdc52692', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', 'Quarterly numbers');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('4b18a73a-5eb0-4ef5-a471-6de9ef353db8', 1, '-', 'Task three', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:42', 'WORK', NULL, '20261017161842533832291b3229-9766-4971-af1d-5566137e5b74', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('211134b9-13ce-4929-9f29-a8f78ace1023', 1, '-', 'Task four', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:42', NULL, NULL, '20261017161842580744f1283192-d70f-4bbb-9964-58e1d77276d3', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('6dbd6b06-cfc6-4b2b-b2e2-fae52c9ff81c', 1, 5, 'Hidden task', 'N', 'TO_DO', '2030-02-01', '2030-01-20', 'pending', '2026-10-17 16:18:42', NULL, NULL, '202610171618426248681d7ba774-9bb5-4696-949c-858f161c58d3', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('cfd159c1-40af-41a9-96fb-f41f03e9dce8', 1, '-', 'Started task', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:42', NULL, 'OFFICE', '2026101716184267163715ea8e55-894e-4eae-a1bb-81d98f2c82bd', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('4b18a73a-5eb0-4ef5-a471-6de9ef353db8', 2, '-', 'Task three', 'N', 'DONE', NULL, NULL, 'completed', '2026-10-17 16:18:42', 'WORK', NULL, '202610171618427171100546e87b-870b-4764-8a12-c53bd0b9959b', NULL, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('211134b9-13ce-4929-9f29-a8f78ace1023', 2, '-', 'Task four', 'N', 'DELETED', NULL, NULL, 'bin', '2026-10-17 16:18:42', NULL, NULL, '20261017161842773700fabd0204-f888-46fc-b525-abbbe2d4772c', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('cfd159c1-40af-41a9-96fb-f41f03e9dce8', 2, 6, 'Started task', 'N', 'STARTED', NULL, NULL, 'pending', '2026-10-17 16:18:42', NULL, 'OFFICE', '2026101716184267163715ea8e55-894e-4eae-a1bb-81d98f2c82bd', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:42', 0, '2026-10-17 16:18:42', NULL);
+INSERT INTO workspace_free_ids(id) VALUES (3);
+INSERT INTO workspace_free_ids(id) VALUES (4);
+INSERT INTO workspace_free_ids(id) VALUES (7);
+INSERT INTO workspace_groups(uuid, path) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 'WORK');
+INSERT INTO workspace_groups(uuid, path) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 'WORK.PROJA');
+INSERT INTO workspace_groups(uuid, path) VALUES ('473c5997-ac22-4b2e-8d36-33985b9a8863', 'HOME');
+INSERT INTO workspace_groups(uuid, path) VALUES ('4b18a73a-5eb0-4ef5-a471-6de9ef353db8', 'WORK');
+INSERT INTO app_metadata(key, value) VALUES ('LAST_RECUR_CREATE_DT', '2026-10-17');
+INSERT INTO app_metadata(key, value) VALUES ('DB_SCHEMA_VERSION', '0.7');
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 't1', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 't2', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 't1', 2);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 't2', 2);
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 2, 1, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('473c5997-ac22-4b2e-8d36-33985b9a8863', 1, 2, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('4b18a73a-5eb0-4ef5-a471-6de9ef353db8', 2, '-', 'completed', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('211134b9-13ce-4929-9f29-a8f78ace1023', 2, '-', 'bin', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('6dbd6b06-cfc6-4b2b-b2e2-fae52c9ff81c', 1, 5, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('cfd159c1-40af-41a9-96fb-f41f03e9dce8', 2, 6, 'pending', 'NORMAL');
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('3108693a-5e44-47d8-a705-a3634a3617c3', 'Task one', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('473c5997-ac22-4b2e-8d36-33985b9a8863', 'Budget review', 'Quarterly numbers');
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('6dbd6b06-cfc6-4b2b-b2e2-fae52c9ff81c', 'Hidden task', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('4b18a73a-5eb0-4ef5-a471-6de9ef353db8', 'Task three', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('211134b9-13ce-4929-9f29-a8f78ace1023', 'Task four', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('cfd159c1-40af-41a9-96fb-f41f03e9dce8', 'Started task', NULL);
+CREATE TRIGGER trg_ws_lt_fts_ins
+       AFTER INSERT ON workspace_latest
+       BEGIN
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END;
+CREATE TRIGGER trg_ws_lt_fts_upd
+       AFTER UPDATE OF version ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END;
+CREATE TRIGGER trg_ws_lt_fts_del
+       AFTER DELETE ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+       END;
+CREATE TRIGGER trg_ws_lt_ids_ins
+       AFTER INSERT ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_free_ids WHERE id = NEW.id AND NEW.area = 'pending' AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-';INSERT OR IGNORE INTO workspace_free_ids(id) SELECT NEW.id + 1 WHERE NEW.area = 'pending' AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-' AND NOT EXISTS (SELECT 1 FROM workspace_free_ids WHERE id > NEW.id);
+       END;
+CREATE TRIGGER trg_ws_lt_ids_upd
+       AFTER UPDATE OF id, area, task_type ON workspace_latest
+       WHEN OLD.id IS NOT NEW.id OR OLD.area IS NOT NEW.area
+            OR OLD.task_type IS NOT NEW.task_type
+       BEGIN
+           INSERT OR IGNORE INTO workspace_free_ids(id) SELECT OLD.id WHERE OLD.area = 'pending' AND OLD.task_type IN ('NORMAL', 'DERIVED') AND OLD.id != '-';
+           DELETE FROM workspace_free_ids WHERE id = NEW.id AND NEW.area = 'pending' AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-';INSERT OR IGNORE INTO workspace_free_ids(id) SELECT NEW.id + 1 WHERE NEW.area = 'pending' AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-' AND NOT EXISTS (SELECT 1 FROM workspace_free_ids WHERE id > NEW.id);
+       END;
+CREATE TRIGGER trg_ws_lt_ids_del
+       AFTER DELETE ON workspace_latest
+       BEGIN
+           INSERT OR IGNORE INTO workspace_free_ids(id) SELECT OLD.id WHERE OLD.area = 'pending' AND OLD.task_type IN ('NORMAL', 'DERIVED') AND OLD.id != '-';
+       END;
@@ -0,0 +1,172 @@
+CREATE TABLE workspace (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	description VARCHAR, 
+	priority VARCHAR, 
+	status VARCHAR NOT NULL, 
+	due VARCHAR, 
+	hide VARCHAR, 
+	area VARCHAR NOT NULL, 
+	created VARCHAR NOT NULL, 
+	groups VARCHAR, 
+	context VARCHAR, 
+	event_id VARCHAR NOT NULL, 
+	now_flag BOOLEAN, 
+	task_type VARCHAR NOT NULL, 
+	base_uuid VARCHAR, 
+	recur_mode VARCHAR, 
+	recur_when VARCHAR, 
+	recur_end VARCHAR, 
+	inception VARCHAR NOT NULL, 
+	duration INTEGER, 
+	dur_event VARCHAR, 
+	notes VARCHAR, 
+	PRIMARY KEY (uuid, version)
+);
+CREATE INDEX idx_ws_due ON workspace (due);
+CREATE INDEX idx_ws_base_uuid_type ON workspace (base_uuid, task_type);
+CREATE INDEX idx_ws_event_id ON workspace (event_id);
+CREATE INDEX idx_ws_now ON workspace (uuid, version) WHERE now_flag = 1;
+CREATE TABLE workspace_events (
+	event_id VARCHAR NOT NULL, 
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	operation VARCHAR, 
+	created VARCHAR NOT NULL, 
+	PRIMARY KEY (event_id, uuid, version)
+);
+CREATE INDEX idx_ws_evt_uuid ON workspace_events (uuid);
+CREATE TABLE workspace_redo (
+	event_id VARCHAR NOT NULL, 
+	rows VARCHAR NOT NULL, 
+	PRIMARY KEY (event_id)
+);
+CREATE TABLE workspace_free_ids (
+	id INTEGER NOT NULL, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE workspace_groups (
+	uuid VARCHAR NOT NULL, 
+	path VARCHAR COLLATE "NOCASE" NOT NULL, 
+	PRIMARY KEY (uuid, path)
+);
+CREATE INDEX idx_ws_grp_path_uuid ON workspace_groups (path, uuid);
+CREATE TABLE app_metadata (
+	"key" VARCHAR NOT NULL, 
+	value VARCHAR, 
+	PRIMARY KEY ("key")
+);
+CREATE TABLE workspace_tags (
+	uuid VARCHAR NOT NULL, 
+	tags VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	PRIMARY KEY (uuid, tags, version), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_tg_tags ON workspace_tags (tags);
+CREATE INDEX idx_ws_tg_uuid_ver ON workspace_tags (uuid, version);
+CREATE TABLE workspace_recur_dates (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	due VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid, version, due), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_recr_uuid_ver ON workspace_recur_dates (uuid, version);
+CREATE TABLE workspace_latest (
+	uuid VARCHAR NOT NULL, 
+	version INTEGER NOT NULL, 
+	id INTEGER, 
+	area VARCHAR NOT NULL, 
+	task_type VARCHAR NOT NULL, 
+	PRIMARY KEY (uuid), 
+	FOREIGN KEY(uuid, version) REFERENCES workspace (uuid, version)
+);
+CREATE INDEX idx_ws_lt_area_type_uuid_ver ON workspace_latest (area, task_type, uuid, version);
+CREATE INDEX idx_ws_lt_pend_id ON workspace_latest (task_type, id) WHERE area = 'pending';
+CREATE VIRTUAL TABLE workspace_fts
+       USING fts5(uuid, description, notes, tokenize='trigram');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 1, '-', 'Task one', 'N', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:43', 'WORK.PROJA', NULL, '202610171618437361752a1e3fa3-07d1-4705-b0bc-97909e582657', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:43', 0, '2026-10-17 16:18:43', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 2, 1, 'Task one', 'H', 'TO_DO', '2030-01-15', NULL, 'pending', '2026-10-17 16:18:43', 'WORK.PROJA', NULL, '20261017161843795472ff34d217-4b0d-416e-b5b3-7f2ee70b9272', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:43', 0, '2026-10-17 16:18:43', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('4a8212da-4292-4477-8444-d3c760cf6cc9', 1, 2, 'Budget review', 'N', 'TO_DO', '2020-01-10', NULL, 'pending', '2026-10-17 16:18:43', 'HOME', NULL, '20261017161843871501f125e7e7-d8e3-4c11-be0d-5737b3a43424', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:43', 0, '2026-10-17 16:18:43', 'Quarterly numbers');
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('c55e6f8f-9c9c-4b47-81a5-8c5e10741ed8', 1, '-', 'Task three', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:43', 'WORK', NULL, '202610171618439313879022994a-9269-41a2-b852-ff227f58812a', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:43', 0, '2026-10-17 16:18:43', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('1a60ff2a-cba9-44cc-8c62-bc11401a2a91', 1, '-', 'Task four', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:43', NULL, NULL, '20261017161843979102c1ee5d24-d92b-44ee-87d7-f5e14c190151', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:43', 0, '2026-10-17 16:18:43', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('218fded3-db97-47f3-b073-678dd3a6d37c', 1, 5, 'Hidden task', 'N', 'TO_DO', '2030-02-01', '2030-01-20', 'pending', '2026-10-17 16:18:44', NULL, NULL, '20261017161844024240bdbedc77-52e6-4523-bd54-b09c3974d925', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:44', 0, '2026-10-17 16:18:44', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('7c342858-18fe-4bd5-b356-c53b9f89a776', 1, '-', 'Started task', 'N', 'TO_DO', NULL, NULL, 'pending', '2026-10-17 16:18:44', NULL, 'OFFICE', '202610171618440738440b65fdf2-dc1a-45ff-b62b-65926b68aab7', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:44', 0, '2026-10-17 16:18:44', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('c55e6f8f-9c9c-4b47-81a5-8c5e10741ed8', 2, '-', 'Task three', 'N', 'DONE', NULL, NULL, 'completed', '2026-10-17 16:18:44', 'WORK', NULL, '20261017161844123855dc5ce9ef-5c43-4f3a-9e17-d0ce2f161e38', NULL, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:43', 0, '2026-10-17 16:18:43', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('1a60ff2a-cba9-44cc-8c62-bc11401a2a91', 2, '-', 'Task four', 'N', 'DELETED', NULL, NULL, 'bin', '2026-10-17 16:18:44', NULL, NULL, '20261017161844177488a22863dd-a9c4-4fe9-961f-6eaed9b5bd39', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:43', 0, '2026-10-17 16:18:43', NULL);
+INSERT INTO workspace(uuid, version, id, description, priority, status, due, hide, area, created, groups, context, event_id, now_flag, task_type, base_uuid, recur_mode, recur_when, recur_end, inception, duration, dur_event, notes) VALUES ('7c342858-18fe-4bd5-b356-c53b9f89a776', 2, 6, 'Started task', 'N', 'STARTED', NULL, NULL, 'pending', '2026-10-17 16:18:44', NULL, 'OFFICE', '202610171618440738440b65fdf2-dc1a-45ff-b62b-65926b68aab7', 0, 'NORMAL', NULL, NULL, NULL, NULL, '2026-10-17 16:18:44', 0, '2026-10-17 16:18:44', NULL);
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('202610171618437361752a1e3fa3-07d1-4705-b0bc-97909e582657', 'fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 1, 'add', '2026-10-17 16:18:43');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('20261017161843795472ff34d217-4b0d-416e-b5b3-7f2ee70b9272', 'fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 2, 'modify', '2026-10-17 16:18:43');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('20261017161843871501f125e7e7-d8e3-4c11-be0d-5737b3a43424', '4a8212da-4292-4477-8444-d3c760cf6cc9', 1, 'add', '2026-10-17 16:18:43');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('202610171618439313879022994a-9269-41a2-b852-ff227f58812a', 'c55e6f8f-9c9c-4b47-81a5-8c5e10741ed8', 1, 'add', '2026-10-17 16:18:43');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('20261017161843979102c1ee5d24-d92b-44ee-87d7-f5e14c190151', '1a60ff2a-cba9-44cc-8c62-bc11401a2a91', 1, 'add', '2026-10-17 16:18:43');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('20261017161844024240bdbedc77-52e6-4523-bd54-b09c3974d925', '218fded3-db97-47f3-b073-678dd3a6d37c', 1, 'add', '2026-10-17 16:18:44');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('202610171618440738440b65fdf2-dc1a-45ff-b62b-65926b68aab7', '7c342858-18fe-4bd5-b356-c53b9f89a776', 1, 'add', '2026-10-17 16:18:44');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('20261017161844123855dc5ce9ef-5c43-4f3a-9e17-d0ce2f161e38', 'c55e6f8f-9c9c-4b47-81a5-8c5e10741ed8', 2, 'done', '2026-10-17 16:18:44');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('20261017161844177488a22863dd-a9c4-4fe9-961f-6eaed9b5bd39', '1a60ff2a-cba9-44cc-8c62-bc11401a2a91', 2, 'delete', '2026-10-17 16:18:44');
+INSERT INTO workspace_events(event_id, uuid, version, operation, created) VALUES ('202610171618440738440b65fdf2-dc1a-45ff-b62b-65926b68aab7', '7c342858-18fe-4bd5-b356-c53b9f89a776', 2, 'start', '2026-10-17 16:18:44');
+INSERT INTO workspace_free_ids(id) VALUES (3);
+INSERT INTO workspace_free_ids(id) VALUES (4);
+INSERT INTO workspace_free_ids(id) VALUES (7);
+INSERT INTO workspace_groups(uuid, path) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 'WORK');
+INSERT INTO workspace_groups(uuid, path) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 'WORK.PROJA');
+INSERT INTO workspace_groups(uuid, path) VALUES ('4a8212da-4292-4477-8444-d3c760cf6cc9', 'HOME');
+INSERT INTO workspace_groups(uuid, path) VALUES ('c55e6f8f-9c9c-4b47-81a5-8c5e10741ed8', 'WORK');
+INSERT INTO app_metadata(key, value) VALUES ('LAST_RECUR_CREATE_DT', '2026-10-17');
+INSERT INTO app_metadata(key, value) VALUES ('DB_SCHEMA_VERSION', '0.8');
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 't1', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 't2', 1);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 't1', 2);
+INSERT INTO workspace_tags(uuid, tags, version) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 't2', 2);
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 2, 1, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('4a8212da-4292-4477-8444-d3c760cf6cc9', 1, 2, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('c55e6f8f-9c9c-4b47-81a5-8c5e10741ed8', 2, '-', 'completed', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('1a60ff2a-cba9-44cc-8c62-bc11401a2a91', 2, '-', 'bin', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('218fded3-db97-47f3-b073-678dd3a6d37c', 1, 5, 'pending', 'NORMAL');
+INSERT INTO workspace_latest(uuid, version, id, area, task_type) VALUES ('7c342858-18fe-4bd5-b356-c53b9f89a776', 2, 6, 'pending', 'NORMAL');
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('fe9648ad-09d4-4b8a-aa74-d7c32845c7b0', 'Task one', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('4a8212da-4292-4477-8444-d3c760cf6cc9', 'Budget review', 'Quarterly numbers');
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('218fded3-db97-47f3-b073-678dd3a6d37c', 'Hidden task', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('c55e6f8f-9c9c-4b47-81a5-8c5e10741ed8', 'Task three', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('1a60ff2a-cba9-44cc-8c62-bc11401a2a91', 'Task four', NULL);
+INSERT INTO workspace_fts(uuid, description, notes) VALUES ('7c342858-18fe-4bd5-b356-c53b9f89a776', 'Started task', NULL);
+CREATE TRIGGER trg_ws_lt_fts_ins
+       AFTER INSERT ON workspace_latest
+       BEGIN
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END;
+CREATE TRIGGER trg_ws_lt_fts_upd
+       AFTER UPDATE OF version ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+           INSERT INTO workspace_fts(uuid, description, notes)
+           SELECT uuid, description, notes FROM workspace
+           WHERE uuid = NEW.uuid AND version = NEW.version;
+       END;
+CREATE TRIGGER trg_ws_lt_fts_del
+       AFTER DELETE ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_fts WHERE uuid GLOB OLD.uuid;
+       END;
+CREATE TRIGGER trg_ws_lt_ids_ins
+       AFTER INSERT ON workspace_latest
+       BEGIN
+           DELETE FROM workspace_free_ids WHERE id = NEW.id AND NEW.area = 'pending' AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-';INSERT OR IGNORE INTO workspace_free_ids(id) SELECT NEW.id + 1 WHERE NEW.area = 'pending' AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-' AND NOT EXISTS (SELECT 1 FROM workspace_free_ids WHERE id > NEW.id);
+       END;
+CREATE TRIGGER trg_ws_lt_ids_upd
+       AFTER UPDATE OF id, area, task_type ON workspace_latest
+       WHEN OLD.id IS NOT NEW.id OR OLD.area IS NOT NEW.area
+            OR OLD.task_type IS NOT NEW.task_type
+       BEGIN
+           INSERT OR IGNORE INTO workspace_free_ids(id) SELECT OLD.id WHERE OLD.area = 'pending' AND OLD.task_type IN ('NORMAL', 'DERIVED') AND OLD.id != '-';
+           DELETE FROM workspace_free_ids WHERE id = NEW.id AND NEW.area = 'pending' AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-';INSERT OR IGNORE INTO workspace_free_ids(id) SELECT NEW.id + 1 WHERE NEW.area = 'pending' AND NEW.task_type IN ('NORMAL', 'DERIVED') AND NEW.id != '-' AND NOT EXISTS (SELECT 1 FROM workspace_free_ids WHERE id > NEW.id);
+       END;
+CREATE TRIGGER trg_ws_lt_ids_del
+       AFTER DELETE ON workspace_latest
+       BEGIN
+           INSERT OR IGNORE INTO workspace_free_ids(id) SELECT OLD.id WHERE OLD.area = 'pending' AND OLD.task_type IN ('NORMAL', 'DERIVED') AND OLD.id != '-';
+       END;
@@ -0,0 +1,114 @@
+"""Tests for the bulk versions of start, stop, done, delete and modify,
+compared against the results of the same commands applied task by task."""
+
+import uuid
+import shutil
+import sqlite3
+import itertools
+import tempfile
+from datetime import datetime, timedelta
+
+import mock
+import pytest
+from click.testing import CliRunner
+
+from src.mytcli.myt import add, start, stop, done, delete, modify, admin
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+NOW = datetime(2026, 3, 14, 9, 30, 15)
+EVENT_ID = NOW.strftime("%Y%m%d%H%M%S%f") + "bulk"
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture(scope="module")
+def template():
+    path = tempfile.mkdtemp() + "/test_bulk.sqlite3"
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--reinit', '-db', path])
+    for cnt in range(1, 7):
+        args = ['-de', 'Bulk task {}'.format(cnt), '-tg', 'blk,t{}'.format(cnt),
+                '-gr', 'WORK.PRJ{}'.format(cnt % 2), '-db', path]
+        if cnt % 3 == 0:
+            args = args + ['-no', 'Some notes']
+        runner.invoke(add, args)
+    runner.invoke(add, ['-de', 'Recur bulk', '-re', 'D', '-du', '-2', '-tg',
+                        'rblk', '-db', path])
+    runner.invoke(start, ['id:2,4', '-db', path])
+    # Started a while back so the stopped tasks have a duration
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE workspace SET dur_event = ? WHERE status = 'STARTED'",
+                 ((NOW - timedelta(hours=2, seconds=5))
+                  .strftime("%Y-%m-%d %H:%M:%S"),))
+    conn.commit()
+    conn.close()
+    db.discard_db_resources()
+    yield path
+
+
+def snapshot(path):
+    conn = sqlite3.connect(path)
+    tables = {}
+    for table in ["workspace", "workspace_tags", "workspace_latest",
+                  "workspace_groups", "workspace_recur_dates"]:
+        tables[table] = sorted(conn.execute("SELECT * FROM {}".format(table))
+                               .fetchall(), key=repr)
+    tables["workspace_fts"] = sorted(conn.execute(
+        "SELECT uuid, description, notes FROM workspace_fts").fetchall(),
+        key=repr)
+    conn.close()
+    return tables
+
+
+def run(template, command, args, bulk_min):
+    path = tempfile.mkdtemp() + "/test_bulk_run.sqlite3"
+    shutil.copyfile(template, path)
+    with mock.patch('src.mytcli.operations.BULK_MIN_TASKS', bulk_min), \
+            mock.patch('src.mytcli.operations.datetime', FrozenDatetime), \
+            mock.patch('src.mytcli.utils.get_event_id', return_value=EVENT_ID), \
+            mock.patch('uuid.uuid4', side_effect=(uuid.UUID(int=cnt) for cnt
+                                                  in itertools.count(1))), \
+            mock.patch('src.mytcli.operations.Prompt.ask',
+                       return_value="this"):
+        result = runner.invoke(command, args + ['-db', path])
+    db.discard_db_resources()
+    return result, snapshot(path)
+
+
+@pytest.mark.parametrize("command, args", [
+    (start, ['tg:blk']),
+    (stop, ['tg:blk']),
+    (done, ['tg:blk']),
+    (done, ['tg:rblk']),
+    (done, ['id:1,2,7']),
+    (delete, ['tg:blk']),
+    (modify, ['tg:blk', '-pr', 'H', '-tg', 'new,-t1', '-no', 'more',
+              '-gr', 'HOME.GARDEN', '-hi', '+3']),
+    (modify, ['tg:blk', '-tg', 'clr', '-gr', 'clr', '-no', 'clr', '-de',
+              'Renamed', '-cx', 'desk']),
+    (modify, ['tg:blk', '-du', '+5', '-hi', '-2']),
+    (modify, ['tg:blk', '-hi', '-2']),
+])
+def test_bulk_same_as_single(template, command, args):
+    single, single_tables = run(template, command, args, 10**6)
+    bulk, bulk_tables = run(template, command, args, 2)
+    assert single.exit_code == 0
+    assert bulk.exit_code == single.exit_code
+    assert bulk.output == single.output
+    assert bulk_tables == single_tables
+    # Something changed
+    assert bulk_tables["workspace"] != snapshot(template)["workspace"]
+
+
+def test_bulk_chunks(template):
+    with mock.patch('src.mytcli.operations.BULK_CHUNK_SIZE', 2):
+        chunked, chunked_tables = run(template, done, ['tg:blk'], 2)
+    bulk, bulk_tables = run(template, done, ['tg:blk'], 2)
+    assert chunked.output == bulk.output
+    assert chunked_tables == bulk_tables
@@ -0,0 +1,103 @@
+"""Tests for the TUI completions and their vocabulary snapshot."""
+
+import tempfile
+import threading
+
+import mock
+import pytest
+from click.testing import CliRunner
+from prompt_toolkit.document import Document
+
+from src.mytcli.myt import add, done, delete, admin
+from src.mytcli.queries import get_vocabulary
+from src.mytcli.completer import MytCompleter, VocabularyCache
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def db_path():
+    path = tempfile.mkdtemp() + "/test_completer.sqlite3"
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--reinit', '-db', path])
+    runner.invoke(add, ['-de', 'task1', '-gr', 'Work.Dev', '-cx', 'office',
+                        '-tg', 'urgent,backend', '-db', path])
+    runner.invoke(add, ['-de', 'task2', '-gr', 'Home', '-cx', 'home', '-tg',
+                        'urgent', '-db', path])
+    runner.invoke(add, ['-de', 'task3', '-gr', 'Bin', '-tg', 'binned', '-db',
+                        path])
+    runner.invoke(done, ['id:2', '-db', path])
+    runner.invoke(delete, ['id:3', '-db', path])
+    db.connect_to_tasksdb(full_db_path=path)
+    return path
+
+
+def completions(completer, text):
+    return [c.text for c in completer.get_completions(Document(text), None)]
+
+
+def test_vocabulary(db_path):
+    assert get_vocabulary() == {"groups": ["Home", "Work", "Work.Dev"],
+                                "contexts": ["office"],
+                                "tags": ["backend", "urgent"],
+                                "ids": ["1"]}
+
+
+def test_vocabulary_case(db_path):
+    # Values which only differ in case are all offered, as the tag filter is
+    # case sensitive
+    runner.invoke(add, ['-de', 'task4', '-cx', 'Office', '-tg', 'Urgent',
+                        '-db', db_path])
+    db.connect_to_tasksdb(full_db_path=db_path)
+    vocabulary = get_vocabulary()
+    assert sorted(vocabulary["contexts"]) == ["Office", "office"]
+    assert sorted(vocabulary["tags"]) == ["Urgent", "backend", "urgent"]
+
+
+def test_vocabulary_cache_generation(db_path):
+    cache = VocabularyCache(background=False)
+    assert cache.get()["ids"] == ["1"]
+    runner.invoke(add, ['-de', 'task4', '-gr', 'New', '-db', db_path])
+    # Stale till the generation is bumped by the mutation
+    assert cache.get()["ids"] == ["1"]
+    cache.bump()
+    assert cache.generation == 1
+    assert cache.get()["ids"] == ["1", "2"]
+    assert "New" in cache.get()["groups"]
+
+
+def test_vocabulary_cache_background(db_path):
+    cache = VocabularyCache()
+    cache.get()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_vocabulary(session):
+        started.set()
+        release.wait(5)
+        return {"groups": ["Slow"], "contexts": [], "tags": [], "ids": []}
+
+    with mock.patch('src.mytcli.queries.get_vocabulary', slow_vocabulary):
+        cache.bump()
+        assert started.wait(5)
+        # Previous snapshot is used while the refresh is running
+        assert cache.get()["groups"] == ["Home", "Work", "Work.Dev"]
+        release.set()
+        for _ in range(100):
+            if cache.get()["groups"] == ["Slow"]:
+                break
+            threading.Event().wait(0.05)
+    assert cache.get()["groups"] == ["Slow"]
+
+
+def test_completer_values(db_path):
+    completer = MytCompleter(background=False)
+    assert completions(completer, "view gr:w") == ["gr:Work", "gr:Work.Dev"]
+    assert completions(completer, "view tg:") == ["tg:backend", "tg:urgent"]
+    assert completions(completer, "view cx:") == ["cx:office"]
+    assert completions(completer, "done id:") == ["id:1"]
+    assert completions(completer, "add +H") == ["+Home"]
+    runner.invoke(add, ['-de', 'task4', '-cx', 'phone', '-db', db_path])
+    completer.invalidate_cache()
+    assert completions(completer, "view cx:") == ["cx:office", "cx:phone"]
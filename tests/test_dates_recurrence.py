@@ -10,6 +10,7 @@ Covers:
 - Edge cases: no due with hide, clear due retaining hide, etc.
 """
 
+import shutil
 import tempfile
 import pytest
 import mock
@@ -21,9 +22,16 @@ from src.mytcli.myt import add, modify, delete, done, revert, start, view, admin
 from src.mytcli.utils import (
     convert_date, convert_date_rel, is_date_short_format,
     adjust_date, calc_next_inst_date, parse_n_validate_recur,
+    calc_recur_inst_dates, derive_task_ids,
 )
+from src.mytcli.operations import create_recur_inst, prep_recurring_tasks
+from src.mytcli.queries import get_tasks, get_tags, get_task_uuid_n_ver
+from src.mytcli.models import (Workspace, WorkspaceTags, WorkspaceRecurDates,
+                               WorkspaceLatest, AppMetadata)
+import src.mytcli.db as db
 from src.mytcli.constants import (
-    CLR_STR, FMT_DATEONLY, SUCCESS, FAILURE,
+    CLR_STR, FMT_DATEONLY, SUCCESS, FAILURE, FUTDT, UNTIL_WHEN,
+    TASK_TYPE_DRVD,
     MODE_DAILY, MODE_WEEKLY, MODE_MONTHLY, MODE_YEARLY,
     MODE_WKDAY, MODE_MTHDYS, MODE_MONTHS,
 )
@@ -373,6 +381,59 @@ class TestCalcNextInstDate:
         assert result[1] == date(2024, 3, 31)  # Feb skipped (no 31st day)
 
 
+class TestCalcRecurInstDates:
+
+    def _next_inst_loop(self, mode, when, start_dt, end_dt, skip_start,
+                        create_one):
+        """Instance dates as created one at a time by prep_recurring_tasks"""
+        curr_date = date.today()
+        dates = calc_next_inst_date(mode, when, start_dt, end_dt)
+        if skip_start:
+            dates = dates[1:]
+        inst_dates = []
+        while dates:
+            next_due = dates[0]
+            if not (create_one
+                    or (next_due - curr_date).days < UNTIL_WHEN.get(mode)):
+                break
+            inst_dates.append(next_due)
+            create_one = False
+            dates = calc_next_inst_date(mode, when, next_due, end_dt)[1:]
+        return inst_dates
+
+    @pytest.mark.parametrize("mode, when", [
+        (MODE_DAILY, None), (MODE_DAILY, "E3"), (MODE_WEEKLY, None),
+        (MODE_WEEKLY, "E2"), (MODE_MONTHLY, None), (MODE_YEARLY, None),
+        (MODE_WKDAY, "1,3,5"), (MODE_MTHDYS, "1,15,31"),
+        (MODE_MONTHS, "3,9"),
+    ])
+    def test_matches_next_inst_date(self, mode, when):
+        for days_ago in (0, 3, 40, 400):
+            start_dt = date.today() - relativedelta(days=days_ago)
+            for end_dt in (FUTDT, date.today() + relativedelta(days=1)):
+                for skip_start, create_one in ((False, True), (True, False),
+                                               (True, True)):
+                    assert (calc_recur_inst_dates(mode, when, start_dt,
+                                                  end_dt, skip_start,
+                                                  create_one)
+                            == self._next_inst_loop(mode, when, start_dt,
+                                                    end_dt, skip_start,
+                                                    create_one))
+
+    def test_future_start_creates_one(self):
+        start_dt = date.today() + relativedelta(days=30)
+        assert calc_recur_inst_dates(MODE_DAILY, None, start_dt, FUTDT,
+                                     False, True) == [start_dt]
+        assert calc_recur_inst_dates(MODE_DAILY, None, start_dt, FUTDT,
+                                     True, False) == []
+
+    def test_end_date_before_start(self):
+        start_dt = date.today()
+        end_dt = start_dt - relativedelta(days=1)
+        assert calc_recur_inst_dates(MODE_DAILY, None, start_dt, end_dt,
+                                     False, True) == []
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # INTEGRATION TESTS: Add with due dates
 # ═══════════════════════════════════════════════════════════════════════
@@ -1667,3 +1728,159 @@ class TestModifyHideRecurringFixed:
         assert result.exit_code == 0
         assert result.exception is None
         _cleanup(db_path, 'tfix6b')
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# INTEGRATION TESTS: Recurring instances created on the first run of a day
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestCreateRecurInst:
+
+    def _setup_db(self):
+        path = tempfile.mkdtemp() + "/test_recur_inst.sqlite3"
+        with mock.patch('builtins.input', return_value="yes"):
+            runner.invoke(admin, ['--reinit', '-db', path])
+        for args in (['-de', 'Inst daily', '-re', 'D', '-du', '-5',
+                      '-hi', '-1', '-tg', 'tinst1,tinst2'],
+                     ['-de', 'Inst weekly', '-re', 'W', '-du', '-20',
+                      '-gr', 'INST'],
+                     ['-de', 'Inst weekdays', '-re', 'WD1,3,5', '-du', '-9'],
+                     ['-de', 'Inst every 3', '-re', 'DE3', '-du', '-7',
+                      '-en', '+20', '-tg', 'tinst1'],
+                     ['-de', 'Inst normal', '-du', '+1']):
+            assert _add(path, args).exit_code == 0
+        # Remove the recent instances as if the days since had not been run
+        cutoff = (date.today() - relativedelta(days=2)).strftime(FMT_DATEONLY)
+        db.connect_to_tasksdb(full_db_path=path)
+        inst = (db.SESSION.query(Workspace.uuid, Workspace.base_uuid,
+                                 Workspace.due)
+                .filter(Workspace.task_type == TASK_TYPE_DRVD,
+                        Workspace.due >= cutoff)
+                .all())
+        for uuidn, base_uuid, due in inst:
+            for model in (WorkspaceTags, WorkspaceLatest, Workspace):
+                (db.SESSION.query(model).filter(model.uuid == uuidn)
+                 .delete(synchronize_session=False))
+            (db.SESSION.query(WorkspaceRecurDates)
+             .filter(WorkspaceRecurDates.uuid == base_uuid,
+                     WorkspaceRecurDates.due == due)
+             .delete(synchronize_session=False))
+        db.SESSION.commit()
+        db.discard_db_resources()
+        return path
+
+    def _instances(self, path, create_func):
+        db.connect_to_tasksdb(full_db_path=path)
+        existing = {row[0] for row in db.SESSION.query(Workspace.uuid).all()}
+        assert create_func() == SUCCESS
+        db.SESSION.commit()
+        inst = []
+        for task in (db.SESSION.query(Workspace)
+                     .filter(Workspace.uuid.notin_(existing)).all()):
+            tags = sorted(row[0] for row in
+                          db.SESSION.query(WorkspaceTags.tags)
+                          .filter(WorkspaceTags.uuid == task.uuid).all())
+            inst.append((task.base_uuid, task.due, task.hide, task.id,
+                         task.version, task.description, task.groups,
+                         task.event_id, task.status, task.area,
+                         task.task_type, task.duration, tags))
+        latest = (db.SESSION.query(WorkspaceLatest)
+                  .filter(WorkspaceLatest.uuid.notin_(existing)).count())
+        rec_dates = sorted(db.SESSION.query(WorkspaceRecurDates.uuid,
+                                            WorkspaceRecurDates.version,
+                                            WorkspaceRecurDates.due).all())
+        db.discard_db_resources()
+        assert latest == len(inst)
+        return sorted(inst), rec_dates
+
+    def _per_task(self):
+        uuid_version_results = get_task_uuid_n_ver({"osrecur": "yes"})
+        for task in get_tasks(uuid_version_results):
+            ret, _ = prep_recurring_tasks(task,
+                                          get_tags(task.uuid, task.version),
+                                          True)
+            assert ret == SUCCESS
+        return SUCCESS
+
+    def test_matches_per_task(self):
+        path = self._setup_db()
+        path_copy = path + ".copy"
+        shutil.copy(path, path_copy)
+        expected = self._instances(path_copy, self._per_task)
+        actual = self._instances(path, create_recur_inst)
+        assert actual[0]
+        assert actual == expected
+
+    def test_nothing_due(self):
+        path = self._setup_db()
+        self._instances(path, create_recur_inst)
+        inst, _ = self._instances(path, create_recur_inst)
+        assert inst == []
+
+    def test_derive_task_ids(self):
+        path = self._setup_db()
+        db.connect_to_tasksdb(full_db_path=path)
+        used = {row[0] for row in db.SESSION.query(WorkspaceLatest.id)
+                .filter(WorkspaceLatest.id.notin_(['-', '*'])).all()}
+        ids = derive_task_ids(5)
+        db.discard_db_resources()
+        assert len(ids) == 5
+        assert not used & set(ids)
+        assert ids == sorted(ids)
+        assert ids[-1] <= max(used, default=0) + 5
+
+    def _set_watermark(self, path, day):
+        db.connect_to_tasksdb(full_db_path=path)
+        (db.SESSION.query(AppMetadata)
+         .filter(AppMetadata.key == "LAST_RECUR_CREATE_DT")
+         .update({AppMetadata.value: day.strftime(FMT_DATEONLY)}))
+        db.SESSION.commit()
+        db.discard_db_resources()
+
+    def _recent_count(self, path):
+        cutoff = (date.today() - relativedelta(days=2)).strftime(FMT_DATEONLY)
+        db.connect_to_tasksdb(full_db_path=path)
+        count = (db.SESSION.query(Workspace)
+                 .filter(Workspace.task_type == TASK_TYPE_DRVD,
+                         Workspace.due >= cutoff)
+                 .count())
+        due = db.is_recur_inst_due()
+        db.discard_db_resources()
+        return count, due
+
+    def test_background_view(self):
+        path = self._setup_db()
+        result = runner.invoke(admin, ['--recur-mode', 'background',
+                                       '-db', path])
+        assert result.exit_code == 0
+        assert "Recurrence mode set to 'background'." in result.output
+        self._set_watermark(path, date.today() - relativedelta(days=1))
+        db.RECUR_PROC = None
+        result = runner.invoke(view, ['-db', path])
+        assert result.exit_code == 0
+        assert db.RECUR_PROC is not None
+        assert db.RECUR_PROC.wait(timeout=120) == 0
+        db.RECUR_PROC = None
+        count, due = self._recent_count(path)
+        assert count > 0
+        assert not due
+        # Commands which change tasks still create them before running
+        self._set_watermark(path, date.today() - relativedelta(days=1))
+        result = _add(path, ['-de', 'Inst after', '-tg', 'tinst3'])
+        assert result.exit_code == 0
+        assert db.RECUR_PROC is None
+        assert self._recent_count(path) == (count, False)
+
+    def test_watermark_claimed_once(self):
+        path = self._setup_db()
+        before = self._recent_count(path)
+        db.connect_to_tasksdb(full_db_path=path)
+        # As if another process moved the watermark after it was read
+        with mock.patch('src.mytcli.db.is_recur_inst_due',
+                        return_value=True), \
+             mock.patch('src.mytcli.operations.create_recur_inst') as create:
+            assert db.create_recur_inst_if_due() == SUCCESS
+        db.SESSION.commit()
+        db.discard_db_resources()
+        create.assert_not_called()
+        assert self._recent_count(path) == before
@@ -0,0 +1,114 @@
+"""Tests for the group hierarchy of the tasks in 'workspace_groups'."""
+
+import sqlite3
+import tempfile
+
+import mock
+import pytest
+from click.testing import CliRunner
+
+from src.mytcli.myt import add, modify, delete, undo, admin, view
+from src.mytcli.models import WorkspaceGroups
+from src.mytcli.queries import (get_task_uuid_n_ver, get_tasks,
+                                get_all_groups, get_group_counts)
+from src.mytcli.constants import TASK_ALL
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def db_path():
+    path = tempfile.mkdtemp() + "/test_groups.sqlite3"
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--reinit', '-db', path])
+    runner.invoke(add, ['-de', 'Proj A task', '-gr', 'WORK.PROJA', '-cx',
+                        'desk', '-db', path])
+    runner.invoke(add, ['-de', 'Proj A sub task', '-gr', 'WORK.PROJA.SUB',
+                        '-db', path])
+    runner.invoke(add, ['-de', 'Homework task', '-gr', 'HOMEWORK', '-db',
+                        path])
+    runner.invoke(add, ['-de', 'No group task', '-db', path])
+    return path
+
+
+def group_tasks(db_path, group):
+    db.connect_to_tasksdb(full_db_path=db_path)
+    tasks = get_tasks(get_task_uuid_n_ver({"group": group}))
+    return sorted(task.description for task in tasks)
+
+
+@pytest.mark.parametrize("group, expected", [
+    ("WORK", ["Proj A sub task", "Proj A task"]),
+    ("work.proja", ["Proj A sub task", "Proj A task"]),
+    ("WORK.PROJA.", ["Proj A sub task", "Proj A task"]),
+    ("WORK.PROJA.SUB", ["Proj A sub task"]),
+    ("HOMEWORK", ["Homework task"]),
+    ("PROJA", []),
+    ("WO", []),
+])
+def test_group_filter(db_path, group, expected):
+    assert group_tasks(db_path, group) == expected
+
+
+def test_group_follows_changes(db_path):
+    runner.invoke(modify, ['id:1', '-gr', 'HOME.GARDEN', '-db', db_path])
+    assert group_tasks(db_path, "WORK") == ["Proj A sub task"]
+    assert group_tasks(db_path, "HOME") == ["Proj A task"]
+    runner.invoke(undo, ['-db', db_path])
+    assert group_tasks(db_path, "HOME") == []
+    assert group_tasks(db_path, "WORK") == ["Proj A sub task", "Proj A task"]
+    runner.invoke(modify, ['id:1', '-gr', 'clr', '-db', db_path])
+    assert group_tasks(db_path, "WORK") == ["Proj A sub task"]
+    runner.invoke(delete, ['gr:HOMEWORK', '-db', db_path])
+    assert group_tasks(db_path, "HOMEWORK") == []
+    assert "HOMEWORK" not in get_all_groups()
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--empty', '-db', db_path])
+    db.connect_to_tasksdb(full_db_path=db_path)
+    assert (db.SESSION.query(WorkspaceGroups)
+            .filter(WorkspaceGroups.path == "HOMEWORK").count()) == 0
+
+
+def test_group_recurring(db_path):
+    runner.invoke(add, ['-de', 'Recurring task', '-gr', 'HOME.BILLS', '-re',
+                        'D', '-du', '-2', '-db', db_path])
+    # The base task and the instances for the last 2 days and today
+    assert group_tasks(db_path, "HOME") == ["Recurring task"] * 4
+
+
+def test_all_groups(db_path):
+    db.connect_to_tasksdb(full_db_path=db_path)
+    assert get_all_groups() == ["HOMEWORK", "WORK", "WORK.PROJA",
+                                "WORK.PROJA.SUB"]
+
+
+def test_group_counts(db_path):
+    db.connect_to_tasksdb(full_db_path=db_path)
+    group_counts = get_group_counts(get_task_uuid_n_ver({TASK_ALL: "yes"}))
+    assert sorted(group_counts) == [
+        ("+NONE", "@NONE", "TO_DO", 1),
+        ("HOMEWORK", "@NONE", "TO_DO", 1),
+        ("WORK", "@NONE", "TO_DO", 1),
+        ("WORK", "desk", "TO_DO", 1),
+        ("WORK.PROJA", "@NONE", "TO_DO", 1),
+        ("WORK.PROJA", "desk", "TO_DO", 1),
+        ("WORK.PROJA.SUB", "@NONE", "TO_DO", 1),
+    ]
+    result = runner.invoke(view, ['--groups', '-db', db_path])
+    assert result.exit_code == 0
+    assert "WORK.PROJA.SUB" in result.output
+
+
+def test_group_migration(db_path):
+    # Databases from before the group hierarchy are migrated
+    db.discard_db_resources()
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE workspace_groups")
+    conn.execute("UPDATE app_metadata SET value = '0.5' "
+                 "WHERE key = 'DB_SCHEMA_VERSION'")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(admin, ['--verify', '-db', db_path])
+    assert "Database migrated: added group hierarchy." in result.output
+    assert group_tasks(db_path, "WORK") == ["Proj A sub task", "Proj A task"]
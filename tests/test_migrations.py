@@ -0,0 +1,107 @@
+"""Tests for the migration of databases from the earlier schema versions.
+
+Each database is loaded from tests/data/schema_<version>.sql, which holds the
+schema and tasks of a database created by the release of that version,
+refer tests/data/dump_schema.py. A single run of the current version must
+migrate it and return the same tasks for the views and filters.
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import pytest
+from click.testing import CliRunner
+
+from src.mytcli.myt import add, view, undo, admin
+from src.mytcli.constants import DB_SCHEMA_VER
+from src.mytcli.queries import get_task_uuid_n_ver, get_tasks
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+VERSIONS = ["0.2", "0.3", "0.4", "0.5", "0.6", "0.7", "0.8"]
+
+
+def load_schema(version):
+    path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    with open(os.path.join(DATA_DIR, "schema_{}.sql"
+                           .format(version.replace(".", "_")))) as script:
+        conn = sqlite3.connect(path)
+        conn.executescript(script.read())
+        conn.close()
+    return path
+
+
+@pytest.fixture(params=VERSIONS)
+def old_db_path(request):
+    return load_schema(request.param)
+
+
+def get_schema_version(path):
+    conn = sqlite3.connect(path)
+    version = conn.execute("SELECT value FROM app_metadata "
+                           "WHERE key = 'DB_SCHEMA_VERSION'").fetchone()[0]
+    conn.close()
+    return float(version)
+
+
+def search(path, **potential_filters):
+    db.connect_to_tasksdb(full_db_path=path)
+    tasks = get_tasks(get_task_uuid_n_ver(potential_filters))
+    return sorted(task.description for task in tasks)
+
+
+def test_schema_data():
+    # Every data file is at the version it is named for
+    for version in VERSIONS:
+        assert get_schema_version(load_schema(version)) == float(version)
+
+
+def test_migration_once(old_db_path):
+    result = runner.invoke(view, ['-db', old_db_path])
+    assert result.exit_code == 0
+    assert "Database migrated: added integer date columns." in result.output
+    assert "Displayed Tasks: 3" in result.output
+    assert "Total Pending Tasks: 4, of which Hidden: 1" in result.output
+    assert get_schema_version(old_db_path) == DB_SCHEMA_VER
+    result = runner.invoke(view, ['-db', old_db_path])
+    assert "Database migrated" not in result.output
+    assert "Displayed Tasks: 3" in result.output
+
+
+@pytest.mark.parametrize("potential_filters, expected", [
+    ({}, ["Budget review", "Started task", "Task one"]),
+    ({"group": "WORK"}, ["Task one"]),
+    ({"tag": "t2"}, ["Task one"]),
+    ({"context": "OFFICE"}, ["Started task"]),
+    ({"due": ["lt", "2025-01-01", None]}, ["Budget review"]),
+    ({"due": ["bt", "2030-01-01", "2030-12-31"]}, ["Hidden task",
+                                                   "Task one"]),
+    ({"desc": "budget"}, ["Budget review"]),
+    ({"notes": "quarterly"}, ["Budget review"]),
+    ({"OVERDUE": "yes"}, ["Budget review"]),
+    ({"HIDDEN": "yes"}, ["Hidden task"]),
+    ({"STARTED": "yes"}, ["Started task"]),
+    ({"COMPLETE": "yes"}, ["Task three"]),
+    ({"BIN": "yes"}, ["Task four"]),
+])
+def test_migration_filters(old_db_path, potential_filters, expected):
+    runner.invoke(view, ['-db', old_db_path])
+    if not potential_filters:
+        potential_filters = {"ALL": "yes"}
+    assert search(old_db_path, **potential_filters) == expected
+
+
+def test_migration_changes(old_db_path):
+    # Derived tables are consistent and the tasks can be changed and undone
+    result = runner.invoke(admin, ['--verify', '-db', old_db_path])
+    assert result.exit_code == 0
+    assert "Free task IDs are consistent." in result.output
+    result = runner.invoke(add, ['-de', 'Task after migration', '-db',
+                                 old_db_path])
+    assert "Added/Updated Task ID: 3" in result.output
+    result = runner.invoke(undo, ['-db', old_db_path])
+    assert "Undone 1 change(s)." in result.output
+    assert search(old_db_path, desc="migration") == []
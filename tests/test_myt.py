@@ -6,6 +6,8 @@ from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 import mock
 import logging
+import os
+import sqlite3
 
 from src.mytcli.myt import add
 from src.mytcli.myt import modify
@@ -20,6 +22,9 @@ from src.mytcli.myt import view
 from src.mytcli.myt import now
 from src.mytcli.myt import urlopen
 from src.mytcli.myt import stats
+from src.mytcli.myt import undo
+from src.mytcli.myt import redo
+import src.mytcli.db as db
 
 runner = CliRunner()
 # Use db in a temp location
@@ -774,6 +779,20 @@ def test_view4(create_task3, set_full_db_path):
     assert "Total Pending Tasks: 2, of which Hidden: 0" in result.output
     runner.invoke(delete, ['tg:view4', '-db', set_full_db_path])                     
 
+def test_view5(create_task3, set_full_db_path):
+    duedt = (date.today() + relativedelta(days=-2)).strftime("%Y-%m-%d")
+    runner.invoke(add, ['-de', 'Top', '-tg','view5','-du', duedt,
+                        '-db', set_full_db_path])
+    with mock.patch('src.mytcli.display.RichTable.add_row',
+                    autospec=True) as add_row:
+        result = runner.invoke(view, ['--top', '1', '-db', set_full_db_path])
+    assert result.exit_code == 0
+    # One row for the overdue task with the top score and one for the legend
+    assert add_row.call_count == 2
+    assert "Top" in add_row.call_args_list[0].args
+    assert "Displayed Tasks: 2" in result.output
+    runner.invoke(delete, ['tg:view5', '-db', set_full_db_path])
+
 def test_admin_empty_1(set_full_db_path):
     result = runner.invoke(add, ['-de', 'Test task 10.1', '-db', set_full_db_path])
     temp = result.output.replace("\n"," ")
@@ -826,6 +845,417 @@ def test_admin_groups_2(set_full_db_path):
     runner.invoke(delete, ['gr:OTH', '-db', set_full_db_path])
     runner.invoke(delete, ['gr:PERS', '-db', set_full_db_path])
 
+def test_admin_verify_1(set_full_db_path):
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--reinit', '-db', set_full_db_path])
+    runner.invoke(add, ['-de', 'Test task 20.1', '-tg', 'verify1', '-db',
+                        set_full_db_path])
+    runner.invoke(add, ['-de', 'Test task 20.2', '-tg', 'verify1', '-du', '+1',
+                        '-re', 'D', '-db', set_full_db_path])
+    runner.invoke(modify, ['id:1', '-pr', 'H', '-db', set_full_db_path])
+    runner.invoke(start, ['id:1', '-db', set_full_db_path])
+    runner.invoke(done, ['id:2', '-db', set_full_db_path])
+    runner.invoke(undo, ['-db', set_full_db_path])
+    runner.invoke(undo, ['-db', set_full_db_path])
+    result = runner.invoke(admin, ['--verify', '-db', set_full_db_path])
+    assert result.exit_code == 0
+    assert "Latest versions of tasks are consistent." in result.output
+    with mock.patch('builtins.input', return_value="all"):
+        runner.invoke(delete, ['tg:verify1', '-db', set_full_db_path])
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--empty', '-db', set_full_db_path])
+    result = runner.invoke(admin, ['--verify', '-db', set_full_db_path])
+    assert result.exit_code == 0
+    assert "Latest versions of tasks are consistent." in result.output
+
+def test_admin_verify_2(set_full_db_path):
+    runner.invoke(add, ['-de', 'Test task 21.1', '-db', set_full_db_path])
+    runner.invoke(add, ['-de', 'Test task 21.2', '-db', set_full_db_path])
+    conn = sqlite3.connect(set_full_db_path)
+    conn.execute("DELETE FROM workspace_latest WHERE id = 1")
+    conn.execute("UPDATE workspace_latest SET area = 'bin' WHERE id = 2")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(admin, ['--verify', '-db', set_full_db_path])
+    assert result.exit_code == 1
+    assert "Latest versions out of sync for 2 task(s):" in result.output
+    result = runner.invoke(admin, ['--rebuild', '--verify', '-db',
+                                   set_full_db_path])
+    assert result.exit_code == 0
+    assert "Latest versions of tasks rebuilt." in result.output
+    assert "Latest versions of tasks are consistent." in result.output
+    result = runner.invoke(view, ['-db', set_full_db_path])
+    assert "Displayed Tasks: 2" in result.output
+    runner.invoke(delete, ['id:1,2', '-db', set_full_db_path])
+
+def test_undo_reassigns_unique_ids(set_full_db_path):
+    from src.mytcli.queries import get_all_ids
+    for i in range(3):
+        runner.invoke(add, ['-de', 'Test task 23.' + str(i), '-tg', 'undoids',
+                            '-db', set_full_db_path])
+    runner.invoke(modify, ['tg:undoids', '-pr', 'H', '-db', set_full_db_path])
+    runner.invoke(undo, ['-db', set_full_db_path])
+    assert sorted(get_all_ids()) == ['1', '2', '3']
+    result = runner.invoke(admin, ['--verify', '-db', set_full_db_path])
+    assert result.exit_code == 0
+    runner.invoke(delete, ['tg:undoids', '-db', set_full_db_path])
+
+def snapshot_tasks(full_db_path):
+    conn = sqlite3.connect(full_db_path)
+    tables = {table: sorted(conn.execute("SELECT * FROM {}".format(table))
+                            .fetchall(), key=repr)
+              for table in ["workspace", "workspace_tags", "workspace_latest",
+                            "workspace_groups", "workspace_free_ids",
+                            "workspace_events"]}
+    conn.close()
+    return tables
+
+def count_high_priority(full_db_path):
+    conn = sqlite3.connect(full_db_path)
+    count = conn.execute("SELECT count(*) FROM workspace ws "
+                         "JOIN workspace_latest lt ON lt.uuid = ws.uuid "
+                         "AND lt.version = ws.version "
+                         "WHERE ws.priority = 'H'").fetchone()[0]
+    conn.close()
+    return count
+
+def test_undo_redo_1():
+    # Undo a few changes at once and redo them one at a time
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    for i in range(3):
+        runner.invoke(add, ['-de', 'Test task 29.' + str(i), '-tg', 'redo',
+                            '-gr', 'REDO', '-db', full_db_path])
+    runner.invoke(modify, ['tg:redo', '-pr', 'H', '-db', full_db_path])
+    runner.invoke(done, ['id:1,2', '-db', full_db_path])
+    before = snapshot_tasks(full_db_path)
+    result = runner.invoke(undo, ['2', '-db', full_db_path])
+    assert result.exit_code == 0
+    assert "Undone 2 change(s)." in result.output
+    assert count_high_priority(full_db_path) == 0
+    result = runner.invoke(redo, ['-db', full_db_path])
+    assert "Redone 1 change(s)." in result.output
+    assert count_high_priority(full_db_path) == 3
+    result = runner.invoke(redo, ['5', '-db', full_db_path])
+    assert "No more redo actions available" in result.output
+    assert "Redone 1 change(s)." in result.output
+    assert snapshot_tasks(full_db_path) == before
+    result = runner.invoke(admin, ['--verify', '-db', full_db_path])
+    assert result.exit_code == 0
+
+def test_undo_redo_2():
+    # A new change after an undo cannot be followed by a redo
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    runner.invoke(add, ['-de', 'Test task 30.1', '-db', full_db_path])
+    runner.invoke(add, ['-de', 'Test task 30.2', '-db', full_db_path])
+    runner.invoke(undo, ['-db', full_db_path])
+    runner.invoke(add, ['-de', 'Test task 30.3', '-db', full_db_path])
+    result = runner.invoke(redo, ['-db', full_db_path])
+    assert "No more redo actions available" in result.output
+    # Undo stops once there are no more changes
+    result = runner.invoke(undo, ['3', '-db', full_db_path])
+    assert "Undone 2 change(s)." in result.output
+    assert "No more undo actions available" in result.output
+    result = runner.invoke(view, ['-db', full_db_path])
+    assert "No tasks to display..." in result.output
+
+def test_undo_redo_3():
+    # The recurring instances created on the first run of the day keep the
+    # changes which can be redone
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    runner.invoke(add, ['-de', 'Test task 30.4', '-du', '+0', '-re', 'D',
+                        '-db', full_db_path])
+    runner.invoke(add, ['-de', 'Test task 30.5', '-db', full_db_path])
+    runner.invoke(undo, ['-db', full_db_path])
+    # The last instance was created yesterday
+    conn = sqlite3.connect(full_db_path)
+    conn.execute("UPDATE workspace_recur_dates "
+                 "SET due = date(due, '-1 day')")
+    conn.execute("UPDATE app_metadata SET value = date('now', '-1 day') "
+                 "WHERE key = 'LAST_RECUR_CREATE_DT'")
+    conn.commit()
+    instances = ("SELECT count(*) FROM workspace "
+                 "WHERE task_type = 'DERIVED'")
+    before = conn.execute(instances).fetchone()[0]
+    conn.close()
+    runner.invoke(view, ['-db', full_db_path])
+    conn = sqlite3.connect(full_db_path)
+    assert conn.execute(instances).fetchone()[0] > before
+    conn.close()
+    result = runner.invoke(redo, ['-db', full_db_path])
+    assert "Redone 1 change(s)." in result.output
+    result = runner.invoke(view, ['de:30.5', '-db', full_db_path])
+    assert "Displayed Tasks: 1" in result.output
+
+def test_undo_list_1():
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    runner.invoke(add, ['-de', 'Test task 31.1', '-db', full_db_path])
+    runner.invoke(add, ['-de', 'Test task 31.2', '-db', full_db_path])
+    runner.invoke(modify, ['id:1', '-pr', 'H', '-db', full_db_path])
+    result = runner.invoke(undo, ['--list', '-db', full_db_path])
+    assert result.exit_code == 0
+    assert "Total number of changes: 3" in result.output
+    assert "modify" in result.output
+    result = runner.invoke(undo, ['--list', '1', '-db', full_db_path])
+    assert "Total number of changes: 1" in result.output
+    assert "Test task 31.2" not in result.output
+    result = runner.invoke(undo, ['--list', '--since', '+1', '-db',
+                                  full_db_path])
+    assert "No changes to display." in result.output
+    result = runner.invoke(undo, ['--list', '--since', '-1', '-db',
+                                  full_db_path])
+    assert "Total number of changes: 3" in result.output
+    result = runner.invoke(undo, ['--list', '--since', 'abc', '-db',
+                                  full_db_path])
+    assert result.exit_code == 1
+    # Listing does not undo
+    assert count_high_priority(full_db_path) == 1
+
+def test_undo_migration_1():
+    # Databases from before the events journal are migrated
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    runner.invoke(add, ['-de', 'Test task 32.1', '-db', full_db_path])
+    runner.invoke(modify, ['id:1', '-pr', 'H', '-db', full_db_path])
+    conn = sqlite3.connect(full_db_path)
+    conn.execute("DROP TABLE workspace_events")
+    conn.execute("DROP TABLE workspace_redo")
+    conn.execute("UPDATE app_metadata SET value = '0.7' "
+                 "WHERE key = 'DB_SCHEMA_VERSION'")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(view, ['-db', full_db_path])
+    assert "Database migrated: added events journal." in result.output
+    result = runner.invoke(undo, ['-db', full_db_path])
+    assert "Undone 1 change(s)." in result.output
+    assert count_high_priority(full_db_path) == 0
+    result = runner.invoke(redo, ['-db', full_db_path])
+    assert "Redone 1 change(s)." in result.output
+
+def test_date_columns_migration_1():
+    # Databases from before the integer date columns are migrated
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    runner.invoke(add, ['-de', 'Test task 33.1', '-du', '-1', '-db',
+                        full_db_path])
+    runner.invoke(add, ['-de', 'Test task 33.2', '-du', '+10', '-db',
+                        full_db_path])
+    conn = sqlite3.connect(full_db_path)
+    for index in ["idx_ws_due_day", "idx_ws_hide_day", "idx_ws_created_sec"]:
+        conn.execute("DROP INDEX {}".format(index))
+    for col in ["due_day", "hide_day", "created_sec", "inception_sec",
+                "dur_event_sec"]:
+        conn.execute("ALTER TABLE workspace DROP COLUMN {}".format(col))
+    conn.execute("CREATE INDEX idx_ws_due ON workspace(due)")
+    conn.execute("UPDATE app_metadata SET value = '0.8' "
+                 "WHERE key = 'DB_SCHEMA_VERSION'")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(view, ['du:lt:+0', '-db', full_db_path])
+    assert "Database migrated: added integer date columns." in result.output
+    assert "Displayed Tasks: 1" in result.output
+    result = runner.invoke(view, ['OVERDUE', '-db', full_db_path])
+    assert "Displayed Tasks: 1" in result.output
+    conn = sqlite3.connect(full_db_path)
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT uuid FROM workspace "
+                        "WHERE due_day < 0").fetchall()
+    indexes = conn.execute("SELECT name FROM sqlite_master "
+                           "WHERE name = 'idx_ws_due'").fetchall()
+    conn.close()
+    assert "idx_ws_due_day" in plan[0][-1]
+    assert indexes == []
+
+def test_date_columns_migration_2(caplog):
+    # The date columns need SQLite 3.31.0, older libraries are not migrated
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    runner.invoke(add, ['-de', 'Test task 34.1', '-db', full_db_path])
+    conn = sqlite3.connect(full_db_path)
+    conn.execute("UPDATE app_metadata SET value = '0.8' "
+                 "WHERE key = 'DB_SCHEMA_VERSION'")
+    conn.commit()
+    conn.close()
+    with mock.patch.object(sqlite3, "sqlite_version_info", (3, 30, 1)):
+        result = runner.invoke(view, ['-db', full_db_path])
+    assert result.exit_code == 1
+    assert "SQLite 3.31.0 or later is required" in caplog.text
+    assert "Database migrated" not in result.output
+    conn = sqlite3.connect(full_db_path)
+    version = conn.execute("SELECT value FROM app_metadata "
+                           "WHERE key = 'DB_SCHEMA_VERSION'").fetchone()
+    conn.close()
+    assert version[0] == "0.8"
+    # Nor are new databases created
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    with mock.patch.object(sqlite3, "sqlite_version_info", (3, 30, 1)):
+        result = runner.invoke(add, ['-de', 'Test task 34.2', '-db',
+                                     full_db_path])
+    assert result.exit_code == 1
+    assert not os.path.exists(full_db_path)
+
+def test_admin_verify_3(set_full_db_path):
+    # Databases from before the latest versions table are migrated
+    runner.invoke(add, ['-de', 'Test task 22.1', '-db', set_full_db_path])
+    conn = sqlite3.connect(set_full_db_path)
+    conn.execute("DROP TABLE workspace_latest")
+    conn.execute("UPDATE app_metadata SET value = '0.2' "
+                 "WHERE key = 'DB_SCHEMA_VERSION'")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(view, ['-db', set_full_db_path])
+    assert "Database migrated: added latest versions lookup." in result.output
+    assert "Displayed Tasks: 1" in result.output
+    result = runner.invoke(admin, ['--verify', '-db', set_full_db_path])
+    assert result.exit_code == 0
+    runner.invoke(delete, ['id:1', '-db', set_full_db_path])
+
+def test_admin_verify_4(set_full_db_path):
+    # Free task IDs are reused smallest first and kept in sync
+    for i in range(1, 6):
+        runner.invoke(add, ['-de', 'Test task 25.' + str(i), '-tg', 'freeids',
+                            '-db', set_full_db_path])
+    runner.invoke(done, ['id:2', '-db', set_full_db_path])
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(delete, ['id:4,5', '-db', set_full_db_path])
+    result = runner.invoke(add, ['-de', 'Test task 25.6', '-tg', 'freeids',
+                                 '-db', set_full_db_path])
+    assert "Added/Updated Task ID: 2" in result.output
+    result = runner.invoke(add, ['-de', 'Test task 25.7', '-tg', 'freeids',
+                                 '-db', set_full_db_path])
+    assert "Added/Updated Task ID: 4" in result.output
+    result = runner.invoke(admin, ['--verify', '-db', set_full_db_path])
+    assert result.exit_code == 0
+    assert "Free task IDs are consistent." in result.output
+    conn = sqlite3.connect(set_full_db_path)
+    conn.execute("DELETE FROM workspace_free_ids WHERE id = 5")
+    conn.execute("INSERT INTO workspace_free_ids(id) VALUES (3)")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(admin, ['--verify', '-db', set_full_db_path])
+    assert result.exit_code == 1
+    assert "Free task IDs out of sync for 2 ID(s):" in result.output
+    assert "3, 5" in result.output
+    result = runner.invoke(admin, ['--rebuild', '--verify', '-db',
+                                   set_full_db_path])
+    assert result.exit_code == 0
+    assert "Free task IDs are consistent." in result.output
+    result = runner.invoke(add, ['-de', 'Test task 25.8', '-tg', 'freeids',
+                                 '-db', set_full_db_path])
+    assert "Added/Updated Task ID: 5" in result.output
+    runner.invoke(delete, ['tg:freeids', '-db', set_full_db_path])
+
+def test_admin_verify_5(set_full_db_path):
+    # Databases from before the free task IDs table are migrated
+    runner.invoke(add, ['-de', 'Test task 26.1', '-db', set_full_db_path])
+    runner.invoke(add, ['-de', 'Test task 26.2', '-db', set_full_db_path])
+    runner.invoke(done, ['id:1', '-db', set_full_db_path])
+    conn = sqlite3.connect(set_full_db_path)
+    for trigger in ["trg_ws_lt_ids_ins", "trg_ws_lt_ids_upd",
+                    "trg_ws_lt_ids_del"]:
+        conn.execute("DROP TRIGGER {}".format(trigger))
+    conn.execute("DROP TABLE workspace_free_ids")
+    conn.execute("UPDATE app_metadata SET value = '0.6' "
+                 "WHERE key = 'DB_SCHEMA_VERSION'")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(view, ['-db', set_full_db_path])
+    assert "Database migrated: added free task IDs." in result.output
+    result = runner.invoke(admin, ['--verify', '-db', set_full_db_path])
+    assert result.exit_code == 0
+    result = runner.invoke(add, ['-de', 'Test task 26.3', '-db',
+                                 set_full_db_path])
+    assert "Added/Updated Task ID: 1" in result.output
+    runner.invoke(delete, ['id:1,2', '-db', set_full_db_path])
+
+def test_admin_profile_1(set_full_db_path):
+    result = runner.invoke(admin, ['--profile', 'fast', '-db',
+                                   set_full_db_path])
+    assert result.exit_code == 0
+    assert "Database profile set to 'fast'." in result.output
+    runner.invoke(add, ['-de', 'Test task 24.1', '-db', set_full_db_path])
+    with db.ENGINE.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        # NORMAL
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+    db.ENGINE.dispose()
+    result = runner.invoke(view, ['-db', set_full_db_path])
+    assert "Displayed Tasks: 1" in result.output
+    result = runner.invoke(admin, ['--profile', 'durable', '-db',
+                                   set_full_db_path])
+    assert result.exit_code == 0
+    runner.invoke(delete, ['id:1', '-db', set_full_db_path])
+    with db.ENGINE.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+        # FULL
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 2
+    db.ENGINE.dispose()
+
+def test_admin_profile_2(set_full_db_path):
+    result = runner.invoke(admin, ['--profile', 'unsafe', '-db',
+                                   set_full_db_path])
+    assert result.exit_code == 2
+    assert "Invalid value for '--profile'" in result.output
+
+def test_admin_compact_1():
+    # Versions superseded before the days to keep are archived
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    runner.invoke(add, ['-de', 'Test task 27.1', '-tg', 'arch', '-db',
+                        full_db_path])
+    for pri in ['H', 'M', 'L']:
+        runner.invoke(modify, ['id:1', '-pr', pri, '-tg', 'arch' + pri, '-db',
+                               full_db_path])
+    runner.invoke(done, ['id:1', '-db', full_db_path])
+    result = runner.invoke(admin, ['--compact', '30', '-db', full_db_path])
+    assert result.exit_code == 0
+    assert "No versions of tasks to archive." in result.output
+    # All but the last change made 60 days back
+    conn = sqlite3.connect(full_db_path)
+    conn.execute("UPDATE workspace SET event_id = ? || substr(event_id, 21) "
+                 "WHERE version < 5",
+                 ((datetime.now() - relativedelta(days=60))
+                  .strftime("%Y%m%d%H%M%S%f"),))
+    conn.commit()
+    conn.close()
+    result = runner.invoke(admin, ['--compact', '30', '-db', full_db_path])
+    assert result.exit_code == 0
+    assert "Archived 3 version(s) of 1 task(s)" in result.output
+    conn = sqlite3.connect(full_db_path)
+    assert conn.execute("SELECT version FROM workspace").fetchall() == [(4,),
+                                                                       (5,)]
+    conn.close()
+    conn = sqlite3.connect(full_db_path.replace(".sqlite3",
+                                                "_archive.sqlite3"))
+    assert (conn.execute("SELECT count(*) FROM workspace_tags")
+            .fetchone()[0]) == 6
+    conn.close()
+    result = runner.invoke(view, ['--history', 'complete', '-db',
+                                  full_db_path])
+    assert "Displayed Tasks: 5" in result.output
+    result = runner.invoke(admin, ['--verify', '-db', full_db_path])
+    assert result.exit_code == 0
+    # The last change can be undone but not the ones before it
+    result = runner.invoke(undo, ['-db', full_db_path])
+    assert result.exit_code == 0
+    result = runner.invoke(undo, ['-db', full_db_path])
+    assert ("No more undo actions available, the earlier versions of the "
+            "tasks are archived") in result.output
+    result = runner.invoke(view, ['-db', full_db_path])
+    assert "Displayed Tasks: 1" in result.output
+
+def test_admin_compact_2():
+    # Emptying the bin removes the archived versions too
+    full_db_path = tempfile.mkdtemp() + "/tasksdb.sqlite3"
+    runner.invoke(add, ['-de', 'Test task 28.1', '-db', full_db_path])
+    runner.invoke(modify, ['id:1', '-pr', 'H', '-db', full_db_path])
+    runner.invoke(delete, ['id:1', '-db', full_db_path])
+    result = runner.invoke(admin, ['--compact', '0', '-db', full_db_path])
+    assert "Archived 2 version(s) of 1 task(s)" in result.output
+    with mock.patch('builtins.input', return_value="yes"):
+        result = runner.invoke(admin, ['--empty', '-db', full_db_path])
+    assert "Bin emptied!" in result.output
+    conn = sqlite3.connect(full_db_path.replace(".sqlite3",
+                                                "_archive.sqlite3"))
+    assert conn.execute("SELECT count(*) FROM workspace").fetchone()[0] == 0
+    conn.close()
+    result = runner.invoke(admin, ['--compact', '-1', '-db', full_db_path])
+    assert result.exit_code == 2
+
 def test_urlopen_1(set_full_db_path):
     result = runner.invoke(add, ['-de', 'Test task 13.1', '-du', '+0', '-no',
                             'Test https://abc.com [ABC] https://xy.com [ XY]', 
@@ -0,0 +1,121 @@
+"""Query plan regression tests for the task filters.
+
+Runs EXPLAIN QUERY PLAN on the statement issued by each branch of
+get_task_uuid_n_ver() and checks that the lookup is driven by an index
+rather than a full scan of the task history.
+"""
+
+import re
+import tempfile
+import pytest
+import mock
+from click.testing import CliRunner
+from sqlalchemy import event
+
+from src.mytcli.myt import add, admin
+from src.mytcli.queries import get_task_uuid_n_ver
+from src.mytcli.display import display_default
+from src.mytcli.constants import (TASK_ALL, TASK_NOW, TASK_OVERDUE,
+                                  TASK_TODAY, TASK_HIDDEN, TASK_STARTED,
+                                  TASK_COMPLETE, TASK_BIN)
+import src.mytcli.db as db
+
+runner = CliRunner()
+# A plan line for a table scan which does not use any index
+FULL_SCAN = re.compile(r"^SCAN (workspace|workspace_tags|workspace_latest|"
+                       r"workspace_groups)$")
+
+
+@pytest.fixture(scope='module')
+def db_path():
+    path = tempfile.mkdtemp() + "/test_plans.sqlite3"
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--reinit', '-db', path])
+    runner.invoke(add, ['-de', 'Plan task 1', '-gr', 'PLAN.ONE', '-tg', 'plan',
+                        '-du', '+1', '-db', path])
+    runner.invoke(add, ['-de', 'Plan task 2', '-du', '+1', '-re', 'D',
+                        '-db', path])
+    return path
+
+
+@pytest.fixture
+def plan_for(db_path):
+    """Returns the query plan lines for the statement run by the filters."""
+    def _plan_for(potential_filters):
+        db.connect_to_tasksdb(full_db_path=db_path)
+        statements = []
+
+        def _capture(conn, cursor, statement, params, context, executemany):
+            statements.append((statement, params))
+        event.listen(db.ENGINE, "before_cursor_execute", _capture)
+        try:
+            get_task_uuid_n_ver(potential_filters)
+        finally:
+            event.remove(db.ENGINE, "before_cursor_execute", _capture)
+        statement, params = statements[-1]
+        with db.ENGINE.connect() as conn:
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement,
+                                        tuple(params)).fetchall()
+        return [row[3] for row in rows]
+    return _plan_for
+
+
+@pytest.mark.parametrize("potential_filters, index", [
+    ({TASK_ALL: "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"id": "1,2"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({TASK_NOW: "yes"}, "idx_ws_now"),
+    ({"osrecur": "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"uuid": "abc", TASK_COMPLETE: "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"bybaseuuid": "abc"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"baseuuidonly": "abc"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"eventid": "abc"}, "idx_ws_event_id"),
+    ({"missingid": "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"group": "PLAN"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"context": "plan"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"tag": "plan"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"notes": "plan"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"desc": "plan"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"due": ["lt", "2030-01-01", None]}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"hide": ["bt", "2020-01-01", "2030-01-01"]},
+     "idx_ws_lt_area_type_uuid_ver"),
+    ({"end": ["ge", "2020-01-01", None]}, "idx_ws_lt_area_type_uuid_ver"),
+    ({TASK_OVERDUE: "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({TASK_TODAY: "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({TASK_HIDDEN: "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({TASK_STARTED: "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({TASK_COMPLETE: "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({TASK_BIN: "yes"}, "idx_ws_lt_area_type_uuid_ver"),
+    ({"group": "PLAN", "tag": "plan", "due": ["lt", "2030-01-01", None]},
+     "idx_ws_lt_area_type_uuid_ver"),
+    ({"tag": "plan", TASK_OVERDUE: "yes", TASK_STARTED: "yes"},
+     "idx_ws_lt_area_type_uuid_ver"),
+    ({"group": "PLAN.ONE"}, "idx_ws_grp_path_uuid"),
+    ({"desc": "plan"}, "VIRTUAL TABLE INDEX"),
+    ({"notes": "plan"}, "VIRTUAL TABLE INDEX"),
+    ({"desc": "~plan AND task"}, "VIRTUAL TABLE INDEX"),
+])
+def test_filter_uses_index(plan_for, potential_filters, index):
+    plan = plan_for(potential_filters)
+    assert not [line for line in plan if FULL_SCAN.match(line)], plan
+    assert any(index in line for line in plan), plan
+
+
+def test_top_view_single_statement(db_path):
+    # The filters are a subquery of the top tasks query, not bound values
+    db.connect_to_tasksdb(full_db_path=db_path)
+    statements = []
+
+    def _capture(conn, cursor, statement, params, context, executemany):
+        statements.append((statement, params))
+    event.listen(db.ENGINE, "before_cursor_execute", _capture)
+    try:
+        display_default({"group": "PLAN"}, top=1)
+    finally:
+        event.remove(db.ENGINE, "before_cursor_execute", _capture)
+    top_qr = [(statement, params) for statement, params in statements
+              if "ORDER BY score DESC" in statement]
+    assert len(top_qr) == 1
+    statement, params = top_qr[0]
+    assert "workspace_latest" in statement
+    assert "LIMIT" in statement
+    assert "PLAN" in params
@@ -8,9 +8,18 @@ from unittest.mock import patch
 from src.mytcli.utils import calc_task_scores
 from src.mytcli.constants import (
     PRIORITY_HIGH, PRIORITY_MEDIUM, PRIORITY_LOW, PRIORITY_NORMAL,
-    TASK_STATUS_TODO, TASK_STATUS_STARTED,
+    TASK_STATUS_TODO, TASK_STATUS_STARTED, FMT_DATEONLY, FMT_DATETIME,
 )
 
+# Scores are calculated against a fixed current time
+NOW = datetime(2026, 3, 15, 10, 30, 0)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
 
 def _make_task(due_days=None, priority=None, status=None,
                now_flag=0, groups=None, notes=None,
@@ -27,18 +36,22 @@ def _make_task(due_days=None, priority=None, status=None,
     task.notes = notes
     # incep_diff_now in total seconds
     task.incep_diff_now = inception_days_ago * 86400
+    task.inception = ((NOW - timedelta(days=inception_days_ago))
+                      .strftime(FMT_DATETIME))
     if due_days is None:
         task.due = None
         task.due_diff_today = None
     else:
-        task.due = "set"
+        task.due = (NOW + timedelta(days=due_days)).strftime(FMT_DATEONLY)
         task.due_diff_today = due_days
     return task
 
 
 @pytest.fixture(autouse=True)
 def mock_get_tags():
-    with patch("src.mytcli.queries.get_tags", return_value=[]):
+    with patch("src.mytcli.queries.get_tags", return_value=[]), \
+         patch("src.mytcli.queries.get_tagged_tasks", return_value=set()), \
+         patch("src.mytcli.utils.datetime", _FrozenDatetime):
         yield
 
 
@@ -143,3 +156,122 @@ class TestInceptionBug:
         one_day = _make_task(inception_days_ago=1)
         scores = calc_task_scores([two_days, one_day])
         assert scores[two_days.uuid] > scores[one_day.uuid]
+
+
+class TestBatchScoring:
+    """Batch scoring must match the per task scoring on a real database."""
+
+    @pytest.fixture
+    def db_tasks(self):
+        import tempfile
+        import mock
+        from click.testing import CliRunner
+        from src.mytcli.myt import add, admin
+        from src.mytcli.queries import get_tasks, get_task_uuid_n_ver
+        from src.mytcli.constants import TASK_ALL
+        import src.mytcli.db as db
+        runner = CliRunner()
+        path = tempfile.mkdtemp() + "/test_scoring.sqlite3"
+        with mock.patch('builtins.input', return_value="yes"):
+            runner.invoke(admin, ['--reinit', '-db', path])
+        runner.invoke(add, ['-de', 'Score 1', '-tg', 'a,b', '-du', '-3',
+                            '-db', path])
+        runner.invoke(add, ['-de', 'Score 2', '-gr', 'GRP', '-du', '+5',
+                            '-pr', 'H', '-db', path])
+        runner.invoke(add, ['-de', 'Score 3', '-tg', 'c', '-no', 'note',
+                            '-db', path])
+        runner.invoke(add, ['-de', 'Score 4', '-du', '+0', '-db', path])
+        db.connect_to_tasksdb(full_db_path=path)
+        return get_tasks(get_task_uuid_n_ver({TASK_ALL: "yes"}),
+                         expunge=False)
+
+    def _legacy_scores(self, task_list):
+        """Reference scores using per task tag lookups."""
+        from src.mytcli.queries import get_tags
+        sc_priority = {PRIORITY_HIGH[0]: 100, PRIORITY_MEDIUM[0]: 95,
+                       PRIORITY_NORMAL[0]: 85, PRIORITY_LOW[0]: 70}
+        sc_status = {TASK_STATUS_STARTED: 100, TASK_STATUS_TODO: 75}
+        incep_sum = sum(task.incep_diff_now for task in task_list) or 1
+        scores = {}
+        for task in task_list:
+            total = ((100 if task.now_flag == 1 else 0) * 15
+                     + (sc_priority.get(task.priority) or 0) * 15
+                     + (sc_status.get(task.status) or 0) * 14
+                     + (10 if task.groups else 0)
+                     + (10 if get_tags(task.uuid, task.version,
+                                       expunge=False) else 0)
+                     + (10 if task.notes else 0)
+                     + 100 * task.incep_diff_now / incep_sum * 3)
+            if task.due is not None:
+                d = int(task.due_diff_today)
+                if d == 0:
+                    due_raw = 1.0
+                elif d > 0:
+                    due_raw = math.exp(-d / 14.0)
+                else:
+                    due_raw = 1.0 + (1.0 - math.exp(d / 7.0))
+                total = total + due_raw * 100 * 50
+            scores[task.uuid] = round(total / 100, 2)
+        return scores
+
+    @pytest.fixture
+    def frozen_now(self):
+        return datetime.now()
+
+    @pytest.fixture(autouse=True)
+    def mock_get_tags(self, frozen_now):
+        # Use the database and freeze time for both scoring paths
+        class _FrozenNow(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return frozen_now
+        with patch("src.mytcli.utils.datetime", _FrozenNow), \
+             patch("src.mytcli.models.datetime", _FrozenNow):
+            yield
+
+    def test_batch_matches_per_task_scores(self, db_tasks):
+        assert len(db_tasks) == 4
+        assert calc_task_scores(db_tasks) == self._legacy_scores(db_tasks)
+
+    def test_tags_retrieved_in_one_query(self, db_tasks):
+        from sqlalchemy import event
+        import src.mytcli.db as db
+        statements = []
+
+        def _capture(conn, cursor, statement, params, context, executemany):
+            statements.append(statement)
+        event.listen(db.ENGINE, "before_cursor_execute", _capture)
+        try:
+            calc_task_scores(db_tasks)
+        finally:
+            event.remove(db.ENGINE, "before_cursor_execute", _capture)
+        assert len(statements) == 1
+
+    def _sql_scores(self, db_tasks, curr_time, top=None):
+        from sqlalchemy import tuple_, desc
+        from src.mytcli.models import Workspace, WorkspaceTags
+        from src.mytcli.queries import get_score_xpr
+        import src.mytcli.db as db
+        tagged_xpr = (db.SESSION.query(WorkspaceTags.uuid)
+                      .filter(WorkspaceTags.uuid == Workspace.uuid,
+                              WorkspaceTags.version == Workspace.version)
+                      .exists())
+        return (db.SESSION.query(Workspace.uuid,
+                                 get_score_xpr(tagged_xpr, curr_time)
+                                 .label("score"))
+                .filter(tuple_(Workspace.uuid, Workspace.version)
+                        .in_([(t.uuid, t.version) for t in db_tasks]))
+                .order_by(desc("score"))
+                .limit(top)
+                .all())
+
+    def test_sql_scores_match_python(self, db_tasks, frozen_now):
+        scores = calc_task_scores(db_tasks)
+        sql_scores = self._sql_scores(db_tasks, frozen_now)
+        assert dict(sql_scores) == scores
+
+    def test_sql_top_scores(self, db_tasks, frozen_now):
+        scores = calc_task_scores(db_tasks)
+        top = self._sql_scores(db_tasks, frozen_now, top=2)
+        assert [score for _, score in top] == sorted(scores.values(),
+                                                     reverse=True)[:2]
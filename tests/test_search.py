@@ -0,0 +1,124 @@
+"""Tests for the full text search index on the description and notes."""
+
+import sqlite3
+import tempfile
+
+import mock
+import pytest
+from click.testing import CliRunner
+
+from src.mytcli.myt import add, modify, delete, undo, admin
+from src.mytcli.queries import get_task_uuid_n_ver, get_tasks
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def db_path():
+    path = tempfile.mkdtemp() + "/test_search.sqlite3"
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--reinit', '-db', path])
+    runner.invoke(add, ['-de', 'Review the budget item', '-no',
+                        'Meeting minutes attached', '-db', path])
+    runner.invoke(add, ['-de', 'Budget planning for Q3', '-db', path])
+    runner.invoke(add, ['-de', 'Item review', '-no', 'Budget notes',
+                        '-db', path])
+    runner.invoke(add, ['-de', 'Call (john) about R AND D', '-db', path])
+    return path
+
+
+def search(db_path, **potential_filters):
+    db.connect_to_tasksdb(full_db_path=db_path)
+    tasks = get_tasks(get_task_uuid_n_ver(potential_filters))
+    return sorted(task.description for task in tasks)
+
+
+@pytest.mark.parametrize("potential_filters, expected", [
+    ({"desc": "budget"}, ["Budget planning for Q3",
+                          "Review the budget item"]),
+    ({"desc": "dget it"}, ["Review the budget item"]),
+    ({"desc": "bu"}, ["Budget planning for Q3", "Review the budget item"]),
+    ({"desc": "R AND D"}, ["Call (john) about R AND D"]),
+    ({"desc": "(john)"}, ["Call (john) about R AND D"]),
+    ({"desc": '"buy'}, []),
+    ({"notes": "budget"}, ["Item review"]),
+    ({"notes": "minutes"}, ["Review the budget item"]),
+    ({"desc": "missing"}, []),
+])
+def test_search(db_path, potential_filters, expected):
+    assert search(db_path, **potential_filters) == expected
+    # Same results from the substring search without the index
+    with mock.patch.object(db, "FTS_ENABLED", False):
+        assert search(db_path, **potential_filters) == expected
+
+
+@pytest.mark.parametrize("potential_filters, expected", [
+    ({"desc": "~budget AND review"}, ["Review the budget item"]),
+    ({"desc": "~planning OR item"}, ["Budget planning for Q3", "Item review",
+                                     "Review the budget item"]),
+    ({"desc": "~review NOT budget"}, ["Item review"]),
+    ({"desc": '~"budget item"'}, ["Review the budget item"]),
+    ({"desc": "~plan*"}, ["Budget planning for Q3"]),
+    ({"notes": "~budget OR minutes"}, ["Item review",
+                                      "Review the budget item"]),
+])
+def test_search_query(db_path, potential_filters, expected):
+    assert search(db_path, **potential_filters) == expected
+
+
+@pytest.mark.parametrize("potential_filters, expected", [
+    # Not valid FTS5 queries, searched for as substrings
+    ({"desc": '~"buy'}, []),
+    ({"desc": "~(john"}, ["Call (john) about R AND D"]),
+    ({"desc": "~budget AND"}, []),
+    # Without the index the query is searched for as a substring
+    ({"desc": "~budget"}, ["Budget planning for Q3",
+                           "Review the budget item"]),
+])
+def test_search_query_fallback(db_path, potential_filters, expected):
+    assert search(db_path, **potential_filters) == expected
+    with mock.patch.object(db, "FTS_ENABLED", False):
+        assert search(db_path, **potential_filters) == expected
+    # The session is still usable after the query failed
+    assert search(db_path, desc="budget") == ["Budget planning for Q3",
+                                              "Review the budget item"]
+
+
+def test_search_follows_changes(db_path):
+    runner.invoke(modify, ['id:2', '-de', 'Quarterly planning', '-db',
+                           db_path])
+    assert search(db_path, desc="budget") == ["Review the budget item"]
+    assert search(db_path, desc="quarterly") == ["Quarterly planning"]
+    runner.invoke(undo, ['-db', db_path])
+    assert search(db_path, desc="quarterly") == []
+    assert search(db_path, desc="budget") == ["Budget planning for Q3",
+                                              "Review the budget item"]
+    runner.invoke(delete, ['id:1', '-db', db_path])
+    assert search(db_path, desc="budget") == ["Budget planning for Q3"]
+
+
+def test_search_rebuild(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM workspace_fts")
+    conn.commit()
+    conn.close()
+    assert search(db_path, desc="budget") == []
+    result = runner.invoke(admin, ['--rebuild', '-db', db_path])
+    assert result.exit_code == 0
+    assert search(db_path, desc="budget") == ["Budget planning for Q3",
+                                              "Review the budget item"]
+
+
+def test_search_migration(db_path):
+    # Databases from before the search index are migrated
+    db.discard_db_resources()
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE workspace_fts")
+    conn.execute("UPDATE app_metadata SET value = '0.4' "
+                 "WHERE key = 'DB_SCHEMA_VERSION'")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(admin, ['--verify', '-db', db_path])
+    assert "Database migrated: added search index." in result.output
+    assert search(db_path, notes="budget") == ["Item review"]
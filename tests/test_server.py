@@ -0,0 +1,91 @@
+"""Tests for the server mode and its client."""
+
+import os
+import tempfile
+import threading
+
+import pytest
+
+import src.mytcli.constants as constants
+from src.mytcli.server import MytServer, get_db_path_arg
+from src.mytcli.client import send_command, ANSI_ESCAPE
+
+
+@pytest.fixture
+def server():
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "test_server.sqlite3")
+    myt_server = MytServer(os.path.join(tmp_dir, "myt.sock"), db_path)
+    assert myt_server.start() == 0
+    thread = threading.Thread(target=myt_server.serve_forever, daemon=True)
+    thread.start()
+    yield myt_server, db_path
+    myt_server.stop()
+    thread.join()
+    assert not constants.TUI_MODE
+    assert constants.TUI_PROMPT_CALLBACK is None
+    assert not os.path.exists(myt_server.socket_path)
+
+
+def test_server_commands(server):
+    myt_server, db_path = server
+    code, output = send_command(['add', '-de', 'Server task 1', '-tg', 'srv'],
+                                myt_server.socket_path)
+    assert code == 0
+    assert "task 1\n" in output
+    code, output = send_command(['modify', 'id:1', '-pr', 'H', '-db',
+                                 db_path], myt_server.socket_path, width=120)
+    assert code == 0
+    code, output = send_command(['view', 'tg:srv'], myt_server.socket_path)
+    assert code == 0
+    assert "Server task 1" in ANSI_ESCAPE.sub("", output)
+
+
+def test_server_prompts(server):
+    # Prompts are declined, so the recurring instance is not changed
+    myt_server, db_path = server
+    send_command(['add', '-de', 'Server task 2', '-du', '+0', '-re', 'D'],
+                 myt_server.socket_path)
+    for argv in (['modify', 'id:1', '-de', 'Server task 3'],
+                 ['delete', 'id:1']):
+        code, output = send_command(argv, myt_server.socket_path)
+        output = " ".join(ANSI_ESCAPE.sub("", output).split())
+        assert code == 0
+        assert ("Declined with 'none' as prompts cannot be answered through "
+                "the server." in output)
+        assert "Defaulting to 'this'" not in output
+    code, output = send_command(['view', 'de:Server'], myt_server.socket_path)
+    output = ANSI_ESCAPE.sub("", output)
+    assert "Server task 2" in output
+    assert "Server task 3" not in output
+
+
+def test_server_errors(server):
+    myt_server, db_path = server
+    code, output = send_command(['view', '-db', '/tmp/other.sqlite3'],
+                                myt_server.socket_path)
+    assert code == 1
+    assert "Server is running for the database at" in output
+    code, output = send_command(['serve'], myt_server.socket_path)
+    assert code == 1
+    code, output = send_command(['unknown'], myt_server.socket_path)
+    assert code == 1
+    assert "Unknown command: 'unknown'" in output
+
+
+def test_server_second_instance(server):
+    myt_server, db_path = server
+    other = MytServer(myt_server.socket_path, db_path)
+    assert other.start() == 1
+    constants.TUI_MODE = False
+
+
+def test_client_no_server():
+    with pytest.raises(FileNotFoundError):
+        send_command(['view'], os.path.join(tempfile.mkdtemp(), "none.sock"))
+
+
+def test_get_db_path_arg():
+    assert get_db_path_arg(['view', '-db', '/a/b']) == '/a/b'
+    assert get_db_path_arg(['view', '--full-db-path=/a/c']) == '/a/c'
+    assert get_db_path_arg(['view']) is None
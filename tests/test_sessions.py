@@ -0,0 +1,134 @@
+"""Tests for the thread scoped sessions and the read and write sessions."""
+
+import tempfile
+import threading
+
+import mock
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.mytcli.myt import add, admin
+from src.mytcli.queries import get_task_uuid_n_ver, get_tasks
+from src.mytcli.constants import TASK_ALL
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def db_path():
+    path = tempfile.mkdtemp() + "/test_sessions.sqlite3"
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--reinit', '-db', path])
+    for cnt in range(1, 6):
+        runner.invoke(add, ['-de', 'Task {}'.format(cnt), '-pr', 'L', '-db',
+                            path])
+    # Write ahead log so readers and the writer do not wait on each other
+    runner.invoke(admin, ['--profile', 'fast', '-db', path])
+    db.connect_to_tasksdb(full_db_path=path)
+    yield path
+    db.discard_db_resources()
+
+
+def priorities():
+    tasks = get_tasks(get_task_uuid_n_ver({TASK_ALL: "yes"}))
+    return sorted(task.priority for task in tasks)
+
+
+def in_threads(func, count):
+    results = [None] * count
+
+    def _run(idx):
+        try:
+            results[idx] = func()
+        except Exception as e:
+            results[idx] = e
+        finally:
+            db.SESSION.remove()
+
+    threads = [threading.Thread(target=_run, args=(idx,))
+               for idx in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_thread_sessions(db_path):
+    assert db.SESSION() is db.SESSION()
+    sessions = in_threads(db.SESSION, 3)
+    assert len({id(session) for session in sessions}) == 3
+    assert db.SESSION() not in sessions
+
+
+def test_read_session(db_path):
+    with db.session_scope(read_only=True) as session:
+        assert session.execute(text(
+            "SELECT count(*) FROM workspace")).scalar() == 5
+        with pytest.raises(OperationalError):
+            session.execute(text("UPDATE workspace SET priority = 'H'"))
+    # The pooled connection can write again after the read session
+    with db.session_scope() as session:
+        session.execute(text("UPDATE workspace SET priority = 'H'"))
+    assert priorities() == ["H"] * 5
+
+
+def test_write_session_rollback(db_path):
+    with pytest.raises(ValueError):
+        with db.session_scope() as session:
+            session.execute(text("UPDATE workspace SET priority = 'H'"))
+            raise ValueError("Failed")
+    assert priorities() == ["L"] * 5
+
+
+def test_reads_during_write(db_path):
+    written = threading.Event()
+    read = threading.Event()
+
+    def _write():
+        with db.session_scope() as session:
+            session.execute(text("UPDATE workspace SET priority = 'H'"))
+            written.set()
+            # Keep the write transaction open while the readers run
+            assert read.wait(10)
+
+    writer = threading.Thread(target=_write)
+    writer.start()
+    assert written.wait(10)
+    # Readers on their own sessions are not blocked by the writer and read
+    # the last committed state
+    results = in_threads(priorities, 4)
+    read.set()
+    writer.join(10)
+    assert results == [["L"] * 5] * 4
+    assert in_threads(priorities, 1) == [["H"] * 5]
+
+
+def test_write_during_read(db_path):
+    reading = threading.Event()
+    written = threading.Event()
+
+    def _read():
+        with db.session_scope(read_only=True) as session:
+            result = session.execute(text(
+                "SELECT priority FROM workspace ORDER BY event_id"))
+            first = result.fetchone()
+            reading.set()
+            # The open statement keeps the read snapshot
+            assert written.wait(10)
+            return [first[0]] + [row[0] for row in result.fetchall()]
+
+    results = []
+    reader = threading.Thread(target=lambda: results.append(_read()))
+    reader.start()
+    assert reading.wait(10)
+    # The writer commits without waiting for the reader to finish
+    with db.session_scope() as session:
+        session.execute(text("UPDATE workspace SET priority = 'M'"))
+    written.set()
+    reader.join(10)
+    assert results == [["L"] * 5]
+    assert priorities() == ["M"] * 5
@@ -0,0 +1,54 @@
+"""Startup time checks for the myt entry point using python -X importtime."""
+
+import os
+import sys
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Budget for the imports of a cold 'myt add', measured at 400-600 ms. Can be
+# raised on slow machines
+IMPORT_BUDGET_MS = int(os.environ.get("MYT_IMPORT_BUDGET_MS", "800"))
+# Modules which are not needed to add a task
+NOT_NEEDED = {"plotext", "src.mytcli.display", "src.mytcli.tui",
+              "src.mytcli.server", "prompt_toolkit"}
+# Modules which are not needed to print the version
+NOT_NEEDED_VERSION = NOT_NEEDED | {"sqlalchemy", "dateutil.rrule",
+                                   "rich.prompt", "src.mytcli.db"}
+
+
+def run_importtime(args):
+    """Runs myt with -X importtime and returns the imported modules and the
+    total import time in milliseconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             "from src.mytcli.myt import myt; myt()"] + args,
+                            cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    modules = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        # Only top level imports, the nested ones are in their cumulative
+        if not name.startswith("  "):
+            total_us = total_us + int(cumulative)
+    return modules, total_us / 1000
+
+
+def test_add_startup():
+    db_path = os.path.join(tempfile.mkdtemp(), "test_startup.sqlite3")
+    # Create the database first so only adding the task is measured
+    run_importtime(["add", "-de", "Startup task 1", "-db", db_path])
+    modules, total_ms = run_importtime(["add", "-de", "Startup task 2",
+                                        "-db", db_path])
+    assert not modules & NOT_NEEDED
+    assert total_ms < IMPORT_BUDGET_MS
+
+
+
+def test_version_startup():
+    modules, total_ms = run_importtime(["version"])
+    assert not modules & NOT_NEEDED_VERSION
+    assert total_ms < IMPORT_BUDGET_MS
@@ -0,0 +1,331 @@
+"""Tests for the TUI refresh, the rows of the displayed task table and the
+commands run on the worker thread."""
+
+import asyncio
+import sqlite3
+import tempfile
+import threading
+from io import StringIO
+from datetime import date, timedelta
+
+import mock
+import pytest
+from click.testing import CliRunner
+from rich.text import Text
+from sqlalchemy import text as sql_text
+from sqlalchemy.exc import OperationalError
+
+from src.mytcli.myt import myt, add, delete, view, admin
+from src.mytcli.tui import MytTUI
+from src.mytcli.dispatcher import TUIDispatcher
+import src.mytcli.constants as constants
+import src.mytcli.db as db
+
+runner = CliRunner()
+
+
+class CountingDispatcher:
+    """Stands in for the TUIDispatcher and counts the commands run."""
+
+    def __init__(self):
+        self.commands = []
+
+    def dispatch(self, text, width_override=None):
+        self.commands.append(text)
+        return 0, "output {}".format(len(self.commands)), False
+
+
+@pytest.fixture
+def db_path():
+    path = tempfile.mkdtemp() + "/test_tui.sqlite3"
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(admin, ['--reinit', '-db', path])
+    runner.invoke(add, ['-de', 'TUI task 1', '-db', path])
+    db.connect_to_tasksdb(full_db_path=path)
+    yield path
+    db.discard_db_resources()
+
+
+def test_data_version(db_path, monkeypatch):
+    # Keep the connection across commands as in the TUI
+    monkeypatch.setattr(constants, "TUI_MODE", True)
+    version = db.get_data_version()
+    assert version is not None
+    # Reads do not change it
+    runner.invoke(view, ['-db', db_path])
+    assert db.get_data_version() == version
+    # A change from another process
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE workspace SET priority = 'H'")
+    conn.commit()
+    conn.close()
+    assert db.get_data_version() != version
+    # A change from the global session
+    version = db.get_data_version()
+    runner.invoke(add, ['-de', 'TUI task 2', '-db', db_path])
+    assert db.get_data_version() != version
+
+
+def test_refresh_if_changed(db_path):
+    tui = MytTUI()
+    tui._dispatcher = CountingDispatcher()
+    tui._refresh_view()
+    assert tui._dispatcher.commands == ["view"]
+    # Nothing changed, so nothing is run
+    assert not tui._refresh_if_changed()
+    assert not tui._refresh_if_changed()
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE workspace SET priority = 'L'")
+    conn.commit()
+    conn.close()
+    assert tui._refresh_if_changed()
+    assert tui._display_text == "output 2"
+    assert not tui._refresh_if_changed()
+    # A new day changes the overdue and today tasks
+    tui._data_date = date.today() - timedelta(days=1)
+    assert tui._refresh_if_changed()
+    assert tui._dispatcher.commands == ["view"] * 3
+    # Not while a command is running
+    tui._data_date = None
+    tui._running = {"label": "view", "cancellable": True, "started": 0}
+    assert not tui._refresh_if_changed()
+
+
+def test_displayed_rows(db_path, monkeypatch):
+    monkeypatch.setattr(constants, "TUI_MODE", True)
+    runner.invoke(add, ['-de', 'A long description which wraps over the '
+                        'lines of the narrow table ' * 10, '-db', db_path])
+    dispatcher = TUIDispatcher(myt)
+    code, output, _ = dispatcher.dispatch("view -db " + db_path,
+                                          width_override=200)
+    assert code == 0
+    rows = constants.TUI_DISPLAYED_ROWS
+    assert sorted(row["id"] for row in rows) == ["1", "2"]
+    assert rows[1]["start"] == rows[0]["end"] + 1
+    lines = [Text.from_ansi(line).plain for line in output.split("\n")]
+    short, wrapped = sorted(rows, key=lambda row: row["id"])
+    # The first line of each row has the ID, the wrapped lines follow
+    assert short["end"] == short["start"]
+    assert "TUI task 1" in lines[short["start"]]
+    assert wrapped["end"] > wrapped["start"]
+    assert "narrow" in lines[wrapped["end"]]
+    for row in rows:
+        assert lines[row["start"]].split()[0] == row["id"]
+    # Not set for the output of other commands
+    dispatcher.dispatch("view --tags -db " + db_path, width_override=200)
+    assert constants.TUI_DISPLAYED_ROWS is None
+
+
+def test_row_highlight(db_path, monkeypatch):
+    monkeypatch.setattr(constants, "TUI_MODE", True)
+    tui = MytTUI()
+    tui._dispatcher = TUIDispatcher(myt)
+    tui._dispatch("view -db " + db_path, "view")
+    fragments = tui._get_display_text()
+    tui._table_focused = True
+    highlighted = tui._get_display_text()
+    # The selected row's fragments are restyled, the text is unchanged
+    assert "".join(f[1] for f in highlighted) == "".join(
+        f[1] for f in fragments)
+    restyled = [f[1] for f, h in zip(fragments, highlighted) if f != h]
+    assert "1" in "".join(restyled)
+    assert all(h[0].endswith("bg:#444444")
+               for f, h in zip(fragments, highlighted) if f != h)
+    # The display is parsed once, not on each highlight
+    with mock.patch('src.mytcli.tui.to_formatted_text') as parse:
+        tui._get_display_text()
+        assert not parse.called
+
+
+def test_view_window(db_path, monkeypatch):
+    monkeypatch.setattr(constants, "TUI_MODE", True)
+    for cnt in range(2, 26):
+        runner.invoke(add, ['-de', 'TUI task {}'.format(cnt), '-pr',
+                            'HML'[cnt % 3], '-db', db_path])
+    dispatcher = TUIDispatcher(myt)
+    dispatcher.dispatch("view -db " + db_path)
+    all_ids = [row["id"] for row in constants.TUI_DISPLAYED_ROWS]
+    assert len(all_ids) == 25
+    tui = MytTUI()
+    tui._dispatcher = dispatcher
+    monkeypatch.setattr(tui, "_get_page_size", lambda: 10)
+    tui._dispatch("view -db " + db_path, "view")
+    assert tui._view_total == 25
+    pages = [[row["id"] for row in tui._rows]]
+    assert tui._change_page(1)
+    pages.append([row["id"] for row in tui._rows])
+    assert tui._change_page(1)
+    pages.append([row["id"] for row in tui._rows])
+    assert not tui._change_page(1)
+    # The pages follow the order of the full view
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert sum(pages, []) == all_ids
+    assert "Rows: 21-25 of 25" in tui._get_toolbar_text()[0][1]
+    # Back to the last page when the tasks on the page are removed
+    with mock.patch('builtins.input', return_value="yes"):
+        runner.invoke(delete, ['id:' + ",".join(pages[2]), '-db', db_path])
+    assert tui._refresh_if_changed()
+    assert tui._view_offset == 10
+    assert [row["id"] for row in tui._rows] == pages[1]
+    # A new command starts from the top
+    tui._dispatch("view -db {} --top 15".format(db_path), "view")
+    assert tui._view_offset == 0
+    assert tui._view_total == 15
+    assert tui._change_page(3)
+    assert len(tui._rows) == 5
+    # No tasks, as the filter's value is not valid
+    monkeypatch.setattr(constants, "TUI_VIEW_WINDOW", (0, 10))
+    exit_code, output, _ = dispatcher.dispatch("view en:x -db " + db_path)
+    assert exit_code == 0
+    assert "No tasks to display" in output
+    assert constants.TUI_VIEW_TOTAL == 0
+
+
+def test_console_pool(db_path):
+    dispatcher = TUIDispatcher(myt)
+    _, first, _ = dispatcher.dispatch("view -db " + db_path, width_override=120)
+    console = constants.CONSOLE._pool[(StringIO, 120)]
+    _, second, _ = dispatcher.dispatch("view -db " + db_path, width_override=120)
+    # The Console is reused with only the target swapped
+    assert constants.CONSOLE._pool[(StringIO, 120)] is console
+    assert "TUI" in Text.from_ansi(first).plain
+    assert "TUI" in Text.from_ansi(second).plain
+    dispatcher.dispatch("view -db " + db_path, width_override=80)
+    assert constants.CONSOLE._pool[(StringIO, 80)] is not console
+    # Released after the command, output goes to the default Console
+    assert console._file is None
+    assert constants.CONSOLE._console is constants.CONSOLE._default
+
+
+class FakeApp:
+    """Stands in for the running Application with an asyncio loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.is_running = True
+
+    def invalidate(self):
+        pass
+
+    def create_background_task(self, coroutine):
+        return self.loop.create_task(coroutine)
+
+
+class QueryDispatcher(CountingDispatcher):
+    """Runs a query which only ends when interrupted for 'view slow'."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.finished = threading.Event()
+
+    def dispatch(self, text, width_override=None):
+        self.commands.append(text)
+        if "slow" not in text:
+            count = db.SESSION.execute(sql_text(
+                "SELECT count(*) FROM workspace")).scalar()
+            return 0, "{} tasks".format(count), False
+        self.started.set()
+        try:
+            db.SESSION.execute(sql_text(
+                "WITH RECURSIVE cnt(x) AS (SELECT 1 UNION ALL "
+                "SELECT x + 1 FROM cnt) SELECT max(x) FROM cnt"))
+            return 0, "slow", False
+        except OperationalError:
+            return 1, "interrupted", False
+        finally:
+            self.finished.set()
+
+
+@pytest.fixture
+def async_tui(db_path):
+    loop = asyncio.new_event_loop()
+    tui = MytTUI()
+    tui._dispatcher = QueryDispatcher()
+    tui._app = FakeApp(loop)
+    tui._start_worker()
+    yield tui
+    if tui._running is not None:
+        tui._cancel_command(notify=False)
+    loop.close()
+
+
+def run_till_idle(tui):
+    async def _wait():
+        for _ in range(500):
+            if tui._running is None and not tui._spinning:
+                return
+            await asyncio.sleep(0.01)
+    tui._app.loop.run_until_complete(_wait())
+
+
+def test_dispatch_superseded(async_tui):
+    tui = async_tui
+    tui._dispatch("view slow", "view")
+    assert tui._running["label"] == "view slow"
+    assert tui._dispatcher.started.wait(5)
+    # The input is free, a new command supersedes the running one
+    tui._dispatch("view fast", "view")
+    run_till_idle(tui)
+    assert tui._dispatcher.finished.is_set()
+    assert tui._dispatcher.commands == ["view slow", "view fast"]
+    assert tui._display_text == "1 tasks"
+    assert tui._task_counts == (1, 0)
+
+
+def test_dispatch_cancel(async_tui):
+    tui = async_tui
+    tui._dispatch("view slow", "view")
+    assert tui._dispatcher.started.wait(5)
+    tui._cancel_command()
+    assert tui._running is None
+    assert tui._status_message == "Cancelled: view slow"
+    # The query is interrupted and its result dropped
+    assert tui._dispatcher.finished.wait(5)
+    run_till_idle(tui)
+    assert tui._display_text == ""
+    # Later commands run as usual
+    tui._dispatch("view", "view")
+    run_till_idle(tui)
+    assert tui._display_text == "1 tasks"
+    # Changes to the tasks can not be cancelled, input waits for them
+    tui._running = {"label": "add", "cancellable": False, "started": 0}
+    tui._handle_command(mock.Mock(text="view"))
+    assert tui._dispatcher.commands == ["view slow", "view"]
+
+
+def test_pager_then_command(async_tui):
+    tui = async_tui
+    tui._last_command = "view"
+    paged = []
+
+    async def fake_run_in_terminal(func):
+        return func()
+
+    def fake_call(args):
+        with open(args[-1]) as f:
+            paged.append(f.read())
+        return 0
+
+    with mock.patch("src.mytcli.tui.run_in_terminal", fake_run_in_terminal), \
+            mock.patch("src.mytcli.tui.subprocess.call", fake_call):
+        tui._open_pager()
+        assert not tui._running["cancellable"]
+        # A new command while the pager renders does not drop the render
+        tui._handle_command(mock.Mock(text="view slow"))
+        run_till_idle(tui)
+        tui._app.loop.run_until_complete(asyncio.sleep(0.05))
+        assert paged == ["1 tasks"]
+        assert tui._dispatcher.commands == ["view"]
+        # Later commands run as usual
+        tui._handle_command(mock.Mock(text="view"))
+        run_till_idle(tui)
+        assert tui._dispatcher.commands == ["view", "view"]
+        assert tui._display_text == "1 tasks"
+        # A superseded render does not open the pager or block the input
+        tui._open_pager()
+        tui._refresh_view()
+        run_till_idle(tui)
+        tui._app.loop.run_until_complete(asyncio.sleep(0.05))
+        assert paged == ["1 tasks"]
+        assert tui._running is None